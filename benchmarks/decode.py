@@ -0,0 +1,150 @@
+"""
+Benchmark decoding of Spark History Server responses into spark_types models.
+
+Compares the bulk list validator used by SparkRestClient._parse_model_list with
+validating one model at a time (the previous implementation), on a synthetic
+taskList response, and the Spark timestamp parser with the strptime it replaced.
+
+Usage:
+    uv run python benchmarks/decode.py [--tasks 100000] [--repeat 3]
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from spark_history_mcp.api.spark_client import SparkRestClient
+from spark_history_mcp.config.config import ServerConfig
+from spark_history_mcp.models.spark_types import TaskData
+
+_TIMESTAMP = "2024-05-01T12:34:56.789GMT"
+
+
+def make_task(task_id: int) -> Dict[str, Any]:
+    """Build a taskList entry shaped like the ones Spark 3.5 returns."""
+    return {
+        "taskId": task_id,
+        "index": task_id,
+        "attempt": 0,
+        "partitionId": task_id,
+        "launchTime": _TIMESTAMP,
+        "resultFetchStart": _TIMESTAMP,
+        "duration": 1000 + task_id % 500,
+        "executorId": str(task_id % 64),
+        "host": f"worker-{task_id % 16}.cluster.local",
+        "status": "SUCCESS",
+        "taskLocality": "PROCESS_LOCAL",
+        "speculative": False,
+        "accumulatorUpdates": [],
+        "executorLogs": {
+            "stdout": f"http://worker-{task_id % 16}:8042/stdout",
+            "stderr": f"http://worker-{task_id % 16}:8042/stderr",
+        },
+        "schedulerDelay": 3,
+        "gettingResultTime": 0,
+        "taskMetrics": {
+            "executorDeserializeTime": 12,
+            "executorDeserializeCpuTime": 9000000,
+            "executorRunTime": 950,
+            "executorCpuTime": 800000000,
+            "resultSize": 2048,
+            "jvmGcTime": 15,
+            "resultSerializationTime": 1,
+            "memoryBytesSpilled": 0,
+            "diskBytesSpilled": 0,
+            "peakExecutionMemory": 33554432,
+            "inputMetrics": {"bytesRead": 134217728, "recordsRead": 1000000},
+            "outputMetrics": {"bytesWritten": 0, "recordsWritten": 0},
+            "shuffleReadMetrics": {
+                "remoteBlocksFetched": 10,
+                "localBlocksFetched": 2,
+                "fetchWaitTime": 5,
+                "remoteBytesRead": 1048576,
+                "remoteBytesReadToDisk": 0,
+                "localBytesRead": 262144,
+                "recordsRead": 5000,
+                "remoteReqsDuration": 20,
+                "shufflePushReadMetrics": {
+                    "corruptMergedBlockChunks": 0,
+                    "mergedFetchFallbackCount": 0,
+                    "remoteMergedBlocksFetched": 0,
+                    "localMergedBlocksFetched": 0,
+                    "remoteMergedChunksFetched": 0,
+                    "localMergedChunksFetched": 0,
+                    "remoteMergedBytesRead": 0,
+                    "localMergedBytesRead": 0,
+                    "remoteMergedReqsDuration": 0,
+                },
+            },
+            "shuffleWriteMetrics": {
+                "bytesWritten": 524288,
+                "writeTime": 3000000,
+                "recordsWritten": 5000,
+            },
+        },
+    }
+
+
+def best_of(repeat: int, func: Callable[[], Any]) -> float:
+    """Run func repeat times and return the fastest wall time in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    body = json.dumps([make_task(i) for i in range(args.tasks)]).encode()
+    data = json.loads(body)
+    client = SparkRestClient(ServerConfig(url="http://localhost:18080"))
+
+    def per_item() -> List[TaskData]:
+        return [TaskData.model_validate(item) for item in data]
+
+    def bulk() -> List[TaskData]:
+        return client._parse_model_list(data, TaskData)
+
+    if per_item() != bulk():
+        sys.stderr.write("Decoders disagree\n")
+        return 1
+
+    def strptime() -> None:
+        for _ in range(args.tasks):
+            datetime.strptime(
+                _TIMESTAMP.replace("GMT", "+0000"), "%Y-%m-%dT%H:%M:%S.%f%z"
+            )
+
+    def fromisoformat() -> None:
+        for _ in range(args.tasks):
+            datetime.fromisoformat(_TIMESTAMP[:-3] + "+00:00")
+
+    results = [
+        ("json.loads", best_of(args.repeat, lambda: json.loads(body))),
+        ("model_validate per task", best_of(args.repeat, per_item)),
+        ("_parse_model_list (bulk)", best_of(args.repeat, bulk)),
+        ("strptime timestamps", best_of(args.repeat, strptime)),
+        ("fromisoformat timestamps", best_of(args.repeat, fromisoformat)),
+    ]
+
+    sys.stdout.write(
+        f"{args.tasks} tasks, {len(body) / 1024 / 1024:.1f} MB, best of {args.repeat}\n"
+    )
+    for name, seconds in results:
+        rate = args.tasks / seconds
+        sys.stdout.write(f"  {name:<28} {seconds:8.3f} s  {rate:12,.0f} /s\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+Benchmark replaying a large event log, in process and with pools of processes.
+
+Builds a log from an example application by repeating its task events (with new
+task IDs), as a single file or a rolling log of gzip segments, and times
+AppReplay.update() with each number of worker processes. With --skipped, each
+task also updates blocks, events a replay skips without parsing them.
+
+Usage:
+    uv run python benchmarks/replay.py [--copies 200] [--workers 0 2 4] [--rolling]
+        [--skipped 0]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import List
+
+from spark_history_mcp.eventlog.files import event_type, find_event_logs
+from spark_history_mcp.eventlog.parallel import ParsePool
+from spark_history_mcp.eventlog.replay import AppReplay
+
+_APP_ID = "spark-cc4d115f011443d787f03a71a476a745"
+_LOG = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "examples",
+    "basic",
+    "events",
+    f"eventlog_v2_{_APP_ID}",
+    f"events_1_{_APP_ID}",
+)
+_TASK_EVENTS = ("SparkListenerTaskStart", "SparkListenerTaskEnd")
+
+
+def block_updated(executor_id: str, block: int) -> bytes:
+    """A BlockUpdated event, as written with spark.eventLog.logBlockUpdates.enabled."""
+    event = {
+        "Event": "SparkListenerBlockUpdated",
+        "Block Updated Info": {
+            "Block Manager ID": {
+                "Executor ID": executor_id,
+                "Host": "worker-1.cluster.local",
+                "Port": 40000,
+            },
+            "Block ID": f"rdd_7_{block}",
+            "Storage Level": {
+                "Use Disk": False,
+                "Use Memory": True,
+                "Use Off Heap": False,
+                "Deserialized": True,
+                "Replication": 1,
+            },
+            "Memory Size": 1048576,
+            "Disk Size": 0,
+        },
+    }
+    return json.dumps(event).encode() + b"\n"
+
+
+def make_lines(copies: int, skipped: int = 0) -> List[bytes]:
+    """Lines of the example log, its task events repeated with new task IDs."""
+    lines = []
+    with open(_LOG, "rb") as f:
+        for line in f:
+            if event_type(line) not in _TASK_EVENTS:
+                lines.append(line)
+                continue
+            event = json.loads(line)
+            task_id = event["Task Info"]["Task ID"]
+            for copy in range(copies):
+                event["Task Info"]["Task ID"] = task_id + copy * 1_000_000
+                lines.append(json.dumps(event).encode() + b"\n")
+                executor_id = event["Task Info"]["Executor ID"]
+                lines.extend(block_updated(executor_id, n) for n in range(skipped))
+    return lines
+
+
+def write_log(directory: str, lines: List[bytes], rolling: bool) -> None:
+    """Write the lines as a single log file, or as gzip segments of a rolling log."""
+    if not rolling:
+        with open(os.path.join(directory, _APP_ID), "wb") as f:
+            f.writelines(lines)
+        return
+    rolling_dir = os.path.join(directory, f"eventlog_v2_{_APP_ID}")
+    os.makedirs(rolling_dir)
+    open(os.path.join(rolling_dir, f"appstatus_{_APP_ID}"), "w").close()
+    per_segment = max(len(lines) // 16, 1)
+    for number, start in enumerate(range(0, len(lines), per_segment), 1):
+        path = os.path.join(rolling_dir, f"events_{number}_{_APP_ID}.gz")
+        with gzip.open(path, "wb", compresslevel=1) as f:
+            f.writelines(lines[start : start + per_segment])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--copies", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 2, 4])
+    parser.add_argument("--rolling", action="store_true")
+    parser.add_argument("--skipped", type=int, default=0)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        lines = make_lines(args.copies, args.skipped)
+        size = sum(len(line) for line in lines) / 1e6
+        write_log(directory, lines, args.rolling)
+        (log,) = find_event_logs(directory)
+        sys.stdout.write(
+            f"{len(lines)} events, {size:.0f} MB, {len(log.segments)} segment(s)\n"
+        )
+        for workers in args.workers:
+            pool = ParsePool(workers) if workers > 1 else None
+            if pool is not None:
+                # Start the processes before timing
+                list(pool.map(time.sleep, [(0.1,)] * workers))
+            started = time.perf_counter()
+            AppReplay(log).update(pool=pool)
+            elapsed = time.perf_counter() - started
+            sys.stdout.write(
+                f"  workers={workers:<3} {elapsed:8.2f} s  {size / elapsed:6.0f} MB/s\n"
+            )
+            if pool is not None:
+                pool.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
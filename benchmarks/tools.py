@@ -0,0 +1,267 @@
+"""
+Benchmark every MCP tool against a synthetic Spark History Server.
+
+Each tool is called through the MCP server (argument validation, the tool itself
+and the serialization of its result) against an in-process StubHistoryServer
+serving SyntheticHistory data. Every call gets a fresh client, so nothing is
+served from the client caches. Reports the fastest wall time, the peak growth of
+the resident set size during a call, and the size of the serialized result.
+
+Results are stored in benchmarks/results/<version>-<scale>.json and compared with
+the most recent results of another version at the same scale, so regressions
+show up across versions.
+
+Usage:
+    uv run python benchmarks/tools.py [--scale small|medium|large] [--repeat 3]
+        [--tools list_jobs,get_stage] [--baseline FILE] [--no-save]
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import glob
+import json
+import os
+import platform
+import resource
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError
+from importlib.metadata import version as package_version
+from typing import Any, Dict, List, Optional
+from unittest.mock import patch
+
+import pydantic_core
+
+from spark_history_mcp.api.spark_client import SparkRestClient
+from spark_history_mcp.config.config import ServerConfig
+from spark_history_mcp.core.app import mcp
+from spark_history_mcp.testing.stub_server import StubHistoryServer
+from spark_history_mcp.testing.synthetic import SCALES, SyntheticHistory
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# Slowdown over the baseline reported as a regression, and the smallest one in
+# seconds (timings of a few milliseconds are noisy)
+REGRESSION_RATIO = 1.25
+REGRESSION_MIN_SECONDS = 0.005
+
+
+def tool_arguments(app_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Arguments of the benchmarked call of each tool."""
+    app, other = app_ids[-1], app_ids[0]
+    return {
+        "list_applications": {},
+        "get_application": {"app_id": app},
+        "list_jobs": {"app_id": app},
+        "list_slowest_jobs": {"app_id": app},
+        "list_stages": {"app_id": app},
+        "list_slowest_stages": {"app_id": app},
+        "get_stage": {"app_id": app, "stage_id": 1, "with_summaries": True},
+        "get_stage_task_summary": {"app_id": app, "stage_id": 1},
+        "get_environment": {"app_id": app},
+        "compare_job_environments": {"app_id1": app, "app_id2": other},
+        "list_executors": {"app_id": app, "include_inactive": True},
+        "get_executor": {"app_id": app, "executor_id": "1"},
+        "get_executor_summary": {"app_id": app},
+        "compare_job_performance": {"app_id1": app, "app_id2": other},
+        "compare_sql_execution_plans": {"app_id1": app, "app_id2": other},
+        "list_slowest_sql_queries": {"app_id": app, "top_n": 5},
+        "get_job_bottlenecks": {"app_id": app},
+        "get_resource_usage_timeline": {"app_id": app},
+    }
+
+
+def rss_bytes() -> int:
+    """Current resident set size, or the peak so far where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class PeakRss(threading.Thread):
+    """Thread sampling the resident set size until stopped, keeping the peak."""
+
+    def __init__(self, interval: float = 0.002):
+        super().__init__(name="rss-sampler", daemon=True)
+        self.interval = interval
+        self.start_rss = self.peak = rss_bytes()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self.peak = max(self.peak, rss_bytes())
+
+    def stop(self) -> int:
+        """Stop sampling and return the peak growth in bytes."""
+        self._stop_event.set()
+        self.join()
+        self.peak = max(self.peak, rss_bytes())
+        return self.peak - self.start_rss
+
+
+async def call_tool(url: str, name: str, arguments: Dict[str, Any]) -> int:
+    """Call a tool with a fresh client and return the size of its result."""
+    client = SparkRestClient(ServerConfig(url=url), name="benchmark")
+    try:
+        with patch(
+            "spark_history_mcp.tools.tools.get_client_or_default",
+            return_value=client,
+        ):
+            result = await mcp.call_tool(name, arguments)
+    finally:
+        client.session.close()
+    return len(pydantic_core.to_json(result))
+
+
+async def run_tools(
+    url: str, calls: Dict[str, Dict[str, Any]], repeat: int
+) -> Dict[str, Dict[str, Any]]:
+    """Run each tool once to warm up, then repeat times, and collect the results."""
+    results = {}
+    for name, arguments in calls.items():
+        size = await call_tool(url, name, arguments)
+        timings = []
+        peak_rss = 0
+        for _ in range(repeat):
+            sampler = PeakRss()
+            sampler.start()
+            start = time.perf_counter()
+            try:
+                await call_tool(url, name, arguments)
+            finally:
+                elapsed = time.perf_counter() - start
+                peak_rss = max(peak_rss, sampler.stop())
+            timings.append(elapsed)
+        results[name] = {
+            "seconds": round(min(timings), 6),
+            "peak_rss_mb": round(peak_rss / 1024 / 1024, 2),
+            "response_bytes": size,
+        }
+        sys.stdout.write(f"  {name:<30} {min(timings):8.3f} s\n")
+    return results
+
+
+def current_version() -> str:
+    """Version of the installed package."""
+    try:
+        return package_version("mcp-apache-spark-history-server")
+    except PackageNotFoundError:
+        return "dev"
+
+
+def find_baseline(scale: str, version: str) -> Optional[str]:
+    """Most recent results of another version at the same scale."""
+    candidates = []
+    for path in glob.glob(os.path.join(RESULTS_DIR, f"*-{scale}.json")):
+        with open(path) as f:
+            results = json.load(f)
+        if results.get("scale") == scale and results.get("version") != version:
+            candidates.append((results.get("created", ""), path))
+    return max(candidates)[1] if candidates else None
+
+
+def report(results: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> int:
+    """Write the results table and return the number of regressions."""
+    base_tools = baseline["tools"] if baseline else {}
+    regressions = 0
+    sys.stdout.write(
+        f"\n{'tool':<30} {'seconds':>9} {'vs base':>8} "
+        f"{'peak RSS MB':>12} {'response KB':>12}\n"
+    )
+    for name, result in results["tools"].items():
+        seconds = result["seconds"]
+        change = ""
+        base = base_tools.get(name)
+        if base and base["seconds"] > 0:
+            ratio = seconds / base["seconds"]
+            change = f"{ratio:7.2f}x"
+            if (
+                ratio > REGRESSION_RATIO
+                and seconds - base["seconds"] > REGRESSION_MIN_SECONDS
+            ):
+                change += " !"
+                regressions += 1
+        sys.stdout.write(
+            f"{name:<30} {seconds:9.3f} {change:>8} "
+            f"{result['peak_rss_mb']:12.1f} {result['response_bytes'] / 1024:12.1f}\n"
+        )
+    if baseline:
+        sys.stdout.write(
+            f"\nBaseline: version {baseline['version']} ({baseline['created']}), "
+            f"{regressions} regression(s) over {REGRESSION_RATIO}x\n"
+        )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="medium")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tools", help="Comma-separated tools to run (default: all)")
+    parser.add_argument("--baseline", help="Results file to compare with")
+    parser.add_argument(
+        "--no-save", action="store_true", help="Don't store the results"
+    )
+    args = parser.parse_args(argv)
+
+    history = SyntheticHistory(SCALES[args.scale])
+    calls = tool_arguments(history.app_ids)
+    registered = {tool.name for tool in mcp._tool_manager.list_tools()}
+    if registered - set(calls):
+        sys.stderr.write(
+            f"No benchmark arguments for tools: {sorted(registered - set(calls))}\n"
+        )
+        return 1
+    if args.tools:
+        selected = args.tools.split(",")
+        unknown = set(selected) - set(calls)
+        if unknown:
+            sys.stderr.write(f"Unknown tools: {sorted(unknown)}\n")
+            return 1
+        calls = {name: calls[name] for name in selected}
+
+    version = current_version()
+    sys.stdout.write(
+        f"Scale {args.scale}: {dataclasses.asdict(history.scale)}, "
+        f"best of {args.repeat}\n"
+    )
+    with StubHistoryServer(history) as server:
+        tools = asyncio.run(run_tools(server.url, calls, args.repeat))
+
+    results = {
+        "version": version,
+        "scale": args.scale,
+        "scale_params": dataclasses.asdict(history.scale),
+        "repeat": args.repeat,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPUs",
+        "tools": tools,
+    }
+
+    baseline_path = args.baseline or find_baseline(args.scale, version)
+    baseline = None
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+    regressions = report(results, baseline)
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{version}-{args.scale}.json")
+        with open(path, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        sys.stdout.write(f"Results stored in {path}\n")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
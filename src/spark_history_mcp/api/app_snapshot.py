@@ -0,0 +1,118 @@
+"""
+Per-analysis snapshot of a Spark application's REST resources.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, TypeVar
+
+from spark_history_mcp.api.async_spark_client import AsyncSparkRestClient
+from spark_history_mcp.models.spark_types import (
+    ApplicationInfo,
+    ExecutionData,
+    ExecutorSummary,
+    JobData,
+)
+
+R = TypeVar("R")
+
+
+class AppSnapshot:
+    """
+    Lazily loaded, memoized view of one application for the duration of a tool call.
+
+    Each resource is fetched on first use and shared afterwards, including with
+    callers awaiting it concurrently, so a composite tool fetches every endpoint at
+    most once however many of its analyses need it. Stages are the exception: they
+    can outnumber the other resources by far, so they are streamed to a reduction
+    instead of being kept (see scan_stages).
+    """
+
+    # Resources that can be passed to prefetch
+    RESOURCES = ("application", "jobs", "executors", "sql")
+
+    def __init__(self, client: AsyncSparkRestClient, app_id: str):
+        """
+        Initialize the snapshot.
+
+        Args:
+            client: The client to fetch resources with
+            app_id: The Spark application ID
+        """
+        self.client = client
+        self.app_id = app_id
+        self._loads: Dict[str, asyncio.Future] = {}
+
+    async def _load(self, name: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        load = self._loads.get(name)
+        if load is None:
+            load = self._loads[name] = asyncio.ensure_future(fetch())
+        try:
+            return await asyncio.shield(load)
+        except Exception:
+            # Forget failures so a later call can retry
+            if self._loads.get(name) is load:
+                del self._loads[name]
+            raise
+
+    async def prefetch(self, *resources: str) -> None:
+        """
+        Load resources concurrently ahead of their use.
+
+        Args:
+            resources: Names of the resources (see RESOURCES)
+
+        Raises:
+            ValueError: If a resource name is unknown
+        """
+        unknown = set(resources) - set(self.RESOURCES)
+        if unknown:
+            raise ValueError(f"Unknown snapshot resources: {sorted(unknown)}")
+        await asyncio.gather(*(getattr(self, name)() for name in resources))
+
+    async def application(self) -> ApplicationInfo:
+        """Get the application info."""
+        return await self._load(
+            "application", lambda: self.client.get_application(self.app_id)
+        )
+
+    async def jobs(self) -> List[JobData]:
+        """Get all jobs of the application."""
+        return await self._load(
+            "jobs", lambda: self.client.list_jobs(app_id=self.app_id)
+        )
+
+    async def scan_stages(self, reduce: Callable[[Iterator[Dict[str, Any]]], R]) -> R:
+        """
+        Reduce the stages of the application as they are decoded.
+
+        The stages are neither kept nor parsed: reduce gets raw JSON records (for
+        example to rank them with StageTable.nlargest) and runs on the worker pool,
+        so memory stays bounded however many stages the application has. Unlike
+        the other resources, each call fetches the stages again.
+
+        Args:
+            reduce: Function consuming the stream of stage records
+
+        Returns:
+            The result of reduce
+        """
+        return await self.client.scan_stage_records(reduce, app_id=self.app_id)
+
+    async def executors(self) -> List[ExecutorSummary]:
+        """Get all executors (active and inactive) of the application."""
+        return await self._load(
+            "executors", lambda: self.client.list_all_executors(app_id=self.app_id)
+        )
+
+    async def sql(self) -> List[ExecutionData]:
+        """Get all SQL executions of the application, without details or plans."""
+
+        async def fetch() -> List[ExecutionData]:
+            executions: List[ExecutionData] = []
+            async for page in self.client.iter_sql_list(
+                app_id=self.app_id, details=False, plan_description=False
+            ):
+                executions.extend(page)
+            return executions
+
+        return await self._load("sql", fetch)
@@ -0,0 +1,207 @@
+"""
+Asyncio interface to the Spark REST API.
+
+The blocking HTTP work is done by SparkRestClient (pooled keep-alive session,
+attempt-ID fallback, EMR cookie authentication) on a shared worker pool, so
+coroutines awaiting these methods never block the MCP event loop.
+"""
+
+import asyncio
+import collections
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+
+from spark_history_mcp.api.spark_client import SparkRestClient
+from spark_history_mcp.models.spark_types import ExecutionData
+
+# Shared by every AsyncSparkRestClient so the number of threads blocked on the
+# Spark History Server stays bounded regardless of how many sessions are active
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="spark-rest")
+
+# Pages of a paginated endpoint requested concurrently by iter_pages
+PAGE_WINDOW = 8
+
+R = TypeVar("R")
+T = TypeVar("T")
+
+
+def _mirror(name: str) -> Callable[..., Any]:
+    """Create an async method that runs SparkRestClient.<name> on the worker pool."""
+    sync_method = getattr(SparkRestClient, name)
+
+    @functools.wraps(sync_method)
+    async def method(self: "AsyncSparkRestClient", *args, **kwargs):
+        return await self._run(getattr(self.client, name), *args, **kwargs)
+
+    return method
+
+
+def _mirror_scan(name: str) -> Callable[..., Any]:
+    """Create an async method that reduces the SparkRestClient.<name> stream on the worker pool."""
+    iter_method = getattr(SparkRestClient, name)
+
+    async def method(
+        self: "AsyncSparkRestClient",
+        reduce: Callable[[Iterator[Any]], R],
+        *args,
+        **kwargs,
+    ) -> R:
+        return await self._run(
+            lambda: reduce(getattr(self.client, name)(*args, **kwargs))
+        )
+
+    method.__name__ = method.__qualname__ = name.replace("iter_", "scan_", 1)
+    method.__doc__ = (
+        f"Run reduce over SparkRestClient.{name}(*args, **kwargs) on the worker pool.\n\n"
+        "Only the result of reduce (for example a top-N heap) is kept in memory.\n\n"
+        f"{iter_method.__doc__}"
+    )
+    return method
+
+
+async def iter_pages(
+    fetch: Callable[[int, int], Awaitable[List[T]]],
+    page_size: int,
+    window: int = PAGE_WINDOW,
+) -> AsyncIterator[List[T]]:
+    """
+    Fetch the pages of a paginated endpoint, up to window of them concurrently.
+
+    The first page is fetched alone, so a listing that fits in one page costs a
+    single request. After that, window pages are kept in flight and the ones past
+    the end of the listing (detected by a short page) are cancelled.
+
+    Args:
+        fetch: Coroutine function fetching the page at (offset, length)
+        page_size: Number of items per page
+        window: Maximum number of pages in flight
+
+    Returns:
+        Async iterator over the non-empty pages, in offset order
+    """
+    page = await fetch(0, page_size)
+    if page:
+        yield page
+    if len(page) < page_size:
+        return
+
+    in_flight: collections.deque = collections.deque()
+    offset = page_size
+    try:
+        while True:
+            while len(in_flight) < window:
+                in_flight.append(asyncio.ensure_future(fetch(offset, page_size)))
+                offset += page_size
+            page = await in_flight.popleft()
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+    finally:
+        for request in in_flight:
+            request.cancel()
+
+
+class AsyncSparkRestClient:
+    """
+    Asyncio client for the Spark REST API.
+
+    Mirrors the public API of SparkRestClient; every method is a coroutine.
+    """
+
+    def __init__(self, client: SparkRestClient):
+        """
+        Initialize the async Spark REST client.
+
+        Args:
+            client: The SparkRestClient performing the HTTP requests
+        """
+        self.client = client
+
+    async def _run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        # Run in a copy of the caller's context so spans started on the worker
+        # thread are children of the caller's span
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            _executor, functools.partial(context.run, func, *args, **kwargs)
+        )
+
+    get_version = _mirror("get_version")
+    list_applications = _mirror("list_applications")
+    get_application = _mirror("get_application")
+    get_application_attempt = _mirror("get_application_attempt")
+    list_jobs = _mirror("list_jobs")
+    get_job = _mirror("get_job")
+    list_stages = _mirror("list_stages")
+    scan_stages = _mirror_scan("iter_stages")
+    scan_stage_records = _mirror_scan("iter_stage_records")
+    list_stage_attempts = _mirror("list_stage_attempts")
+    get_stage_attempt = _mirror("get_stage_attempt")
+    get_stage_task_summary = _mirror("get_stage_task_summary")
+    list_stage_tasks = _mirror("list_stage_tasks")
+    scan_stage_tasks = _mirror_scan("iter_stage_tasks")
+    scan_stage_task_records = _mirror_scan("iter_stage_task_records")
+    list_executors = _mirror("list_executors")
+    list_all_executors = _mirror("list_all_executors")
+    list_executor_thread_dump = _mirror("list_executor_thread_dump")
+    get_task_thread_dump = _mirror("get_task_thread_dump")
+    list_all_processes = _mirror("list_all_processes")
+    list_rdds = _mirror("list_rdds")
+    get_rdd = _mirror("get_rdd")
+    get_environment = _mirror("get_environment")
+    get_metrics_prometheus = _mirror("get_metrics_prometheus")
+    get_sql_list = _mirror("get_sql_list")
+    get_sql_execution = _mirror("get_sql_execution")
+
+    async def iter_sql_list(
+        self,
+        app_id: str,
+        attempt_id: Optional[str] = None,
+        details: bool = True,
+        plan_description: bool = False,
+        page_size: int = 100,
+        window: int = PAGE_WINDOW,
+        fields: Optional[Sequence[str]] = None,
+    ) -> AsyncIterator[List[ExecutionData]]:
+        """
+        Get all SQL executions of an application, page by page.
+
+        Args:
+            app_id: The application ID
+            attempt_id: Optional attempt ID
+            details: Whether to include execution details
+            plan_description: Whether to include plan description
+            page_size: Number of executions per request
+            window: Maximum number of pages requested concurrently
+            fields: Only parse these ExecutionData fields (names or JSON aliases)
+
+        Returns:
+            Async iterator over pages of ExecutionData objects, in execution order
+        """
+
+        def fetch(offset: int, length: int) -> Awaitable[List[ExecutionData]]:
+            return self.get_sql_list(
+                app_id=app_id,
+                attempt_id=attempt_id,
+                details=details,
+                plan_description=plan_description,
+                offset=offset,
+                length=length,
+                fields=fields,
+            )
+
+        async for page in iter_pages(fetch, page_size, window):
+            yield page
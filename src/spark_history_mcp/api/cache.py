@@ -0,0 +1,120 @@
+"""
+In-memory cache for Spark History Server REST responses.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, NamedTuple, Optional
+
+
+class _CacheEntry(NamedTuple):
+    value: Any
+    size: int
+    expires_at: Optional[float]  # None for entries that never expire
+
+
+class ResponseCache:
+    """
+    LRU cache of decoded REST responses bounded by a byte budget.
+
+    Responses belonging to completed applications never change, so they are kept
+    until they are evicted to make room for newer entries. Everything else (running
+    applications, application listings) expires after a short TTL.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Total response bytes the cache may hold (0 disables caching)
+            ttl: Seconds mutable responses stay cached
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value, or None on a miss or expired entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (
+                entry.expires_at is None or entry.expires_at > time.monotonic()
+            ):
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry.value
+
+            if entry is not None:
+                self._remove(key)
+            self._misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any, size: int, immutable: bool) -> None:
+        """
+        Store a response.
+
+        Args:
+            key: Cache key
+            value: Decoded response
+            size: Size of the raw response in bytes
+            immutable: Whether the response can never change (completed application)
+        """
+        if not self.enabled or size > self.max_bytes:
+            return
+
+        expires_at = None if immutable else time.monotonic() + self.ttl
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _CacheEntry(value, size, expires_at)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get cache usage counters.
+
+        Returns:
+            Dictionary with hits, misses, evictions, entry count and bytes held
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
@@ -0,0 +1,192 @@
+"""
+Persistent SQLite cache for Spark History Server REST responses.
+
+Only responses of completed applications are stored, so entries never go stale
+and a restarted MCP server can answer from disk instead of re-warming against
+the History Server.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import closing
+from typing import Any, Dict, List, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    app_id TEXT,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+"""
+
+
+class DiskCache:
+    """
+    Size-capped, LRU-evicted store of zlib-compressed response bodies.
+
+    A single SQLite file can be shared by several configured servers; each server
+    reads and writes its own namespace, while the size cap applies to the file.
+    """
+
+    def __init__(self, path: str, namespace: str, max_bytes: int):
+        """
+        Open (and create if needed) the cache database.
+
+        Args:
+            path: Path of the SQLite database file
+            namespace: Namespace of the server using the cache
+            max_bytes: Maximum compressed bytes stored in the database file
+        """
+        self.path = path
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Look up a response body and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The decompressed response body, or None if not cached
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM responses WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+            if row is None:
+                return None
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE responses SET last_access = ? WHERE namespace = ? AND key = ?",
+                    (time.time(), self.namespace, key),
+                )
+        return zlib.decompress(row[0])
+
+    def put(self, key: str, body: bytes, app_id: Optional[str] = None) -> None:
+        """
+        Store a response body, evicting least recently used entries over the cap.
+
+        Args:
+            key: Cache key
+            body: Raw response body
+            app_id: Application the response belongs to
+        """
+        data = zlib.compress(body)
+        if len(data) > self.max_bytes:
+            return
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(namespace, key, app_id, data, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.namespace, key, app_id, data, len(data), time.time()),
+            )
+            (total,) = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            if total <= self.max_bytes:
+                return
+
+            # Drop the least recently used rows until the file is back under the cap
+            excess = total - self.max_bytes
+            rows = self._conn.execute(
+                "SELECT namespace, key, size FROM responses ORDER BY last_access"
+            )
+            evicted = []
+            for namespace, evict_key, size in rows:
+                evicted.append((namespace, evict_key))
+                excess -= size
+                if excess <= 0:
+                    break
+            self._conn.executemany(
+                "DELETE FROM responses WHERE namespace = ? AND key = ?", evicted
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def get_disk_cache_stats(path: str) -> List[Dict[str, Any]]:
+    """
+    Summarize the contents of a cache database per namespace.
+
+    Args:
+        path: Path of the SQLite database file
+
+    Returns:
+        List of dictionaries with namespace, entries, applications and bytes
+    """
+    with closing(sqlite3.connect(path)) as conn:
+        conn.executescript(_SCHEMA)
+        rows = conn.execute(
+            "SELECT namespace, COUNT(*), COUNT(DISTINCT app_id), SUM(size), "
+            "MIN(last_access), MAX(last_access) "
+            "FROM responses GROUP BY namespace ORDER BY namespace"
+        ).fetchall()
+    return [
+        {
+            "namespace": namespace,
+            "entries": entries,
+            "applications": applications,
+            "bytes": size,
+            "oldest_access": oldest,
+            "newest_access": newest,
+        }
+        for namespace, entries, applications, size, oldest, newest in rows
+    ]
+
+
+def purge_disk_cache(
+    path: str, namespace: Optional[str] = None, app_id: Optional[str] = None
+) -> int:
+    """
+    Delete cached responses.
+
+    Args:
+        path: Path of the SQLite database file
+        namespace: Only purge this server's namespace (all namespaces if None)
+        app_id: Only purge responses of this application (all if None)
+
+    Returns:
+        Number of deleted entries
+    """
+    clauses = []
+    args = []
+    if namespace is not None:
+        clauses.append("namespace = ?")
+        args.append(namespace)
+    if app_id is not None:
+        clauses.append("app_id = ?")
+        args.append(app_id)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    with closing(sqlite3.connect(path)) as conn:
+        conn.executescript(_SCHEMA)
+        with conn:
+            deleted = conn.execute(
+                f"DELETE FROM responses{where}",  # noqa: S608
+                args,
+            ).rowcount
+        conn.execute("VACUUM")
+    return deleted
@@ -0,0 +1,128 @@
+"""
+Spark REST client answering from event logs instead of a Spark History Server.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterator, Optional
+
+import requests
+
+from spark_history_mcp.api.spark_client import SparkRestClient
+from spark_history_mcp.config.config import ServerConfig
+from spark_history_mcp.eventlog.history import EventLogHistory
+from spark_history_mcp.utils.metrics import (
+    SHS_REQUEST_DURATION,
+    SHS_RESPONSES,
+    endpoint_label,
+)
+from spark_history_mcp.utils.tracing import tracer
+
+
+class EventLogClient(SparkRestClient):
+    """
+    SparkRestClient reading the event logs of a directory, like a History Server would.
+
+    Requests are answered by an EventLogHistory in process, with the same models
+    and errors (404 for unknown resources) as from a History Server. The
+    in-memory and disk response caches are not used: the replays of the
+    applications are the cache.
+    """
+
+    def __init__(self, server_config: ServerConfig, name: Optional[str] = None):
+        """
+        Initialize the client.
+
+        Args:
+            server_config: Configuration object, with event_log_dir set
+            name: Name of the server in the configuration (defaults to its URL)
+        """
+        directory = server_config.event_log_dir
+        super().__init__(
+            server_config.model_copy(
+                update={
+                    "url": server_config.url or Path(directory).absolute().as_uri(),
+                    "cache_max_mb": 0,
+                    "disk_cache_path": None,
+                }
+            ),
+            name=name,
+        )
+        self.history = EventLogHistory(
+            directory,
+            refresh_interval=server_config.event_log_refresh,
+            max_apps=server_config.event_log_max_apps,
+            index_dir=server_config.event_log_index_dir,
+            workers=server_config.event_log_workers,
+        )
+
+    def _load(
+        self, endpoint: str, params: Optional[Dict[str, Any]], cache_key: Hashable
+    ) -> Any:
+        return self._answer(endpoint, params)
+
+    def _stream(
+        self, endpoint: str, params: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Any]:
+        yield from self._answer(endpoint.lstrip("/"), params)
+
+    def _answer(self, endpoint: str, params: Optional[Dict[str, Any]]) -> Any:
+        """
+        Answer a request from the event logs.
+
+        Raises:
+            requests.exceptions.HTTPError: 404 for unknown resources, 400 for
+                invalid parameters, like the History Server
+        """
+        query = {
+            name: [str(v) for v in value] if isinstance(value, list) else [str(value)]
+            for name, value in (params or {}).items()
+            if value is not None
+        }
+        label = endpoint_label(endpoint)
+        status = "error"
+        with (
+            tracer.start_as_current_span(
+                "eventlog.get", attributes={"spark.server": self.name}
+            ),
+            SHS_REQUEST_DURATION.labels(self.name, label).time(),
+        ):
+            try:
+                data = self.history.get(endpoint, query)
+                status = "200"
+                return data
+            except LookupError as e:
+                status = "404"
+                raise self._http_error(endpoint, 404, "Not Found", e) from e
+            except ValueError as e:
+                status = "400"
+                raise self._http_error(endpoint, 400, "Bad Request", e) from e
+            finally:
+                SHS_RESPONSES.labels(self.name, label, status).inc()
+
+    def _http_error(
+        self, endpoint: str, status: int, reason: str, error: Exception
+    ) -> requests.exceptions.HTTPError:
+        """The error a History Server response with this status would raise."""
+        response = requests.Response()
+        response.status_code = status
+        response.reason = reason
+        response.url = f"{self.base_url}/{endpoint}"
+        response._content = str(error).encode()
+        return requests.exceptions.HTTPError(
+            f"{status} Client Error: {reason} for url: {response.url}",
+            response=response,
+        )
+
+    def get_metrics_prometheus(self, app_id: str) -> str:
+        """
+        Executor metrics are only served by live applications.
+
+        Raises:
+            requests.exceptions.HTTPError: Always (404)
+        """
+        raise self._http_error(
+            f"applications/{app_id}/prometheus",
+            404,
+            "Not Found",
+            LookupError("Executor metrics are not written to event logs"),
+        )
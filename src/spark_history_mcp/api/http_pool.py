@@ -0,0 +1,102 @@
+"""
+Pooled keep-alive HTTP transport shared by the Spark REST clients.
+"""
+
+import threading
+import time
+from typing import Dict
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that keeps connections alive between calls and tracks pool usage.
+
+    Idle connections older than ``keepalive_timeout`` seconds are dropped before the
+    next request instead of being reused, so servers or proxies that silently close
+    idle sockets don't cause spurious failures.
+    """
+
+    def __init__(self, pool_size: int, keepalive_timeout: int, retries: int):
+        """
+        Initialize the adapter.
+
+        Args:
+            pool_size: Maximum number of connections kept alive per host
+            keepalive_timeout: Seconds an idle connection may be reused for
+            retries: Connection-level retries for idempotent requests
+        """
+        self.keepalive_timeout = keepalive_timeout
+        self._lock = threading.Lock()
+        self._last_used = time.monotonic()
+        self._requests = 0
+        self._retired_connections = 0
+
+        # Only retry failures where the server never produced a response (refused
+        # connections, dropped keep-alive sockets). HTTP status codes are surfaced to
+        # the caller untouched.
+        max_retries = Retry(
+            total=retries,
+            connect=retries,
+            read=min(retries, 1),
+            status=0,
+            backoff_factor=0.2,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            raise_on_status=False,
+        )
+        super().__init__(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=max_retries,
+        )
+
+    def _managers(self):
+        return [self.poolmanager, *self.proxy_manager.values()]
+
+    def _live_connections(self) -> int:
+        total = 0
+        for manager in self._managers():
+            for key in manager.pools.keys():
+                try:
+                    total += manager.pools[key].num_connections
+                except KeyError:
+                    continue
+        return total
+
+    def _expire_idle(self) -> None:
+        """Drop pooled connections that have been idle for too long."""
+        now = time.monotonic()
+        with self._lock:
+            idle = now - self._last_used
+            self._last_used = now
+            self._requests += 1
+            if idle <= self.keepalive_timeout:
+                return
+            self._retired_connections += self._live_connections()
+            for manager in self._managers():
+                manager.clear()
+
+    def send(self, request, **kwargs):
+        self._expire_idle()
+        return super().send(request, **kwargs)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get connection pool usage counters.
+
+        Returns:
+            Dictionary with the number of requests sent, connections opened and
+            connections reused
+        """
+        with self._lock:
+            opened = self._retired_connections + self._live_connections()
+            requests_sent = self._requests
+        return {
+            "requests": requests_sent,
+            "connections_opened": opened,
+            "connections_reused": max(requests_sent - opened, 0),
+            "pool_size": self._pool_maxsize,
+            "keepalive_timeout": self.keepalive_timeout,
+        }
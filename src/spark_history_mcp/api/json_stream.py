@@ -0,0 +1,104 @@
+"""
+Incremental decoding of JSON array responses.
+"""
+
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_START = "-0123456789"
+_NUMBER_CHARS = "+-.0123456789eE"
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Decode the elements of a top-level JSON array as its bytes arrive.
+
+    Only the element being decoded is buffered, so memory stays proportional to
+    the largest element instead of the whole document.
+
+    Args:
+        chunks: Raw UTF-8 bytes of the document, in any chunking
+
+    Returns:
+        Iterator over the decoded array elements
+
+    Raises:
+        json.JSONDecodeError: If the document is not a well-formed JSON array
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def read(min_length: int) -> None:
+        # Drop what has been consumed, then read until min_length characters are
+        # buffered past pos (or the document ends)
+        nonlocal buffer, pos, eof
+        buffer = buffer[pos:]
+        pos = 0
+        parts = [buffer]
+        length = len(buffer)
+        while length < min_length and not eof:
+            chunk = next(chunks, None)
+            if chunk is None:
+                eof = True
+                text = text_decoder.decode(b"", final=True)
+            else:
+                text = text_decoder.decode(chunk)
+            parts.append(text)
+            length += len(text)
+        buffer = "".join(parts)
+
+    def next_char() -> str:
+        # Skip whitespace and return the next character ("" at the end of the document)
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer) or eof:
+                return buffer[pos : pos + 1]
+            read(1)
+
+    if next_char() != "[":
+        raise json.JSONDecodeError("Expecting '['", buffer, pos)
+    pos += 1
+
+    first = True
+    while True:
+        char = next_char()
+        if char == "]":
+            return
+        if not first:
+            if char != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+            pos += 1
+            next_char()
+
+        while True:
+            if not eof and buffer[pos] in _NUMBER_START:
+                # A number running up to the end of the buffer may continue in the
+                # next chunk, and a prefix of it would still decode
+                end = pos
+                while end < len(buffer) and buffer[end] in _NUMBER_CHARS:
+                    end += 1
+                if end == len(buffer):
+                    read(len(buffer) - pos + 1)
+                    continue
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # Grow the buffer geometrically so a large element is not
+                # re-decoded once per chunk
+                read(2 * (len(buffer) - pos) or 1)
+                continue
+            break
+
+        pos = end
+        first = False
+        yield item
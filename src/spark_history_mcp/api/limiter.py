@@ -0,0 +1,174 @@
+"""
+Adaptive concurrency limiting of requests to a Spark History Server.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+import requests
+
+
+class LimiterTimeoutError(requests.exceptions.Timeout):
+    """Raised when a request waited longer than its timeout for room under the limit."""
+
+
+class Slot:
+    """A request admitted by an AdaptiveLimiter."""
+
+    def __init__(self, start: float):
+        self.start = start
+        self.overloaded = False  # Set when the server signalled overload
+        # Set when the response arrived, if the slot is held longer (None: the
+        # time the slot was held)
+        self.latency: Optional[float] = None
+        self.streaming = False  # Held while the body of the response downloads
+
+
+class AdaptiveLimiter:
+    """
+    Bound the requests in flight to one server, adapting the bound to its health.
+
+    The limit follows additive-increase/multiplicative-decrease: every request
+    answered within latency_target raises it by 1/limit (about one more request
+    per round of healthy responses), and a request signalling overload (HTTP 5xx,
+    an out-of-memory error, a timeout) halves it. Requests already in flight when
+    the limit was cut do not cut it again, so one burst of failures counts once.
+    Callers beyond the limit wait in line until a request completes. Time spent
+    waiting while a streamed response holds room doesn't count towards their
+    timeout: the stream is healthy, just long.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        latency_target: float = 5.0,
+        backoff: float = 0.5,
+    ):
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError("Limits must satisfy 1 <= min_limit <= max_limit")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._waiting = 0
+        self._streaming = 0
+        self._last_decrease = float("-inf")
+        self._increases = 0
+        self._decreases = 0
+
+    @property
+    def limit(self) -> int:
+        """The number of requests currently allowed in flight."""
+        return int(self._limit)
+
+    @contextmanager
+    def slot(self, timeout: Optional[float] = None) -> Iterator[Slot]:
+        """
+        Wait for room under the limit and hold it for the duration of a request.
+
+        The request reports overload by setting `overloaded` on the yielded slot.
+        Exceptions raised inside the block release the slot without adjusting the
+        limit; set `overloaded` before re-raising to count them as overload.
+
+        Args:
+            timeout: Seconds to wait for room at most, not counting the time
+                streams hold room (None: no limit)
+
+        Yields:
+            The slot of the admitted request
+
+        Raises:
+            LimiterTimeoutError: If there was no room within the timeout
+        """
+        with self._condition:
+            self._waiting += 1
+            try:
+                self._wait_for_room(timeout)
+            finally:
+                self._waiting -= 1
+            self._in_flight += 1
+
+        slot = Slot(time.monotonic())
+        latency: Optional[float] = None
+        try:
+            yield slot
+            latency = slot.latency
+            if latency is None:
+                latency = time.monotonic() - slot.start
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                if slot.streaming:
+                    self._streaming -= 1
+                if slot.overloaded:
+                    self._decrease(slot.start)
+                elif latency is not None and latency <= self.latency_target:
+                    self._increase()
+                self._condition.notify_all()
+
+    def _wait_for_room(self, timeout: Optional[float]) -> None:
+        """Wait (holding the condition) until a request fits under the limit."""
+        waited = 0.0
+        while self._in_flight >= self.limit:
+            if timeout is None or self._streaming:
+                self._condition.wait()
+                continue
+            if waited >= timeout:
+                raise LimiterTimeoutError(
+                    f"No room under the concurrency limit of {self.limit} "
+                    f"within {timeout}s"
+                )
+            started = time.monotonic()
+            self._condition.wait(timeout - waited)
+            waited += time.monotonic() - started
+
+    def stream(self, slot: Slot) -> None:
+        """
+        Mark an admitted request as downloading a streamed body.
+
+        Callers waiting for room stop their timeout until the slot is released.
+
+        Args:
+            slot: The slot of the request
+        """
+        with self._condition:
+            if not slot.streaming:
+                slot.streaming = True
+                self._streaming += 1
+                self._condition.notify_all()
+
+    def _increase(self) -> None:
+        if self._limit < self.max_limit:
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            self._increases += 1
+
+    def _decrease(self, start: float) -> None:
+        if start < self._last_decrease:
+            return
+        self._limit = max(self.min_limit, self._limit * self.backoff)
+        self._last_decrease = time.monotonic()
+        self._decreases += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get limiter state and counters.
+
+        Returns:
+            Dictionary with the current limit, requests in flight, callers waiting,
+            and how often the limit was raised and cut
+        """
+        with self._condition:
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "waiting": self._waiting,
+                "increases": self._increases,
+                "decreases": self._decreases,
+            }
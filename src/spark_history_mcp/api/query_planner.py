@@ -0,0 +1,288 @@
+"""
+Declarative fetching of jobs, stages and SQL executions with filter pushdown.
+
+Tools describe what they need from a list endpoint as a Query (entity, status
+filter, fields, top N) and plan_query turns it into the cheapest Spark History
+Server calls: status filters become `status=` parameters where the endpoint
+supports them, heavy payloads (`details`, `withSummaries`, `planDescription`) are
+only requested when a needed field lives in them, and for SQL only for the top N
+executions. What the server cannot do, like ranking, is left as residual work
+done locally.
+"""
+
+import asyncio
+import heapq
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+
+from spark_history_mcp.api.async_spark_client import AsyncSparkRestClient
+from spark_history_mcp.models.projection import field_names, project
+from spark_history_mcp.models.spark_types import (
+    ExecutionData,
+    JobData,
+    JobExecutionStatus,
+    SQLExecutionStatus,
+    StageData,
+    StageStatus,
+)
+from spark_history_mcp.models.tables import StageTable
+
+# Status values per entity, and whether the list endpoint can filter on them
+_STATUSES = {
+    "jobs": tuple(s.value for s in JobExecutionStatus),
+    "stages": tuple(s.value for s in StageStatus),
+    "sql": tuple(s.value for s in SQLExecutionStatus),
+}
+_STATUS_PUSHDOWN = {"jobs": True, "stages": True, "sql": False}
+
+# Names tools may use for the status of a stage that is still running
+_STATUS_ALIASES = {"stages": {"RUNNING": StageStatus.ACTIVE.value}}
+
+_MODELS = {"jobs": JobData, "stages": StageData, "sql": ExecutionData}
+
+# Fields ranking by duration reads
+_DURATION_FIELDS = {
+    "jobs": ("submission_time", "completion_time"),
+    "stages": StageTable.EXECUTION_COLUMNS,
+    "sql": ("duration",),
+}
+
+# Fields only returned when a flag of the list call is set
+_STAGE_DETAIL_FIELDS = {"tasks", "executor_summary"}
+_STAGE_SUMMARY_FIELDS = {"task_metrics_distributions", "executor_metrics_distributions"}
+_SQL_DETAIL_FIELDS = {"nodes", "edges"}
+
+
+@dataclass(frozen=True)
+class Query:
+    """What a tool needs from a list endpoint of one application."""
+
+    entity: str  # "jobs", "stages" or "sql"
+    app_id: str
+    statuses: Optional[Tuple[str, ...]] = None  # Keep only these statuses
+    exclude_statuses: Tuple[str, ...] = ()  # Drop these statuses
+    fields: Optional[Tuple[str, ...]] = (
+        None  # Fields the tool reads (None: default payload)
+    )
+    top_n: Optional[int] = None  # Keep only the N longest, longest first
+    attempt_id: Optional[str] = None  # Application attempt (SQL only)
+    page_size: int = 100  # Executions per request (SQL only)
+
+
+@dataclass(frozen=True)
+class FetchPlan:
+    """The Spark History Server calls answering a Query, and the work left to do locally."""
+
+    query: Query
+    list_params: Dict[str, Any]  # Keyword arguments of the list call
+    keep_statuses: Optional[FrozenSet[str]]  # Statuses kept locally (None keeps all)
+    fields: Optional[Tuple[str, ...]]  # Fields parsed from the list response
+    detail_params: Optional[Dict[str, Any]] = None  # Per-winner SQL call
+
+    async def execute(self, client: AsyncSparkRestClient) -> List[Any]:
+        """
+        Run the plan.
+
+        Args:
+            client: The client to fetch with
+
+        Returns:
+            The matching jobs, stages or SQL executions (the N longest first when
+            top_n is set, in server order otherwise)
+        """
+        entity = self.query.entity
+        if entity == "jobs":
+            jobs = await client.list_jobs(**self.list_params, fields=self.fields)
+            return self.residual(jobs)
+
+        if entity == "stages":
+            if self.query.top_n is None:
+                stages = await client.list_stages(
+                    **self.list_params, fields=self.fields
+                )
+                return self.residual(stages)
+            # Stages are streamed and ranked in columnar batches, so only the N
+            # longest are parsed and held in memory
+            return await client.scan_stage_records(self.residual, **self.list_params)
+
+        executions: List[ExecutionData] = []
+        async for page in client.iter_sql_list(**self.list_params, fields=self.fields):
+            # Previous winners come first so they win ties against later ones
+            executions = self.residual(executions + page)
+
+        if self.detail_params is not None and executions:
+            executions = list(
+                await asyncio.gather(
+                    *(
+                        client.get_sql_execution(
+                            app_id=self.query.app_id,
+                            execution_id=execution.id,
+                            attempt_id=self.query.attempt_id,
+                            **self.detail_params,
+                        )
+                        for execution in executions
+                    )
+                )
+            )
+        return executions
+
+    def residual(self, rows: Iterable[Any]) -> List[Any]:
+        """
+        Do the local part of the query: status filtering and top-N ranking.
+
+        Statuses pushed down to the server are checked again, which costs nothing
+        next to the transfer and lets the plan run on rows fetched without it (for
+        example from an AppSnapshot).
+
+        Args:
+            rows: Models of the entity, or raw JSON records for stages
+
+        Returns:
+            The matching models
+        """
+        top_n = self.query.top_n
+        if self.query.entity == "stages":
+            return self._stage_residual(rows)
+
+        rows = [row for row in rows if self._keep(row.status)]
+        if top_n is None:
+            return rows
+        if self.query.entity == "jobs":
+            return heapq.nlargest(top_n, rows, key=_job_seconds)
+        return heapq.nlargest(top_n, rows, key=lambda e: e.duration or 0)
+
+    def _keep(self, status: Any) -> bool:
+        return self.keep_statuses is None or status in self.keep_statuses
+
+    def _stage_residual(self, rows: Iterable[Any]) -> List[StageData]:
+        model = project(StageData, self.fields)
+
+        def parse(record):
+            return (
+                record
+                if isinstance(record, BaseModel)
+                else model.model_validate(record)
+            )
+
+        if self.query.top_n is None:
+            stages = [parse(record) for record in rows]
+            return [stage for stage in stages if self._keep(stage.status)]
+
+        def score(stages: StageTable) -> np.ndarray:
+            seconds = stages.execution_seconds()
+            if self.keep_statuses is not None:
+                seconds[~np.isin(stages["status"], list(self.keep_statuses))] = np.nan
+            return seconds
+
+        [top] = StageTable.nlargest(
+            rows,
+            self.query.top_n,
+            [score],
+            ("status",) + StageTable.EXECUTION_COLUMNS,
+        )
+        return [parse(record) for record in top.records]
+
+
+def _job_seconds(job: JobData) -> float:
+    if job.completion_time and job.submission_time:
+        return (job.completion_time - job.submission_time).total_seconds()
+    return 0
+
+
+def plan_query(query: Query) -> FetchPlan:
+    """
+    Choose the cheapest Spark History Server calls answering a query.
+
+    Args:
+        query: What the tool needs
+
+    Returns:
+        The fetch plan
+
+    Raises:
+        ValueError: If the entity, a status or a field is unknown
+    """
+    if query.entity not in _MODELS:
+        raise ValueError(f"Unknown entity {query.entity}")
+
+    keep_statuses = _keep_statuses(query)
+    pushed_statuses = None
+    if keep_statuses is not None and _STATUS_PUSHDOWN[query.entity]:
+        pushed_statuses = sorted(keep_statuses)
+
+    needed = None
+    if query.fields is not None:
+        model = _MODELS[query.entity]
+        needed = set(field_names(model, query.fields))
+        # Residual filtering and ranking read these too
+        needed.add("status")
+        if query.top_n is not None:
+            needed.update(_DURATION_FIELDS[query.entity])
+        needed = tuple(sorted(needed))
+
+    if query.entity == "jobs":
+        status = pushed_statuses and [JobExecutionStatus(s) for s in pushed_statuses]
+        return FetchPlan(
+            query,
+            {"app_id": query.app_id, "status": status},
+            keep_statuses,
+            needed,
+        )
+
+    if query.entity == "stages":
+        status = pushed_statuses and [StageStatus(s) for s in pushed_statuses]
+        return FetchPlan(
+            query,
+            {
+                "app_id": query.app_id,
+                "status": status,
+                "details": bool(_STAGE_DETAIL_FIELDS & set(needed or ())),
+                "with_summaries": bool(_STAGE_SUMMARY_FIELDS & set(needed or ())),
+            },
+            keep_statuses,
+            needed,
+        )
+
+    details = needed is None or bool(_SQL_DETAIL_FIELDS & set(needed))
+    plan_description = needed is not None and "plan_description" in needed
+    list_params = {
+        "app_id": query.app_id,
+        "attempt_id": query.attempt_id,
+        "details": details,
+        "plan_description": plan_description,
+        "page_size": query.page_size,
+    }
+    detail_params = None
+    if query.top_n is not None and (details or plan_description):
+        # Rank on the light listing, then fetch the heavy parts of the winners only
+        list_params.update(details=False, plan_description=False)
+        detail_params = {"details": details, "plan_description": plan_description}
+        if needed is not None:
+            # The winners are fetched by ID
+            needed = tuple(sorted(set(needed) | {"id"}))
+    return FetchPlan(query, list_params, keep_statuses, needed, detail_params)
+
+
+def _keep_statuses(query: Query) -> Optional[FrozenSet[str]]:
+    """Statuses the query keeps, or None if it keeps all of them."""
+    if query.statuses is None and not query.exclude_statuses:
+        return None
+
+    known = _STATUSES[query.entity]
+    aliases = _STATUS_ALIASES.get(query.entity, {})
+
+    def normalize(statuses):
+        normalized = set()
+        for status in statuses:
+            status = aliases.get(status.upper(), status.upper())
+            if status not in known:
+                raise ValueError(f"Unknown {query.entity} status {status}")
+            normalized.add(status)
+        return normalized
+
+    keep = normalize(known if query.statuses is None else query.statuses)
+    keep -= normalize(query.exclude_statuses)
+    return None if keep == set(known) else frozenset(keep)
@@ -0,0 +1,200 @@
+"""
+Retries with jittered backoff and circuit breaking for Spark History Server requests.
+"""
+
+import random
+import threading
+import time
+from typing import Any, Dict
+
+import requests
+
+from spark_history_mcp.utils.metrics import SHS_BREAKER_OPENED, SHS_BREAKER_STATE
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request while a server's circuit breaker is open."""
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter between retries of a request.
+
+    The n-th retry waits a random time between 0 and min(backoff_max,
+    backoff * 2**n) seconds, so sessions retrying the same failure spread out
+    instead of hitting the recovering server in lockstep.
+    """
+
+    def __init__(self, retries: int = 2, backoff: float = 0.5, backoff_max: float = 10):
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self._lock = threading.Lock()
+        self._retried = 0
+        self._exhausted = 0
+
+    def should_retry(self, attempt: int) -> bool:
+        """
+        Decide whether a retryable failure of an attempt is retried.
+
+        Args:
+            attempt: Number of the failed attempt, starting at 0
+
+        Returns:
+            True if retries are left, in which case the caller must wait() first
+        """
+        if attempt < self.retries:
+            return True
+        if self.retries:
+            with self._lock:
+                self._exhausted += 1
+        return False
+
+    def wait(self, attempt: int) -> None:
+        """
+        Sleep before retrying a failed attempt.
+
+        Args:
+            attempt: Number of the failed attempt, starting at 0
+        """
+        with self._lock:
+            self._retried += 1
+        delay = min(self.backoff_max, self.backoff * 2**attempt)
+        time.sleep(random.uniform(0, delay))  # noqa: S311 - jitter, not crypto
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get retry counters.
+
+        Returns:
+            Dictionary with retries made and requests that failed after all retries
+        """
+        with self._lock:
+            return {"retries": self._retried, "retries_exhausted": self._exhausted}
+
+
+class CircuitBreaker:
+    """
+    Fail fast while a server keeps failing, and probe it before trusting it again.
+
+    After `threshold` consecutive failures the breaker opens and requests are
+    rejected with CircuitOpenError without reaching the server. Once
+    `reset_timeout` seconds have passed it lets a single probe request through
+    (half-open): success closes the breaker, failure opens it for another
+    `reset_timeout`. Outcomes of requests admitted before the last change of
+    state are ignored, so a slow request that started before the breaker opened
+    can't close it: only the probe can.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    # Values of the breaker state gauge
+    _GAUGE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, name: str, threshold: int = 5, reset_timeout: float = 30):
+        self.name = name
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        # Incremented on each change of state, to tell stale outcomes apart
+        self._generation = 0
+        self._opened = 0
+        self._rejected = 0
+        SHS_BREAKER_STATE.labels(name).set(0)
+        SHS_BREAKER_OPENED.labels(name).set(0)
+
+    @property
+    def state(self) -> str:
+        """The state of the breaker: closed, open or half_open."""
+        return self._state
+
+    def before_request(self) -> int:
+        """
+        Admit a request, or reject it while the breaker is open.
+
+        Every admitted request must report its outcome with record().
+
+        Returns:
+            The generation of the breaker the request is admitted under
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with its probe
+                still in flight
+        """
+        if self.threshold <= 0:
+            return 0
+        with self._lock:
+            if (
+                self._state == self.OPEN
+                and time.monotonic() - self._opened_at >= self.reset_timeout
+            ):
+                self._set_state(self.HALF_OPEN)
+            if self._state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return self._generation
+            if self._state == self.CLOSED:
+                return self._generation
+            self._rejected += 1
+            retry_in = max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+        raise CircuitOpenError(
+            f"Spark History Server {self.name} is unavailable after "
+            f"{self.threshold} consecutive failures; retrying in {retry_in:.0f}s"
+        )
+
+    def record(self, success: bool, generation: int) -> None:
+        """
+        Report the outcome of an admitted request.
+
+        Args:
+            success: Whether the server answered healthily
+            generation: What before_request() returned when admitting it
+        """
+        if self.threshold <= 0:
+            return
+        with self._lock:
+            if generation != self._generation:
+                # Admitted before the breaker opened, or closed again
+                return
+            if self._state == self.HALF_OPEN:
+                self._probing = False
+            if success:
+                self._set_state(self.CLOSED)
+                self._failures = 0
+                return
+            self._failures += 1
+            if self._state == self.HALF_OPEN or (
+                self._state == self.CLOSED and self._failures >= self.threshold
+            ):
+                self._set_state(self.OPEN)
+                self._opened_at = time.monotonic()
+                self._opened += 1
+                SHS_BREAKER_OPENED.labels(self.name).set(self._opened)
+
+    def _set_state(self, state: str) -> None:
+        """Change the state, under the lock, and publish it."""
+        if state != self._state:
+            self._generation += 1
+        self._state = state
+        SHS_BREAKER_STATE.labels(self.name).set(self._GAUGE_VALUES[state])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get breaker state and counters.
+
+        Returns:
+            Dictionary with the state, consecutive failures, how often the breaker
+            opened, and requests rejected while it was open
+        """
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "opened": self._opened,
+                "rejected": self._rejected,
+            }
@@ -0,0 +1,105 @@
+"""
+Query parameters and value formats of the History Server REST API.
+
+Shared by the sources answering REST requests without a History Server: the
+event log backend and the stand-in servers used for testing.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+# Query parameters as parsed by urllib.parse.parse_qs
+Params = Dict[str, List[str]]
+
+# taskList sortBy values (and their short forms), mapped to descending or not
+TASK_SORTING = {
+    "ID": False,
+    "INCREASING_RUNTIME": False,
+    "RUNTIME": False,
+    "DECREASING_RUNTIME": True,
+    "-RUNTIME": True,
+}
+
+# Quantiles of task summaries when the request doesn't ask for any
+DEFAULT_QUANTILES = "0.05,0.25,0.5,0.75,0.95"
+
+
+def param(params: Params, name: str, default: Optional[str] = None) -> Optional[str]:
+    """First value of a query parameter."""
+    values = params.get(name)
+    return values[0] if values else default
+
+
+def flag(params: Params, name: str, default: bool = False) -> bool:
+    """Boolean query parameter, like details=true."""
+    value = param(params, name)
+    return default if value is None else value.lower() == "true"
+
+
+def statuses(params: Params, name: str = "status") -> Optional[set]:
+    """Upper-cased values of a status filter, or None without one."""
+    values = params.get(name)
+    return {value.upper() for value in values} if values else None
+
+
+def task_sorting(params: Params) -> str:
+    """
+    The sortBy parameter of a taskList request, upper-cased.
+
+    Raises:
+        ValueError: If the sort order is unknown
+    """
+    sort_by = (param(params, "sortBy") or "ID").upper()
+    if sort_by not in TASK_SORTING:
+        raise ValueError(f"Invalid sortBy: {sort_by}")
+    return sort_by
+
+
+def quantiles(params: Params) -> List[float]:
+    """
+    The quantiles parameter of a taskSummary or withSummaries request.
+
+    Raises:
+        ValueError: If a quantile is not a number
+    """
+    value = param(params, "quantiles") or DEFAULT_QUANTILES
+    try:
+        return [float(q) for q in value.split(",")]
+    except ValueError:
+        raise ValueError(f"Invalid quantiles: {value}") from None
+
+
+def page(items: Sequence[Any], params: Params, length: int = 20) -> Sequence[Any]:
+    """
+    The slice of a list selected by the offset and length parameters.
+
+    Raises:
+        ValueError: If offset or length is not an integer
+    """
+    offset = int(param(params, "offset") or 0)
+    return items[offset : offset + int(param(params, "length") or length)]
+
+
+def timestamp(ms: int) -> str:
+    """Format epoch milliseconds the way the History Server does."""
+    moment = datetime.fromtimestamp(ms // 1000, timezone.utc)
+    return f"{moment:%Y-%m-%dT%H:%M:%S}.{ms % 1000:03d}GMT"
+
+
+def parse_date(value: str) -> int:
+    """
+    Parse a date parameter (yyyy-MM-dd'T'HH:mm:ss.SSSz or yyyy-MM-dd) to epoch ms.
+
+    Raises:
+        ValueError: If the date has neither format
+    """
+    try:
+        if "T" in value:
+            moment = datetime.strptime(
+                value.replace("GMT", "+0000"), "%Y-%m-%dT%H:%M:%S.%f%z"
+            )
+        else:
+            moment = datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    except ValueError:
+        raise ValueError(f"Invalid date: {value}") from None
+    return int(moment.timestamp() * 1000)
@@ -1,11 +1,34 @@
+import contextlib
+import functools
+import json
 import re
-from typing import Any, Dict, List, Optional, Type, TypeVar
+import time
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+)
 from urllib.parse import urljoin
 
 import requests
-from pydantic import BaseModel
-
+from opentelemetry import trace
+from pydantic import BaseModel, TypeAdapter
+
+from spark_history_mcp.api.cache import ResponseCache
+from spark_history_mcp.api.disk_cache import DiskCache
+from spark_history_mcp.api.http_pool import PooledHTTPAdapter
+from spark_history_mcp.api.json_stream import iter_json_array
+from spark_history_mcp.api.limiter import AdaptiveLimiter
+from spark_history_mcp.api.resilience import CircuitBreaker, RetryPolicy
+from spark_history_mcp.api.singleflight import SingleFlight
 from spark_history_mcp.config.config import ServerConfig
+from spark_history_mcp.models.projection import project
 from spark_history_mcp.models.spark_types import (
     ApplicationAttemptInfo,
     ApplicationEnvironmentInfo,
@@ -24,26 +47,57 @@ from spark_history_mcp.models.spark_types import (
     ThreadStackTrace,
     VersionInfo,
 )
+from spark_history_mcp.utils.metrics import (
+    CACHE_LOOKUPS,
+    JSON_DECODE_DURATION,
+    MODEL_PARSE_DURATION,
+    SHS_REQUEST_DURATION,
+    SHS_RESPONSE_BYTES,
+    SHS_RESPONSES,
+    SHS_RETRIES,
+    endpoint_label,
+)
+from spark_history_mcp.utils.tracing import tracer
 
 T = TypeVar("T", bound=BaseModel)
 
+# Bytes read from the socket at a time when decoding a streamed response
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Statuses telling that the server is overloaded; an out-of-memory Spark History
+# Server answers 500 like other server errors
+_OVERLOAD_STATUSES = frozenset({429, *range(500, 600)})
+
+# Statuses of transient failures worth retrying, and those telling that the server
+# (or the proxy in front of it) is down or out of memory, which count towards its
+# circuit breaker
+_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+_UNAVAILABLE_STATUSES = frozenset({500, 502, 503, 504})
+
+
+@functools.lru_cache(maxsize=128)
+def _list_adapter(model_class: Type[T]) -> TypeAdapter:
+    """Get the precompiled validator for lists of a model."""
+    return TypeAdapter(List[model_class])
+
 
 class SparkRestClient:
     """
     Python client for the Spark REST API.
     """
 
-    def __init__(self, server_config: ServerConfig):
+    def __init__(self, server_config: ServerConfig, name: Optional[str] = None):
         """
         Initialize the Spark REST client.
 
         Args:
             server_config: Configuration object
+            name: Name of the server in the configuration (defaults to its URL)
         """
         self.config = server_config
+        self.name = name or self.config.url
         self.base_url = self.config.url.rstrip("/") + "/api/v1"
         self.auth = None
-        self.session = None
         self.use_proxy = self.config.use_proxy
         self.proxies = (
             self.use_proxy
@@ -54,6 +108,8 @@ class SparkRestClient:
             or None
         )
         self.pattern = re.compile(r"(.*?/applications/[^/]+/)(.+)")
+        self.app_endpoint_pattern = re.compile(r"^applications/([^/]+)(/.+)?$")
+        self.app_resource_pattern = re.compile(r"/applications/([^/]+)/(?!\d+(?:/|$))")
 
         # Determine whether to verify SSL certificates and timeout
         # Default to True for verify_ssl and 30 seconds for timeout if not specified
@@ -65,18 +121,148 @@ class SparkRestClient:
             if self.config.auth.username and self.config.auth.password:
                 self.auth = (self.config.auth.username, self.config.auth.password)
 
+        # Every client owns a keep-alive connection pool so repeated tool calls reuse
+        # TCP/TLS connections (and SOCKS tunnels) instead of reconnecting each time
+        self.adapter = PooledHTTPAdapter(
+            pool_size=self.config.pool_size,
+            keepalive_timeout=self.config.keepalive_timeout,
+            retries=self.config.connect_retries,
+        )
+        self.session = requests.Session()
+
+        # Responses of completed applications never change and are cached until
+        # evicted; anything that can still change only lives for cache_ttl seconds
+        self.cache = ResponseCache(
+            max_bytes=self.config.cache_max_mb * 1024 * 1024,
+            ttl=self.config.cache_ttl,
+        )
+        self._completed_apps: set[str] = set()
+
+        # Per application, the attempt ID that must be inserted into resource URLs
+        # (None when the plain /applications/{id}/... form works)
+        self._app_attempts: Dict[str, Optional[str]] = {}
+
+        # Optionally persist completed application responses across restarts
+        self.disk_cache = None
+        if self.config.disk_cache_path:
+            self.disk_cache = DiskCache(
+                self.config.disk_cache_path,
+                namespace=self.name,
+                max_bytes=self.config.disk_cache_max_mb * 1024 * 1024,
+            )
+
+        # Identical GETs issued concurrently (e.g. several sessions analyzing the
+        # same application) share a single HTTP request and decoded response.
+        # Streamed GETs don't (see _stream)
+        self._inflight = SingleFlight()
+
+        # Requests in flight to this server are capped by a limit that grows while
+        # it answers quickly and backs off when it fails or runs out of memory
+        self.limiter = AdaptiveLimiter(
+            initial_limit=self.config.initial_concurrency,
+            max_limit=self.config.max_concurrency,
+            latency_target=self.config.latency_target,
+        )
+
+        # Transient failures are retried with backoff; a server that keeps failing
+        # is failed fast by every session until a probe request succeeds again
+        self.retry_policy = RetryPolicy(
+            retries=self.config.retries,
+            backoff=self.config.retry_backoff,
+            backoff_max=self.config.retry_backoff_max,
+        )
+        self.breaker = CircuitBreaker(
+            self.name,
+            threshold=self.config.breaker_threshold,
+            reset_timeout=self.config.breaker_reset_timeout,
+        )
+
+    @property
+    def session(self) -> requests.Session:
+        """The HTTP session used for all requests to the server."""
+        return self._session
+
+    @session.setter
+    def session(self, session: requests.Session) -> None:
+        # Sessions injected from outside (e.g. the EMR persistent UI session with its
+        # authentication cookies) are routed through the same pooled adapter
+        session.mount("http://", self.adapter)
+        session.mount("https://", self.adapter)
+        self._session = session
+
+    def get_pool_stats(self) -> Dict[str, int]:
+        """
+        Get HTTP connection pool statistics.
+
+        Returns:
+            Dictionary with requests sent, connections opened and connections reused
+        """
+        return self.adapter.get_stats()
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        """
+        Get response cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, evictions, entry count and bytes held
+        """
+        return self.cache.get_stats()
+
+    def get_coalescing_stats(self) -> Dict[str, int]:
+        """
+        Get request coalescing statistics.
+
+        Returns:
+            Dictionary with requests executed, requests coalesced into an identical
+            in-flight request, and requests currently in flight
+        """
+        return self._inflight.get_stats()
+
+    def get_limiter_stats(self) -> Dict[str, int]:
+        """
+        Get adaptive concurrency limiter statistics.
+
+        Returns:
+            Dictionary with the current limit, requests in flight, callers waiting,
+            and how often the limit was raised and cut
+        """
+        return self.limiter.get_stats()
+
+    def get_breaker_stats(self) -> Dict[str, Any]:
+        """
+        Get retry and circuit breaker statistics.
+
+        Returns:
+            Dictionary with the breaker state, consecutive failures, how often the
+            breaker opened, requests rejected while open, retries made and requests
+            that failed after all retries
+        """
+        return {**self.breaker.get_stats(), **self.retry_policy.get_stats()}
+
     def _make_request(
-        self, request_url: str, params: Optional[Dict[str, Any]]
+        self,
+        request_url: str,
+        params: Optional[Dict[str, Any]],
+        stream: bool = False,
     ) -> requests.Response:
         """
         Make a GET request to the Spark REST API.
 
+        Requests are rejected without reaching the server while its circuit breaker
+        is open. Responses with a transient status (429, 502, 503, 504) are retried
+        with jittered exponential backoff; the final outcome counts towards the
+        breaker once, as a failure if the server is down or out of memory (500).
+
         Args:
             request_url: The request URL
             params: Optional query parameters
+            stream: Whether to defer downloading the response body
 
         Returns:
             The response from the API
+
+        Raises:
+            CircuitOpenError: If the circuit breaker of the server is open
         """
         headers = {"Accept": "application/json"}
 
@@ -84,76 +270,362 @@ class SparkRestClient:
         if self.config.auth and self.config.auth.token:
             headers["Authorization"] = f"Bearer {self.config.auth.token}"
 
-        # Use the verify_ssl setting for HTTPS requests
-        verify = self.verify_ssl
-
-        # Use the session if available, otherwise use requests directly
-        if self.session:
-            # Add headers to the session
-            for key, value in headers.items():
-                self.session.headers[key] = value
-
-            response = self.session.get(
-                request_url,
-                params=params,
-                timeout=self.timeout,
-                verify=verify,
-                proxies=self.proxies,
-            )
-        else:
-            response = requests.get(
-                request_url,
-                params=params,
-                headers=headers,
-                auth=self.auth,
-                timeout=self.timeout,
-                verify=verify,
-                proxies=self.proxies,
-            )
-        return response
+        generation = self.breaker.before_request()
+        healthy = False
+        try:
+            attempt = 0
+            while True:
+                response = self._send(request_url, params, headers, stream)
+                if response.status_code not in _RETRY_STATUSES:
+                    break
+                if not self.retry_policy.should_retry(attempt):
+                    break
+                response.close()
+                SHS_RETRIES.labels(self.name).inc()
+                self.retry_policy.wait(attempt)
+                attempt += 1
+            healthy = response.status_code not in _UNAVAILABLE_STATUSES
+            return response
+        finally:
+            # Timeouts and connection errors count as failures too
+            self.breaker.record(healthy, generation)
+
+    def _send(
+        self,
+        request_url: str,
+        params: Optional[Dict[str, Any]],
+        headers: Dict[str, str],
+        stream: bool,
+    ) -> requests.Response:
+        """
+        Send one GET request within the server's concurrency limit.
 
-    def _modify_url(self, url):
+        Its time to response headers, or its failure with a 429/5xx status or a
+        timeout, adjusts the limit. The request waits for room under the limit for
+        its timeout at most. A streamed response holds its room until it is closed,
+        as its body is only downloaded then; requests waiting behind it meanwhile
+        don't time out.
+        """
+        endpoint = endpoint_label(request_url)
+        status = "error"
+        # Room under the limit, passed on to a streamed response
+        limit = contextlib.ExitStack()
+        slot = limit.enter_context(self.limiter.slot(self.timeout))
+        with (
+            limit,
+            tracer.start_as_current_span(
+                f"GET {endpoint}",
+                kind=trace.SpanKind.CLIENT,
+                attributes={
+                    "http.request.method": "GET",
+                    "url.full": request_url,
+                    "spark.server": self.name,
+                },
+            ) as span,
+        ):
+            try:
+                with SHS_REQUEST_DURATION.labels(self.name, endpoint).time():
+                    response = self.session.get(
+                        request_url,
+                        params=params,
+                        headers=headers,
+                        auth=self.auth,
+                        timeout=self.timeout,
+                        # Use the verify_ssl setting for HTTPS requests
+                        verify=self.verify_ssl,
+                        proxies=self.proxies,
+                        stream=stream,
+                    )
+                status = str(response.status_code)
+                span.set_attribute("http.response.status_code", response.status_code)
+            except requests.exceptions.Timeout:
+                status = "timeout"
+                slot.overloaded = True
+                raise
+            finally:
+                SHS_RESPONSES.labels(self.name, endpoint, status).inc()
+            slot.latency = time.monotonic() - slot.start
+            slot.overloaded = response.status_code in _OVERLOAD_STATUSES
+            if stream:
+                self.limiter.stream(slot)
+                release = limit.pop_all()
+                close = response.close
+
+                def close_and_release() -> None:
+                    try:
+                        close()
+                    finally:
+                        release.close()
+
+                response.close = close_and_release
+            return response
+
+    def _modify_url(self, url, app_attempt_id="1"):
         match = self.pattern.search(url)
         if match:
             prefix = match.group(1)
             suffix = match.group(2)
             # Check if the suffix already starts with a number (attempt ID)
             if not re.match(r"^\d+/", suffix):
-                # If no attempt ID present, add the first (and probably only) attempt of the app running on YARN
-                app_attempt_id = 1
+                # If no attempt ID present, add the given attempt (the first and probably only attempt of an app running on YARN by default)
                 return f"{prefix}{app_attempt_id}/{suffix}"
         return url
 
-    def _get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    def _fetch(
+        self, url: str, params: Optional[Dict[str, Any]] = None, stream: bool = False
+    ) -> requests.Response:
         """
-        Make a GET request to the Spark REST API.
+        Fetch a URL, inserting the application attempt ID when the server needs it.
+
+        The URL form that works is remembered per application, so only the first
+        request for an application that needs an attempt ID pays for a 404.
 
         Args:
-            endpoint: The API endpoint to call
+            url: The request URL
             params: Optional query parameters
+            stream: Whether to defer downloading the response body
 
         Returns:
-            The JSON response from the API
+            The successful response from the API
         """
-        url = urljoin(self.base_url + "/", endpoint.lstrip("/"))
+        # Only application resources without an explicit attempt ID are rewritten
+        match = self.app_resource_pattern.search(url)
+        app_id = match.group(1) if match else None
+        attempt_id = self._app_attempts.get(app_id) if app_id else None
+        request_url = self._modify_url(url, attempt_id) if attempt_id else url
 
         try:
-            # Try original URL first
-            first_response = self._make_request(url, params)
+            first_response = self._make_request(request_url, params, stream)
             first_response.raise_for_status()
-            return first_response.json()
+            if app_id and app_id not in self._app_attempts:
+                self._app_attempts[app_id] = None
+            return first_response
         except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 404 and "/applications/" in url:
-                modified_url = self._modify_url(url)
-                try:
-                    second_response = self._make_request(modified_url, params)
-                    second_response.raise_for_status()
-                    return second_response.json()
-                except requests.exceptions.HTTPError as e2:
-                    raise e2 from e  # Chain the exception with the original error
+            e.response.close()
+            if e.response.status_code == 404 and app_id:
+                attempt_id = self._latest_attempt_id(app_id)
+                modified_url = self._modify_url(url, attempt_id) if attempt_id else url
+                if modified_url != request_url:
+                    trace.get_current_span().add_event(
+                        "retry with attempt ID", {"spark.attempt_id": attempt_id}
+                    )
+                    try:
+                        second_response = self._make_request(
+                            modified_url, params, stream
+                        )
+                        second_response.raise_for_status()
+                        self._app_attempts[app_id] = attempt_id
+                        return second_response
+                    except requests.exceptions.HTTPError as e2:
+                        raise e2 from e  # Chain the exception with the original error
             # Raise the original error
             raise e from None
 
+    def _latest_attempt_id(self, app_id: str) -> Optional[str]:
+        """
+        Look up the ID of the latest attempt of an application.
+
+        Falls back to the first attempt ("1") when the application can't be fetched.
+        """
+        try:
+            app = self.get_application(app_id)
+        except requests.exceptions.RequestException:
+            return "1"
+        # The History Server lists the most recent attempt first
+        return app.attempts[0].attempt_id if app.attempts else None
+
+    def _get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Make a GET request to the Spark REST API.
+
+        Args:
+            endpoint: The API endpoint to call
+            params: Optional query parameters
+
+        Returns:
+            The JSON response from the API
+        """
+        endpoint = endpoint.lstrip("/")
+        cache_key = self._cache_key(endpoint, params)
+        with tracer.start_as_current_span(
+            "shs.get",
+            attributes={
+                "spark.server": self.name,
+                "spark.endpoint": endpoint_label(endpoint),
+            },
+        ) as span:
+            if self.cache.enabled:
+                cached = self.cache.get(cache_key)
+                self._count_lookup("memory", cached is not None)
+                span.set_attribute("spark.cache_hit", cached is not None)
+                if cached is not None:
+                    return cached
+
+            return self._inflight.do(
+                cache_key, lambda: self._load(endpoint, params, cache_key)
+            )
+
+    def _load(
+        self, endpoint: str, params: Optional[Dict[str, Any]], cache_key: Hashable
+    ) -> Any:
+        """
+        Load a response missing from the in-memory cache.
+
+        Args:
+            endpoint: The API endpoint to call
+            params: Optional query parameters
+            cache_key: Cache key of the request
+
+        Returns:
+            The JSON response from the disk cache or the API
+        """
+        if self.disk_cache:
+            body = self.disk_cache.get(json.dumps(cache_key))
+            self._count_lookup("disk", body is not None)
+            if body is not None:
+                data = json.loads(body)
+                self.cache.put(cache_key, data, size=len(body), immutable=True)
+                return data
+
+        url = urljoin(self.base_url + "/", endpoint)
+        response = self._fetch(url, params)
+        label = endpoint_label(endpoint)
+        SHS_RESPONSE_BYTES.labels(self.name, label).observe(len(response.content))
+        with (
+            tracer.start_as_current_span(
+                "json.decode",
+                attributes={"spark.response_bytes": len(response.content)},
+            ),
+            JSON_DECODE_DURATION.labels(self.name, label).time(),
+        ):
+            data = response.json()
+
+        if self.cache.enabled or self.disk_cache:
+            immutable = self._is_immutable(endpoint, data)
+            self.cache.put(
+                cache_key, data, size=len(response.content), immutable=immutable
+            )
+            if immutable and self.disk_cache:
+                app_id = self.app_endpoint_pattern.match(endpoint).group(1)
+                self.disk_cache.put(
+                    json.dumps(cache_key), response.content, app_id=app_id
+                )
+        return data
+
+    def _stream(
+        self, endpoint: str, params: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Any]:
+        """
+        Make a GET request and decode the JSON array response incrementally.
+
+        Responses already cached are served from the cache. Streamed responses are
+        not cached, since holding them in memory is what streaming avoids. For the
+        same reason they don't go through SingleFlight: it shares a call's whole
+        result, and a stream is consumed once as it downloads, so identical
+        concurrent streams each make their own request (within the concurrency
+        limit) rather than buffering one response for all of them.
+
+        Args:
+            endpoint: The API endpoint to call
+            params: Optional query parameters
+
+        Returns:
+            Iterator over the elements of the JSON array response
+        """
+        endpoint = endpoint.lstrip("/")
+        cache_key = self._cache_key(endpoint, params)
+        if self.cache.enabled:
+            cached = self.cache.get(cache_key)
+            self._count_lookup("memory", cached is not None)
+            if cached is not None:
+                yield from cached
+                return
+        if self.disk_cache:
+            body = self.disk_cache.get(json.dumps(cache_key))
+            self._count_lookup("disk", body is not None)
+            if body is not None:
+                yield from iter_json_array([body])
+                return
+
+        url = urljoin(self.base_url + "/", endpoint)
+        # The span covers the download, decoding and parsing of the stream, but is
+        # only made current around the request: a generator can't keep it current
+        # for its consumer
+        span = tracer.start_span(
+            "shs.stream",
+            attributes={
+                "spark.server": self.name,
+                "spark.endpoint": endpoint_label(endpoint),
+            },
+        )
+        try:
+            with trace.use_span(span):
+                response = self._fetch(url, params, stream=True)
+        except BaseException:
+            span.end()
+            raise
+        size = 0
+
+        def chunks() -> Iterator[bytes]:
+            nonlocal size
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                size += len(chunk)
+                yield chunk
+
+        try:
+            # Decoding overlaps the download here, so only the size is recorded
+            yield from iter_json_array(chunks())
+        finally:
+            response.close()
+            SHS_RESPONSE_BYTES.labels(self.name, endpoint_label(endpoint)).observe(size)
+            span.set_attribute("spark.response_bytes", size)
+            span.end()
+
+    def _count_lookup(self, cache: str, hit: bool) -> None:
+        """Count a response cache lookup for the metrics endpoint."""
+        CACHE_LOOKUPS.labels(self.name, cache, "hit" if hit else "miss").inc()
+
+    @staticmethod
+    def _cache_key(endpoint: str, params: Optional[Dict[str, Any]]) -> Hashable:
+        frozen_params = tuple(
+            sorted(
+                (key, tuple(value) if isinstance(value, list) else value)
+                for key, value in (params or {}).items()
+            )
+        )
+        return endpoint, frozen_params
+
+    def _is_immutable(self, endpoint: str, data: Any) -> bool:
+        """
+        Check whether a response can never change.
+
+        Only responses scoped to a completed application qualify; application
+        listings and the version endpoint can change at any time.
+        """
+        match = self.app_endpoint_pattern.match(endpoint)
+        if not match:
+            return False
+
+        app_id = match.group(1)
+        if match.group(2) is None:
+            # The application itself: its attempts tell us whether it completed
+            self._record_application(app_id, data.get("attempts"))
+        elif app_id not in self._completed_apps:
+            try:
+                self.get_application(app_id)
+            except requests.exceptions.RequestException:
+                return False
+        return app_id in self._completed_apps
+
+    def _record_application(self, app_id: str, attempts: Any) -> None:
+        """Remember the latest attempt of an application and whether it completed."""
+        if not attempts:
+            return
+        # The History Server lists the most recent attempt first
+        self._app_attempts[app_id] = attempts[0].get("attemptId")
+        if all(attempt.get("completed") for attempt in attempts):
+            self._completed_apps.add(app_id)
+
     def _parse_model(self, data: Dict[str, Any], model_class: Type[T]) -> T:
         """
         Parse JSON data into a Pydantic model.
@@ -165,10 +637,27 @@ class SparkRestClient:
         Returns:
             An instance of the model class
         """
-        return model_class.model_validate(data)
+        with (
+            tracer.start_as_current_span(f"parse {model_class.__name__}"),
+            MODEL_PARSE_DURATION.labels(model_class.__name__).time(),
+        ):
+            return model_class.model_validate(data)
+
+    def _parse_record(self, data: Dict[str, Any], model_class: Type[T]) -> T:
+        """
+        Parse one record of a streamed response into a Pydantic model.
+
+        Unlike _parse_model no span is created, as there is one per record; the
+        stream span covers them.
+        """
+        with MODEL_PARSE_DURATION.labels(model_class.__name__).time():
+            return model_class.model_validate(data)
 
     def _parse_model_list(
-        self, data: List[Dict[str, Any]], model_class: Type[T]
+        self,
+        data: List[Dict[str, Any]],
+        model_class: Type[T],
+        fields: Optional[Sequence[str]] = None,
     ) -> List[T]:
         """
         Parse a list of JSON data into a list of Pydantic models.
@@ -176,11 +665,20 @@ class SparkRestClient:
         Args:
             data: The list of JSON data to parse
             model_class: The Pydantic model class to use
+            fields: Optional names of the only fields to parse (see models.projection)
 
         Returns:
             A list of instances of the model class
         """
-        return [self._parse_model(item, model_class) for item in data]
+        # Validating the whole list in one call stays inside pydantic-core instead
+        # of returning to Python for every item
+        with (
+            tracer.start_as_current_span(
+                f"parse {model_class.__name__}", attributes={"spark.items": len(data)}
+            ),
+            MODEL_PARSE_DURATION.labels(model_class.__name__).time(),
+        ):
+            return _list_adapter(project(model_class, fields)).validate_python(data)
 
     def get_version(self) -> VersionInfo:
         """Get the Spark version."""
@@ -225,6 +723,8 @@ class SparkRestClient:
             params["limit"] = limit
 
         data = self._get("applications", params)
+        for item in data:
+            self._record_application(item.get("id"), item.get("attempts"))
         return self._parse_model_list(data, ApplicationInfo)
 
     def get_application(self, app_id: str) -> ApplicationInfo:
@@ -238,6 +738,7 @@ class SparkRestClient:
             ApplicationInfo object
         """
         data = self._get(f"applications/{app_id}")
+        self._record_application(app_id, data.get("attempts"))
         return self._parse_model(data, ApplicationInfo)
 
     def get_application_attempt(
@@ -257,7 +758,10 @@ class SparkRestClient:
         return self._parse_model(data, ApplicationAttemptInfo)
 
     def list_jobs(
-        self, app_id: str, status: Optional[List[JobExecutionStatus]] = None
+        self,
+        app_id: str,
+        status: Optional[List[JobExecutionStatus]] = None,
+        fields: Optional[Sequence[str]] = None,
     ) -> List[JobData]:
         """
         Get a list of all jobs for an application.
@@ -265,6 +769,7 @@ class SparkRestClient:
         Args:
             app_id: The application ID
             status: Filter by job status
+            fields: Only parse these JobData fields (names or JSON aliases)
 
         Returns:
             List of JobData objects
@@ -274,7 +779,7 @@ class SparkRestClient:
             params["status"] = [s.value for s in status]
 
         data = self._get(f"applications/{app_id}/jobs", params)
-        return self._parse_model_list(data, JobData)
+        return self._parse_model_list(data, JobData, fields)
 
     def get_job(self, app_id: str, job_id: int) -> JobData:
         """
@@ -298,6 +803,7 @@ class SparkRestClient:
         with_summaries: bool = False,
         quantiles: str = "0.05, 0.25, 0.5, 0.75, 0.95",
         task_status: Optional[List[TaskStatus]] = None,
+        fields: Optional[Sequence[str]] = None,
     ) -> List[StageData]:
         """
         Get a list of all stages for an application.
@@ -309,10 +815,87 @@ class SparkRestClient:
             with_summaries: Whether to include summary metrics
             quantiles: Comma-separated list of quantiles to use for summary metrics
             task_status: Filter by task status (only takes effect when details=true)
+            fields: Only parse these StageData fields (names or JSON aliases)
 
         Returns:
             List of StageData objects
         """
+        params = self._stage_params(
+            status, details, with_summaries, quantiles, task_status
+        )
+        data = self._get(f"applications/{app_id}/stages", params)
+        return self._parse_model_list(data, StageData, fields)
+
+    def iter_stages(
+        self,
+        app_id: str,
+        status: Optional[List[StageStatus]] = None,
+        details: bool = False,
+        with_summaries: bool = False,
+        quantiles: str = "0.05, 0.25, 0.5, 0.75, 0.95",
+        task_status: Optional[List[TaskStatus]] = None,
+    ) -> Iterator[StageData]:
+        """
+        Stream the stages of an application, parsing one stage at a time.
+
+        Takes the same arguments as list_stages, but never holds the whole response
+        in memory, which matters for applications with tens of thousands of stages.
+
+        Args:
+            app_id: The application ID
+            status: Filter by stage status
+            details: Whether to include task details
+            with_summaries: Whether to include summary metrics
+            quantiles: Comma-separated list of quantiles to use for summary metrics
+            task_status: Filter by task status (only takes effect when details=true)
+
+        Returns:
+            Iterator over StageData objects
+        """
+        for item in self.iter_stage_records(
+            app_id, status, details, with_summaries, quantiles, task_status
+        ):
+            yield self._parse_record(item, StageData)
+
+    def iter_stage_records(
+        self,
+        app_id: str,
+        status: Optional[List[StageStatus]] = None,
+        details: bool = False,
+        with_summaries: bool = False,
+        quantiles: str = "0.05, 0.25, 0.5, 0.75, 0.95",
+        task_status: Optional[List[TaskStatus]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the stages of an application as raw JSON records.
+
+        Like iter_stages without parsing StageData models, for callers that only
+        need a few fields (see StageTable.from_records).
+
+        Args:
+            app_id: The application ID
+            status: Filter by stage status
+            details: Whether to include task details
+            with_summaries: Whether to include summary metrics
+            quantiles: Comma-separated list of quantiles to use for summary metrics
+            task_status: Filter by task status (only takes effect when details=true)
+
+        Returns:
+            Iterator over stage JSON records
+        """
+        params = self._stage_params(
+            status, details, with_summaries, quantiles, task_status
+        )
+        return self._stream(f"applications/{app_id}/stages", params)
+
+    @staticmethod
+    def _stage_params(
+        status: Optional[List[StageStatus]],
+        details: bool,
+        with_summaries: bool,
+        quantiles: str,
+        task_status: Optional[List[TaskStatus]],
+    ) -> Dict[str, Any]:
         params = {
             "details": str(details).lower(),
             "withSummaries": str(with_summaries).lower(),
@@ -324,9 +907,7 @@ class SparkRestClient:
         # taskStatus parameter only takes effect when details=true
         if task_status and details:
             params["taskStatus"] = [s.value for s in task_status]
-
-        data = self._get(f"applications/{app_id}/stages", params)
-        return self._parse_model_list(data, StageData)
+        return params
 
     def list_stage_attempts(
         self,
@@ -436,6 +1017,7 @@ class SparkRestClient:
         length: int = 20,
         sort_by: str = "ID",
         status: Optional[List[TaskStatus]] = None,
+        fields: Optional[Sequence[str]] = None,
     ) -> List[TaskData]:
         """
         Get tasks for a specific stage attempt.
@@ -448,6 +1030,7 @@ class SparkRestClient:
             length: Number of tasks to return
             sort_by: Field to sort by
             status: Filter by task status
+            fields: Only parse these TaskData fields (names or JSON aliases)
 
         Returns:
             List of TaskData objects
@@ -460,33 +1043,109 @@ class SparkRestClient:
         data = self._get(
             f"applications/{app_id}/stages/{stage_id}/{attempt_id}/taskList", params
         )
-        return self._parse_model_list(data, TaskData)
+        return self._parse_model_list(data, TaskData, fields)
 
-    def list_executors(self, app_id: str) -> List[ExecutorSummary]:
+    def iter_stage_tasks(
+        self,
+        app_id: str,
+        stage_id: int,
+        attempt_id: int,
+        offset: int = 0,
+        length: int = 20,
+        sort_by: str = "ID",
+        status: Optional[List[TaskStatus]] = None,
+    ) -> Iterator[TaskData]:
+        """
+        Stream the tasks of a stage attempt, parsing one task at a time.
+
+        Takes the same arguments as list_stage_tasks, but never holds the whole
+        response in memory, so large pages of tasks can be scanned cheaply.
+
+        Args:
+            app_id: The application ID
+            stage_id: The stage ID
+            attempt_id: The attempt ID
+            offset: Pagination offset
+            length: Number of tasks to return
+            sort_by: Field to sort by
+            status: Filter by task status
+
+        Returns:
+            Iterator over TaskData objects
+        """
+        for item in self.iter_stage_task_records(
+            app_id, stage_id, attempt_id, offset, length, sort_by, status
+        ):
+            yield self._parse_record(item, TaskData)
+
+    def iter_stage_task_records(
+        self,
+        app_id: str,
+        stage_id: int,
+        attempt_id: int,
+        offset: int = 0,
+        length: int = 20,
+        sort_by: str = "ID",
+        status: Optional[List[TaskStatus]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the tasks of a stage attempt as raw JSON records.
+
+        Like iter_stage_tasks without parsing TaskData models, for callers that only
+        need a few fields (see TaskTable.from_records).
+
+        Args:
+            app_id: The application ID
+            stage_id: The stage ID
+            attempt_id: The attempt ID
+            offset: Pagination offset
+            length: Number of tasks to return
+            sort_by: Field to sort by
+            status: Filter by task status
+
+        Returns:
+            Iterator over task JSON records
+        """
+        params = {"offset": offset, "length": length, "sortBy": sort_by}
+
+        if status:
+            params["status"] = [s.value for s in status]
+
+        return self._stream(
+            f"applications/{app_id}/stages/{stage_id}/{attempt_id}/taskList", params
+        )
+
+    def list_executors(
+        self, app_id: str, fields: Optional[Sequence[str]] = None
+    ) -> List[ExecutorSummary]:
         """
         Get a list of all executors for an application.
 
         Args:
             app_id: The application ID
+            fields: Only parse these ExecutorSummary fields (names or JSON aliases)
 
         Returns:
             List of ExecutorSummary objects
         """
         data = self._get(f"applications/{app_id}/executors")
-        return self._parse_model_list(data, ExecutorSummary)
+        return self._parse_model_list(data, ExecutorSummary, fields)
 
-    def list_all_executors(self, app_id: str) -> List[ExecutorSummary]:
+    def list_all_executors(
+        self, app_id: str, fields: Optional[Sequence[str]] = None
+    ) -> List[ExecutorSummary]:
         """
         Get a list of all executors (active and inactive) for an application.
 
         Args:
             app_id: The application ID
+            fields: Only parse these ExecutorSummary fields (names or JSON aliases)
 
         Returns:
             List of ExecutorSummary objects
         """
         data = self._get(f"applications/{app_id}/allexecutors")
-        return self._parse_model_list(data, ExecutorSummary)
+        return self._parse_model_list(data, ExecutorSummary, fields)
 
     def list_executor_thread_dump(
         self, app_id: str, executor_id: str
@@ -589,11 +1248,7 @@ class SparkRestClient:
             self.base_url.replace("/api/v1", "/metrics/executors"), "prometheus"
         )
 
-        if self.session:
-            response = self.session.get(url, timeout=self.timeout, proxies=self.proxies)
-        else:
-            response = requests.get(url, timeout=self.timeout, proxies=self.proxies)
-
+        response = self.session.get(url, timeout=self.timeout, proxies=self.proxies)
         response.raise_for_status()
         return response.text
 
@@ -605,6 +1260,7 @@ class SparkRestClient:
         plan_description: bool = False,
         offset: int = 0,
         length: int = 20,
+        fields: Optional[Sequence[str]] = None,
     ) -> List[ExecutionData]:
         """
         Get a list of all SQL executions for an application.
@@ -616,6 +1272,7 @@ class SparkRestClient:
             plan_description: Whether to include plan description
             offset: Pagination offset
             length: Number of executions to return
+            fields: Only parse these ExecutionData fields (names or JSON aliases)
 
         Returns:
             List of ExecutionData objects
@@ -633,7 +1290,7 @@ class SparkRestClient:
             endpoint = f"applications/{app_id}/sql"
 
         data = self._get(endpoint, params)
-        return [ExecutionData.from_dict(item) for item in data]
+        return self._parse_model_list(data, ExecutionData, fields)
 
     def get_sql_execution(
         self,
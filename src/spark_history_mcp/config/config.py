@@ -26,8 +26,51 @@ class ServerConfig(BaseSettings):
     default: bool = False
     verify_ssl: bool = True
     emr_cluster_arn: Optional[str] = None  # EMR specific field
+    event_log_dir: Optional[str] = None  # Read event logs here instead of from url
+    event_log_refresh: float = 10  # Seconds before the log directory is listed again
+    event_log_max_apps: int = 16  # Applications whose replayed logs stay in memory
+    event_log_index_dir: Optional[str] = None  # SQLite indexes of replayed logs
+    event_log_workers: int = 0  # Processes parsing large event logs, 0 for none
     use_proxy: bool = False
     timeout: int = 30  # HTTP request timeout in seconds
+    pool_size: int = 10  # Max keep-alive HTTP connections pooled for this server
+    keepalive_timeout: int = 60  # Seconds an idle pooled connection may be reused
+    connect_retries: int = 3  # Retries for connection failures on pooled connections
+    cache_max_mb: int = 256  # Response cache budget in MB (0 disables caching)
+    cache_ttl: int = 10  # Seconds responses of running applications stay cached
+    disk_cache_path: Optional[str] = (
+        None  # SQLite file persisting completed app responses
+    )
+    disk_cache_max_mb: int = 1024  # Size cap of the disk cache file in MB
+    max_concurrency: int = 16  # Upper bound of concurrent requests to this server
+    initial_concurrency: int = 4  # Concurrent requests allowed before adapting
+    latency_target: float = 5  # Seconds under which a response counts as healthy
+    retries: int = 2  # Retries of requests answered 429, 502, 503 or 504
+    retry_backoff: float = 0.5  # Base delay in seconds of the jittered retry backoff
+    retry_backoff_max: float = 10  # Cap of a single retry delay in seconds
+    breaker_threshold: int = 5  # Consecutive failures opening the breaker (0: off)
+    breaker_reset_timeout: float = 30  # Seconds an open breaker fails fast
+
+
+class TracingConfig(BaseSettings):
+    """OpenTelemetry tracing configuration for the MCP server."""
+
+    enabled: bool = False
+    exporter: Literal["otlp", "memory"] = "otlp"  # "memory" keeps spans in-process
+    endpoint: Optional[str] = None  # OTLP/HTTP traces URL (default: OTEL_* env vars)
+    service_name: str = "spark-history-mcp"
+    model_config = SettingsConfigDict(extra="ignore")
+
+
+class ProfilingConfig(BaseSettings):
+    """Profiling of tool calls, for finding hotspots on real workloads."""
+
+    enabled: bool = False  # Profile every call
+    allow_per_call: bool = False  # Let clients ask to profile a call (_meta.profile)
+    directory: str = "profiles"  # Where .pstats and .collapsed files are written
+    threshold_ms: float = 0  # Only keep profiles of calls at least this slow
+    sample_interval_ms: float = 5  # Stack sampling period of the collapsed profile
+    model_config = SettingsConfigDict(extra="ignore")
 
 
 class McpConfig(BaseSettings):
@@ -39,6 +82,8 @@ class McpConfig(BaseSettings):
     address: Optional[str] = "localhost"
     port: Optional[int | str] = "18888"
     debug: Optional[bool] = False
+    tracing: TracingConfig = Field(default_factory=TracingConfig)
+    profiling: ProfilingConfig = Field(default_factory=ProfilingConfig)
     model_config = SettingsConfigDict(extra="ignore")
 
 
@@ -4,13 +4,22 @@ from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 
 from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.exceptions import ToolError
+from opentelemetry.context import Context
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from starlette.requests import Request
+from starlette.responses import Response
 
 from spark_history_mcp.api.emr_persistent_ui_client import EMRPersistentUIClient
+from spark_history_mcp.api.event_log_client import EventLogClient
 from spark_history_mcp.api.spark_client import SparkRestClient
 from spark_history_mcp.config.config import Config
+from spark_history_mcp.utils.metrics import TOOL_CALLS, TOOL_DURATION
+from spark_history_mcp.utils.profiling import configure_profiling, profile_call
+from spark_history_mcp.utils.tracing import configure_tracing, tracer
 
 
 @dataclass
@@ -49,13 +58,16 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
             emr_server_config.url = base_url
 
             # Create SparkRestClient with the session
-            spark_client = SparkRestClient(emr_server_config)
+            spark_client = SparkRestClient(emr_server_config, name=name)
             spark_client.session = session  # Use the authenticated session
 
             clients[name] = spark_client
+        elif server_config.event_log_dir:
+            # Event logs read directly, without a History Server
+            clients[name] = EventLogClient(server_config, name=name)
         else:
             # Regular Spark REST client
-            clients[name] = SparkRestClient(server_config)
+            clients[name] = SparkRestClient(server_config, name=name)
 
         if server_config.default:
             default_client = clients[name]
@@ -63,14 +75,67 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
     yield AppContext(clients=clients, default_client=default_client)
 
 
+class InstrumentedFastMCP(FastMCP):
+    """
+    FastMCP server recording the count, outcome and duration of tool calls.
+
+    Every tool call is also the root span of a trace, with the execution of the
+    tool and the serialization of its result as a child span. Calls are profiled when
+    profiling is enabled, or when the client sends `"_meta": {"profile": true}` and
+    profiling.allow_per_call is set.
+    """
+
+    async def call_tool(self, name: str, arguments: dict[str, Any]) -> Any:
+        registered = self._tool_manager.get_tool(name)
+        # Clients choose the name, so unknown ones share a label
+        tool = name if registered else "unknown"
+        outcome = "error"
+        try:
+            with (
+                profile_call(tool, arguments, self._profile_requested()),
+                TOOL_DURATION.labels(tool).time(),
+                tracer.start_as_current_span(
+                    f"tool {tool}",
+                    context=Context(),
+                    attributes={"mcp.tool.name": tool},
+                ),
+            ):
+                if registered is None:
+                    raise ToolError(f"Unknown tool: {name}")
+                # FastMCP runs the tool and converts its result to content
+                with tracer.start_as_current_span("execute"):
+                    result = await super().call_tool(name, arguments)
+            outcome = "ok"
+            return result
+        finally:
+            TOOL_CALLS.labels(tool, outcome).inc()
+
+    def _profile_requested(self) -> bool:
+        """Whether the client asked to profile the current call."""
+        try:
+            meta = self.get_context().request_context.meta
+        except ValueError:
+            return False
+        return bool(getattr(meta, "profile", False))
+
+
 def run(config: Config):
     mcp.settings.host = config.mcp.address
     mcp.settings.port = int(config.mcp.port)
     mcp.settings.debug = bool(config.mcp.debug)
+    configure_tracing(config.mcp.tracing)
+    configure_profiling(config.mcp.profiling)
     mcp.run(transport=os.getenv("SHS_MCP_TRANSPORT", config.mcp.transports[0]))
 
 
-mcp = FastMCP("Spark Events", lifespan=app_lifespan)
+mcp = InstrumentedFastMCP("Spark Events", lifespan=app_lifespan)
+
+
+@mcp.custom_route("/metrics", methods=["GET"], include_in_schema=False)
+async def metrics(request: Request) -> Response:
+    """Serve Prometheus metrics next to the HTTP transports."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 
 # Import tools to register them with MCP
 from spark_history_mcp.tools import tools  # noqa: E402,F401
@@ -0,0 +1,73 @@
+"""Command line tool to inspect and purge the persistent response cache."""
+
+import argparse
+import json
+import os
+import sys
+from typing import Dict, List, Optional
+
+from spark_history_mcp.api.disk_cache import get_disk_cache_stats, purge_disk_cache
+from spark_history_mcp.config.config import Config
+
+
+def _cache_paths(config: Config, server: Optional[str]) -> Dict[str, List[str]]:
+    """Map each disk cache file to the servers (namespaces) configured to use it."""
+    paths: Dict[str, List[str]] = {}
+    for name, server_config in config.servers.items():
+        if server and name != server:
+            continue
+        if server_config.disk_cache_path:
+            paths.setdefault(server_config.disk_cache_path, []).append(name)
+    return paths
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        prog="spark-mcp-cache",
+        description="Inspect or purge the persistent Spark History Server response cache.",
+    )
+    parser.add_argument(
+        "--config", default="config.yaml", help="Path to the MCP server config file"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    stats_parser = subparsers.add_parser("stats", help="Show cache usage per server")
+    stats_parser.add_argument("--server", help="Only show this server")
+
+    purge_parser = subparsers.add_parser("purge", help="Delete cached responses")
+    purge_parser.add_argument("--server", help="Only purge this server")
+    purge_parser.add_argument("--app-id", help="Only purge this application")
+
+    args = parser.parse_args(argv)
+    config = Config.from_file(args.config)
+    paths = _cache_paths(config, args.server)
+    if not paths:
+        sys.stderr.write("No disk cache configured (set disk_cache_path on a server)\n")
+        return 1
+
+    output = []
+    for path, servers in paths.items():
+        if args.command == "stats":
+            stats = get_disk_cache_stats(path) if os.path.exists(path) else []
+            output.append(
+                {
+                    "path": path,
+                    "namespaces": [s for s in stats if s["namespace"] in servers],
+                }
+            )
+        else:
+            deleted = 0
+            if os.path.exists(path):
+                for server in servers:
+                    deleted += purge_disk_cache(
+                        path, namespace=server, app_id=args.app_id
+                    )
+            output.append({"path": path, "servers": servers, "deleted": deleted})
+
+    sys.stdout.write(json.dumps(output, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
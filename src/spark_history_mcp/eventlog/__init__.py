@@ -0,0 +1 @@
+"""Spark event logs read directly, without a Spark History Server."""
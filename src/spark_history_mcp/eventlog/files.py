@@ -0,0 +1,401 @@
+"""
+Discovery and streaming of Spark event log files.
+
+Spark writes the listener events of an application attempt as JSON lines, to a
+single file, or with spark.eventLog.rolling.enabled to a directory of segments:
+
+    <app_id>[_<attempt_id>][.<codec>][.inprogress]
+    eventlog_v2_<app_id>[_<attempt_id>]/
+        appstatus_<app_id>[_<attempt_id>][.inprogress]
+        events_<N>_<app_id>[_<attempt_id>][.<codec>]
+
+Segments are read as streams of lines, decompressing them on the fly, so memory
+use doesn't depend on the size of a log. EventScanner finds the events of some
+types without parsing the others, in place in memory-mapped uncompressed
+segments. Besides plain text and gzip, the codecs of
+spark.eventLog.compression.codec are supported except lzf: lz4, snappy and zstd
+need the `eventlog` extra.
+"""
+
+import functools
+import gzip
+import importlib
+import mmap
+import os
+import re
+import struct
+from dataclasses import dataclass
+from typing import BinaryIO, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+ROLLING_PREFIX = "eventlog_v2_"
+IN_PROGRESS = ".inprogress"
+COMPACTED = ".compact"
+
+# Decompressed bytes read at a time
+READ_SIZE = 1024 * 1024
+
+# Events are written with their type first
+EVENT_TYPE = re.compile(rb'^\{"Event":\s*"([^"]+)"')
+
+# Header of a block written by LZ4BlockOutputStream: magic, method and level,
+# compressed length, decompressed length, checksum (little endian)
+_LZ4_HEADER = struct.Struct("<8sBiii")
+_LZ4_MAGIC = b"LZ4Block"
+_LZ4_RAW = 0x10
+
+# Stream header written by SnappyOutputStream: magic, then two versions
+_SNAPPY_MAGIC = b"\x82SNAPPY\x00"
+_SNAPPY_HEADER_SIZE = 16
+
+
+@dataclass(frozen=True)
+class EventLog:
+    """The event log of one application attempt, as found on disk."""
+
+    path: str  # The log file, or the directory of a rolling log
+    segments: Tuple[str, ...]  # Files holding the events, in order
+    completed: bool  # Whether the application finished writing it
+
+    def signature(self) -> Tuple[Tuple[str, int], ...]:
+        """Names and sizes of the segments, which change as events are added."""
+        return tuple(
+            (os.path.basename(path), os.stat(path).st_size) for path in self.segments
+        )
+
+    def last_updated(self) -> int:
+        """Modification time of the newest segment in epoch milliseconds."""
+        return max(int(os.stat(path).st_mtime * 1000) for path in self.segments)
+
+
+def event_type(line: bytes) -> Optional[str]:
+    """The type of an event from the start of its line, without parsing it."""
+    match = EVENT_TYPE.match(line)
+    return match.group(1).decode() if match else None
+
+
+def find_event_logs(directory: str) -> List[EventLog]:
+    """
+    Find the event logs in a directory, like spark.history.fs.logDirectory.
+
+    Args:
+        directory: Directory Spark writes event logs to (spark.eventLog.dir)
+
+    Returns:
+        Event logs in name order, rolling or not, completed or in progress
+
+    Raises:
+        OSError: If the directory can't be listed
+    """
+    logs = []
+    for entry in sorted(os.scandir(directory), key=lambda entry: entry.name):
+        # Hidden files include the .crc checksums of the Hadoop local file system
+        if entry.name.startswith("."):
+            continue
+        if entry.is_dir():
+            if entry.name.startswith(ROLLING_PREFIX):
+                log = _rolling_log(entry.path)
+                if log is not None:
+                    logs.append(log)
+        elif entry.is_file():
+            logs.append(
+                EventLog(
+                    entry.path, (entry.path,), not entry.name.endswith(IN_PROGRESS)
+                )
+            )
+    return logs
+
+
+def _rolling_log(path: str) -> Optional[EventLog]:
+    """The event log of a rolling log directory, or None while it has no events."""
+    segments = []
+    completed = False
+    for name in os.listdir(path):
+        if name.startswith("events_"):
+            try:
+                index = int(name.split("_", 2)[1])
+            except (IndexError, ValueError):
+                continue
+            segments.append((index, name))
+        elif name.startswith("appstatus_"):
+            completed = not name.endswith(IN_PROGRESS)
+    if not segments:
+        return None
+    segments.sort()
+    # A compacted segment replaces all segments before it
+    for position in range(len(segments) - 1, -1, -1):
+        if segments[position][1].endswith(COMPACTED):
+            segments = segments[position:]
+            break
+    return EventLog(
+        path, tuple(os.path.join(path, name) for _, name in segments), completed
+    )
+
+
+def segment_codec(path: str) -> Optional[str]:
+    """Compression codec of a segment from its extension, None if uncompressed."""
+    name = os.path.basename(path)
+    for suffix in (IN_PROGRESS, COMPACTED):
+        if name.endswith(suffix):
+            name = name[: -len(suffix)]
+    extension = name.rpartition(".")[2]
+    return extension if extension in _CODECS else None
+
+
+def _require(module: str, codec: str):
+    """Import the library of a codec that comes with the eventlog extra."""
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        raise ImportError(
+            f"Reading {codec} compressed event logs needs the eventlog extra: "
+            'pip install "mcp-apache-spark-history-server[eventlog]"'
+        ) from None
+
+
+def _read_exactly(f: BinaryIO, size: int) -> Optional[bytes]:
+    """Read size bytes, or None if the file ends (or is still written) before."""
+    data = f.read(size)
+    return data if len(data) == size else None
+
+
+def _plain_chunks(f: BinaryIO) -> Iterator[bytes]:
+    yield from iter(functools.partial(f.read, READ_SIZE), b"")
+
+
+def _gzip_chunks(f: BinaryIO) -> Iterator[bytes]:
+    with gzip.GzipFile(fileobj=f) as stream:
+        try:
+            yield from iter(functools.partial(stream.read, READ_SIZE), b"")
+        except EOFError:
+            # A log still being written ends in the middle of the stream
+            return
+
+
+def _zstd_chunks(f: BinaryIO) -> Iterator[bytes]:
+    zstandard = _require("zstandard", "zstd")
+    with zstandard.ZstdDecompressor().stream_reader(
+        f, read_across_frames=True, closefd=False
+    ) as stream:
+        yield from iter(functools.partial(stream.read, READ_SIZE), b"")
+
+
+def _lz4_chunks(f: BinaryIO) -> Iterator[bytes]:
+    """Decompress the LZ4BlockOutputStream format Spark's lz4 codec writes."""
+    lz4_block = _require("lz4.block", "lz4")
+    while True:
+        header = _read_exactly(f, _LZ4_HEADER.size)
+        if header is None:
+            return
+        magic, token, compressed, decompressed, _checksum = _LZ4_HEADER.unpack(header)
+        if magic != _LZ4_MAGIC:
+            raise ValueError(f"Corrupt lz4 event log: {f.name}")
+        if decompressed == 0:
+            # The end mark of a stream, which another stream may follow
+            continue
+        data = _read_exactly(f, compressed)
+        if data is None:
+            return
+        if token & 0xF0 == _LZ4_RAW:
+            yield data
+        else:
+            yield lz4_block.decompress(data, uncompressed_size=decompressed)
+
+
+def _snappy_chunks(f: BinaryIO) -> Iterator[bytes]:
+    """Decompress the SnappyOutputStream format Spark's snappy codec writes."""
+    snappy = _require("snappy", "snappy")
+    header = _read_exactly(f, _SNAPPY_HEADER_SIZE)
+    if header is None:
+        return
+    if not header.startswith(_SNAPPY_MAGIC):
+        raise ValueError(f"Corrupt snappy event log: {f.name}")
+    while True:
+        length = _read_exactly(f, 4)
+        if length is None:
+            return
+        if length == _SNAPPY_MAGIC[:4]:
+            # The header of another stream appended to the file
+            if _read_exactly(f, _SNAPPY_HEADER_SIZE - 4) is None:
+                return
+            continue
+        data = _read_exactly(f, struct.unpack(">i", length)[0])
+        if data is None:
+            return
+        yield snappy.uncompress(data)
+
+
+_CODECS = {
+    "gz": _gzip_chunks,
+    "lz4": _lz4_chunks,
+    "snappy": _snappy_chunks,
+    "zstd": _zstd_chunks,
+    "lzf": None,
+}
+
+
+def iter_chunks(path: str, start: int = 0) -> Iterator[bytes]:
+    """
+    Stream the decompressed content of a segment.
+
+    Args:
+        path: The segment file
+        start: Offset in the decompressed content to start at
+
+    Returns:
+        Iterator over chunks of content
+
+    Raises:
+        ValueError: If the codec is not supported, or the file is corrupt
+        ImportError: If the library of the codec is not installed
+    """
+    codec = segment_codec(path)
+    if codec is not None and _CODECS[codec] is None:
+        raise ValueError(f"Unsupported event log codec {codec}: {path}")
+    with open(path, "rb") as f:
+        if codec is None:
+            f.seek(start)
+            yield from _plain_chunks(f)
+            return
+        # Compressed streams can't seek, what comes before start is skipped
+        skip = start
+        for chunk in _CODECS[codec](f):
+            if skip:
+                if len(chunk) <= skip:
+                    skip -= len(chunk)
+                    continue
+                chunk = chunk[skip:]
+                skip = 0
+            yield chunk
+
+
+def iter_lines(path: str, start: int = 0) -> Iterator[Tuple[int, bytes]]:
+    """
+    Stream the lines of a segment with their offsets.
+
+    Only complete lines are returned: a log still being written may end in the
+    middle of an event, which is read once the rest of its line is there.
+
+    Args:
+        path: The segment file
+        start: Offset of the first line to read, in the decompressed content
+
+    Returns:
+        Iterator over (offset, line without its newline) pairs
+    """
+    offset = start
+    pending: List[bytes] = []
+    for chunk in iter_chunks(path, start):
+        lines = chunk.split(b"\n")
+        if len(lines) == 1:
+            pending.append(chunk)
+            continue
+        if pending:
+            pending.append(lines[0])
+            lines[0] = b"".join(pending)
+            pending = []
+        last = lines.pop()
+        if last:
+            pending.append(last)
+        for line in lines:
+            yield offset, line
+            offset += len(line) + 1
+
+
+@functools.lru_cache(maxsize=16)
+def _events_pattern(types: FrozenSet[str]) -> "re.Pattern[bytes]":
+    """Pattern matching the start of the lines of events of some types."""
+    names = b"|".join(re.escape(name.encode()) for name in sorted(types))
+    return re.compile(rb'\{"Event":\s*"(?:' + names + rb')"')
+
+
+class EventScanner:
+    """
+    The lines of the events of some types in a segment, skipping the others.
+
+    Uncompressed segments are memory-mapped and searched for the start of the
+    lines of these types: the other lines are neither copied nor parsed.
+    Compressed segments are streamed (see iter_lines) and their lines matched.
+    Iterating gives the same (offset, line) pairs iter_lines() would for these
+    events, and position the offset it would continue from.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        types: FrozenSet[str],
+        start: int = 0,
+        end: Optional[int] = None,
+    ):
+        """
+        Initialize the scanner.
+
+        Args:
+            path: The segment file
+            types: Types of the events to return, e.g. "SparkListenerTaskEnd"
+            start: Offset of the first line to read, in the decompressed content
+            end: Offset of a line to stop before, None to read to the end
+        """
+        self.path = path
+        self.types = types
+        self.end = end
+        # Offset after the last complete line read
+        self.position = start
+
+    def __iter__(self) -> Iterator[Tuple[int, bytes]]:
+        pattern = _events_pattern(self.types)
+        if segment_codec(self.path) is not None:
+            for offset, line in iter_lines(self.path, self.position):
+                if self.end is not None and offset >= self.end:
+                    return
+                self.position = offset + len(line) + 1
+                if pattern.match(line):
+                    yield offset, line
+            return
+        with open(self.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            end = size if self.end is None else min(self.end, size)
+            if end <= self.position:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                find, match = data.find, pattern.match
+                offset = self.position
+                # A line still being written has no newline yet
+                newline = find(b"\n", offset, end)
+                while newline >= 0:
+                    if match(data, offset, newline):
+                        yield offset, data[offset:newline]
+                    offset = self.position = newline + 1
+                    newline = find(b"\n", offset, end)
+
+
+def read_lines(path: str, offsets: Iterable[int]) -> Iterator[Tuple[int, bytes]]:
+    """
+    Read the lines starting at some offsets of a segment.
+
+    Uncompressed segments are read by seeking to each line; compressed ones are
+    streamed from the first offset on.
+
+    Args:
+        path: The segment file
+        offsets: Offsets of the lines, as returned by iter_lines
+
+    Returns:
+        Iterator over (offset, line without its newline) pairs, in offset order
+    """
+    wanted = sorted(set(offsets))
+    if not wanted:
+        return
+    if segment_codec(path) is None:
+        with open(path, "rb") as f:
+            for offset in wanted:
+                f.seek(offset)
+                yield offset, f.readline().rstrip(b"\n")
+        return
+    targets = iter(wanted)
+    target = next(targets)
+    for offset, line in iter_lines(path, wanted[0]):
+        if offset == target:
+            yield offset, line
+            target = next(targets, None)
+            if target is None:
+                return
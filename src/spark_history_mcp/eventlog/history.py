@@ -0,0 +1,403 @@
+"""
+History Server REST API answered from a directory of Spark event logs.
+
+The application list is built from the first events of each log (and the end of
+an uncompressed one, for the end time), without replaying it. An application's
+log is replayed the first time one of its resources is requested, and the replay
+is kept and brought up to date while its log grows; the replays of the most
+recently used applications are kept in memory. Until a compressed log is
+replayed, its modification time stands for its end time, as it can't be read
+from the end.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from spark_history_mcp.api import rest
+from spark_history_mcp.api.rest import Params
+from spark_history_mcp.eventlog.files import (
+    EventLog,
+    event_type,
+    find_event_logs,
+    iter_lines,
+    segment_codec,
+)
+from spark_history_mcp.eventlog.index import AppIndex, index_path
+from spark_history_mcp.eventlog.parallel import ParsePool
+from spark_history_mcp.eventlog.replay import AppReplay, attempt_record
+
+logger = logging.getLogger(__name__)
+
+# Lines read at most at the start of a log to find its application
+_HEAD_LINES = 100
+
+# Bytes read at the end of an uncompressed log to find its end time
+_TAIL_SIZE = 64 * 1024
+
+
+@dataclass
+class _Summary:
+    """What the application list shows of an event log."""
+
+    log: EventLog
+    info: Dict[str, Any]  # As AppReplay.info, from the first and last events
+    signature: Tuple[Tuple[str, int], ...]
+    last_updated: int
+
+    @property
+    def attempt(self) -> Dict[str, Any]:
+        return attempt_record(self.info, self.log.completed, self.last_updated)
+
+
+@dataclass
+class _Entry:
+    """The replay of an application attempt, and what it has read."""
+
+    index: Optional[AppIndex] = None
+    replay: Optional[AppReplay] = None  # Until first used
+    signature: Tuple[Tuple[str, int], ...] = ()
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def _head(log: EventLog) -> Dict[str, Any]:
+    """Spark version and application start from the first events of a log."""
+    info: Dict[str, Any] = {}
+    for number, (_, line) in enumerate(iter_lines(log.segments[0])):
+        kind = event_type(line)
+        if kind == "SparkListenerLogStart":
+            info["sparkVersion"] = json.loads(line).get("Spark Version")
+        elif kind == "SparkListenerApplicationStart":
+            event = json.loads(line)
+            info.update(
+                id=event.get("App ID"),
+                name=event.get("App Name"),
+                attemptId=event.get("App Attempt ID"),
+                startTime=event.get("Timestamp"),
+                sparkUser=event.get("User"),
+            )
+            break
+        if number >= _HEAD_LINES:
+            break
+    return info
+
+
+def _end_time(log: EventLog) -> Optional[int]:
+    """
+    Time of the ApplicationEnd event of a completed log, from the end of the log.
+
+    Only the last bytes of an uncompressed log are read; a compressed one would
+    have to be decompressed whole, so its end time is left to its replay (None).
+    """
+    path = log.segments[-1]
+    if segment_codec(path) is not None:
+        return None
+    with open(path, "rb") as f:
+        f.seek(max(os.fstat(f.fileno()).st_size - _TAIL_SIZE, 0))
+        lines = f.read().split(b"\n")
+    for line in reversed(lines):
+        if event_type(line) == "SparkListenerApplicationEnd":
+            return json.loads(line).get("Timestamp")
+    return None
+
+
+class EventLogHistory:
+    """History Server answering REST requests from the event logs of a directory."""
+
+    def __init__(
+        self,
+        directory: str,
+        refresh_interval: float = 10,
+        max_apps: int = 16,
+        index_dir: Optional[str] = None,
+        workers: int = 0,
+    ):
+        """
+        Initialize the source.
+
+        Args:
+            directory: Directory of the event logs (spark.eventLog.dir)
+            refresh_interval: Seconds before the directory is listed again
+            max_apps: Application attempts whose replay is kept in memory
+            index_dir: Directory of the indexes persisting replays (None: no index)
+            workers: Processes parsing large logs (0 or 1: parse them in process)
+        """
+        self.directory = directory
+        self.refresh_interval = refresh_interval
+        self.max_apps = max_apps
+        self.index_dir = index_dir
+        self._pool = ParsePool(workers) if workers > 1 else None
+        self._lock = threading.Lock()
+        # Lists the directory, apart from the lock of the replays
+        self._listing = threading.Lock()
+        self._listed_at = float("-inf")
+        self._summaries: Dict[str, _Summary] = {}
+        # Attempt summaries by application ID, latest attempt first
+        self._apps: Dict[str, List[_Summary]] = {}
+        self._replays: "OrderedDict[Tuple[str, Optional[str]], _Entry]" = OrderedDict()
+
+    @property
+    def app_ids(self) -> List[str]:
+        """IDs of the applications, as listed by the applications endpoint."""
+        return [app["id"] for app in self._applications({})]
+
+    # Listing
+
+    def _refresh(self) -> Dict[str, List[_Summary]]:
+        """Summaries of the logs by application, listing the directory if due."""
+        with self._listing:
+            if time.monotonic() - self._listed_at < self.refresh_interval:
+                return self._apps
+            summaries = {}
+            for log in find_event_logs(self.directory):
+                try:
+                    summary = self._summary(log)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Skipping event log {log.path}: {e}")
+                    continue
+                if summary is not None:
+                    summaries[log.path] = summary
+            apps: Dict[str, List[_Summary]] = {}
+            for summary in summaries.values():
+                apps.setdefault(summary.info["id"], []).append(summary)
+            for attempts in apps.values():
+                attempts.sort(key=lambda s: s.info.get("startTime") or 0, reverse=True)
+            self._summaries = summaries
+            self._apps = apps
+            self._listed_at = time.monotonic()
+            return apps
+
+    def _summary(self, log: EventLog) -> Optional[_Summary]:
+        """The summary of a log, reusing the previous one if unchanged."""
+        signature = log.signature()
+        previous = self._summaries.get(log.path)
+        if previous is not None and previous.signature == signature:
+            if previous.log == log:
+                return previous
+        info = dict(previous.info) if previous is not None else _head(log)
+        if not info.get("id"):
+            # The application hasn't started writing its events yet
+            return None
+        info.pop("endTime", None)
+        last_updated = log.last_updated()
+        if log.completed:
+            info["endTime"] = _end_time(log) or last_updated
+        return _Summary(log, info, signature, last_updated)
+
+    def _applications(self, params: Params) -> List[Dict[str, Any]]:
+        statuses = rest.statuses(params)
+        min_date = rest.parse_date(rest.param(params, "minDate", "2010-01-01"))
+        max_date = rest.parse_date(rest.param(params, "maxDate", "3000-01-01"))
+        min_end = rest.parse_date(rest.param(params, "minEndDate", "2010-01-01"))
+        max_end = rest.parse_date(rest.param(params, "maxEndDate", "3000-01-01"))
+        now = int(time.time() * 1000)
+        apps = []
+        for attempts in self._refresh().values():
+            running = any(not summary.log.completed for summary in attempts)
+            if statuses and ("RUNNING" if running else "COMPLETED") not in statuses:
+                continue
+            records = [summary.attempt for summary in attempts]
+            if not any(
+                min_date <= record["startTimeEpoch"] <= max_date
+                and (
+                    max_end > now
+                    if running
+                    else min_end <= record["endTimeEpoch"] <= max_end
+                )
+                for record in records
+            ):
+                continue
+            apps.append(
+                {
+                    "id": attempts[0].info["id"],
+                    "name": attempts[0].info.get("name"),
+                    "attempts": records,
+                }
+            )
+        apps.sort(key=lambda app: app["attempts"][0]["endTimeEpoch"], reverse=True)
+        limit = rest.param(params, "limit")
+        return apps[: int(limit)] if limit is not None else apps
+
+    def _attempts(self, app_id: str) -> List[_Summary]:
+        attempts = self._refresh().get(app_id)
+        if not attempts:
+            raise LookupError(f"Unknown application: {app_id}")
+        return attempts
+
+    # Replays
+
+    def _replay(self, summary: _Summary) -> _Entry:
+        """The replay of an attempt, locked and brought up to date."""
+        key = (summary.info["id"], summary.info.get("attemptId"))
+        with self._lock:
+            entry = self._replays.get(key)
+            if entry is None:
+                index = None
+                if self.index_dir is not None:
+                    index = AppIndex(index_path(self.index_dir, *key))
+                entry = self._replays[key] = _Entry(index)
+            self._replays.move_to_end(key)
+            while len(self._replays) > self.max_apps:
+                self._replays.popitem(last=False)
+        entry.lock.acquire()
+        try:
+            self._update(entry, summary)
+            end_time = entry.replay.info.get("endTime")
+            if summary.log.completed and end_time:
+                # Exact, where the listing may only have approximated it
+                summary.info["endTime"] = end_time
+        except BaseException:
+            entry.lock.release()
+            raise
+        return entry
+
+    def _update(self, entry: _Entry, summary: _Summary) -> None:
+        """Bring a replay up to date with its log, loading or saving its index."""
+        log = summary.log
+        if entry.replay is None and entry.index is not None:
+            entry.replay = entry.index.load(log)
+        if entry.replay is None or not entry.replay.follows(log):
+            # First use, or the log was rewritten (compacted): replay it all
+            if entry.index is not None:
+                entry.index.clear()
+            entry.replay = AppReplay(log)
+            entry.signature = ()
+        if entry.signature == summary.signature and entry.replay.log == log:
+            return
+        started = time.perf_counter()
+        if entry.replay.update(log, self._pool) and entry.index is not None:
+            entry.index.save(entry.replay)
+        entry.signature = summary.signature
+        logger.debug(f"Replayed {log.path} in {time.perf_counter() - started:.2f}s")
+
+    # Requests
+
+    def get(self, endpoint: str, params: Optional[Params] = None) -> Any:
+        """
+        Answer a REST request.
+
+        Args:
+            endpoint: Path below /api/v1, e.g. applications/<app_id>/stages
+            params: Query parameters, as parsed by urllib.parse.parse_qs
+
+        Returns:
+            The JSON response
+
+        Raises:
+            LookupError: If the resource doesn't exist (a 404 of the History Server)
+            ValueError: If a query parameter is invalid, or a log can't be read
+            OSError: If a log can't be read
+        """
+        params = params or {}
+        parts = endpoint.strip("/").split("/")
+        if parts == ["version"]:
+            apps = self._applications({"limit": ["1"]})
+            version = apps[0]["attempts"][0]["appSparkVersion"] if apps else ""
+            return {"spark": version}
+        if parts == ["applications"]:
+            return self._applications(params)
+        if parts[0] != "applications" or len(parts) < 2:
+            raise LookupError(f"Unknown endpoint: {endpoint}")
+
+        attempts = self._attempts(parts[1])
+        summary = attempts[0]
+        tail = parts[2:]
+        if tail and tail[0].isdigit():
+            matches = [s for s in attempts if s.info.get("attemptId") == tail[0]]
+            if not matches:
+                raise LookupError(f"Unknown attempt {tail[0]} of {parts[1]}")
+            summary = matches[0]
+            tail = tail[1:]
+            if not tail:
+                return summary.attempt
+        if not tail:
+            return {
+                "id": summary.info["id"],
+                "name": summary.info.get("name"),
+                "attempts": [s.attempt for s in attempts],
+            }
+        if tail in (["storage", "rdd"], ["allmiscellaneousprocess"]):
+            # Not written to event logs
+            return []
+
+        entry = self._replay(summary)
+        try:
+            return self._resource(entry.replay, tail, params)
+        finally:
+            entry.lock.release()
+
+    def _resource(self, replay: AppReplay, tail: List[str], params: Params) -> Any:
+        resource, args = tail[0], tail[1:]
+        try:
+            ids = [int(arg) for arg in args[:2]]
+        except ValueError:
+            raise LookupError(f"Unknown resource: {'/'.join(tail)}") from None
+        statuses = rest.statuses(params)
+
+        if resource == "jobs" and not args:
+            jobs = (replay.job(job_id) for job_id in sorted(replay.jobs, reverse=True))
+            return [job for job in jobs if not statuses or job["status"] in statuses]
+        if resource == "jobs" and len(args) == 1:
+            if ids[0] not in replay.jobs:
+                raise LookupError(f"Unknown job: {ids[0]}")
+            return replay.job(ids[0])
+
+        if resource == "stages":
+            details = rest.flag(params, "details")
+            quantiles = (
+                rest.quantiles(params) if rest.flag(params, "withSummaries") else None
+            )
+            task_statuses = rest.statuses(params, "taskStatus")
+
+            def stage(key):
+                return replay.stage(key, details, quantiles, task_statuses)
+
+            if not args:
+                return [
+                    stage(key)
+                    for key in replay.stage_keys()
+                    if not statuses or replay.stages[key]["status"] in statuses
+                ]
+            keys = replay.stage_keys(ids[0])
+            if len(args) == 1:
+                if not keys:
+                    raise LookupError(f"Unknown stage: {ids[0]}")
+                return [stage(key) for key in keys]
+            key = (ids[0], ids[1])
+            if key not in replay.stages:
+                raise LookupError(f"Unknown attempt {ids[1]} of stage {ids[0]}")
+            if len(args) == 2:
+                return stage(key)
+            if args[2:] == ["taskSummary"]:
+                return replay.task_summary(key, rest.quantiles(params))
+            if args[2:] == ["taskList"]:
+                offset = int(rest.param(params, "offset") or 0)
+                length = int(rest.param(params, "length") or 20)
+                return replay.task_list(
+                    key, statuses, rest.task_sorting(params), offset, length
+                )
+
+        if resource in ("executors", "allexecutors") and not args:
+            return replay.executor_list(active_only=resource == "executors")
+        if resource == "environment" and not args:
+            return replay.environment_info()
+
+        if resource == "sql" and len(args) <= 1:
+            details = rest.flag(params, "details", default=True)
+            if not args:
+                execution_ids = rest.page(replay.sql_ids(), params)
+                plan_description = rest.flag(params, "planDescription")
+            else:
+                if ids[0] not in replay.sql:
+                    raise LookupError(f"Unknown SQL execution: {ids[0]}")
+                execution_ids = ids
+                plan_description = rest.flag(params, "planDescription", default=True)
+            executions = replay.sql_executions(execution_ids, details, plan_description)
+            return executions if not args else executions[0]
+
+        raise LookupError(f"Unknown resource: {'/'.join(tail)}")
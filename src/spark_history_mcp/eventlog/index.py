@@ -0,0 +1,275 @@
+"""
+Persistent index of replayed event logs.
+
+An AppIndex keeps what an AppReplay rebuilt from an event log in a SQLite file
+per application attempt: a table of records per kind (jobs, stage attempts,
+executors, SQL executions, SQL metrics), the task rows of each stage attempt as
+compressed column chunks, and the offset reached in each segment of the log.
+Reopening an application loads the index and reads only what was appended to
+the log since; saving writes only the records that changed and the new task rows.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from array import array
+from collections import defaultdict
+from typing import Dict, Optional
+
+import numpy as np
+
+from spark_history_mcp.eventlog.files import EventLog
+from spark_history_mcp.eventlog.replay import TASK_COLUMNS, AppReplay, StageKey
+
+# Incremented when the records saved by AppReplay change
+FORMAT = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id INTEGER PRIMARY KEY,
+    record TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stages (
+    stage_id INTEGER NOT NULL,
+    attempt_id INTEGER NOT NULL,
+    record TEXT NOT NULL,
+    PRIMARY KEY (stage_id, attempt_id)
+);
+CREATE TABLE IF NOT EXISTS executors (
+    executor_id TEXT PRIMARY KEY,
+    record TEXT,
+    totals TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sql_executions (
+    execution_id INTEGER PRIMARY KEY,
+    record TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sql_metrics (
+    accumulator_id INTEGER PRIMARY KEY,
+    total INTEGER NOT NULL,
+    min INTEGER NOT NULL,
+    max INTEGER NOT NULL,
+    updates INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS task_chunks (
+    stage_id INTEGER NOT NULL,
+    attempt_id INTEGER NOT NULL,
+    first_row INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    columns BLOB NOT NULL,
+    PRIMARY KEY (stage_id, attempt_id, first_row)
+);
+"""
+
+_TABLES = ("meta", "jobs", "stages", "executors", "sql_executions", "sql_metrics")
+
+
+def index_path(directory: str, app_id: str, attempt_id: Optional[str]) -> str:
+    """Path of the index file of an application attempt."""
+    name = app_id + (f"_{attempt_id}" if attempt_id else "")
+    return os.path.join(directory, re.sub(r"[^\w.-]", "_", name) + ".sqlite")
+
+
+class AppIndex:
+    """SQLite index of the replay of one application attempt."""
+
+    def __init__(self, path: str):
+        """
+        Open (and create if needed) the index database.
+
+        Args:
+            path: Path of the SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        # Task rows of each stage attempt already saved
+        self._saved_rows: Dict[StageKey, int] = {}
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def load(self, log: EventLog) -> Optional[AppReplay]:
+        """
+        Rebuild the saved replay of a log.
+
+        Args:
+            log: The current state of the log
+
+        Returns:
+            The replay, to be updated with what the log got since it was saved;
+            None if nothing usable was saved (the index is then cleared)
+        """
+        with self._lock:
+            meta = dict(self._conn.execute("SELECT name, value FROM meta"))
+            if not meta:
+                return None
+            state = json.loads(meta["state"])
+            if (
+                state.get("format") != FORMAT
+                or state.get("columns") != list(TASK_COLUMNS)
+                or state.get("log") != _log_name(log)
+            ):
+                self._clear()
+                return None
+
+            tasks: Dict[StageKey, array] = defaultdict(lambda: array("q"))
+            for stage_id, attempt_id, rows, data in self._conn.execute(
+                "SELECT stage_id, attempt_id, rows, columns FROM task_chunks "
+                "ORDER BY stage_id, attempt_id, first_row"
+            ):
+                columns = np.frombuffer(zlib.decompress(data), dtype=np.int64)
+                tasks[stage_id, attempt_id].frombytes(
+                    columns.reshape(len(TASK_COLUMNS), rows).T.tobytes()
+                )
+            replay = AppReplay.restore(
+                log,
+                state["replay"],
+                jobs=self._records("SELECT record FROM jobs"),
+                stages=self._records("SELECT record FROM stages"),
+                executors=[
+                    (
+                        executor_id,
+                        json.loads(record) if record else None,
+                        json.loads(totals),
+                    )
+                    for executor_id, record, totals in self._conn.execute(
+                        "SELECT executor_id, record, totals FROM executors"
+                    )
+                ],
+                sql=self._records("SELECT record FROM sql_executions"),
+                accumulators=[
+                    (accumulator_id, list(totals))
+                    for accumulator_id, *totals in self._conn.execute(
+                        "SELECT accumulator_id, total, min, max, updates FROM sql_metrics"
+                    )
+                ],
+                tasks=tasks,
+            )
+            if replay is None:
+                # The log was rewritten, e.g. compacted
+                self._clear()
+                return None
+            self._saved_rows = {
+                key: len(rows) // len(TASK_COLUMNS) for key, rows in tasks.items()
+            }
+            return replay
+
+    def _records(self, query: str):
+        return [json.loads(record) for (record,) in self._conn.execute(query)]
+
+    def save(self, replay: AppReplay) -> None:
+        """
+        Save what changed in a replay since it was loaded or last saved.
+
+        Args:
+            replay: The replay, loaded from this index or replayed from the start
+        """
+        changed = replay.changed
+        state = {
+            "format": FORMAT,
+            "columns": list(TASK_COLUMNS),
+            "log": _log_name(replay.log),
+            "replay": replay.state(),
+        }
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES ('state', ?)",
+                (json.dumps(state),),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO jobs (job_id, record) VALUES (?, ?)",
+                (
+                    (job_id, json.dumps(replay.jobs[job_id]))
+                    for job_id in changed["jobs"]
+                ),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO stages (stage_id, attempt_id, record) "
+                "VALUES (?, ?, ?)",
+                ((*key, json.dumps(replay.stages[key])) for key in changed["stages"]),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO executors (executor_id, record, totals) "
+                "VALUES (?, ?, ?)",
+                (
+                    (
+                        executor_id,
+                        json.dumps(record) if record else None,
+                        json.dumps(totals),
+                    )
+                    for executor_id in changed["executors"]
+                    for record, totals in [replay.executor_state(executor_id)]
+                ),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO sql_executions (execution_id, record) "
+                "VALUES (?, ?)",
+                (
+                    (execution_id, json.dumps(replay.sql[execution_id]))
+                    for execution_id in changed["sql"]
+                ),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO sql_metrics "
+                "(accumulator_id, total, min, max, updates) VALUES (?, ?, ?, ?, ?)",
+                (
+                    (accumulator_id, *replay.accumulators[accumulator_id])
+                    for accumulator_id in changed["accumulators"]
+                ),
+            )
+            chunks = []
+            for key, rows in replay.tasks.items():
+                saved = self._saved_rows.get(key, 0)
+                count = len(rows) // len(TASK_COLUMNS)
+                if count > saved:
+                    new_rows = np.array(
+                        rows[saved * len(TASK_COLUMNS) :], dtype=np.int64
+                    ).reshape(-1, len(TASK_COLUMNS))
+                    chunks.append(
+                        (
+                            *key,
+                            saved,
+                            count - saved,
+                            zlib.compress(new_rows.T.tobytes(), 1),
+                        )
+                    )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO task_chunks "
+                "(stage_id, attempt_id, first_row, rows, columns) VALUES (?, ?, ?, ?, ?)",
+                chunks,
+            )
+        for stage_id, attempt_id, first_row, rows, _ in chunks:
+            self._saved_rows[stage_id, attempt_id] = first_row + rows
+        changed.clear()
+
+    def clear(self) -> None:
+        """Drop everything saved, e.g. before saving a replay from the start."""
+        with self._lock:
+            self._clear()
+
+    def _clear(self) -> None:
+        with self._conn:
+            for table in (*_TABLES, "task_chunks"):
+                self._conn.execute(f"DELETE FROM {table}")  # noqa: S608
+        self._saved_rows = {}
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def _log_name(log: EventLog) -> str:
+    """Name of a log, which loses .inprogress when its application ends."""
+    name = os.path.basename(log.path)
+    return name[: -len(".inprogress")] if name.endswith(".inprogress") else name
@@ -0,0 +1,112 @@
+"""
+Process pool parsing large event logs.
+
+Replaying a large log is bound by json.loads, which holds the GIL. A ParsePool
+spreads the parsing over processes: AppReplay.update() cuts what it has to read
+into ranges (each compressed segment, newline-aligned chunks of uncompressed
+ones) and has the pool decode them, then applies the decoded events in log
+order, so the replay is the same whatever the number of processes.
+"""
+
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Optional, Tuple
+
+# Bytes of an uncompressed segment decoded by one task of the pool
+CHUNK_SIZE = 8 * 1024 * 1024
+
+# Bytes read at a time to find the end of a line
+_SCAN_SIZE = 64 * 1024
+
+
+class ParsePool:
+    """Worker processes decoding ranges of event logs, shared by the replays."""
+
+    def __init__(self, workers: int, chunk_size: int = CHUNK_SIZE):
+        """
+        Initialize the pool; its processes are started when first needed.
+
+        Args:
+            workers: Number of worker processes
+            chunk_size: Bytes of an uncompressed segment decoded by one task
+        """
+        self.workers = workers
+        self.chunk_size = chunk_size
+        # Spawned rather than forked: the server runs threads
+        self._executor = ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    def map(self, fn: Callable[..., Any], args: Iterable[Tuple]) -> Iterator[Any]:
+        """
+        Call a function in the worker processes, for each tuple of arguments.
+
+        At most two calls per worker are queued ahead of the results consumed,
+        which bounds the memory held by results not applied yet.
+
+        Args:
+            fn: A module level function, run in the workers
+            args: Arguments of each call
+
+        Returns:
+            Iterator over the results, in the order of the arguments
+        """
+        args = iter(args)
+        pending: Deque[Future] = deque()
+        try:
+            for call in args:
+                pending.append(self._executor.submit(fn, *call))
+                if len(pending) >= 2 * self.workers:
+                    break
+            while pending:
+                result = pending.popleft().result()
+                call = next(args, None)
+                if call is not None:
+                    pending.append(self._executor.submit(fn, *call))
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        self._executor.shutdown(cancel_futures=True)
+
+
+def split_segment(
+    path: str, start: int, chunk_size: int
+) -> List[Tuple[int, Optional[int]]]:
+    """
+    Cut the rest of an uncompressed segment into ranges of whole lines.
+
+    Args:
+        path: The segment file
+        start: Offset of the first line to read
+        chunk_size: Approximate size of the ranges
+
+    Returns:
+        (start, end) offsets of the ranges; the end of the last one is None, as
+        the segment may still grow
+    """
+    ranges: List[Tuple[int, Optional[int]]] = []
+    size = os.stat(path).st_size
+    with open(path, "rb") as f:
+        while start + chunk_size < size:
+            # The range ends after the first newline past its size
+            f.seek(start + chunk_size)
+            end = None
+            while end is None:
+                data = f.read(_SCAN_SIZE)
+                if not data:
+                    break
+                newline = data.find(b"\n")
+                if newline >= 0:
+                    end = f.tell() - len(data) + newline + 1
+            if end is None or end >= size:
+                break
+            ranges.append((start, end))
+            start = end
+    ranges.append((start, None))
+    return ranges
@@ -0,0 +1,1715 @@
+"""
+Replay of Spark listener events into History Server REST records.
+
+AppReplay follows the events of an application attempt like the History Server's
+AppStatusListener does, but keeps much less of them in memory: small records of
+the jobs, stages, executors and SQL executions, and per stage attempt a row of
+integers per finished task (its metrics, and where its event is in the log).
+Task records and SQL plans are read back from the log for what a response lists,
+and aggregates (stage totals, task counts of jobs, metric quantiles) are computed
+from the task rows when they are requested.
+"""
+
+import itertools
+import json
+import logging
+import os
+import re
+import time
+from array import array
+from collections import Counter, defaultdict
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from spark_history_mcp.api import rest
+from spark_history_mcp.eventlog.files import (
+    EventLog,
+    EventScanner,
+    event_type,
+    read_lines,
+    segment_codec,
+)
+from spark_history_mcp.eventlog.parallel import ParsePool, split_segment
+
+logger = logging.getLogger(__name__)
+
+SQL_EVENT_PREFIX = "org.apache.spark.sql.execution.ui."
+
+StageKey = Tuple[int, int]
+
+# Where an event is in a log: index of the segment, offset of the line
+Position = Tuple[int, int]
+
+# Task metrics in the order of the task row columns: the REST group and name,
+# then the group and name in the Task Metrics of TaskEnd events
+_TASK_METRICS = (
+    (None, "executorDeserializeTime", None, "Executor Deserialize Time"),
+    (None, "executorDeserializeCpuTime", None, "Executor Deserialize CPU Time"),
+    (None, "executorRunTime", None, "Executor Run Time"),
+    (None, "executorCpuTime", None, "Executor CPU Time"),
+    (None, "resultSize", None, "Result Size"),
+    (None, "jvmGcTime", None, "JVM GC Time"),
+    (None, "resultSerializationTime", None, "Result Serialization Time"),
+    (None, "memoryBytesSpilled", None, "Memory Bytes Spilled"),
+    (None, "diskBytesSpilled", None, "Disk Bytes Spilled"),
+    (None, "peakExecutionMemory", None, "Peak Execution Memory"),
+    ("inputMetrics", "bytesRead", "Input Metrics", "Bytes Read"),
+    ("inputMetrics", "recordsRead", "Input Metrics", "Records Read"),
+    ("outputMetrics", "bytesWritten", "Output Metrics", "Bytes Written"),
+    ("outputMetrics", "recordsWritten", "Output Metrics", "Records Written"),
+    (
+        "shuffleReadMetrics",
+        "remoteBlocksFetched",
+        "Shuffle Read Metrics",
+        "Remote Blocks Fetched",
+    ),
+    (
+        "shuffleReadMetrics",
+        "localBlocksFetched",
+        "Shuffle Read Metrics",
+        "Local Blocks Fetched",
+    ),
+    ("shuffleReadMetrics", "fetchWaitTime", "Shuffle Read Metrics", "Fetch Wait Time"),
+    (
+        "shuffleReadMetrics",
+        "remoteBytesRead",
+        "Shuffle Read Metrics",
+        "Remote Bytes Read",
+    ),
+    (
+        "shuffleReadMetrics",
+        "remoteBytesReadToDisk",
+        "Shuffle Read Metrics",
+        "Remote Bytes Read To Disk",
+    ),
+    (
+        "shuffleReadMetrics",
+        "localBytesRead",
+        "Shuffle Read Metrics",
+        "Local Bytes Read",
+    ),
+    ("shuffleReadMetrics", "recordsRead", "Shuffle Read Metrics", "Total Records Read"),
+    (
+        "shuffleReadMetrics",
+        "remoteReqsDuration",
+        "Shuffle Read Metrics",
+        "Remote Requests Duration",
+    ),
+    (
+        "shuffleWriteMetrics",
+        "bytesWritten",
+        "Shuffle Write Metrics",
+        "Shuffle Bytes Written",
+    ),
+    ("shuffleWriteMetrics", "writeTime", "Shuffle Write Metrics", "Shuffle Write Time"),
+    (
+        "shuffleWriteMetrics",
+        "recordsWritten",
+        "Shuffle Write Metrics",
+        "Shuffle Records Written",
+    ),
+)
+
+# Columns of the task rows: the task, where its TaskEnd event is, its metrics
+TASK_COLUMNS = (
+    "taskId",
+    "index",
+    "launchTime",
+    "finishTime",
+    "gettingResultTime",
+    "executor",
+    "status",
+    "segment",
+    "offset",
+    *(f"{group}.{name}" if group else name for group, name, _, _ in _TASK_METRICS),
+)
+_COLUMN = {name: i for i, name in enumerate(TASK_COLUMNS)}
+_METRICS_START = _COLUMN["executorDeserializeTime"]
+
+# Values of the status column
+_TASK_STATUSES = ("SUCCESS", "FAILED", "KILLED")
+_SUCCESS, _FAILED, _KILLED = range(3)
+
+# Stage totals: REST name, then the task metric columns adding up to it
+_STAGE_TOTALS = (
+    ("executorDeserializeTime", ("executorDeserializeTime",)),
+    ("executorDeserializeCpuTime", ("executorDeserializeCpuTime",)),
+    ("executorRunTime", ("executorRunTime",)),
+    ("executorCpuTime", ("executorCpuTime",)),
+    ("resultSize", ("resultSize",)),
+    ("jvmGcTime", ("jvmGcTime",)),
+    ("resultSerializationTime", ("resultSerializationTime",)),
+    ("memoryBytesSpilled", ("memoryBytesSpilled",)),
+    ("diskBytesSpilled", ("diskBytesSpilled",)),
+    ("peakExecutionMemory", ("peakExecutionMemory",)),
+    ("inputBytes", ("inputMetrics.bytesRead",)),
+    ("inputRecords", ("inputMetrics.recordsRead",)),
+    ("outputBytes", ("outputMetrics.bytesWritten",)),
+    ("outputRecords", ("outputMetrics.recordsWritten",)),
+    ("shuffleRemoteBlocksFetched", ("shuffleReadMetrics.remoteBlocksFetched",)),
+    ("shuffleLocalBlocksFetched", ("shuffleReadMetrics.localBlocksFetched",)),
+    ("shuffleFetchWaitTime", ("shuffleReadMetrics.fetchWaitTime",)),
+    ("shuffleRemoteBytesRead", ("shuffleReadMetrics.remoteBytesRead",)),
+    ("shuffleRemoteBytesReadToDisk", ("shuffleReadMetrics.remoteBytesReadToDisk",)),
+    ("shuffleLocalBytesRead", ("shuffleReadMetrics.localBytesRead",)),
+    (
+        "shuffleReadBytes",
+        ("shuffleReadMetrics.remoteBytesRead", "shuffleReadMetrics.localBytesRead"),
+    ),
+    ("shuffleReadRecords", ("shuffleReadMetrics.recordsRead",)),
+    ("shuffleRemoteReqsDuration", ("shuffleReadMetrics.remoteReqsDuration",)),
+    ("shuffleWriteBytes", ("shuffleWriteMetrics.bytesWritten",)),
+    ("shuffleWriteTime", ("shuffleWriteMetrics.writeTime",)),
+    ("shuffleWriteRecords", ("shuffleWriteMetrics.recordsWritten",)),
+)
+
+# Per executor, the totals of its tasks: completed, failed and started tasks,
+# duration, GC time, input, shuffle read and shuffle write bytes
+_EXECUTOR_TOTALS = (
+    "completedTasks",
+    "failedTasks",
+    "totalTasks",
+    "totalDuration",
+    "totalGCTime",
+    "totalInputBytes",
+    "totalShuffleRead",
+    "totalShuffleWrite",
+)
+
+# Plan nodes pointing at an exchange, possibly one reused from elsewhere
+_QUERY_STAGES = ("BroadcastQueryStage", "ShuffleQueryStage", "TableCacheQueryStage")
+_SUBQUERIES = ("Subquery", "SubqueryBroadcast")
+
+
+def _metric_values(metrics: Dict[str, Any]) -> List[int]:
+    """Task metrics of a TaskEnd event, in column order."""
+    values = []
+    for _, _, group, name in _TASK_METRICS:
+        source = (metrics.get(group) or {}) if group else metrics
+        values.append(source.get(name) or 0)
+    return values
+
+
+def decode_task_start(event: Dict[str, Any]) -> Tuple[StageKey, int, str, int]:
+    """What a replay keeps of a TaskStart event: stage attempt, task, executor, launch."""
+    info = event["Task Info"]
+    return (
+        (event["Stage ID"], event.get("Stage Attempt ID", 0)),
+        info["Task ID"],
+        info["Executor ID"],
+        info["Launch Time"],
+    )
+
+
+def decode_task_end(event: Dict[str, Any]) -> Tuple:
+    """
+    What a replay keeps of a TaskEnd event.
+
+    Returns:
+        The stage attempt; the executor; task ID, index, launch, finish and
+        getting result times and status code; the metric values in column
+        order; the peak executor metrics, if any; the updates of SQL metrics
+    """
+    info = event["Task Info"]
+    status = (
+        _KILLED if info.get("Killed") else _FAILED if info.get("Failed") else _SUCCESS
+    )
+    return (
+        (event["Stage ID"], event.get("Stage Attempt ID", 0)),
+        info["Executor ID"],
+        (
+            info["Task ID"],
+            info["Index"],
+            info["Launch Time"],
+            info.get("Finish Time") or 0,
+            info.get("Getting Result Time") or 0,
+            status,
+        ),
+        _metric_values(event.get("Task Metrics") or {}),
+        event.get("Task Executor Metrics") or None,
+        [
+            (acc["ID"], acc.get("Update"))
+            for acc in info.get("Accumulables") or ()
+            if acc.get("Metadata") == "sql"
+        ],
+    )
+
+
+def _rest_metrics(values: Sequence[int]) -> Dict[str, Any]:
+    """REST taskMetrics from the metric values of a task row."""
+    record: Dict[str, Any] = {}
+    for (group, name, _, _), value in zip(_TASK_METRICS, values, strict=True):
+        (record.setdefault(group, {}) if group else record)[name] = int(value)
+    return record
+
+
+def _peak(peaks: Dict[str, int], metrics: Dict[str, int]) -> None:
+    """Raise peak executor metrics to the values of an event."""
+    for name, value in metrics.items():
+        if value > peaks.get(name, 0):
+            peaks[name] = value
+
+
+def _pairs(properties: Optional[Dict[str, Any]]) -> List[List[Any]]:
+    return [[name, value] for name, value in sorted((properties or {}).items())]
+
+
+def _timestamp(ms: Optional[int]) -> Optional[str]:
+    return rest.timestamp(ms) if ms is not None and ms > 0 else None
+
+
+def _without_none(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop absent optional fields, which the History Server leaves out."""
+    return {name: value for name, value in record.items() if value is not None}
+
+
+def _error_message(reason: Dict[str, Any]) -> str:
+    """The errorMessage of a task, from the Task End Reason of its event."""
+    kind = reason.get("Reason")
+    if kind == "ExceptionFailure":
+        return reason.get("Full Stack Trace") or (
+            f"{reason.get('Class Name')}: {reason.get('Description')}"
+        )
+    if kind == "FetchFailed":
+        address = reason.get("Block Manager Address") or {}
+        return (
+            f"FetchFailed(BlockManagerId({address.get('Executor ID')}, "
+            f"{address.get('Host')}, {address.get('Port')}), "
+            f"shuffleId={reason.get('Shuffle ID')}, mapIndex={reason.get('Map Index')}, "
+            f"mapId={reason.get('Map ID')}, reduceId={reason.get('Reduce ID')}, "
+            f"message=\n{reason.get('Message')}\n)"
+        )
+    if kind == "ExecutorLostFailure":
+        behavior = (
+            "caused by one of the running tasks"
+            if reason.get("Exit Caused By App", True)
+            else "unrelated to the running tasks"
+        )
+        return (
+            f"ExecutorLostFailure (executor {reason.get('Executor ID')} exited "
+            f"{behavior}) Reason: {reason.get('Loss Reason')}"
+        )
+    if kind == "TaskKilled":
+        return f"TaskKilled ({reason.get('Kill Reason')})"
+    if kind == "TaskCommitDenied":
+        return (
+            "TaskCommitDenied (Driver denied task commit) for job: "
+            f"{reason.get('Job ID')}, partition: {reason.get('Partition ID')}, "
+            f"attemptNumber: {reason.get('Attempt Number')}"
+        )
+    if kind == "TaskResultLost":
+        return "TaskResultLost (result lost from block manager)"
+    if kind == "Resubmitted":
+        return "Resubmitted (resubmitted due to lost executor)"
+    return str(kind or "UnknownReason")
+
+
+def _bytes(size: float) -> str:
+    """Format a size like Spark's Utils.bytesToString."""
+    for unit, scale in (("TiB", 1 << 40), ("GiB", 1 << 30), ("MiB", 1 << 20)):
+        if size >= 2 * scale:
+            return f"{size / scale:.1f} {unit}"
+    if size >= 2 * 1024:
+        return f"{size / 1024:.1f} KiB"
+    return f"{size:.1f} B"
+
+
+def _duration(ms: float) -> str:
+    """Format milliseconds like Spark's Utils.msDurationToString."""
+    if ms < 1000:
+        return f"{int(ms)} ms"
+    if ms < 60_000:
+        return f"{ms / 1000:.1f} s"
+    if ms < 3_600_000:
+        return f"{ms / 60_000:.1f} m"
+    return f"{ms / 3_600_000:.2f} h"
+
+
+_METRIC_FORMATS = {
+    "size": _bytes,
+    "timing": _duration,
+    "nsTiming": lambda ns: _duration(ns / 1_000_000),
+}
+
+
+def _metric_value(metric_type: str, totals: List[int]) -> str:
+    """
+    Format an SQL metric from its total, minimum, maximum and number of updates.
+
+    Spark also shows the median of per-task values, which would take keeping
+    every value; those metrics are shown as total (min, max) instead.
+    """
+    total, low, high, _count = totals
+    if metric_type == "average":
+        return f"avg (min, max)\n({low / 10:.1f}, {high / 10:.1f})"
+    format_value = _METRIC_FORMATS.get(metric_type)
+    if format_value is None:
+        return f"{total:,}" if metric_type == "sum" else str(total)
+    return (
+        f"total (min, max)\n{format_value(total)} "
+        f"({format_value(low)}, {format_value(high)})"
+    )
+
+
+def plan_graph(
+    plan: Dict[str, Any], accumulators: Dict[int, List[int]]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    The nodes and edges of a SQL execution, like Spark's SparkPlanGraph.
+
+    Args:
+        plan: The sparkPlanInfo of a SQL execution event
+        accumulators: Total, minimum, maximum and updates of the SQL metrics by
+            accumulator ID
+
+    Returns:
+        Nodes (highest ID first) and edges from child to parent
+    """
+    nodes: List[Dict[str, Any]] = []
+    edges: List[Dict[str, Any]] = []
+    # Exchanges and subqueries by plan, for the nodes reusing them
+    exchanges: Dict[str, int] = {}
+    ids = itertools.count()
+
+    def key(info: Dict[str, Any]) -> str:
+        return json.dumps(info, sort_keys=True)
+
+    def add(info: Dict[str, Any], codegen: Optional[int]) -> int:
+        node = {
+            "nodeId": next(ids),
+            "nodeName": info["nodeName"].strip(),
+            "metrics": [
+                {
+                    "name": metric["name"],
+                    "value": _metric_value(
+                        metric.get("metricType", "sum"),
+                        accumulators[metric["accumulatorId"]],
+                    ),
+                }
+                for metric in info.get("metrics") or []
+                if metric["accumulatorId"] in accumulators
+            ],
+        }
+        if codegen is not None:
+            node["wholeStageCodegenId"] = codegen
+        nodes.append(node)
+        return node["nodeId"]
+
+    def link(node_id: int, parent: Optional[int]) -> None:
+        if parent is not None:
+            edges.append({"fromId": node_id, "toId": parent})
+
+    def build(info: Dict[str, Any], parent: Optional[int], codegen: Optional[int]):
+        name = info["nodeName"]
+        children = info.get("children") or []
+        if name.startswith("WholeStageCodegen"):
+            match = re.search(r"\((\d+)\)", name)
+            add(info, None)
+            build(children[0], parent, int(match.group(1)) if match else None)
+        elif name == "InputAdapter":
+            build(children[0], parent, None)
+        elif name in _QUERY_STAGES:
+            reused = exchanges.get(key(children[0]))
+            if reused is not None:
+                link(reused, parent)
+            else:
+                build(children[0], parent, None)
+        elif name in _SUBQUERIES and codegen is not None:
+            build(info, parent, None)
+        elif name in _SUBQUERIES and key(info) in exchanges:
+            link(exchanges[key(info)], parent)
+        elif name == "ReusedSubquery":
+            build(children[0], parent, codegen)
+        elif name == "ReusedExchange" and key(children[0]) in exchanges:
+            link(exchanges[key(children[0])], parent)
+        else:
+            node_id = add(info, codegen)
+            if "Exchange" in name or name in _SUBQUERIES:
+                exchanges[key(info)] = node_id
+            link(node_id, parent)
+            for child in children:
+                build(child, node_id, codegen)
+
+    build(plan, None, None)
+    nodes.sort(key=lambda node: node["nodeId"], reverse=True)
+    return nodes, edges
+
+
+class AppReplay:
+    """
+    The state of an application attempt rebuilt from its event log.
+
+    update() reads the events added to the log since the previous call, so a
+    running application is followed by calling it again. Not thread safe.
+    """
+
+    def __init__(self, log: EventLog):
+        """
+        Initialize an empty replay.
+
+        Args:
+            log: The event log to replay
+        """
+        self.log = log
+        self.positions: List[int] = []  # Offset reached in each segment
+        self.sizes: List[int] = []  # Size of each segment when it was read
+        self.version = 0  # Incremented whenever events are applied
+        self.info: Dict[str, Any] = {}  # From the log and application events
+        self.environment: Optional[Dict[str, Any]] = None
+        self.resource_profiles: Dict[int, Dict[str, Any]] = {}
+        self.jobs: Dict[int, Dict[str, Any]] = {}
+        self.stages: Dict[StageKey, Dict[str, Any]] = {}
+        self.executors: Dict[str, Dict[str, Any]] = {}
+        self.sql: Dict[int, Dict[str, Any]] = {}
+        # SQL metrics by accumulator ID: total, minimum, maximum, updates
+        self.accumulators: Dict[int, List[int]] = {}
+        # Task rows of each stage attempt, one flat array of TASK_COLUMNS values
+        self.tasks: Dict[StageKey, array] = {}
+        # Running tasks by ID: stage attempt, position of the TaskStart event,
+        # executor code and launch time
+        self.running: Dict[int, Tuple[StageKey, Position, int, int]] = {}
+        # Executors are coded as integers in the task rows
+        self.executor_ids: List[str] = []
+        self._executor_codes: Dict[str, int] = {}
+        self._executor_totals: List[List[int]] = []
+        self._task_cpus: Dict[int, float] = {}
+        self._stage_attempts: Dict[int, List[int]] = defaultdict(list)
+        self._position: Position = (0, 0)
+        # Keys of the records changed since the index last saved them, by table
+        self.changed: Dict[str, set] = defaultdict(set)
+        # Responses derived from the current state, until events are applied
+        self._memo: Dict[Any, Any] = {}
+        self._handlers = {
+            "SparkListenerLogStart": self._on_log_start,
+            "SparkListenerApplicationStart": self._on_application_start,
+            "SparkListenerApplicationEnd": self._on_application_end,
+            "SparkListenerEnvironmentUpdate": self._on_environment_update,
+            "SparkListenerResourceProfileAdded": self._on_resource_profile_added,
+            "SparkListenerBlockManagerAdded": self._on_block_manager_added,
+            "SparkListenerExecutorAdded": self._on_executor_added,
+            "SparkListenerExecutorRemoved": self._on_executor_removed,
+            "SparkListenerStageExecutorMetrics": self._on_stage_executor_metrics,
+            "SparkListenerJobStart": self._on_job_start,
+            "SparkListenerJobEnd": self._on_job_end,
+            "SparkListenerStageSubmitted": self._on_stage_submitted,
+            "SparkListenerStageCompleted": self._on_stage_completed,
+            "SparkListenerTaskStart": self._on_task_start,
+            "SparkListenerTaskEnd": self._on_task_end,
+            SQL_EVENT_PREFIX + "SparkListenerSQLExecutionStart": self._on_sql_start,
+            SQL_EVENT_PREFIX
+            + "SparkListenerSQLAdaptiveExecutionUpdate": self._on_sql_plan_update,
+            SQL_EVENT_PREFIX + "SparkListenerSQLExecutionEnd": self._on_sql_end,
+            SQL_EVENT_PREFIX
+            + "SparkListenerDriverAccumUpdates": self._on_driver_accum_updates,
+        }
+
+    # Reading the log
+
+    def follows(self, log: EventLog) -> bool:
+        """Whether update() can continue with the given state of the log."""
+        read = len(self.positions)
+        return (
+            len(log.segments) >= read
+            and all(
+                _segment_name(new) == _segment_name(old)
+                # A segment never shrinks, unless it was rewritten
+                and (not os.path.exists(new) or os.stat(new).st_size >= size)
+                for new, old, size in zip(
+                    log.segments[:read],
+                    self.log.segments[:read],
+                    self.sizes,
+                    strict=True,
+                )
+            )
+        )
+
+    def update(
+        self, log: Optional[EventLog] = None, pool: Optional[ParsePool] = None
+    ) -> bool:
+        """
+        Apply the events added to the log since the previous update.
+
+        Args:
+            log: A newer state of the log, e.g. with more segments or completed
+            pool: Processes to parse the events in, when there are enough of them
+
+        Returns:
+            Whether any event was applied
+
+        Raises:
+            ValueError: If the log was rewritten, e.g. compacted, rather than
+                appended to (see follows())
+        """
+        if log is not None:
+            if not self.follows(log):
+                raise ValueError(f"Event log rewritten: {log.path}")
+            self.log = log
+        # Segments with events to read, and their sizes
+        unread = []
+        for index, path in enumerate(self.log.segments):
+            if index == len(self.positions):
+                self.positions.append(0)
+                self.sizes.append(-1)
+            size = os.stat(path).st_size
+            if size != self.sizes[index]:
+                unread.append((index, size))
+        if pool is not None and (
+            sum(max(size - self.positions[index], 0) for index, size in unread)
+            > pool.chunk_size
+        ):
+            applied = self._read_in(pool, unread)
+        else:
+            applied = 0
+            types = frozenset(self._handlers)
+            for index, size in unread:
+                scan = EventScanner(
+                    self.log.segments[index], types, self.positions[index]
+                )
+                for offset, line in scan:
+                    self._position = (index, offset)
+                    applied += self._apply(line)
+                self.positions[index] = scan.position
+                self.sizes[index] = size
+        if applied:
+            self.version += 1
+            self._memo.clear()
+        return applied > 0
+
+    def _read_in(self, pool: ParsePool, unread: List[Tuple[int, int]]) -> int:
+        """Read segments with a pool decoding their ranges, then apply them in order."""
+        ranges = []
+        for index, _ in unread:
+            path = self.log.segments[index]
+            if segment_codec(path) is None:
+                chunks = split_segment(path, self.positions[index], pool.chunk_size)
+            else:
+                chunks = [(self.positions[index], None)]
+            ranges.extend((index, path, start, end) for start, end in chunks)
+        types = frozenset(self._handlers)
+        sizes = dict(unread)
+        applied = 0
+        results = pool.map(
+            decode_range,
+            ((path, types, start, end) for _, path, start, end in ranges),
+        )
+        for (index, _, _, end), (events, position) in zip(ranges, results, strict=True):
+            for offset, kind, value in events:
+                self._position = (index, offset)
+                if kind == _TASK_END:
+                    self._end_task(*value)
+                    applied += 1
+                elif kind == _TASK_START:
+                    self._start_task(*value)
+                    applied += 1
+                else:
+                    applied += self._apply(value)
+            self.positions[index] = position
+            if end is None:
+                self.sizes[index] = sizes[index]
+        return applied
+
+    def _apply(self, line: bytes) -> int:
+        try:
+            event = json.loads(line)
+        except ValueError:
+            logger.debug(f"Skipping a corrupt event in {self.log.path}")
+            return 0
+        handler = self._handlers.get(event.get("Event"))
+        if handler is not None:
+            handler(event)
+        return 1
+
+    def read_events(self, positions: Iterable[Position]) -> Dict[Position, Any]:
+        """Read back the events at some positions of the log."""
+        by_segment: Dict[int, List[int]] = defaultdict(list)
+        for segment, offset in positions:
+            by_segment[segment].append(offset)
+        events = {}
+        for segment, offsets in by_segment.items():
+            for offset, line in read_lines(self.log.segments[segment], offsets):
+                events[segment, offset] = json.loads(line)
+        return events
+
+    # Event handlers
+
+    def _on_log_start(self, event: Dict[str, Any]) -> None:
+        self.info["sparkVersion"] = event.get("Spark Version")
+
+    def _on_application_start(self, event: Dict[str, Any]) -> None:
+        self.info.update(
+            id=event.get("App ID"),
+            name=event.get("App Name"),
+            attemptId=event.get("App Attempt ID"),
+            startTime=event.get("Timestamp"),
+            sparkUser=event.get("User"),
+        )
+
+    def _on_application_end(self, event: Dict[str, Any]) -> None:
+        self.info["endTime"] = event.get("Timestamp")
+
+    def _on_environment_update(self, event: Dict[str, Any]) -> None:
+        jvm = event.get("JVM Information") or {}
+        self.environment = {
+            "runtime": {
+                "javaVersion": jvm.get("Java Version"),
+                "javaHome": jvm.get("Java Home"),
+                "scalaVersion": jvm.get("Scala Version"),
+            },
+            "sparkProperties": _pairs(event.get("Spark Properties")),
+            "hadoopProperties": _pairs(event.get("Hadoop Properties")),
+            "systemProperties": _pairs(event.get("System Properties")),
+            "metricsProperties": _pairs(event.get("Metrics Properties")),
+            "classpathEntries": _pairs(event.get("Classpath Entries")),
+        }
+
+    def _on_resource_profile_added(self, event: Dict[str, Any]) -> None:
+        profile_id = event.get("Resource Profile Id", 0)
+        executor_resources = event.get("Executor Resource Requests") or {}
+        task_resources = event.get("Task Resource Requests") or {}
+        self.resource_profiles[profile_id] = {
+            "id": profile_id,
+            "executorResources": {
+                name: {
+                    "resourceName": request.get("Resource Name"),
+                    "amount": request.get("Amount"),
+                    "discoveryScript": request.get("Discovery Script", ""),
+                    "vendor": request.get("Vendor", ""),
+                }
+                for name, request in executor_resources.items()
+            },
+            "taskResources": {
+                name: {
+                    "resourceName": request.get("Resource Name"),
+                    "amount": request.get("Amount"),
+                }
+                for name, request in task_resources.items()
+            },
+        }
+        cpus = task_resources.get("cpus", {}).get("Amount")
+        if cpus:
+            self._task_cpus[profile_id] = cpus
+
+    def _executor(self, executor_id: str) -> Dict[str, Any]:
+        executor = self.executors.get(executor_id)
+        if executor is None:
+            executor = self.executors[executor_id] = {
+                "id": executor_id,
+                "hostPort": None,
+                "isActive": True,
+                "totalCores": 0,
+                "maxTasks": 0,
+                "maxMemory": 0,
+                "addTime": None,
+                "removeTime": None,
+                "removeReason": None,
+                "executorLogs": {},
+                "memoryMetrics": None,
+                "peakMemoryMetrics": {},
+                "attributes": {},
+                "resources": {},
+                "resourceProfileId": 0,
+            }
+            self._code(executor_id)
+        self.changed["executors"].add(executor_id)
+        return executor
+
+    def _code(self, executor_id: str) -> int:
+        """The integer standing for an executor in the task rows."""
+        code = self._executor_codes.get(executor_id)
+        if code is None:
+            code = self._executor_codes[executor_id] = len(self.executor_ids)
+            self.executor_ids.append(executor_id)
+            self._executor_totals.append([0] * len(_EXECUTOR_TOTALS))
+            self.changed["executors"].add(executor_id)
+        return code
+
+    def _on_block_manager_added(self, event: Dict[str, Any]) -> None:
+        block_manager = event.get("Block Manager ID") or {}
+        executor = self._executor(block_manager.get("Executor ID"))
+        executor["hostPort"] = (
+            f"{block_manager.get('Host')}:{block_manager.get('Port')}"
+        )
+        executor["maxMemory"] = event.get("Maximum Memory", 0)
+        if executor["addTime"] is None:
+            executor["addTime"] = event.get("Timestamp")
+        on_heap = event.get("Maximum Onheap Memory")
+        if on_heap is not None:
+            executor["memoryMetrics"] = {
+                "usedOnHeapStorageMemory": 0,
+                "usedOffHeapStorageMemory": 0,
+                "totalOnHeapStorageMemory": on_heap,
+                "totalOffHeapStorageMemory": event.get("Maximum Offheap Memory", 0),
+            }
+
+    def _on_executor_added(self, event: Dict[str, Any]) -> None:
+        info = event.get("Executor Info") or {}
+        executor = self._executor(event.get("Executor ID"))
+        cores = info.get("Total Cores", 0)
+        profile_id = info.get("Resource Profile Id", 0)
+        executor.update(
+            hostPort=executor["hostPort"] or info.get("Host"),
+            isActive=True,
+            totalCores=cores,
+            maxTasks=int(cores // self._task_cpus.get(profile_id, 1)),
+            addTime=event.get("Timestamp"),
+            executorLogs=info.get("Log Urls") or {},
+            attributes=info.get("Attributes") or {},
+            resources=info.get("Resources") or {},
+            resourceProfileId=profile_id,
+        )
+
+    def _on_executor_removed(self, event: Dict[str, Any]) -> None:
+        executor = self._executor(event.get("Executor ID"))
+        executor.update(
+            isActive=False,
+            removeTime=event.get("Timestamp"),
+            removeReason=event.get("Removed Reason"),
+        )
+
+    def _on_stage_executor_metrics(self, event: Dict[str, Any]) -> None:
+        metrics = event.get("Executor Metrics") or {}
+        _peak(self._executor(event.get("Executor ID"))["peakMemoryMetrics"], metrics)
+        stage = self.stages.get(
+            (event.get("Stage ID"), event.get("Stage Attempt ID", 0))
+        )
+        if stage is not None:
+            _peak(stage["peakExecutorMetrics"], metrics)
+            self.changed["stages"].add((stage["stageId"], stage["attemptId"]))
+
+    def _stage(
+        self, info: Dict[str, Any], properties: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """The record of a stage attempt, updated from a Stage Info."""
+        key = (info["Stage ID"], info.get("Stage Attempt ID", 0))
+        stage = self.stages.get(key)
+        if stage is None:
+            stage = self.stages[key] = {
+                "stageId": key[0],
+                "attemptId": key[1],
+                "status": "PENDING",
+                "name": "",
+                "details": "",
+                "numTasks": 0,
+                "submissionTime": None,
+                "completionTime": None,
+                "failureReason": None,
+                "description": None,
+                "schedulingPool": "default",
+                "rddIds": [],
+                "accumulatorUpdates": [],
+                "resourceProfileId": 0,
+                "peakExecutorMetrics": {},
+                "isShufflePushEnabled": False,
+                "shuffleMergersCount": 0,
+            }
+            self.tasks[key] = array("q")
+            self._stage_attempts[key[0]].append(key[1])
+        self.changed["stages"].add(key)
+        if "Stage Name" in info:
+            stage.update(
+                name=info["Stage Name"],
+                details=info.get("Details", ""),
+                numTasks=info.get("Number of Tasks", 0),
+                rddIds=[rdd["RDD ID"] for rdd in info.get("RDD Info") or []],
+                resourceProfileId=info.get("Resource Profile Id", 0),
+                isShufflePushEnabled=info.get("Shuffle Push Enabled", False),
+                shuffleMergersCount=info.get("Shuffle Push Mergers Count", 0),
+            )
+        if properties is not None:
+            stage["description"] = properties.get("spark.job.description")
+            stage["schedulingPool"] = properties.get("spark.scheduler.pool", "default")
+        return stage
+
+    def _on_job_start(self, event: Dict[str, Any]) -> None:
+        properties = event.get("Properties") or {}
+        infos = event.get("Stage Infos") or []
+        for info in infos:
+            self._stage(info)
+        last = max(infos, key=lambda info: info["Stage ID"], default=None)
+        tags = properties.get("spark.job.tags")
+        sql_id = properties.get("spark.sql.execution.id")
+        job_id = event["Job ID"]
+        self.jobs[job_id] = {
+            "jobId": job_id,
+            "name": last["Stage Name"] if last else "(Unknown Stage Name)",
+            "description": properties.get("spark.job.description"),
+            "submissionTime": event.get("Submission Time"),
+            "completionTime": None,
+            "stageIds": event.get("Stage IDs") or [i["Stage ID"] for i in infos],
+            "jobGroup": properties.get("spark.jobGroup.id"),
+            "jobTags": sorted(tag for tag in tags.split(",") if tag) if tags else [],
+            "status": "RUNNING",
+            # Tasks of the stages still to run, like AppStatusListener counts them
+            "numTasks": sum(
+                info.get("Number of Tasks", 0)
+                for info in infos
+                if not info.get("Completion Time")
+            ),
+            "sqlExecutionId": int(sql_id) if sql_id is not None else None,
+        }
+        self.changed["jobs"].add(job_id)
+
+    def _on_job_end(self, event: Dict[str, Any]) -> None:
+        job = self.jobs.get(event.get("Job ID"))
+        if job is None:
+            return
+        result = (event.get("Job Result") or {}).get("Result")
+        job["status"] = "SUCCEEDED" if result == "JobSucceeded" else "FAILED"
+        job["completionTime"] = event.get("Completion Time")
+        self.changed["jobs"].add(job["jobId"])
+        # Stages the job didn't need to run are skipped
+        for stage_id in job["stageIds"]:
+            for attempt_id in self._stage_attempts.get(stage_id, ()):
+                stage = self.stages[stage_id, attempt_id]
+                if stage["status"] == "PENDING":
+                    stage["status"] = "SKIPPED"
+                    self.changed["stages"].add((stage_id, attempt_id))
+
+    def _on_stage_submitted(self, event: Dict[str, Any]) -> None:
+        info = event["Stage Info"]
+        stage = self._stage(info, event.get("Properties") or {})
+        stage["status"] = "ACTIVE"
+        stage["submissionTime"] = info.get("Submission Time")
+
+    def _on_stage_completed(self, event: Dict[str, Any]) -> None:
+        info = event["Stage Info"]
+        stage = self._stage(info)
+        failure = info.get("Failure Reason")
+        stage.update(
+            status="FAILED" if failure else "COMPLETE",
+            completionTime=info.get("Completion Time"),
+            failureReason=failure,
+            accumulatorUpdates=[
+                {"id": acc["ID"], "name": acc["Name"], "value": str(acc.get("Value"))}
+                for acc in info.get("Accumulables") or []
+                if not acc.get("Internal") and acc.get("Metadata") != "sql"
+            ],
+        )
+        if stage["submissionTime"] is None:
+            stage["submissionTime"] = info.get("Submission Time")
+
+    def _on_task_start(self, event: Dict[str, Any]) -> None:
+        self._start_task(*decode_task_start(event))
+
+    def _start_task(
+        self, key: StageKey, task_id: int, executor_id: str, launch: int
+    ) -> None:
+        self.running[task_id] = (key, self._position, self._code(executor_id), launch)
+
+    def _on_task_end(self, event: Dict[str, Any]) -> None:
+        self._end_task(*decode_task_end(event))
+
+    def _end_task(
+        self,
+        key: StageKey,
+        executor_id: str,
+        times: Tuple[int, int, int, int, int, int],
+        metrics: List[int],
+        peaks: Optional[Dict[str, int]],
+        updates: List[Tuple[int, Any]],
+    ) -> None:
+        """Add the row of a finished task (see decode_task_end)."""
+        if key not in self.tasks:
+            # The log began after the stage was submitted
+            self._stage({"Stage ID": key[0], "Stage Attempt ID": key[1]})
+        task_id, index, launch, finish, getting_result, status = times
+        self.running.pop(task_id, None)
+        code = self._code(executor_id)
+        segment, offset = self._position
+        self.tasks[key].extend(
+            (
+                task_id,
+                index,
+                launch,
+                finish,
+                getting_result,
+                code,
+                status,
+                segment,
+                offset,
+                *metrics,
+            )
+        )
+
+        self.changed["executors"].add(executor_id)
+        totals = self._executor_totals[code]
+        totals[0] += status == _SUCCESS
+        totals[1] += status == _FAILED
+        totals[2] += 1
+        totals[3] += max(finish - launch, 0)
+        column = _COLUMN
+        totals[4] += metrics[column["jvmGcTime"] - _METRICS_START]
+        totals[5] += metrics[column["inputMetrics.bytesRead"] - _METRICS_START]
+        totals[6] += (
+            metrics[column["shuffleReadMetrics.remoteBytesRead"] - _METRICS_START]
+            + metrics[column["shuffleReadMetrics.localBytesRead"] - _METRICS_START]
+        )
+        totals[7] += metrics[
+            column["shuffleWriteMetrics.bytesWritten"] - _METRICS_START
+        ]
+
+        if peaks:
+            _peak(self._executor(executor_id)["peakMemoryMetrics"], peaks)
+            _peak(self.stages[key]["peakExecutorMetrics"], peaks)
+            self.changed["stages"].add(key)
+        for accumulator_id, update in updates:
+            self._accumulate(accumulator_id, update)
+
+    def _accumulate(self, accumulator_id: int, update: Any) -> None:
+        """Add an update of a SQL metric to its total, minimum and maximum."""
+        try:
+            value = int(update)
+        except (TypeError, ValueError):
+            return
+        totals = self.accumulators.get(accumulator_id)
+        if totals is None:
+            self.accumulators[accumulator_id] = [value, value, value, 1]
+        else:
+            totals[0] += value
+            totals[1] = min(totals[1], value)
+            totals[2] = max(totals[2], value)
+            totals[3] += 1
+        self.changed["accumulators"].add(accumulator_id)
+
+    def _on_sql_start(self, event: Dict[str, Any]) -> None:
+        execution_id = event["executionId"]
+        self.sql[execution_id] = {
+            "id": execution_id,
+            "description": event.get("description"),
+            "submissionTime": event.get("time"),
+            "completionTime": None,
+            "errorMessage": None,
+            # The latest event with the plan, read back when it's asked for
+            "plan": self._position,
+        }
+        self.changed["sql"].add(execution_id)
+
+    def _on_sql_plan_update(self, event: Dict[str, Any]) -> None:
+        execution = self.sql.get(event.get("executionId"))
+        if execution is not None:
+            execution["plan"] = self._position
+            self.changed["sql"].add(execution["id"])
+
+    def _on_sql_end(self, event: Dict[str, Any]) -> None:
+        execution = self.sql.get(event.get("executionId"))
+        if execution is not None:
+            execution["completionTime"] = event.get("time")
+            execution["errorMessage"] = event.get("errorMessage")
+            self.changed["sql"].add(execution["id"])
+
+    def _on_driver_accum_updates(self, event: Dict[str, Any]) -> None:
+        for accumulator_id, value in event.get("accumUpdates") or []:
+            self._accumulate(accumulator_id, value)
+
+    # Persistence (see eventlog.index)
+
+    def state(self) -> Dict[str, Any]:
+        """What the replay holds besides its records and task rows, JSON-compatible."""
+        return {
+            "segments": [_segment_name(path) for path in self.log.segments],
+            "positions": self.positions,
+            "sizes": self.sizes,
+            "version": self.version,
+            "info": self.info,
+            "environment": self.environment,
+            "resourceProfiles": list(self.resource_profiles.values()),
+            "taskCpus": [[profile, cpus] for profile, cpus in self._task_cpus.items()],
+            "executorIds": self.executor_ids,
+            "running": [
+                [task_id, *key, *position, code, launch]
+                for task_id, (key, position, code, launch) in self.running.items()
+            ],
+        }
+
+    def executor_state(self, executor_id: str) -> Tuple[Optional[Dict], List[int]]:
+        """The record of an executor (None if only seen running tasks), and totals."""
+        code = self._executor_codes[executor_id]
+        return self.executors.get(executor_id), self._executor_totals[code]
+
+    @classmethod
+    def restore(
+        cls,
+        log: EventLog,
+        state: Dict[str, Any],
+        jobs: Iterable[Dict[str, Any]],
+        stages: Iterable[Dict[str, Any]],
+        executors: Iterable[Tuple[str, Optional[Dict[str, Any]], List[int]]],
+        sql: Iterable[Dict[str, Any]],
+        accumulators: Iterable[Tuple[int, List[int]]],
+        tasks: Dict[StageKey, array],
+    ) -> Optional["AppReplay"]:
+        """
+        Rebuild a replay saved with state() and its records.
+
+        Args:
+            log: The current state of the replayed log
+            state: As returned by state()
+            jobs: Job records
+            stages: Stage attempt records
+            executors: Executor IDs, records and totals, as from executor_state()
+            sql: SQL execution records
+            accumulators: SQL metric IDs and totals
+            tasks: Task rows by stage attempt
+
+        Returns:
+            The replay, or None if the log doesn't continue what it read
+        """
+        read = len(state["positions"])
+        names = [_segment_name(path) for path in log.segments[:read]]
+        if names != state["segments"][:read]:
+            return None
+        replay = cls(log)
+        replay.positions = state["positions"]
+        replay.sizes = state["sizes"]
+        replay.version = state["version"]
+        replay.info = state["info"]
+        replay.environment = state["environment"]
+        replay.resource_profiles = {
+            profile["id"]: profile for profile in state["resourceProfiles"]
+        }
+        replay._task_cpus = {profile: cpus for profile, cpus in state["taskCpus"]}
+        for executor_id in state["executorIds"]:
+            replay._code(executor_id)
+        replay.running = {
+            task_id: ((stage_id, attempt_id), (segment, offset), code, launch)
+            for task_id, stage_id, attempt_id, segment, offset, code, launch in state[
+                "running"
+            ]
+        }
+        replay.jobs = {job["jobId"]: job for job in jobs}
+        for stage in sorted(stages, key=lambda s: (s["stageId"], s["attemptId"])):
+            key = (stage["stageId"], stage["attemptId"])
+            replay.stages[key] = stage
+            replay.tasks[key] = tasks.get(key, array("q"))
+            replay._stage_attempts[key[0]].append(key[1])
+        for executor_id, record, totals in executors:
+            if record is not None:
+                replay.executors[executor_id] = record
+            replay._executor_totals[replay._code(executor_id)] = totals
+        for execution in sql:
+            execution["plan"] = tuple(execution["plan"])
+            replay.sql[execution["id"]] = execution
+        replay.accumulators = dict(accumulators)
+        replay.changed.clear()
+        return replay
+
+    # REST records
+
+    def _rows(self, key: StageKey) -> np.ndarray:
+        """The task rows of a stage attempt as a matrix (copied, the array grows)."""
+        return np.array(self.tasks[key], dtype=np.int64).reshape(-1, len(TASK_COLUMNS))
+
+    def _running_by_stage(self) -> Counter:
+        counts = self._memo.get("running")
+        if counts is None:
+            counts = self._memo["running"] = Counter(
+                task[0] for task in self.running.values()
+            )
+        return counts
+
+    def _stage_counts(self, key: StageKey) -> Dict[str, int]:
+        """Task counts of a stage attempt."""
+        memo_key = ("counts", key)
+        counts = self._memo.get(memo_key)
+        if counts is None:
+            rows = self._rows(key)
+            status = rows[:, _COLUMN["status"]]
+            success = status == _SUCCESS
+            counts = self._memo[memo_key] = {
+                "numActiveTasks": self._running_by_stage()[key],
+                "numCompleteTasks": int(success.sum()),
+                "numFailedTasks": int((status == _FAILED).sum()),
+                "numKilledTasks": int((status == _KILLED).sum()),
+                "numCompletedIndices": len(np.unique(rows[success, _COLUMN["index"]])),
+            }
+        return counts
+
+    def application(self, last_updated: int) -> Dict[str, Any]:
+        """The ApplicationInfo of the attempt, as in applications/<app_id>."""
+        return {
+            "id": self.info.get("id"),
+            "name": self.info.get("name"),
+            "attempts": [self.attempt(last_updated)],
+        }
+
+    def attempt(self, last_updated: int) -> Dict[str, Any]:
+        """The ApplicationAttemptInfo of the attempt."""
+        return attempt_record(self.info, self.log.completed, last_updated)
+
+    def job(self, job_id: int) -> Dict[str, Any]:
+        """The JobData of a job."""
+        job = self.jobs[job_id]
+        counts = Counter()
+        active_stages = completed_stages = skipped_stages = failed_stages = 0
+        skipped_tasks = 0
+        for stage_id in job["stageIds"]:
+            statuses = set()
+            for attempt_id in self._stage_attempts.get(stage_id, ()):
+                key = (stage_id, attempt_id)
+                stage = self.stages[key]
+                statuses.add(stage["status"])
+                counts.update(self._stage_counts(key))
+                active_stages += stage["status"] == "ACTIVE"
+                failed_stages += stage["status"] == "FAILED"
+                if stage["status"] == "SKIPPED":
+                    skipped_tasks += stage["numTasks"]
+            completed_stages += "COMPLETE" in statuses
+            skipped_stages += "SKIPPED" in statuses
+        record = {
+            "jobId": job["jobId"],
+            "name": job["name"],
+            "description": job["description"],
+            "submissionTime": _timestamp(job["submissionTime"]),
+            "completionTime": _timestamp(job["completionTime"]),
+            "stageIds": job["stageIds"],
+            "jobGroup": job["jobGroup"],
+            "jobTags": job["jobTags"],
+            "status": job["status"],
+            "numTasks": job["numTasks"],
+            "numActiveTasks": counts["numActiveTasks"],
+            "numCompletedTasks": counts["numCompleteTasks"],
+            "numSkippedTasks": skipped_tasks,
+            "numFailedTasks": counts["numFailedTasks"],
+            "numKilledTasks": counts["numKilledTasks"],
+            "numCompletedIndices": counts["numCompletedIndices"],
+            "numActiveStages": active_stages,
+            "numCompletedStages": completed_stages,
+            "numSkippedStages": skipped_stages,
+            "numFailedStages": failed_stages,
+            "killedTasksSummary": {},
+        }
+        return _without_none(record)
+
+    def stage_keys(self, stage_id: Optional[int] = None) -> List[StageKey]:
+        """Stage attempts, newest first, or the attempts of a stage in order."""
+        if stage_id is not None:
+            return [(stage_id, attempt) for attempt in self._stage_attempts[stage_id]]
+        return sorted(self.stages, reverse=True)
+
+    def stage(
+        self,
+        key: StageKey,
+        details: bool = False,
+        quantiles: Optional[List[float]] = None,
+        task_statuses: Optional[set] = None,
+    ) -> Dict[str, Any]:
+        """
+        The StageData of a stage attempt.
+
+        Args:
+            key: Stage ID and attempt ID
+            details: Whether to add its tasks and per executor summaries
+            quantiles: Add task metric distributions at these quantiles
+            task_statuses: Only add tasks with these statuses (with details)
+
+        Returns:
+            The REST record
+        """
+        record = self._memo.get(("stage", key))
+        if record is None:
+            record = self._memo[("stage", key)] = self._stage_record(key)
+        if not details and quantiles is None:
+            return record
+        record = dict(record)
+        if quantiles is not None:
+            summary = self.task_summary(key, quantiles, missing_ok=True)
+            if summary is not None:
+                record["taskMetricsDistributions"] = summary
+        if details:
+            tasks = self.task_list(key, task_statuses, "ID", 0, None)
+            record["tasks"] = {str(task["taskId"]): task for task in tasks}
+            record["executorSummary"] = self._executor_summary(key)
+        return record
+
+    def _stage_record(self, key: StageKey) -> Dict[str, Any]:
+        stage = self.stages[key]
+        rows = self._rows(key)
+        launches = [task[3] for task in self.running.values() if task[0] == key]
+        if len(rows):
+            launches.append(int(rows[:, _COLUMN["launchTime"]].min()))
+        totals = rows[:, _METRICS_START:].sum(axis=0)
+        record = {
+            "status": stage["status"],
+            "stageId": stage["stageId"],
+            "attemptId": stage["attemptId"],
+            "numTasks": stage["numTasks"],
+            **self._stage_counts(key),
+            "submissionTime": _timestamp(stage["submissionTime"]),
+            "firstTaskLaunchedTime": _timestamp(min(launches, default=None)),
+            "completionTime": _timestamp(stage["completionTime"]),
+            "failureReason": stage["failureReason"],
+        }
+        for name, columns in _STAGE_TOTALS:
+            record[name] = int(
+                sum(totals[_COLUMN[column] - _METRICS_START] for column in columns)
+            )
+        record.update(
+            name=stage["name"],
+            description=stage["description"],
+            details=stage["details"],
+            schedulingPool=stage["schedulingPool"],
+            rddIds=stage["rddIds"],
+            accumulatorUpdates=stage["accumulatorUpdates"],
+            killedTasksSummary={},
+            resourceProfileId=stage["resourceProfileId"],
+            peakExecutorMetrics=dict(stage["peakExecutorMetrics"]) or None,
+            isShufflePushEnabled=stage["isShufflePushEnabled"],
+            shuffleMergersCount=stage["shuffleMergersCount"],
+        )
+        return _without_none(record)
+
+    def _executor_summary(self, key: StageKey) -> Dict[str, Dict[str, Any]]:
+        """ExecutorStageSummary of each executor that ran tasks of a stage attempt."""
+        rows = self._rows(key)
+        summary = {}
+        executors = rows[:, _COLUMN["executor"]]
+        for code in np.unique(executors):
+            mine = rows[executors == code]
+            status = mine[:, _COLUMN["status"]]
+
+            def total(column: str) -> int:
+                return int(mine[:, _COLUMN[column]].sum())  # noqa: B023
+
+            summary[self.executor_ids[code]] = {
+                "taskTime": int(
+                    (
+                        mine[:, _COLUMN["finishTime"]] - mine[:, _COLUMN["launchTime"]]
+                    ).sum()
+                ),
+                "failedTasks": int((status == _FAILED).sum()),
+                "succeededTasks": int((status == _SUCCESS).sum()),
+                "killedTasks": int((status == _KILLED).sum()),
+                "inputBytes": total("inputMetrics.bytesRead"),
+                "inputRecords": total("inputMetrics.recordsRead"),
+                "outputBytes": total("outputMetrics.bytesWritten"),
+                "outputRecords": total("outputMetrics.recordsWritten"),
+                "shuffleRead": total("shuffleReadMetrics.remoteBytesRead")
+                + total("shuffleReadMetrics.localBytesRead"),
+                "shuffleReadRecords": total("shuffleReadMetrics.recordsRead"),
+                "shuffleWrite": total("shuffleWriteMetrics.bytesWritten"),
+                "shuffleWriteRecords": total("shuffleWriteMetrics.recordsWritten"),
+                "memoryBytesSpilled": total("memoryBytesSpilled"),
+                "diskBytesSpilled": total("diskBytesSpilled"),
+                "isBlacklistedForStage": False,
+                "isExcludedForStage": False,
+            }
+        return summary
+
+    def task_summary(
+        self, key: StageKey, quantiles: List[float], missing_ok: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        The TaskMetricDistributions of the successful tasks of a stage attempt.
+
+        Quantiles are picked from the sorted values like the History Server does,
+        without interpolation.
+
+        Raises:
+            LookupError: If no task succeeded yet, unless missing_ok
+        """
+        rows = self._rows(key)
+        rows = rows[rows[:, _COLUMN["status"]] == _SUCCESS]
+        count = len(rows)
+        if not count:
+            if missing_ok:
+                return None
+            raise LookupError(f"No tasks reported metrics for stage {key}")
+        points = sorted(quantiles)
+        picks = np.minimum((np.array(points) * count).astype(np.int64), count - 1)
+
+        def dist(values: np.ndarray) -> List[float]:
+            return np.sort(values)[picks].astype(float).tolist()
+
+        def column(name: str) -> np.ndarray:
+            return rows[:, _COLUMN[name]]
+
+        finish = column("finishTime")
+        duration = finish - column("launchTime")
+        getting = column("gettingResultTime")
+        getting_result = np.where(getting > 0, finish - getting, 0)
+        scheduler_delay = np.maximum(
+            duration
+            - column("executorRunTime")
+            - column("executorDeserializeTime")
+            - column("resultSerializationTime")
+            - getting_result,
+            0,
+        )
+        summary: Dict[str, Any] = {
+            "quantiles": points,
+            "duration": dist(duration),
+            "gettingResultTime": dist(getting_result),
+            "schedulerDelay": dist(scheduler_delay),
+        }
+        for group, name, _, _ in _TASK_METRICS:
+            if group is None:
+                summary[name] = dist(column(name))
+        summary["inputMetrics"] = {
+            "bytesRead": dist(column("inputMetrics.bytesRead")),
+            "recordsRead": dist(column("inputMetrics.recordsRead")),
+        }
+        summary["outputMetrics"] = {
+            "bytesWritten": dist(column("outputMetrics.bytesWritten")),
+            "recordsWritten": dist(column("outputMetrics.recordsWritten")),
+        }
+        summary["shuffleReadMetrics"] = {
+            "readBytes": dist(
+                column("shuffleReadMetrics.remoteBytesRead")
+                + column("shuffleReadMetrics.localBytesRead")
+            ),
+            "readRecords": dist(column("shuffleReadMetrics.recordsRead")),
+            "remoteBlocksFetched": dist(
+                column("shuffleReadMetrics.remoteBlocksFetched")
+            ),
+            "localBlocksFetched": dist(column("shuffleReadMetrics.localBlocksFetched")),
+            "fetchWaitTime": dist(column("shuffleReadMetrics.fetchWaitTime")),
+            "remoteBytesRead": dist(column("shuffleReadMetrics.remoteBytesRead")),
+            "remoteBytesReadToDisk": dist(
+                column("shuffleReadMetrics.remoteBytesReadToDisk")
+            ),
+            "totalBlocksFetched": dist(
+                column("shuffleReadMetrics.remoteBlocksFetched")
+                + column("shuffleReadMetrics.localBlocksFetched")
+            ),
+            "remoteReqsDuration": dist(column("shuffleReadMetrics.remoteReqsDuration")),
+        }
+        summary["shuffleWriteMetrics"] = {
+            "writeBytes": dist(column("shuffleWriteMetrics.bytesWritten")),
+            "writeRecords": dist(column("shuffleWriteMetrics.recordsWritten")),
+            "writeTime": dist(column("shuffleWriteMetrics.writeTime")),
+        }
+        return summary
+
+    def task_list(
+        self,
+        key: StageKey,
+        statuses: Optional[set],
+        sort_by: str,
+        offset: int,
+        length: Optional[int],
+    ) -> List[Dict[str, Any]]:
+        """
+        TaskData of a page of the tasks of a stage attempt, read back from the log.
+
+        Args:
+            key: Stage ID and attempt ID
+            statuses: Only list tasks with these statuses
+            sort_by: ID, or an order of the executor run time (see rest.TASK_SORTING)
+            offset: Tasks to skip
+            length: Tasks to list (all if None)
+
+        Returns:
+            The tasks of the page
+        """
+        rows = self._rows(key)
+        running = sorted(
+            (task_id, task) for task_id, task in self.running.items() if task[0] == key
+        )
+        status = np.concatenate(
+            [rows[:, _COLUMN["status"]], np.full(len(running), len(_TASK_STATUSES))]
+        )
+        task_ids = np.concatenate(
+            [rows[:, _COLUMN["taskId"]], np.array([t for t, _ in running], np.int64)]
+        )
+        # Running tasks have no run time yet
+        run_time = np.concatenate(
+            [rows[:, _COLUMN["executorRunTime"]], np.full(len(running), -1)]
+        )
+        order = np.argsort(task_ids, kind="stable")
+        if statuses:
+            names = np.array([*_TASK_STATUSES, "RUNNING"])
+            order = order[np.isin(names[status[order]], list(statuses))]
+        if sort_by != "ID":
+            values = run_time[order]
+            if rest.TASK_SORTING[sort_by]:
+                values = -values
+            order = order[np.argsort(values, kind="stable")]
+        page = order[offset : offset + length if length is not None else None]
+
+        positions = []
+        for i in page:
+            if i < len(rows):
+                positions.append(
+                    (int(rows[i, _COLUMN["segment"]]), int(rows[i, _COLUMN["offset"]]))
+                )
+            else:
+                positions.append(running[i - len(rows)][1][1])
+        events = self.read_events(positions)
+        now = int(time.time() * 1000)
+        tasks = []
+        for i, position in zip(page, positions, strict=True):
+            if i < len(rows):
+                row = rows[i]
+                tasks.append(
+                    self._task(
+                        events[position],
+                        _TASK_STATUSES[row[_COLUMN["status"]]],
+                        row[_METRICS_START:],
+                        now,
+                    )
+                )
+            else:
+                tasks.append(self._task(events[position], "RUNNING", None, now))
+        return tasks
+
+    def _task(
+        self,
+        event: Dict[str, Any],
+        status: str,
+        metrics: Optional[np.ndarray],
+        now: int,
+    ) -> Dict[str, Any]:
+        info = event["Task Info"]
+        launch = info["Launch Time"]
+        finish = info.get("Finish Time") or 0
+        getting = info.get("Getting Result Time") or 0
+        executor = self.executors.get(info["Executor ID"]) or {}
+        record = {
+            "taskId": info["Task ID"],
+            "index": info["Index"],
+            "attempt": info["Attempt"],
+            "partitionId": info.get("Partition ID", -1),
+            "launchTime": rest.timestamp(launch),
+            "resultFetchStart": _timestamp(getting),
+            "duration": (finish or now) - launch,
+            "executorId": info["Executor ID"],
+            "host": info["Host"],
+            "status": status,
+            "taskLocality": info.get("Locality"),
+            "speculative": info.get("Speculative", False),
+            "accumulatorUpdates": [
+                {
+                    "id": acc["ID"],
+                    "name": acc["Name"],
+                    "update": str(acc.get("Update")),
+                    "value": str(acc.get("Value")),
+                }
+                for acc in info.get("Accumulables") or []
+                if not acc.get("Internal") and acc.get("Metadata") != "sql"
+            ],
+            "errorMessage": None,
+            "taskMetrics": None,
+            "executorLogs": executor.get("executorLogs", {}),
+            "schedulerDelay": 0,
+            "gettingResultTime": finish - getting if getting and finish else 0,
+        }
+        if status in ("FAILED", "KILLED"):
+            record["errorMessage"] = _error_message(event.get("Task End Reason") or {})
+        if metrics is not None:
+            task_metrics = record["taskMetrics"] = _rest_metrics(metrics)
+            record["schedulerDelay"] = max(
+                record["duration"]
+                - task_metrics["executorRunTime"]
+                - task_metrics["executorDeserializeTime"]
+                - task_metrics["resultSerializationTime"]
+                - record["gettingResultTime"],
+                0,
+            )
+        return _without_none(record)
+
+    def executor_list(self, active_only: bool) -> List[Dict[str, Any]]:
+        """ExecutorSummary of the executors, the driver first."""
+        running = Counter(task[2] for task in self.running.values())
+        records = []
+        for executor_id in sorted(
+            self.executors, key=lambda e: (e != "driver", len(e), e)
+        ):
+            executor = self.executors[executor_id]
+            if active_only and not executor["isActive"]:
+                continue
+            code = self._executor_codes[executor_id]
+            totals = dict(
+                zip(_EXECUTOR_TOTALS, self._executor_totals[code], strict=True)
+            )
+            totals["totalTasks"] += running[code]
+            record = {
+                "id": executor_id,
+                "hostPort": executor["hostPort"],
+                "isActive": executor["isActive"],
+                "rddBlocks": 0,
+                "memoryUsed": 0,
+                "diskUsed": 0,
+                "totalCores": executor["totalCores"],
+                "maxTasks": executor["maxTasks"],
+                "activeTasks": running[code],
+                **totals,
+                "isBlacklisted": False,
+                "maxMemory": executor["maxMemory"],
+                "addTime": _timestamp(executor["addTime"]),
+                "removeTime": _timestamp(executor["removeTime"]),
+                "removeReason": executor["removeReason"],
+                "executorLogs": executor["executorLogs"],
+                "memoryMetrics": executor["memoryMetrics"],
+                "blacklistedInStages": [],
+                "peakMemoryMetrics": dict(executor["peakMemoryMetrics"]) or None,
+                "attributes": executor["attributes"],
+                "resources": executor["resources"],
+                "resourceProfileId": executor["resourceProfileId"],
+                "isExcluded": False,
+                "excludedInStages": [],
+            }
+            records.append(_without_none(record))
+        return records
+
+    def environment_info(self) -> Dict[str, Any]:
+        """The ApplicationEnvironmentInfo of the attempt."""
+        if self.environment is None:
+            raise LookupError("No environment update in the event log")
+        return {
+            **self.environment,
+            "resourceProfiles": [
+                self.resource_profiles[i] for i in sorted(self.resource_profiles)
+            ],
+        }
+
+    def _sql_jobs(self) -> Dict[int, List[Dict[str, Any]]]:
+        jobs = self._memo.get("sql_jobs")
+        if jobs is None:
+            jobs = self._memo["sql_jobs"] = defaultdict(list)
+            for job in self.jobs.values():
+                if job["sqlExecutionId"] is not None:
+                    jobs[job["sqlExecutionId"]].append(job)
+        return jobs
+
+    def sql_ids(self) -> List[int]:
+        """IDs of the SQL executions in order."""
+        return sorted(self.sql)
+
+    def sql_executions(
+        self, execution_ids: Sequence[int], details: bool, plan_description: bool
+    ) -> List[Dict[str, Any]]:
+        """
+        ExecutionData of some SQL executions.
+
+        Args:
+            execution_ids: IDs of the executions
+            details: Whether to add the nodes and edges of their plans
+            plan_description: Whether to add their physical plan descriptions
+
+        Returns:
+            The REST records, in the order of the IDs
+        """
+        executions = [self.sql[i] for i in execution_ids]
+        events = {}
+        if details or plan_description:
+            events = self.read_events(execution["plan"] for execution in executions)
+        now = int(time.time() * 1000)
+        records = []
+        for execution in executions:
+            jobs = self._sql_jobs().get(execution["id"], [])
+            job_ids = {
+                status: sorted(job["jobId"] for job in jobs if job["status"] == status)
+                for status in ("RUNNING", "SUCCEEDED", "FAILED")
+            }
+            if execution["completionTime"] is None:
+                status = "RUNNING"
+            elif execution["errorMessage"] or job_ids["FAILED"]:
+                status = "FAILED"
+            else:
+                status = "COMPLETED"
+            record = {
+                "id": execution["id"],
+                "status": status,
+                "description": execution["description"],
+                "planDescription": "",
+                "submissionTime": _timestamp(execution["submissionTime"]),
+                "duration": (execution["completionTime"] or now)
+                - execution["submissionTime"],
+                "runningJobIds": job_ids["RUNNING"],
+                "successJobIds": job_ids["SUCCEEDED"],
+                "failedJobIds": job_ids["FAILED"],
+                "nodes": [],
+                "edges": [],
+            }
+            event = events.get(execution["plan"], {})
+            if plan_description:
+                record["planDescription"] = event.get("physicalPlanDescription", "")
+            if details and event.get("sparkPlanInfo"):
+                record["nodes"], record["edges"] = plan_graph(
+                    event["sparkPlanInfo"], self.accumulators
+                )
+            records.append(_without_none(record))
+        return records
+
+
+def attempt_record(
+    info: Dict[str, Any], completed: bool, last_updated: int
+) -> Dict[str, Any]:
+    """
+    The ApplicationAttemptInfo of an attempt.
+
+    Args:
+        info: Spark version and application start and end, as AppReplay.info
+        completed: Whether the log is complete
+        last_updated: Modification time of the log in epoch milliseconds
+
+    Returns:
+        The REST record
+    """
+    start = info.get("startTime") or 0
+    end = info.get("endTime") if completed else None
+    return _without_none(
+        {
+            "attemptId": info.get("attemptId"),
+            "startTime": rest.timestamp(start),
+            "endTime": rest.timestamp(end if end else -1),
+            "lastUpdated": rest.timestamp(last_updated),
+            "duration": end - start if end else 0,
+            "sparkUser": info.get("sparkUser") or "",
+            "completed": completed,
+            "appSparkVersion": info.get("sparkVersion") or "",
+            "startTimeEpoch": start,
+            "endTimeEpoch": end if end else -1,
+            "lastUpdatedEpoch": last_updated,
+        }
+    )
+
+
+# Kinds of the events decoded by decode_range()
+_LINE, _TASK_START, _TASK_END = range(3)
+
+_DECODERS = {
+    "SparkListenerTaskStart": (_TASK_START, decode_task_start),
+    "SparkListenerTaskEnd": (_TASK_END, decode_task_end),
+}
+
+
+def decode_range(
+    path: str, types: FrozenSet[str], start: int, end: Optional[int]
+) -> Tuple[List[Tuple[int, int, Any]], int]:
+    """
+    Decode the task events of a range of a segment, in a ParsePool process.
+
+    Task events make most of a log: they are parsed here into what a replay
+    keeps of them, the other events are returned as lines to be applied.
+
+    Args:
+        path: The segment file
+        types: Types of the events a replay applies, the others are skipped
+        start: Offset of the first line of the range
+        end: Offset of the line after the range, None to read to the end
+
+    Returns:
+        (offset, kind, decoded task event or line) of the events of the range,
+        and the offset reached
+    """
+    events = []
+    scan = EventScanner(path, types, start, end)
+    for offset, line in scan:
+        decoder = _DECODERS.get(event_type(line))
+        if decoder is not None:
+            try:
+                events.append((offset, decoder[0], decoder[1](json.loads(line))))
+                continue
+            except (ValueError, LookupError, TypeError):
+                # Applied as a line, to fail the way it does without a pool
+                pass
+        events.append((offset, _LINE, line))
+    return events, scan.position
+
+
+def _segment_name(path: str) -> str:
+    """Name of a segment, which loses .inprogress when its application ends."""
+    name = path.rsplit("/", 1)[-1]
+    return name[: -len(".inprogress")] if name.endswith(".inprogress") else name
@@ -0,0 +1,90 @@
+"""
+Projections of Spark REST models onto a subset of their fields.
+
+A projection of a model is a subclass that only parses the requested fields (every
+other field is left at None) and only serializes them, so a tool asked for a few
+columns neither validates nor returns the rest of a large response.
+"""
+
+import functools
+from typing import Any, Iterable, Optional, Tuple, Type, TypeVar
+
+from pydantic import (
+    BaseModel,
+    SerializerFunctionWrapHandler,
+    create_model,
+    model_serializer,
+)
+
+T = TypeVar("T", bound=BaseModel)
+
+
+def field_names(model_class: Type[BaseModel], fields: Iterable[str]) -> Tuple[str, ...]:
+    """
+    Resolve field names or their JSON aliases to model attribute names.
+
+    Args:
+        model_class: The Pydantic model class
+        fields: Attribute names (e.g. "stage_id") or aliases (e.g. "stageId")
+
+    Returns:
+        The attribute names, sorted and without duplicates
+
+    Raises:
+        ValueError: If a name is not a field of the model
+    """
+    by_alias = {
+        field.alias: name
+        for name, field in model_class.model_fields.items()
+        if field.alias
+    }
+    names = set()
+    for field in fields:
+        name = field if field in model_class.model_fields else by_alias.get(field)
+        if name is None:
+            raise ValueError(f"{model_class.__name__} has no field {field}")
+        names.add(name)
+    return tuple(sorted(names))
+
+
+def project(model_class: Type[T], fields: Optional[Iterable[str]]) -> Type[T]:
+    """
+    Get the projection of a model onto some of its fields.
+
+    Args:
+        model_class: The Pydantic model class
+        fields: Names or aliases of the fields to keep (None keeps the whole model)
+
+    Returns:
+        A subclass of model_class parsing and serializing only those fields, or
+        model_class itself when fields is None
+    """
+    if fields is None:
+        return model_class
+    return _projection(model_class, field_names(model_class, fields))
+
+
+@functools.lru_cache(maxsize=64)
+def _projection(model_class: Type[T], names: Tuple[str, ...]) -> Type[T]:
+    # Dropped fields become optional so required ones may be missing from the input
+    dropped = {
+        name: (Any, None) for name in model_class.model_fields if name not in names
+    }
+    keep = set(names) | {
+        model_class.model_fields[name].alias
+        for name in names
+        if model_class.model_fields[name].alias
+    }
+
+    @model_serializer(mode="wrap")
+    def serialize(self, handler: SerializerFunctionWrapHandler) -> Any:
+        # Keys are attribute names or aliases depending on by_alias
+        return {key: value for key, value in handler(self).items() if key in keep}
+
+    return create_model(
+        f"{model_class.__name__}Projection",
+        __base__=model_class,
+        __module__=model_class.__module__,
+        __validators__={"serialize_projection": serialize},
+        **dropped,
+    )
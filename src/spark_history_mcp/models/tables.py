@@ -0,0 +1,283 @@
+"""
+Columnar tables of stages, tasks and executors.
+
+A table holds selected fields of many list entries as NumPy arrays, so tools can
+filter, rank and aggregate them with vectorized operations instead of looping over
+thousands of Pydantic objects. Tables are built either from raw JSON records of a
+Spark REST response (no model is parsed at all) or from parsed models.
+
+Columns are named after model attributes, with dots for nested models (for example
+"memory_metrics.used_on_heap_storage_memory"). Integer columns hold 0 and float
+columns NaN where a value is missing; timestamps are stored as float epoch seconds.
+"""
+
+import functools
+import itertools
+import types
+import typing
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+)
+
+import numpy as np
+from pydantic import BaseModel
+
+from spark_history_mcp.models.spark_types import ExecutorSummary, StageData, TaskData
+
+TableT = TypeVar("TableT", bound="_Table")
+
+
+class _Column(NamedTuple):
+    attributes: tuple  # Attribute path on parsed models
+    keys: tuple  # Key path in raw JSON records
+    kind: type  # bool, int, float, datetime or str
+
+
+class _Table:
+    """Base class of the columnar tables; subclasses set the model they mirror."""
+
+    model: ClassVar[Type[BaseModel]]
+
+    def __init__(
+        self,
+        columns: Dict[str, np.ndarray],
+        length: int,
+        records: Optional[List[Any]] = None,
+    ):
+        """
+        Initialize the table.
+
+        Args:
+            columns: Column arrays by column name
+            length: Number of rows
+            records: The records (raw JSON or models) the rows were built from
+        """
+        self.columns = columns
+        self.length = length
+        self.records = records
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    @classmethod
+    def from_records(
+        cls: Type[TableT],
+        records: Iterable[Any],
+        columns: Sequence[str],
+        keep_records: bool = False,
+    ) -> TableT:
+        """
+        Build a table from raw JSON records or parsed models.
+
+        Args:
+            records: Entries of a list response, as dicts or models
+            columns: Names of the columns to extract
+            keep_records: Whether to keep the records, so rows can be turned into models
+
+        Returns:
+            The table
+        """
+        records = list(records)
+        specs = [cls._column(name) for name in columns]
+        values: List[List[Any]] = [[] for _ in specs]
+        for record in records:
+            is_dict = isinstance(record, dict)
+            for spec, column_values in zip(specs, values, strict=True):
+                value = record
+                for step in spec.keys if is_dict else spec.attributes:
+                    value = value.get(step) if is_dict else getattr(value, step, None)
+                    if value is None:
+                        break
+                column_values.append(value)
+
+        arrays = {
+            name: _to_array(column_values, spec.kind)
+            for name, spec, column_values in zip(columns, specs, values, strict=True)
+        }
+        return cls(arrays, len(records), records if keep_records else None)
+
+    @classmethod
+    def concat(cls: Type[TableT], tables: Sequence[TableT]) -> TableT:
+        """Stack tables with the same columns."""
+        columns = {
+            name: np.concatenate([table.columns[name] for table in tables])
+            for name in tables[0].columns
+        }
+        records = None
+        if all(table.records is not None for table in tables):
+            records = [record for table in tables for record in table.records]
+        return cls(columns, sum(len(table) for table in tables), records)
+
+    def take(self: TableT, indices: np.ndarray) -> TableT:
+        """Get the rows at the given indices, in that order."""
+        columns = {name: array[indices] for name, array in self.columns.items()}
+        records = None
+        if self.records is not None:
+            records = [self.records[i] for i in indices]
+        return type(self)(columns, len(indices), records)
+
+    def top_n(self, score: np.ndarray, n: int) -> np.ndarray:
+        """
+        Get the indices of the n rows with the highest score.
+
+        Rows scoring NaN are left out, and ties keep row order (like heapq.nlargest).
+
+        Args:
+            score: One score per row
+            n: Number of rows to return
+
+        Returns:
+            Row indices, highest score first
+        """
+        candidates = np.flatnonzero(~np.isnan(score))
+        order = np.argsort(-score[candidates], kind="stable")
+        return candidates[order[:n]]
+
+    def models(self) -> List[Any]:
+        """Get the rows as models (requires a table built with keep_records)."""
+        if self.records is None:
+            raise ValueError("Table was built without keep_records")
+        return [
+            record
+            if isinstance(record, BaseModel)
+            else self.model.model_validate(record)
+            for record in self.records
+        ]
+
+    @classmethod
+    def nlargest(
+        cls: Type[TableT],
+        records: Iterable[Any],
+        n: int,
+        scores: Sequence[Callable[[TableT], np.ndarray]],
+        columns: Sequence[str],
+        batch_size: int = 4096,
+    ) -> List[TableT]:
+        """
+        Find the n highest scoring rows of a stream of records, for several scores.
+
+        Records are processed in batches, keeping only the current top rows of each
+        score, so memory stays bounded however many records the stream yields. Each
+        score function is called once per batch, on its rows only, so it sees every
+        record exactly once (and can, for example, count them).
+
+        Args:
+            records: Entries of a list response, as dicts or models
+            n: Number of rows to keep per score
+            scores: Functions computing one score per row of a table (NaN to skip a row)
+            columns: Columns the score functions need
+            batch_size: Number of records scored at a time
+
+        Returns:
+            One table per score with its top rows (and their records), highest first
+        """
+        best = [cls.from_records([], columns, keep_records=True) for _ in scores]
+        best_scores = [np.empty(0) for _ in scores]
+        for batch in itertools.batched(records, batch_size):
+            table = cls.from_records(batch, columns, keep_records=True)
+            for i, score in enumerate(scores):
+                # Previous winners come first so they win ties against later rows
+                merged = cls.concat([best[i], table])
+                merged_scores = np.concatenate([best_scores[i], score(table)])
+                top = merged.top_n(merged_scores, n)
+                best[i] = merged.take(top)
+                best_scores[i] = merged_scores[top]
+        return best
+
+    @classmethod
+    @functools.cache
+    def _column(cls, name: str) -> _Column:
+        model = cls.model
+        attributes = tuple(name.split("."))
+        keys = []
+        for depth, attribute in enumerate(attributes):
+            field = model.model_fields.get(attribute)
+            if field is None:
+                raise ValueError(f"{cls.model.__name__} has no field {name}")
+            keys.append(field.alias or attribute)
+            annotation = _unwrap_optional(field.annotation)
+            if depth < len(attributes) - 1:
+                model = annotation
+        if annotation not in (bool, int, float, datetime, str):
+            raise ValueError(f"{cls.model.__name__}.{name} is not a scalar field")
+        return _Column(attributes, tuple(keys), annotation)
+
+
+class StageTable(_Table):
+    """Columnar table of StageData."""
+
+    model = StageData
+
+    # Columns execution_seconds needs
+    EXECUTION_COLUMNS = ("first_task_launched_time", "completion_time")
+
+    def execution_seconds(self) -> np.ndarray:
+        """Time from the first task launch to completion of each stage (0 if unknown)."""
+        return np.nan_to_num(self["completion_time"] - self["first_task_launched_time"])
+
+
+class TaskTable(_Table):
+    """Columnar table of TaskData."""
+
+    model = TaskData
+
+
+class ExecutorTable(_Table):
+    """Columnar table of ExecutorSummary."""
+
+    model = ExecutorSummary
+
+
+def to_datetime(seconds: float) -> Optional[datetime]:
+    """Convert a timestamp column value back to a UTC datetime (None for NaN)."""
+    if np.isnan(seconds):
+        return None
+    return datetime.fromtimestamp(seconds, tz=timezone.utc)
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _epoch_seconds(value: Any) -> float:
+    if value is None:
+        return np.nan
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        if value.endswith("GMT"):
+            value = value[:-3] + "+00:00"
+        return datetime.fromisoformat(value).timestamp()
+    return value / 1000  # Epoch milliseconds
+
+
+def _to_array(values: List[Any], kind: type) -> np.ndarray:
+    if kind is bool:
+        return np.array([bool(v) for v in values], dtype=bool)
+    if kind is int:
+        return np.array([0 if v is None else v for v in values], dtype=np.int64)
+    if kind is float:
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    if kind is datetime:
+        return np.array([_epoch_seconds(v) for v in values], dtype=np.float64)
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
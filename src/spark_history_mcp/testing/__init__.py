@@ -0,0 +1 @@
+"""Synthetic Spark History Server data and a stub server for tests and benchmarks."""
@@ -0,0 +1,303 @@
+"""
+Spark History Server responses recorded from a real server, and served back.
+
+record_history saves the full list responses of each application (jobs, stages
+with summaries, executors, environment, SQL executions with plans) and the
+taskSummary and taskList of every stage, one JSON file per endpoint:
+
+    <directory>/version.json
+    <directory>/applications.json
+    <directory>/applications/<app_id>/stages.json
+    <directory>/applications/<app_id>/stages/<stage_id>/<attempt_id>/taskList.json
+    ...
+
+RecordedHistory answers requests from those files, deriving single resources
+(applications/<app_id>, jobs/<id>, stages/<id>, sql/<id>) from the lists, and
+applying status filters, paging and sorting the way the History Server does.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, Sequence
+
+import requests
+
+from spark_history_mcp.api import rest
+from spark_history_mcp.api.rest import Params
+
+logger = logging.getLogger(__name__)
+
+# Page length large enough to fetch every task or SQL execution in one request
+_ALL = 1_000_000
+
+# Application resources recorded as a whole, with the query that fetches them
+_RECORDED_RESOURCES = {
+    "jobs": {},
+    "stages": {"withSummaries": "true"},
+    "executors": {},
+    "allexecutors": {},
+    "environment": {},
+    "sql": {"details": "true", "planDescription": "true", "length": _ALL},
+}
+
+
+def _path(directory: str, endpoint: str) -> str:
+    return os.path.join(directory, *endpoint.split("/")) + ".json"
+
+
+def record_history(
+    url: str,
+    directory: str,
+    app_ids: Optional[Sequence[str]] = None,
+    timeout: float = 300,
+) -> List[str]:
+    """
+    Record the responses of a Spark History Server into a fixture directory.
+
+    Args:
+        url: Base URL of the History Server
+        directory: Directory to write the JSON files to
+        app_ids: Applications to record (default: all)
+        timeout: Timeout of each request in seconds
+
+    Returns:
+        IDs of the recorded applications
+
+    Raises:
+        requests.exceptions.RequestException: If a request fails
+    """
+    session = requests.Session()
+    base_url = f"{url.rstrip('/')}/api/v1/"
+
+    def fetch(endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        response = session.get(base_url + endpoint, params=params, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def save(endpoint: str, data: Any) -> None:
+        path = _path(directory, endpoint)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+    save("version", fetch("version"))
+    apps = fetch("applications")
+    if app_ids is not None:
+        apps = [app for app in apps if app["id"] in app_ids]
+    save("applications", apps)
+
+    for app in apps:
+        app_id = app["id"]
+        # The latest attempt, as the client reads it; files are saved without it
+        attempts = app.get("attempts") or [{}]
+        attempt_id = attempts[0].get("attemptId")
+        source = f"applications/{app_id}" + (f"/{attempt_id}" if attempt_id else "")
+        target = f"applications/{app_id}"
+        logger.info(f"Recording {app_id}")
+
+        resources = {
+            name: fetch(f"{source}/{name}", params)
+            for name, params in _RECORDED_RESOURCES.items()
+        }
+        for name, data in resources.items():
+            save(f"{target}/{name}", data)
+        for stage in resources["stages"]:
+            stage_path = f"stages/{stage['stageId']}/{stage['attemptId']}"
+            save(
+                f"{target}/{stage_path}/taskSummary",
+                fetch(f"{source}/{stage_path}/taskSummary"),
+            )
+            save(
+                f"{target}/{stage_path}/taskList",
+                fetch(f"{source}/{stage_path}/taskList", {"length": _ALL}),
+            )
+    return [app["id"] for app in apps]
+
+
+class RecordedHistory:
+    """
+    History Server serving responses saved by record_history.
+
+    Task summaries are served as recorded, whatever quantiles are requested.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Initialize the source.
+
+        Args:
+            directory: Directory written by record_history
+
+        Raises:
+            FileNotFoundError: If nothing was recorded in the directory
+        """
+        if not os.path.isfile(_path(directory, "applications")):
+            raise FileNotFoundError(
+                f"No recorded History Server responses in {directory}: record "
+                "them with `spark-mcp-stub record` (task record-fixtures)"
+            )
+        self.directory = directory
+        self._files: Dict[str, Any] = {}
+
+    @property
+    def app_ids(self) -> List[str]:
+        """IDs of the recorded applications."""
+        return [app["id"] for app in self._load("applications")]
+
+    def _load(self, endpoint: str) -> Any:
+        data = self._files.get(endpoint)
+        if data is None:
+            try:
+                with open(_path(self.directory, endpoint)) as f:
+                    data = json.load(f)
+            except FileNotFoundError:
+                raise LookupError(f"Unknown endpoint: {endpoint}") from None
+            self._files[endpoint] = data
+        return data
+
+    def get(self, endpoint: str, params: Optional[Params] = None) -> Any:
+        """
+        Answer a REST request.
+
+        Args:
+            endpoint: Path below /api/v1, e.g. applications/<app_id>/stages
+            params: Query parameters, as parsed by urllib.parse.parse_qs
+
+        Returns:
+            The JSON response
+
+        Raises:
+            LookupError: If the resource wasn't recorded (a 404 of the History Server)
+            ValueError: If a query parameter is invalid
+        """
+        params = params or {}
+        parts = endpoint.strip("/").split("/")
+        if parts == ["version"]:
+            return self._load("version")
+        if parts == ["applications"]:
+            return self._applications(self._load("applications"), params)
+        if parts[0] != "applications" or len(parts) < 2:
+            raise LookupError(f"Unknown endpoint: {endpoint}")
+
+        app = self._application(parts[1])
+        tail = parts[2:]
+        if tail and tail[0].isdigit():
+            attempt = self._attempt(app, tail[0])
+            tail = tail[1:]
+            if not tail:
+                return attempt
+        if not tail:
+            return app
+
+        prefix = f"applications/{app['id']}"
+        resource, args = tail[0], tail[1:]
+        if resource in ("jobs", "stages", "sql") and len(args) == 1:
+            return self._item(f"{prefix}/{resource}", args[0], params)
+        if resource == "stages" and len(args) == 2:
+            return self._stage_attempt(prefix, args, params)
+        if resource == "stages" and args[2:] == ["taskList"]:
+            return self._task_list(self._load(f"{prefix}/{'/'.join(tail)}"), params)
+        data = self._load(f"{prefix}/{'/'.join(tail)}")
+        if resource in ("jobs", "stages") and not args:
+            return [
+                self._stage(item, params) if resource == "stages" else item
+                for item in _filter_statuses(data, params)
+            ]
+        if resource == "sql" and not args:
+            return [self._sql(item, params) for item in rest.page(data, params)]
+        return data
+
+    def _applications(
+        self, apps: List[Dict[str, Any]], params: Params
+    ) -> List[Dict[str, Any]]:
+        statuses = rest.statuses(params)
+        if statuses:
+            apps = [
+                app
+                for app in apps
+                if ("COMPLETED" if app["attempts"][0].get("completed") else "RUNNING")
+                in statuses
+            ]
+        limit = rest.param(params, "limit")
+        return apps[: int(limit)] if limit is not None else apps
+
+    def _application(self, app_id: str) -> Dict[str, Any]:
+        for app in self._load("applications"):
+            if app["id"] == app_id:
+                return app
+        raise LookupError(f"Unknown application: {app_id}")
+
+    @staticmethod
+    def _attempt(app: Dict[str, Any], attempt_id: str) -> Dict[str, Any]:
+        for attempt in app.get("attempts", []):
+            if attempt.get("attemptId") == attempt_id:
+                return attempt
+        raise LookupError(f"Unknown attempt {attempt_id} of {app['id']}")
+
+    def _item(self, endpoint: str, item_id: str, params: Params) -> Any:
+        """A job, the attempts of a stage, or a SQL execution, from its list."""
+        entity = endpoint.rsplit("/", 1)[1]
+        key = {"jobs": "jobId", "stages": "stageId", "sql": "id"}[entity]
+        matches = [item for item in self._load(endpoint) if str(item[key]) == item_id]
+        if not matches:
+            raise LookupError(f"Unknown ID: {item_id}")
+        if entity == "stages":
+            return [self._stage(stage, params) for stage in matches]
+        if entity == "sql":
+            return self._sql(matches[0], params, default=True)
+        return matches[0]
+
+    def _stage_attempt(
+        self, prefix: str, args: List[str], params: Params
+    ) -> Dict[str, Any]:
+        for stage in self._item(f"{prefix}/stages", args[0], params):
+            if str(stage["attemptId"]) == args[1]:
+                return stage
+        raise LookupError(f"Unknown attempt {args[1]} of stage {args[0]}")
+
+    @staticmethod
+    def _stage(stage: Dict[str, Any], params: Params) -> Dict[str, Any]:
+        """A stage as returned for the details and withSummaries parameters."""
+        drop = set()
+        if not rest.flag(params, "withSummaries"):
+            drop |= {"taskMetricsDistributions", "executorMetricsDistributions"}
+        if not rest.flag(params, "details"):
+            drop |= {"tasks", "executorSummary"}
+        if drop.isdisjoint(stage):
+            return stage
+        return {name: value for name, value in stage.items() if name not in drop}
+
+    @staticmethod
+    def _sql(
+        execution: Dict[str, Any], params: Params, default: bool = False
+    ) -> Dict[str, Any]:
+        """A SQL execution as returned for the details and planDescription parameters."""
+        execution = dict(execution)
+        if not rest.flag(params, "details", default=True):
+            execution["nodes"] = []
+            execution["edges"] = []
+        if not rest.flag(params, "planDescription", default=default):
+            execution["planDescription"] = ""
+        return execution
+
+    @staticmethod
+    def _task_list(tasks: List[Dict[str, Any]], params: Params) -> List[Dict[str, Any]]:
+        tasks = _filter_statuses(tasks, params)
+        sort_by = rest.task_sorting(params)
+        if sort_by != "ID":
+            tasks = sorted(
+                tasks,
+                key=lambda task: (
+                    (task.get("taskMetrics") or {}).get("executorRunTime") or 0
+                ),
+                reverse=rest.TASK_SORTING[sort_by],
+            )
+        return list(rest.page(tasks, params))
+
+
+def _filter_statuses(items: List[Dict[str, Any]], params: Params) -> List[Any]:
+    statuses = rest.statuses(params)
+    if not statuses:
+        return items
+    return [item for item in items if str(item.get("status")).upper() in statuses]
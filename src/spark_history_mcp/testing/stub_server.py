@@ -0,0 +1,303 @@
+"""
+Stand-in Spark History Server, serving the REST API without Java.
+
+Serves /api/v1 from any source with a get(endpoint, params) method:
+RecordedHistory (responses recorded from a real server), EventLogHistory (a
+directory of event logs, like examples/basic/events) or SyntheticHistory
+(generated applications at any scale). Faults can be injected to reproduce what
+SparkRestClient has to cope with: slow responses, 5xx errors, servers running out
+of heap on big applications, and YARN applications answering 404 until the
+attempt ID is part of the URL.
+
+Runs in a background thread of the current process (StubHistoryServer), or on
+its own:
+
+    spark-mcp-stub serve --event-logs examples/basic/events --port 18080
+    spark-mcp-stub serve --fixtures tests/fixtures/shs --port 18080
+    spark-mcp-stub serve --scale medium --latency 0.2 --error-rate 0.05
+    spark-mcp-stub record --url http://localhost:18080 --output tests/fixtures/shs
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Protocol, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from spark_history_mcp.eventlog.history import EventLogHistory
+from spark_history_mcp.testing.recorded import RecordedHistory, record_history
+from spark_history_mcp.testing.synthetic import SCALES, SyntheticHistory
+
+API_PREFIX = "/api/v1/"
+
+# Statuses of the injected server errors
+_ERROR_STATUSES = (500, 502, 503)
+
+# What Jetty answers when the History Server runs out of heap replaying a log
+_OOM_BODY = (
+    b"<html><head><title>Error 500 java.lang.OutOfMemoryError: Java heap space"
+    b"</title></head><body><h2>HTTP ERROR 500 java.lang.OutOfMemoryError: "
+    b"Java heap space</h2></body></html>"
+)
+
+
+class ResponseSource(Protocol):
+    """Anything that can answer History Server REST requests."""
+
+    def get(self, endpoint: str, params: Optional[Dict[str, List[str]]] = None) -> Any:
+        """Return the JSON response of an endpoint, or raise LookupError (404)."""
+
+
+@dataclass(frozen=True)
+class Faults:
+    """Misbehavior injected into the responses of a stub server."""
+
+    latency: float = 0  # Seconds added to every response
+    latency_jitter: float = 0  # Up to this many more seconds, at random
+    error_rate: float = 0  # Share of requests failing with a 500, 502 or 503
+    oom_pattern: Optional[str] = None  # Endpoints (regex) failing out of heap
+    require_attempt_id: bool = False  # 404 for app resources without attempt ID
+    seed: Optional[int] = None  # Seed of the random latency and errors
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, don't let Nagle delay the body
+    disable_nagle_algorithm = True
+    server: "_Server"
+
+    def do_GET(self):  # noqa: N802
+        url = urlsplit(self.path)
+        if url.path.startswith(API_PREFIX):
+            endpoint = url.path[len(API_PREFIX) :]
+            status, body, content_type = self.server.respond(
+                endpoint, parse_qs(url.query)
+            )
+        else:
+            status, body, content_type = 404, b"Not found", "text/plain"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, source: ResponseSource, faults: Faults):
+        super().__init__(address, _Handler)
+        self.source = source
+        self.faults = faults
+        self.requests: List[Tuple[str, int]] = []
+        self._random = random.Random(faults.seed)  # noqa: S311
+
+    def respond(
+        self, endpoint: str, params: Dict[str, List[str]]
+    ) -> Tuple[int, bytes, str]:
+        """Answer a request with its status, body and content type."""
+        status, body, content_type = self._respond(endpoint, params)
+        self.requests.append((endpoint, status))
+        return status, body, content_type
+
+    def _respond(
+        self, endpoint: str, params: Dict[str, List[str]]
+    ) -> Tuple[int, bytes, str]:
+        faults = self.faults
+        delay = faults.latency
+        if faults.latency_jitter:
+            delay += self._random.uniform(0, faults.latency_jitter)
+        if delay:
+            time.sleep(delay)
+        if faults.error_rate and self._random.random() < faults.error_rate:
+            status = self._random.choice(_ERROR_STATUSES)
+            return status, HTTPStatus(status).phrase.encode(), "text/plain"
+        if faults.oom_pattern and re.search(faults.oom_pattern, endpoint):
+            return 500, _OOM_BODY, "text/html"
+
+        try:
+            if faults.require_attempt_id and self._missing_attempt_id(endpoint):
+                raise LookupError(f"No attempt ID in {endpoint}")
+            data = self.source.get(endpoint, params)
+        except LookupError as e:
+            return 404, str(e).encode(), "text/plain"
+        except ValueError as e:
+            return 400, str(e).encode(), "text/plain"
+        except Exception as e:
+            return 500, repr(e).encode(), "text/plain"
+        return 200, json.dumps(data).encode(), "application/json"
+
+    def _missing_attempt_id(self, endpoint: str) -> bool:
+        """Whether a resource of an app with attempt IDs is requested without one."""
+        parts = endpoint.strip("/").split("/")
+        if parts[0] != "applications" or len(parts) < 3 or parts[2].isdigit():
+            return False
+        attempts = self.source.get(f"applications/{parts[1]}").get("attempts") or []
+        return bool(attempts and attempts[0].get("attemptId"))
+
+
+class StubHistoryServer:
+    """
+    Spark History Server stand-in running in a background thread.
+
+    Use it as a context manager, and point a SparkRestClient at its url.
+    """
+
+    def __init__(
+        self,
+        source: ResponseSource,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        faults: Optional[Faults] = None,
+    ):
+        """
+        Initialize the server.
+
+        Args:
+            source: Answers the REST requests
+            host: Address to listen on
+            port: Port to listen on (0 picks a free port)
+            faults: Misbehavior to inject (none by default)
+        """
+        self._server = _Server((host, port), source, faults or Faults())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server, as configured for a Spark History Server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def requests(self) -> List[Tuple[str, int]]:
+        """Endpoint and response status of each request served so far."""
+        return list(self._server.requests)
+
+    def start(self) -> "StubHistoryServer":
+        """Start serving in a daemon thread."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="stub-history-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve in the current thread until interrupted."""
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        """Stop serving and close the listening socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "StubHistoryServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        prog="spark-mcp-stub",
+        description="Serve a stand-in Spark History Server, or record fixtures for it.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="Serve recorded, event log or synthetic applications"
+    )
+    source = serve_parser.add_mutually_exclusive_group()
+    source.add_argument("--fixtures", help="Directory written by the record command")
+    source.add_argument("--event-logs", help="Directory of Spark event logs")
+    source.add_argument(
+        "--scale",
+        choices=sorted(SCALES),
+        default="small",
+        help="Serve synthetic applications of this size (default)",
+    )
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=18080)
+    serve_parser.add_argument(
+        "--latency", type=float, default=0, help="Seconds added to every response"
+    )
+    serve_parser.add_argument(
+        "--latency-jitter", type=float, default=0, help="Random extra seconds"
+    )
+    serve_parser.add_argument(
+        "--error-rate", type=float, default=0, help="Share of requests failing (5xx)"
+    )
+    serve_parser.add_argument(
+        "--oom", metavar="REGEX", help="Endpoints failing with an OutOfMemoryError"
+    )
+    serve_parser.add_argument(
+        "--require-attempt-id",
+        action="store_true",
+        help="Answer 404 to app resources requested without attempt ID, like on YARN",
+    )
+    serve_parser.add_argument("--seed", type=int, help="Seed of the injected faults")
+
+    record_parser = subparsers.add_parser(
+        "record", help="Record the responses of a running History Server"
+    )
+    record_parser.add_argument("--url", default="http://localhost:18080")
+    record_parser.add_argument("--output", required=True, help="Fixture directory")
+    record_parser.add_argument(
+        "--app-id", action="append", help="Only record this application (repeatable)"
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "record":
+        app_ids = record_history(args.url, args.output, args.app_id)
+        sys.stdout.write(json.dumps({"output": args.output, "apps": app_ids}) + "\n")
+        return 0
+
+    if args.fixtures:
+        try:
+            history = RecordedHistory(args.fixtures)
+        except FileNotFoundError as e:
+            parser.error(str(e))
+    elif args.event_logs:
+        history = EventLogHistory(args.event_logs)
+    else:
+        history = SyntheticHistory(SCALES[args.scale])
+    server = StubHistoryServer(
+        history,
+        args.host,
+        args.port,
+        Faults(
+            latency=args.latency,
+            latency_jitter=args.latency_jitter,
+            error_rate=args.error_rate,
+            oom_pattern=args.oom,
+            require_attempt_id=args.require_attempt_id,
+            seed=args.seed,
+        ),
+    )
+    sys.stdout.write(f"Serving Spark History Server stand-in at {server.url}\n")
+    sys.stdout.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,958 @@
+"""
+Synthetic Spark History Server REST responses at configurable scale.
+
+SyntheticHistory answers the REST endpoints of the History Server (applications,
+jobs, stages, taskList, taskSummary, executors, allexecutors, sql, environment) for
+a set of generated applications. Everything is derived from a seed, so every run
+sees the same data, and generated on demand: a taskList page only builds the tasks
+on that page, which keeps applications with millions of tasks cheap to serve.
+
+The shapes follow Spark 3.5: timestamps like 2024-05-01T12:34:56.789GMT, jobs and
+stages listed newest first, one attempt per stage, a few skewed stages with
+stragglers and spill, and the occasional failed job.
+"""
+
+import functools
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from spark_history_mcp.api import rest
+from spark_history_mcp.api.rest import Params
+
+SPARK_VERSION = "3.5.1"
+
+# Start of the first application (2024-05-01T00:00:00Z) in epoch milliseconds
+_START_MS = 1714521600000
+
+# Time between the starts of consecutive applications
+_APP_INTERVAL_MS = 3_600_000
+
+# Tasks failing in the last stage of a failed job
+_FAILED_TASKS = 4
+
+_MB = 1024 * 1024
+
+_STAGE_NAMES = (
+    "parquet at NativeMethodAccessorImpl.java:0",
+    "save at DataWriter.scala:88",
+    "count at NativeMethodAccessorImpl.java:0",
+    "collect at AnalysisJob.scala:142",
+    "showString at NativeMethodAccessorImpl.java:0",
+    "run at ThreadPoolExecutor.java:1136",
+)
+
+# Physical operators of the generated SQL plans, leaf first
+_PLANS = (
+    ("Scan parquet", "Filter", "Project", "HashAggregate", "Exchange", "HashAggregate"),
+    (
+        "Scan parquet",
+        "Project",
+        "Exchange",
+        "Sort",
+        "SortMergeJoin",
+        "Project",
+        "Exchange",
+        "Sort",
+    ),
+    ("Scan parquet", "Filter", "BroadcastExchange", "BroadcastHashJoin", "Project"),
+    ("Scan parquet", "Exchange", "HashAggregate", "TakeOrderedAndProject"),
+)
+
+
+@dataclass(frozen=True)
+class Scale:
+    """Size of a synthetic History Server."""
+
+    applications: int = 2
+    jobs: int = 10  # Per application
+    stages_per_job: int = 3
+    tasks_per_stage: int = 100
+    executors: int = 8  # Per application, not counting the driver
+    cores_per_executor: int = 4
+    sql_executions: int = 20  # Per application
+    attempts: int = 1  # Application attempts, the latest one has the data
+    seed: int = 0
+
+
+SCALES = {
+    "small": Scale(),
+    # 200k tasks per application
+    "medium": Scale(
+        applications=5,
+        jobs=100,
+        stages_per_job=4,
+        tasks_per_stage=500,
+        executors=64,
+        sql_executions=2_000,
+    ),
+    # As many tasks spread over 5k stages, and 20k SQL executions
+    "large": Scale(
+        applications=10,
+        jobs=1_000,
+        stages_per_job=5,
+        tasks_per_stage=40,
+        executors=400,
+        sql_executions=20_000,
+    ),
+}
+
+
+class _AppPlan:
+    """Timeline and per-stage parameters of one application, drawn from the seed."""
+
+    def __init__(self, scale: Scale, index: int):
+        rng = np.random.default_rng([scale.seed, index])
+        stages = scale.jobs * scale.stages_per_job
+        slots = max(scale.executors * scale.cores_per_executor, 1)
+        waves = -(-scale.tasks_per_stage // slots)
+
+        self.index = index
+        self.start = _START_MS + index * _APP_INTERVAL_MS
+        moment = datetime.fromtimestamp(self.start // 1000, timezone.utc)
+        self.id = f"app-{moment:%Y%m%d%H%M%S}-{index:04d}"
+
+        # Typical task duration of each stage; one stage in 20 is skewed, with
+        # stragglers running several times longer than the other tasks
+        self.task_ms = rng.lognormal(np.log(800), 0.8, stages)
+        self.skewed = rng.random(stages) < 0.05
+        self.job_failed = rng.random(scale.jobs) < 0.02
+        wall = (self.task_ms * waves * np.where(self.skewed, 8.0, 1.3)).astype(
+            np.int64
+        ) + 50
+        # Stages run one after the other with scheduling gaps in between
+        self.stage_end = self.start + np.cumsum(rng.integers(20, 500, stages) + wall)
+        self.stage_submit = self.stage_end - wall
+        self.end = int(self.stage_end[-1]) + 1000 if stages else self.start + 1000
+
+        # SQL executions are submitted evenly over the application
+        executions = scale.sql_executions
+        self.sql_submit = self.start + np.arange(executions) * (
+            (self.end - self.start) // max(executions, 1)
+        )
+        self.sql_duration = rng.lognormal(np.log(2000), 1.2, executions).astype(
+            np.int64
+        )
+        self.sql_failed = rng.random(executions) < 0.02
+
+        # Executors get a slightly uneven share of the work
+        self.executor_share = rng.lognormal(0, 0.2, scale.executors)
+        self.executor_share /= max(self.executor_share.sum(), 1e-9)
+        self.total_task_ms = float((self.task_ms * scale.tasks_per_stage).sum())
+
+        # Stage records without summaries, built on first use
+        self.stages: Optional[List[Dict[str, Any]]] = None
+
+
+@functools.lru_cache(maxsize=8)
+def _task_columns(
+    seed: int,
+    app: int,
+    stage: int,
+    tasks: int,
+    task_ms: float,
+    skewed: bool,
+    failed: bool,
+    reads_input: bool,
+    writes_shuffle: bool,
+    slots: int,
+) -> Dict[str, np.ndarray]:
+    """Generate the metrics of all tasks of a stage, one array per metric."""
+    rng = np.random.default_rng([seed, app, stage, 1])
+    duration = task_ms * rng.lognormal(0, 0.25, tasks)
+    read_skew = np.ones(tasks)
+    if skewed:
+        stragglers = rng.random(tasks) < 0.02
+        read_skew[stragglers] = rng.uniform(5, 12, int(stragglers.sum()))
+        duration *= read_skew
+    duration = duration.astype(np.int64) + 1
+    deserialize = 1 + duration // 50
+    scheduler_delay = rng.integers(1, 20, tasks)
+    run_time = np.maximum(duration - deserialize - scheduler_delay, 0)
+    gc_share = (
+        rng.uniform(0.1, 0.3, tasks) if skewed else rng.uniform(0.01, 0.08, tasks)
+    )
+    zeros = np.zeros(tasks, dtype=np.int64)
+
+    if reads_input:
+        input_bytes = (128 * _MB * rng.uniform(0.8, 1.0, tasks)).astype(np.int64)
+        shuffle_read = zeros
+    else:
+        input_bytes = zeros
+        shuffle_read = (rng.lognormal(np.log(32 * _MB), 0.3, tasks) * read_skew).astype(
+            np.int64
+        )
+    if writes_shuffle:
+        shuffle_write = rng.lognormal(np.log(16 * _MB), 0.3, tasks).astype(np.int64)
+    else:
+        shuffle_write = zeros
+    peak_memory = (rng.uniform(32, 256, tasks) * _MB).astype(np.int64)
+    if skewed:
+        spilled = (peak_memory * rng.uniform(1, 4, tasks)).astype(np.int64)
+    else:
+        spilled = zeros
+
+    status = np.zeros(tasks, dtype=bool)
+    if failed:
+        status[-_FAILED_TASKS:] = True
+
+    return {
+        "duration": duration,
+        "launch": (np.arange(tasks) // slots) * int(task_ms),
+        "executor": np.arange(tasks) % max(slots, 1),
+        "failed": status,
+        "executorDeserializeTime": deserialize,
+        "executorDeserializeCpuTime": deserialize * 700_000,
+        "executorRunTime": run_time,
+        "executorCpuTime": (run_time * rng.uniform(0.6, 0.95, tasks) * 1e6).astype(
+            np.int64
+        ),
+        "resultSize": rng.integers(1024, 8192, tasks),
+        "jvmGcTime": (run_time * gc_share).astype(np.int64),
+        "resultSerializationTime": rng.integers(0, 3, tasks),
+        "schedulerDelay": scheduler_delay,
+        "memoryBytesSpilled": spilled,
+        "diskBytesSpilled": spilled // 3,
+        "peakExecutionMemory": peak_memory,
+        "bytesRead": input_bytes,
+        "recordsRead": input_bytes // 100,
+        "remoteBytesRead": shuffle_read * 4 // 5,
+        "localBytesRead": shuffle_read - shuffle_read * 4 // 5,
+        "shuffleRecordsRead": shuffle_read // 64,
+        "fetchWaitTime": (duration * rng.uniform(0, 0.05, tasks)).astype(np.int64)
+        * (shuffle_read > 0),
+        "shuffleBytesWritten": shuffle_write,
+        "shuffleRecordsWritten": shuffle_write // 64,
+        "shuffleWriteTime": shuffle_write // 8,
+    }
+
+
+class SyntheticHistory:
+    """
+    Deterministic, lazily generated contents of a Spark History Server.
+
+    Applications are numbered from 0 and have IDs like app-20240501000000-0000.
+    Responses are plain JSON-compatible values, exactly what the History Server
+    would return for the same endpoint and query parameters.
+    """
+
+    def __init__(self, scale: Optional[Scale] = None):
+        """
+        Initialize the generator.
+
+        Args:
+            scale: Number of applications, jobs, stages, tasks, executors and SQL
+                executions to generate (the "small" scale by default)
+        """
+        self.scale = scale or Scale()
+        self._plans: Dict[int, _AppPlan] = {}
+
+    @property
+    def app_ids(self) -> List[str]:
+        """IDs of the applications, oldest first."""
+        return [self._plan(i).id for i in range(self.scale.applications)]
+
+    def get(self, endpoint: str, params: Optional[Params] = None) -> Any:
+        """
+        Answer a REST request.
+
+        Args:
+            endpoint: Path below /api/v1, e.g. applications/<app_id>/stages
+            params: Query parameters, as parsed by urllib.parse.parse_qs
+
+        Returns:
+            The JSON response
+
+        Raises:
+            LookupError: If the resource doesn't exist (a 404 of the History Server)
+            ValueError: If a query parameter is invalid
+        """
+        params = params or {}
+        parts = endpoint.strip("/").split("/")
+        if parts == ["version"]:
+            return {"spark": SPARK_VERSION}
+        if parts[0] != "applications":
+            raise LookupError(f"Unknown endpoint: {endpoint}")
+        if len(parts) == 1:
+            return self._applications(params)
+
+        plan = self._plan_by_id(parts[1])
+        tail = parts[2:]
+        if tail and tail[0].isdigit():
+            attempt = self._attempt(plan, tail[0])
+            tail = tail[1:]
+            if not tail:
+                return attempt
+        if not tail:
+            return self._application(plan)
+
+        resource, args = tail[0], tail[1:]
+        if resource == "jobs" and not args:
+            return self._jobs(plan, params)
+        if resource == "jobs" and len(args) == 1:
+            return self._job(plan, self._index(args[0], self.scale.jobs))
+        if resource == "stages":
+            return self._stages_resource(plan, args, params)
+        if resource in ("executors", "allexecutors") and not args:
+            return self._executors(plan, active_only=resource == "executors")
+        if resource == "environment" and not args:
+            return self._environment(plan)
+        if resource == "sql" and not args:
+            return self._sql_list(plan, params)
+        if resource == "sql" and len(args) == 1:
+            execution = self._index(args[0], self.scale.sql_executions)
+            return self._sql(
+                plan,
+                execution,
+                rest.flag(params, "details", default=True),
+                rest.flag(params, "planDescription", default=True),
+            )
+        raise LookupError(f"Unknown endpoint: {endpoint}")
+
+    def _plan(self, index: int) -> _AppPlan:
+        plan = self._plans.get(index)
+        if plan is None:
+            plan = self._plans[index] = _AppPlan(self.scale, index)
+        return plan
+
+    def _plan_by_id(self, app_id: str) -> _AppPlan:
+        try:
+            index = int(app_id.rsplit("-", 1)[1])
+        except (IndexError, ValueError):
+            raise LookupError(f"Unknown application: {app_id}") from None
+        if not 0 <= index < self.scale.applications or self._plan(index).id != app_id:
+            raise LookupError(f"Unknown application: {app_id}")
+        return self._plan(index)
+
+    @staticmethod
+    def _index(value: str, count: int) -> int:
+        if not value.isdigit() or int(value) >= count:
+            raise LookupError(f"Unknown ID: {value}")
+        return int(value)
+
+    # Applications
+
+    def _applications(self, params: Params) -> List[Dict[str, Any]]:
+        statuses = rest.statuses(params)
+        if statuses and "COMPLETED" not in statuses:
+            # Every generated application has completed
+            return []
+        # Newest first, like the History Server
+        apps = [
+            self._application(self._plan(i))
+            for i in reversed(range(self.scale.applications))
+        ]
+        limit = rest.param(params, "limit")
+        return apps[: int(limit)] if limit is not None else apps
+
+    def _application(self, plan: _AppPlan) -> Dict[str, Any]:
+        return {
+            "id": plan.id,
+            "name": f"synthetic-etl-{plan.index}",
+            "attempts": [
+                self._attempt(plan, str(attempt))
+                for attempt in range(self.scale.attempts, 0, -1)
+            ],
+        }
+
+    def _attempt(self, plan: _AppPlan, attempt_id: str) -> Dict[str, Any]:
+        attempt = int(attempt_id)
+        if not 1 <= attempt <= self.scale.attempts:
+            raise LookupError(f"Unknown attempt {attempt_id} of {plan.id}")
+        start, end = plan.start, plan.end
+        if attempt < self.scale.attempts:
+            # Earlier attempts failed quickly, before the one that succeeded
+            start -= (self.scale.attempts - attempt) * 600_000
+            end = start + 300_000
+        return {
+            "attemptId": attempt_id,
+            "startTime": rest.timestamp(start),
+            "endTime": rest.timestamp(end),
+            "lastUpdated": rest.timestamp(end),
+            "duration": end - start,
+            "sparkUser": "spark",
+            "completed": True,
+            "appSparkVersion": SPARK_VERSION,
+            "startTimeEpoch": start,
+            "endTimeEpoch": end,
+            "lastUpdatedEpoch": end,
+        }
+
+    # Jobs
+
+    def _jobs(self, plan: _AppPlan, params: Params) -> List[Dict[str, Any]]:
+        statuses = rest.statuses(params)
+        jobs = (self._job(plan, job) for job in reversed(range(self.scale.jobs)))
+        return [job for job in jobs if not statuses or job["status"] in statuses]
+
+    def _job(self, plan: _AppPlan, job: int) -> Dict[str, Any]:
+        per_job = self.scale.stages_per_job
+        first, last = job * per_job, (job + 1) * per_job - 1
+        failed = bool(plan.job_failed[job])
+        failed_tasks = min(_FAILED_TASKS, self.scale.tasks_per_stage) if failed else 0
+        tasks = per_job * self.scale.tasks_per_stage
+        return {
+            "jobId": job,
+            "name": _STAGE_NAMES[last % len(_STAGE_NAMES)],
+            "submissionTime": rest.timestamp(int(plan.stage_submit[first]) - 10),
+            "completionTime": rest.timestamp(int(plan.stage_end[last]) + 5),
+            "stageIds": list(range(first, last + 1)),
+            "jobTags": [],
+            "status": "FAILED" if failed else "SUCCEEDED",
+            "numTasks": tasks,
+            "numActiveTasks": 0,
+            "numCompletedTasks": tasks - failed_tasks,
+            "numSkippedTasks": 0,
+            "numFailedTasks": failed_tasks,
+            "numKilledTasks": 0,
+            "numCompletedIndices": tasks - failed_tasks,
+            "numActiveStages": 0,
+            "numCompletedStages": per_job - failed,
+            "numSkippedStages": 0,
+            "numFailedStages": int(failed),
+            "killedTasksSummary": {},
+        }
+
+    # Stages and tasks
+
+    def _stages_resource(self, plan: _AppPlan, args: List[str], params: Params) -> Any:
+        stages = self.scale.jobs * self.scale.stages_per_job
+        if not args:
+            statuses = rest.statuses(params)
+            return [
+                self._stage(plan, stage, params)
+                for stage in reversed(range(stages))
+                if not statuses or self._stage_status(plan, stage) in statuses
+            ]
+        stage = self._index(args[0], stages)
+        if len(args) == 1:
+            return [self._stage(plan, stage, params)]
+        # Every stage has a single attempt
+        if args[1] != "0":
+            raise LookupError(f"Unknown attempt {args[1]} of stage {stage}")
+        if len(args) == 2:
+            return self._stage(plan, stage, params)
+        if args[2:] == ["taskSummary"]:
+            return self._task_summary(self._tasks(plan, stage), rest.quantiles(params))
+        if args[2:] == ["taskList"]:
+            return self._task_list(plan, stage, params)
+        raise LookupError(f"Unknown stage resource: {'/'.join(args)}")
+
+    def _stage_status(self, plan: _AppPlan, stage: int) -> str:
+        per_job = self.scale.stages_per_job
+        job = stage // per_job
+        if plan.job_failed[job] and stage % per_job == per_job - 1:
+            return "FAILED"
+        return "COMPLETE"
+
+    def _tasks(self, plan: _AppPlan, stage: int) -> Dict[str, np.ndarray]:
+        scale = self.scale
+        position = stage % scale.stages_per_job
+        return _task_columns(
+            scale.seed,
+            plan.index,
+            stage,
+            scale.tasks_per_stage,
+            float(plan.task_ms[stage]),
+            bool(plan.skewed[stage]),
+            self._stage_status(plan, stage) == "FAILED",
+            position == 0,
+            position < scale.stages_per_job - 1,
+            scale.executors * scale.cores_per_executor,
+        )
+
+    def _stage(self, plan: _AppPlan, stage: int, params: Params) -> Dict[str, Any]:
+        if plan.stages is None:
+            stages = self.scale.jobs * self.scale.stages_per_job
+            plan.stages = [self._stage_record(plan, s) for s in range(stages)]
+        record = plan.stages[stage]
+        if rest.flag(params, "withSummaries"):
+            summary = self._task_summary(
+                self._tasks(plan, stage), rest.quantiles(params)
+            )
+            record = {**record, "taskMetricsDistributions": summary}
+        return record
+
+    def _stage_record(self, plan: _AppPlan, stage: int) -> Dict[str, Any]:
+        columns = self._tasks(plan, stage)
+        status = self._stage_status(plan, stage)
+        failed = int(columns["failed"].sum())
+        tasks = self.scale.tasks_per_stage
+        total = {name: int(values.sum()) for name, values in columns.items()}
+        shuffle_read = total["remoteBytesRead"] + total["localBytesRead"]
+        record = {
+            "status": status,
+            "stageId": stage,
+            "attemptId": 0,
+            "numTasks": tasks,
+            "numActiveTasks": 0,
+            "numCompleteTasks": tasks - failed,
+            "numFailedTasks": failed,
+            "numKilledTasks": 0,
+            "numCompletedIndices": tasks - failed,
+            "submissionTime": rest.timestamp(int(plan.stage_submit[stage])),
+            "firstTaskLaunchedTime": rest.timestamp(int(plan.stage_submit[stage]) + 15),
+            "completionTime": rest.timestamp(int(plan.stage_end[stage])),
+            "executorDeserializeTime": total["executorDeserializeTime"],
+            "executorDeserializeCpuTime": total["executorDeserializeCpuTime"],
+            "executorRunTime": total["executorRunTime"],
+            "executorCpuTime": total["executorCpuTime"],
+            "resultSize": total["resultSize"],
+            "jvmGcTime": total["jvmGcTime"],
+            "resultSerializationTime": total["resultSerializationTime"],
+            "memoryBytesSpilled": total["memoryBytesSpilled"],
+            "diskBytesSpilled": total["diskBytesSpilled"],
+            "peakExecutionMemory": total["peakExecutionMemory"],
+            "inputBytes": total["bytesRead"],
+            "inputRecords": total["recordsRead"],
+            "outputBytes": 0,
+            "outputRecords": 0,
+            "shuffleRemoteBlocksFetched": tasks * 8 if shuffle_read else 0,
+            "shuffleLocalBlocksFetched": tasks * 2 if shuffle_read else 0,
+            "shuffleFetchWaitTime": total["fetchWaitTime"],
+            "shuffleRemoteBytesRead": total["remoteBytesRead"],
+            "shuffleRemoteBytesReadToDisk": 0,
+            "shuffleLocalBytesRead": total["localBytesRead"],
+            "shuffleReadBytes": shuffle_read,
+            "shuffleReadRecords": total["shuffleRecordsRead"],
+            "shuffleWriteBytes": total["shuffleBytesWritten"],
+            "shuffleWriteTime": total["shuffleWriteTime"],
+            "shuffleWriteRecords": total["shuffleRecordsWritten"],
+            "name": _STAGE_NAMES[stage % len(_STAGE_NAMES)],
+            "details": "org.apache.spark.sql.execution.SparkPlan.executeQuery"
+            "(SparkPlan.scala:218)",
+            "schedulingPool": "default",
+            "rddIds": [stage * 3, stage * 3 + 1, stage * 3 + 2],
+            "accumulatorUpdates": [],
+            "killedTasksSummary": {},
+            "resourceProfileId": 0,
+            "peakExecutorMetrics": {
+                "JVMHeapMemory": int(columns["peakExecutionMemory"].max()) * 4,
+                "JVMOffHeapMemory": 96 * _MB,
+                "OnHeapExecutionMemory": int(columns["peakExecutionMemory"].max()),
+            },
+            "isShufflePushEnabled": False,
+            "shuffleMergersCount": 0,
+        }
+        if status == "FAILED":
+            record["failureReason"] = (
+                f"Job aborted due to stage failure: Task 0 in stage {stage}.0 failed "
+                "4 times, most recent failure: java.lang.OutOfMemoryError: "
+                "Java heap space"
+            )
+        return record
+
+    def _task_summary(
+        self, columns: Dict[str, np.ndarray], points: List[float]
+    ) -> Dict[str, Any]:
+        def dist(name: str) -> List[float]:
+            return np.quantile(columns[name], points).tolist()
+
+        shuffle_read = columns["remoteBytesRead"] + columns["localBytesRead"]
+        return {
+            "quantiles": points,
+            "duration": dist("duration"),
+            "executorDeserializeTime": dist("executorDeserializeTime"),
+            "executorDeserializeCpuTime": dist("executorDeserializeCpuTime"),
+            "executorRunTime": dist("executorRunTime"),
+            "executorCpuTime": dist("executorCpuTime"),
+            "resultSize": dist("resultSize"),
+            "jvmGcTime": dist("jvmGcTime"),
+            "resultSerializationTime": dist("resultSerializationTime"),
+            "gettingResultTime": [0.0] * len(points),
+            "schedulerDelay": dist("schedulerDelay"),
+            "peakExecutionMemory": dist("peakExecutionMemory"),
+            "memoryBytesSpilled": dist("memoryBytesSpilled"),
+            "diskBytesSpilled": dist("diskBytesSpilled"),
+            "inputMetrics": {
+                "bytesRead": dist("bytesRead"),
+                "recordsRead": dist("recordsRead"),
+            },
+            "outputMetrics": {
+                "bytesWritten": [0.0] * len(points),
+                "recordsWritten": [0.0] * len(points),
+            },
+            "shuffleReadMetrics": {
+                "readBytes": np.quantile(shuffle_read, points).tolist(),
+                "readRecords": dist("shuffleRecordsRead"),
+                "remoteBlocksFetched": [8.0 if shuffle_read.any() else 0.0]
+                * len(points),
+                "localBlocksFetched": [2.0 if shuffle_read.any() else 0.0]
+                * len(points),
+                "fetchWaitTime": dist("fetchWaitTime"),
+                "remoteBytesRead": dist("remoteBytesRead"),
+                "remoteBytesReadToDisk": [0.0] * len(points),
+                "totalBlocksFetched": [10.0 if shuffle_read.any() else 0.0]
+                * len(points),
+            },
+            "shuffleWriteMetrics": {
+                "writeBytes": dist("shuffleBytesWritten"),
+                "writeRecords": dist("shuffleRecordsWritten"),
+                "writeTime": dist("shuffleWriteTime"),
+            },
+        }
+
+    def _task_list(
+        self, plan: _AppPlan, stage: int, params: Params
+    ) -> List[Dict[str, Any]]:
+        columns = self._tasks(plan, stage)
+        order = np.arange(len(columns["duration"]))
+        statuses = rest.statuses(params)
+        if statuses:
+            status = np.where(columns["failed"], "FAILED", "SUCCESS")
+            order = order[np.isin(status, list(statuses))]
+        sort_by = rest.task_sorting(params)
+        if sort_by != "ID":
+            run_times = columns["executorRunTime"][order]
+            if rest.TASK_SORTING[sort_by]:
+                run_times = -run_times
+            order = order[np.argsort(run_times, kind="stable")]
+        page = rest.page(order, params)
+        values = {name: column[page].tolist() for name, column in columns.items()}
+        submit = int(plan.stage_submit[stage])
+        executors = self.scale.executors
+        return [
+            self._task(stage, int(index), i, values, submit, executors)
+            for i, index in enumerate(page)
+        ]
+
+    @staticmethod
+    def _task(
+        stage: int,
+        index: int,
+        i: int,
+        values: Dict[str, List[Any]],
+        submit: int,
+        executors: int,
+    ) -> Dict[str, Any]:
+        def value(name: str) -> Any:
+            return values[name][i]
+
+        executor = value("executor") % max(executors, 1) + 1
+        host = f"worker-{executor % 16}.cluster.local"
+        failed = value("failed")
+        launch = submit + 15 + value("launch")
+        task = {
+            "taskId": stage * 1_000_000 + index,
+            "index": index,
+            "attempt": 0,
+            "partitionId": index,
+            "launchTime": rest.timestamp(launch),
+            "resultFetchStart": rest.timestamp(launch + value("duration")),
+            "duration": value("duration"),
+            "executorId": str(executor),
+            "host": host,
+            "status": "FAILED" if failed else "SUCCESS",
+            "taskLocality": "PROCESS_LOCAL",
+            "speculative": False,
+            "accumulatorUpdates": [],
+            "taskMetrics": {
+                "executorDeserializeTime": value("executorDeserializeTime"),
+                "executorDeserializeCpuTime": value("executorDeserializeCpuTime"),
+                "executorRunTime": value("executorRunTime"),
+                "executorCpuTime": value("executorCpuTime"),
+                "resultSize": value("resultSize"),
+                "jvmGcTime": value("jvmGcTime"),
+                "resultSerializationTime": value("resultSerializationTime"),
+                "memoryBytesSpilled": value("memoryBytesSpilled"),
+                "diskBytesSpilled": value("diskBytesSpilled"),
+                "peakExecutionMemory": value("peakExecutionMemory"),
+                "inputMetrics": {
+                    "bytesRead": value("bytesRead"),
+                    "recordsRead": value("recordsRead"),
+                },
+                "outputMetrics": {"bytesWritten": 0, "recordsWritten": 0},
+                "shuffleReadMetrics": {
+                    "remoteBlocksFetched": 8 if value("remoteBytesRead") else 0,
+                    "localBlocksFetched": 2 if value("localBytesRead") else 0,
+                    "fetchWaitTime": value("fetchWaitTime"),
+                    "remoteBytesRead": value("remoteBytesRead"),
+                    "remoteBytesReadToDisk": 0,
+                    "localBytesRead": value("localBytesRead"),
+                    "recordsRead": value("shuffleRecordsRead"),
+                    "remoteReqsDuration": value("fetchWaitTime"),
+                },
+                "shuffleWriteMetrics": {
+                    "bytesWritten": value("shuffleBytesWritten"),
+                    "writeTime": value("shuffleWriteTime"),
+                    "recordsWritten": value("shuffleRecordsWritten"),
+                },
+            },
+            "executorLogs": {
+                "stdout": f"http://{host}:8042/node/containerlogs/{executor}/stdout",
+                "stderr": f"http://{host}:8042/node/containerlogs/{executor}/stderr",
+            },
+            "schedulerDelay": value("schedulerDelay"),
+            "gettingResultTime": 0,
+        }
+        if failed:
+            task["errorMessage"] = (
+                "java.lang.OutOfMemoryError: Java heap space\n"
+                "\tat java.base/java.util.Arrays.copyOf(Arrays.java:3537)"
+            )
+        return task
+
+    # Executors
+
+    def _executors(self, plan: _AppPlan, active_only: bool) -> List[Dict[str, Any]]:
+        executors = [self._driver(plan)]
+        for executor in range(1, self.scale.executors + 1):
+            record = self._executor(plan, executor)
+            if record["isActive"] or not active_only:
+                executors.append(record)
+        return executors
+
+    def _driver(self, plan: _AppPlan) -> Dict[str, Any]:
+        return {
+            **self._executor_base(plan, "driver", "driver-0.cluster.local:7078"),
+            "totalCores": 0,
+            "maxTasks": 0,
+            "addTime": rest.timestamp(plan.start),
+        }
+
+    def _executor_base(
+        self, plan: _AppPlan, executor_id: str, host_port: str
+    ) -> Dict[str, Any]:
+        host = host_port.split(":")[0]
+        return {
+            "id": executor_id,
+            "hostPort": host_port,
+            "isActive": True,
+            "rddBlocks": 0,
+            "memoryUsed": 0,
+            "diskUsed": 0,
+            "totalCores": 0,
+            "maxTasks": 0,
+            "activeTasks": 0,
+            "failedTasks": 0,
+            "completedTasks": 0,
+            "totalTasks": 0,
+            "totalDuration": 0,
+            "totalGCTime": 0,
+            "totalInputBytes": 0,
+            "totalShuffleRead": 0,
+            "totalShuffleWrite": 0,
+            "isBlacklisted": False,
+            "maxMemory": 2_300 * _MB,
+            "executorLogs": {
+                "stdout": f"http://{host}:8042/node/containerlogs/{executor_id}/stdout",
+                "stderr": f"http://{host}:8042/node/containerlogs/{executor_id}/stderr",
+            },
+            "memoryMetrics": {
+                "usedOnHeapStorageMemory": 0,
+                "usedOffHeapStorageMemory": 0,
+                "totalOnHeapStorageMemory": 2_300 * _MB,
+                "totalOffHeapStorageMemory": 0,
+            },
+            "blacklistedInStages": [],
+            "peakMemoryMetrics": {
+                "JVMHeapMemory": 1_200 * _MB,
+                "JVMOffHeapMemory": 96 * _MB,
+                "OnHeapExecutionMemory": 512 * _MB,
+                "OnHeapStorageMemory": 64 * _MB,
+                "ProcessTreeJVMRSSMemory": 0,
+                "MinorGCCount": 40,
+                "MajorGCCount": 2,
+            },
+            "attributes": {},
+            "resources": {},
+            "resourceProfileId": 0,
+            "isExcluded": False,
+            "excludedInStages": [],
+        }
+
+    def _executor(self, plan: _AppPlan, executor: int) -> Dict[str, Any]:
+        scale = self.scale
+        share = float(plan.executor_share[executor - 1])
+        tasks = int(scale.jobs * scale.stages_per_job * scale.tasks_per_stage * share)
+        duration = int(plan.total_task_ms * share)
+        record = {
+            **self._executor_base(
+                plan,
+                str(executor),
+                f"worker-{executor % 16}.cluster.local:{40000 + executor}",
+            ),
+            "totalCores": scale.cores_per_executor,
+            "maxTasks": scale.cores_per_executor,
+            "completedTasks": tasks,
+            "totalTasks": tasks,
+            "totalDuration": duration,
+            "totalGCTime": duration // 25,
+            "totalInputBytes": int(
+                scale.jobs * scale.tasks_per_stage * 115 * _MB * share
+            ),
+            "totalShuffleRead": int(
+                scale.jobs
+                * (scale.stages_per_job - 1)
+                * scale.tasks_per_stage
+                * 32
+                * _MB
+                * share
+            ),
+            "totalShuffleWrite": int(
+                scale.jobs
+                * (scale.stages_per_job - 1)
+                * scale.tasks_per_stage
+                * 16
+                * _MB
+                * share
+            ),
+            "addTime": rest.timestamp(plan.start + 2_000 + executor * 10),
+        }
+        # With dynamic allocation, the last quarter of the executors only ran
+        # through the middle of the application
+        if executor > scale.executors - scale.executors // 4:
+            span = plan.end - plan.start
+            record["isActive"] = False
+            record["addTime"] = rest.timestamp(plan.start + span // 5)
+            record["removeTime"] = rest.timestamp(plan.start + span * 7 // 10)
+            record["removeReason"] = "Executor killed by driver."
+        return record
+
+    # Environment
+
+    def _environment(self, plan: _AppPlan) -> Dict[str, Any]:
+        index = plan.index
+        spark_properties = {
+            "spark.app.id": plan.id,
+            "spark.app.name": f"synthetic-etl-{index}",
+            "spark.master": "yarn",
+            "spark.submit.deployMode": "cluster",
+            "spark.executor.instances": str(self.scale.executors),
+            "spark.executor.cores": str(self.scale.cores_per_executor),
+            "spark.executor.memory": f"{4 + 2 * (index % 3)}g",
+            "spark.driver.memory": "4g",
+            "spark.sql.shuffle.partitions": str(200 * (1 + index % 3)),
+            "spark.sql.adaptive.enabled": "true",
+            "spark.dynamicAllocation.enabled": str(index % 2 == 0).lower(),
+            "spark.eventLog.enabled": "true",
+            "spark.eventLog.dir": "s3a://spark-events/logs",
+            "spark.serializer": "org.apache.spark.serializer.KryoSerializer",
+        }
+        return {
+            "runtime": {
+                "javaVersion": "17.0.10 (Eclipse Adoptium)",
+                "javaHome": "/opt/java/openjdk",
+                "scalaVersion": "version 2.12.18",
+            },
+            "sparkProperties": [
+                list(item) for item in sorted(spark_properties.items())
+            ],
+            "hadoopProperties": [[f"fs.s3a.option.{i}", str(i)] for i in range(100)],
+            "systemProperties": [
+                ["java.vendor", "Eclipse Adoptium"],
+                ["os.name", "Linux"],
+                ["user.timezone", "UTC"],
+            ],
+            "metricsProperties": [
+                [
+                    "*.sink.servlet.class",
+                    "org.apache.spark.metrics.sink.MetricsServlet",
+                ],
+            ],
+            "classpathEntries": [
+                [f"/opt/spark/jars/dependency-{i}.jar", "System Classpath"]
+                for i in range(200)
+            ],
+            "resourceProfiles": [
+                {
+                    "id": 0,
+                    "executorResources": {
+                        "cores": {"resourceName": "cores", "amount": 4},
+                        "memory": {"resourceName": "memory", "amount": 4096},
+                    },
+                    "taskResources": {"cpus": {"resourceName": "cpus", "amount": 1.0}},
+                }
+            ],
+        }
+
+    # SQL
+
+    def _sql_list(self, plan: _AppPlan, params: Params) -> List[Dict[str, Any]]:
+        details = rest.flag(params, "details", default=True)
+        plan_description = rest.flag(params, "planDescription")
+        return [
+            self._sql(plan, execution, details, plan_description)
+            for execution in rest.page(range(self.scale.sql_executions), params)
+        ]
+
+    def _sql(
+        self, plan: _AppPlan, execution: int, details: bool, plan_description: bool
+    ) -> Dict[str, Any]:
+        operators = _PLANS[execution % len(_PLANS)]
+        failed = bool(plan.sql_failed[execution])
+        job_ids = [execution] if execution < self.scale.jobs else []
+        record = {
+            "id": execution,
+            "status": "FAILED" if failed else "COMPLETED",
+            "description": f"INSERT INTO warehouse.daily_{execution % 50} SELECT ...",
+            "planDescription": _plan_description(execution, operators)
+            if plan_description
+            else "",
+            "submissionTime": rest.timestamp(int(plan.sql_submit[execution])),
+            "duration": int(plan.sql_duration[execution]),
+            "runningJobIds": [],
+            "successJobIds": [] if failed else job_ids,
+            "failedJobIds": job_ids if failed else [],
+            "nodes": [],
+            "edges": [],
+        }
+        if details:
+            # Nodes are listed root first, the edges point from child to parent
+            count = len(operators)
+            record["nodes"] = [
+                {
+                    "nodeId": node,
+                    "nodeName": operators[count - 1 - node],
+                    "metrics": [
+                        {
+                            "name": "number of output rows",
+                            "value": f"{1000 * (node + 1):,}",
+                        },
+                        {
+                            "name": "time in aggregation build",
+                            "value": "1.2 s (0 ms, 12 ms, 48 ms)",
+                        },
+                    ],
+                }
+                for node in range(count)
+            ]
+            record["edges"] = [
+                {"fromId": node + 1, "toId": node} for node in range(count - 1)
+            ]
+        return record
+
+
+def _plan_description(execution: int, operators: tuple) -> str:
+    """Render a physical plan the way EXPLAIN FORMATTED does."""
+    count = len(operators)
+    lines = [
+        "== Physical Plan ==",
+        f"AdaptiveSparkPlan ({count + 1})",
+        "+- == Final Plan ==",
+    ]
+    for depth, node in enumerate(range(count, 0, -1)):
+        prefix = "   " + "   " * depth + ("+- " if depth else "")
+        lines.append(f"{prefix}{operators[node - 1]} ({node})")
+    lines.append("")
+    table = f"warehouse.events_{execution % 50}"
+    for node in range(1, count + 1):
+        operator = operators[node - 1]
+        lines += ["", f"({node}) {operator}"]
+        if operator == "Scan parquet":
+            lines += [
+                f"Output [4]: [id#{node}L, user_id#{node + 1}L, value#{node + 2}, ts#{node + 3}]",
+                "Batched: true",
+                f"Location: InMemoryFileIndex [s3a://warehouse/{table}]",
+                "PushedFilters: [IsNotNull(user_id)]",
+                "ReadSchema: struct<id:bigint,user_id:bigint,value:string,ts:timestamp>",
+            ]
+        else:
+            lines += [
+                f"Input [3]: [id#{node}L, user_id#{node + 1}L, value#{node + 2}]",
+                f"Arguments: hashpartitioning(user_id#{node + 1}L, 200), "
+                "ENSURE_REQUIREMENTS, [plan_id=" + str(execution * 10 + node) + "]",
+            ]
+    return "\n".join(lines) + "\n"
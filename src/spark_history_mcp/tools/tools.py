@@ -1,6 +1,11 @@
-import heapq
+import asyncio
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+
+from spark_history_mcp.api.app_snapshot import AppSnapshot
+from spark_history_mcp.api.async_spark_client import AsyncSparkRestClient
+from spark_history_mcp.api.query_planner import Query, plan_query
 from spark_history_mcp.core.app import mcp
 from spark_history_mcp.models.mcp_types import (
     JobSummary,
@@ -8,7 +13,6 @@ from spark_history_mcp.models.mcp_types import (
 )
 from spark_history_mcp.models.spark_types import (
     ApplicationInfo,
-    ExecutionData,
     JobData,
     JobExecutionStatus,
     SQLExecutionStatus,
@@ -16,6 +20,7 @@ from spark_history_mcp.models.spark_types import (
     StageStatus,
     TaskMetricDistributions,
 )
+from spark_history_mcp.models.tables import ExecutorTable, StageTable, to_datetime
 
 from ..utils.utils import parallel_execute
 
@@ -50,8 +55,27 @@ def get_client_or_default(ctx, server_name: Optional[str] = None):
     )
 
 
+def get_async_client_or_default(
+    ctx, server_name: Optional[str] = None
+) -> AsyncSparkRestClient:
+    """
+    Get an asyncio client by server name or the default client if no name is provided.
+
+    Args:
+        ctx: The MCP context
+        server_name: Optional server name
+
+    Returns:
+        AsyncSparkRestClient: Async wrapper around the requested or default client
+
+    Raises:
+        ValueError: If no client is found
+    """
+    return AsyncSparkRestClient(get_client_or_default(ctx, server_name))
+
+
 @mcp.tool()
-def list_applications(
+async def list_applications(
     server: Optional[str] = None,
     status: Optional[list[str]] = None,
     min_date: Optional[str] = None,
@@ -80,9 +104,9 @@ def list_applications(
         List of ApplicationInfo objects for all applications
     """
     ctx = mcp.get_context()
-    client = get_client_or_default(ctx, server)
+    client = get_async_client_or_default(ctx, server)
 
-    return client.list_applications(
+    return await client.list_applications(
         status=status,
         min_date=min_date,
         max_date=max_date,
@@ -93,7 +117,7 @@ def list_applications(
 
 
 @mcp.tool()
-def get_application(app_id: str, server: Optional[str] = None) -> ApplicationInfo:
+async def get_application(app_id: str, server: Optional[str] = None) -> ApplicationInfo:
     """
     Get detailed information about a specific Spark application.
 
@@ -108,14 +132,17 @@ def get_application(app_id: str, server: Optional[str] = None) -> ApplicationInf
         ApplicationInfo object containing application details
     """
     ctx = mcp.get_context()
-    client = get_client_or_default(ctx, server)
+    client = get_async_client_or_default(ctx, server)
 
-    return client.get_application(app_id)
+    return await client.get_application(app_id)
 
 
 @mcp.tool()
-def list_jobs(
-    app_id: str, server: Optional[str] = None, status: Optional[list[str]] = None
+async def list_jobs(
+    app_id: str,
+    server: Optional[str] = None,
+    status: Optional[list[str]] = None,
+    fields: Optional[list[str]] = None,
 ) -> list:
     """
     Get a list of all jobs for a Spark application.
@@ -124,23 +151,24 @@ def list_jobs(
         app_id: The Spark application ID
         server: Optional server name to use (uses default if not specified)
         status: Optional list of job status values to filter by
+        fields: Optional JobData fields to return (e.g. ["job_id", "status", "submission_time"]); all fields if not specified
 
     Returns:
         List of JobData objects for the application
     """
     ctx = mcp.get_context()
-    client = get_client_or_default(ctx, server)
+    client = get_async_client_or_default(ctx, server)
 
     # Convert string status values to JobExecutionStatus enum if provided
     job_statuses = None
     if status:
         job_statuses = [JobExecutionStatus.from_string(s) for s in status]
 
-    return client.list_jobs(app_id=app_id, status=job_statuses)
+    return await client.list_jobs(app_id=app_id, status=job_statuses, fields=fields)
 
 
 @mcp.tool()
-def list_slowest_jobs(
+async def list_slowest_jobs(
     app_id: str,
     server: Optional[str] = None,
     include_running: bool = False,
@@ -161,35 +189,25 @@ def list_slowest_jobs(
         List of JobData objects for the slowest jobs, or empty list if no jobs found
     """
     ctx = mcp.get_context()
-    client = get_client_or_default(ctx, server)
-
-    # Get all jobs
-    jobs = client.list_jobs(app_id=app_id)
-
-    if not jobs:
-        return []
-
-    # Filter out running jobs if not included
-    if not include_running:
-        jobs = [job for job in jobs if job.status != JobExecutionStatus.RUNNING.value]
-
-    if not jobs:
-        return []
-
-    def get_job_duration(job):
-        if job.completion_time and job.submission_time:
-            return (job.completion_time - job.submission_time).total_seconds()
-        return 0
-
-    return heapq.nlargest(n, jobs, key=get_job_duration)
+    client = get_async_client_or_default(ctx, server)
+
+    # Running jobs are filtered out by the History Server
+    query = Query(
+        "jobs",
+        app_id,
+        exclude_statuses=() if include_running else (JobExecutionStatus.RUNNING.value,),
+        top_n=n,
+    )
+    return await plan_query(query).execute(client)
 
 
 @mcp.tool()
-def list_stages(
+async def list_stages(
     app_id: str,
     server: Optional[str] = None,
     status: Optional[list[str]] = None,
     with_summaries: bool = False,
+    fields: Optional[list[str]] = None,
 ) -> list:
     """
     Get a list of all stages for a Spark application.
@@ -202,27 +220,29 @@ def list_stages(
         server: Optional server name to use (uses default if not specified)
         status: Optional list of stage status values to filter by
         with_summaries: Whether to include summary metrics in the response
+        fields: Optional StageData fields to return (e.g. ["stage_id", "name", "executor_run_time"]); all fields if not specified
 
     Returns:
         List of StageData objects for the application
     """
     ctx = mcp.get_context()
-    client = get_client_or_default(ctx, server)
+    client = get_async_client_or_default(ctx, server)
 
     # Convert string status values to StageStatus enum if provided
     stage_statuses = None
     if status:
         stage_statuses = [StageStatus.from_string(s) for s in status]
 
-    return client.list_stages(
+    return await client.list_stages(
         app_id=app_id,
         status=stage_statuses,
         with_summaries=with_summaries,
+        fields=fields,
     )
 
 
 @mcp.tool()
-def list_slowest_stages(
+async def list_slowest_stages(
     app_id: str,
     server: Optional[str] = None,
     include_running: bool = False,
@@ -243,29 +263,31 @@ def list_slowest_stages(
         List of StageData objects for the slowest stages, or empty list if no stages found
     """
     ctx = mcp.get_context()
-    client = get_client_or_default(ctx, server)
-
-    stages = client.list_stages(app_id=app_id)
+    client = get_async_client_or_default(ctx, server)
+
+    # Running stages are filtered out by the History Server. This avoids using the
+    # `details` param which can significantly slow down the execution time
+    query = Query(
+        "stages",
+        app_id,
+        exclude_statuses=() if include_running else (StageStatus.ACTIVE.value,),
+        top_n=n,
+    )
+    return await plan_query(query).execute(client)
 
-    # Filter out running stages if not included. This avoids using the `details` param which can significantly slow down the execution time
-    if not include_running:
-        stages = [stage for stage in stages if stage.status != "RUNNING"]
 
-    if not stages:
-        return []
+_STAGE_TIME_COLUMNS = ("status",) + StageTable.EXECUTION_COLUMNS
 
-    def get_stage_duration(stage: StageData):
-        if stage.completion_time and stage.first_task_launched_time:
-            return (
-                stage.completion_time - stage.first_task_launched_time
-            ).total_seconds()
-        return 0
 
-    return heapq.nlargest(n, stages, key=get_stage_duration)
+def _stage_execution_seconds(stages: StageTable) -> np.ndarray:
+    """Execution time of each stage (0 without timestamps, NaN for running stages)."""
+    seconds = stages.execution_seconds()
+    seconds[stages["status"] == StageStatus.ACTIVE.value] = np.nan
+    return seconds
 
 
 @mcp.tool()
-def get_stage(
+async def get_stage(
     app_id: str,
     stage_id: int,
     attempt_id: Optional[int] = None,
@@ -286,11 +308,11 @@ def get_stage(
         StageData object containing stage information
     """
     ctx = mcp.get_context()
-    client = get_client_or_default(ctx, server)
+    client = get_async_client_or_default(ctx, server)
 
     if attempt_id is not None:
         # Get specific attempt
-        stage_data = client.get_stage_attempt(
+        stage_data = await client.get_stage_attempt(
             app_id=app_id,
             stage_id=stage_id,
             attempt_id=attempt_id,
@@ -299,7 +321,7 @@ def get_stage(
         )
     else:
         # Get all attempts and use the latest one
-        stages = client.list_stage_attempts(
+        stages = await client.list_stage_attempts(
             app_id=app_id,
             stage_id=stage_id,
             details=False,
@@ -320,7 +342,7 @@ def get_stage(
         not hasattr(stage_data, "task_metrics_distributions")
         or stage_data.task_metrics_distributions is None
     ):
-        task_summary = client.get_stage_task_summary(
+        task_summary = await client.get_stage_task_summary(
             app_id=app_id,
             stage_id=stage_id,
             attempt_id=stage_data.attempt_id,
@@ -331,7 +353,7 @@ def get_stage(
 
 
 @mcp.tool()
-def get_environment(app_id: str, server: Optional[str] = None):
+async def get_environment(app_id: str, server: Optional[str] = None):
     """
     Get the comprehensive Spark runtime configuration for a Spark application.
 
@@ -346,14 +368,17 @@ def get_environment(app_id: str, server: Optional[str] = None):
         ApplicationEnvironmentInfo object containing environment details
     """
     ctx = mcp.get_context()
-    client = get_client_or_default(ctx, server)
+    client = get_async_client_or_default(ctx, server)
 
-    return client.get_environment(app_id=app_id)
+    return await client.get_environment(app_id=app_id)
 
 
 @mcp.tool()
-def list_executors(
-    app_id: str, server: Optional[str] = None, include_inactive: bool = False
+async def list_executors(
+    app_id: str,
+    server: Optional[str] = None,
+    include_inactive: bool = False,
+    fields: Optional[list[str]] = None,
 ):
     """
     Get executor information for a Spark application.
@@ -365,21 +390,22 @@ def list_executors(
         app_id: The Spark application ID
         server: Optional server name to use (uses default if not specified)
         include_inactive: Whether to include inactive executors (default: False)
+        fields: Optional ExecutorSummary fields to return (e.g. ["id", "total_gc_time"]); all fields if not specified
 
     Returns:
         List of ExecutorSummary objects containing executor information
     """
     ctx = mcp.get_context()
-    client = get_client_or_default(ctx, server)
+    client = get_async_client_or_default(ctx, server)
 
     if include_inactive:
-        return client.list_all_executors(app_id=app_id)
+        return await client.list_all_executors(app_id=app_id, fields=fields)
     else:
-        return client.list_executors(app_id=app_id)
+        return await client.list_executors(app_id=app_id, fields=fields)
 
 
 @mcp.tool()
-def get_executor(app_id: str, executor_id: str, server: Optional[str] = None):
+async def get_executor(app_id: str, executor_id: str, server: Optional[str] = None):
     """
     Get information about a specific executor.
 
@@ -395,10 +421,10 @@ def get_executor(app_id: str, executor_id: str, server: Optional[str] = None):
         ExecutorSummary object containing executor details or None if not found
     """
     ctx = mcp.get_context()
-    client = get_client_or_default(ctx, server)
+    client = get_async_client_or_default(ctx, server)
 
     # Get all executors and find the one with matching ID
-    executors = client.list_all_executors(app_id=app_id)
+    executors = await client.list_all_executors(app_id=app_id)
 
     for executor in executors:
         if executor.id == executor_id:
@@ -408,7 +434,7 @@ def get_executor(app_id: str, executor_id: str, server: Optional[str] = None):
 
 
 @mcp.tool()
-def get_executor_summary(app_id: str, server: Optional[str] = None):
+async def get_executor_summary(app_id: str, server: Optional[str] = None):
     """
     Aggregates metrics across all executors for a Spark application.
 
@@ -423,14 +449,14 @@ def get_executor_summary(app_id: str, server: Optional[str] = None):
         Dictionary containing aggregated executor metrics
     """
     ctx = mcp.get_context()
-    client = get_client_or_default(ctx, server)
+    client = get_async_client_or_default(ctx, server)
 
-    executors = client.list_all_executors(app_id=app_id)
+    executors = await client.list_all_executors(app_id=app_id)
     return _calculate_executor_metrics(executors)
 
 
 @mcp.tool()
-def compare_job_environments(
+async def compare_job_environments(
     app_id1: str, app_id2: str, server: Optional[str] = None
 ) -> Dict[str, Any]:
     """
@@ -448,10 +474,12 @@ def compare_job_environments(
         Dictionary containing configuration differences and similarities
     """
     ctx = mcp.get_context()
-    client = get_client_or_default(ctx, server)
+    client = get_async_client_or_default(ctx, server)
 
-    env1 = client.get_environment(app_id=app_id1)
-    env2 = client.get_environment(app_id=app_id2)
+    env1, env2 = await asyncio.gather(
+        client.get_environment(app_id=app_id1),
+        client.get_environment(app_id=app_id2),
+    )
 
     def props_to_dict(props):
         return {k: v for k, v in props} if props else {}
@@ -516,35 +544,48 @@ def compare_job_environments(
     return comparison
 
 
+# Executor summary metrics that are plain sums of an ExecutorSummary field
+_EXECUTOR_TOTALS = (
+    "disk_used",
+    "completed_tasks",
+    "failed_tasks",
+    "total_duration",
+    "total_gc_time",
+    "total_input_bytes",
+    "total_shuffle_read",
+    "total_shuffle_write",
+)
+
+
 def _calculate_executor_metrics(executors):
     """Calculate executor summary metrics from executor list."""
+    table = ExecutorTable.from_records(
+        executors,
+        [
+            "is_active",
+            "memory_metrics.used_on_heap_storage_memory",
+            "memory_metrics.used_off_heap_storage_memory",
+            *_EXECUTOR_TOTALS,
+        ],
+    )
     return {
-        "total_executors": len(executors),
-        "active_executors": sum(1 for e in executors if e.is_active),
-        "memory_used": sum(
-            e.memory_metrics.used_on_heap_storage_memory
-            + e.memory_metrics.used_off_heap_storage_memory
-            for e in executors
+        "total_executors": len(table),
+        "active_executors": int(np.count_nonzero(table["is_active"])),
+        "memory_used": int(
+            table["memory_metrics.used_on_heap_storage_memory"].sum()
+            + table["memory_metrics.used_off_heap_storage_memory"].sum()
         ),
-        "disk_used": sum(e.disk_used for e in executors),
-        "completed_tasks": sum(e.completed_tasks for e in executors),
-        "failed_tasks": sum(e.failed_tasks for e in executors),
-        "total_duration": sum(e.total_duration for e in executors),
-        "total_gc_time": sum(e.total_gc_time for e in executors),
-        "total_input_bytes": sum(e.total_input_bytes for e in executors),
-        "total_shuffle_read": sum(e.total_shuffle_read for e in executors),
-        "total_shuffle_write": sum(e.total_shuffle_write for e in executors),
+        **{column: int(table[column].sum()) for column in _EXECUTOR_TOTALS},
     }
 
 
-def _calc_executor_summary_from_client(client, app_id: str):
+async def _calc_executor_summary_from_snapshot(snapshot: AppSnapshot):
     """Helper function to calculate executor summary without MCP context."""
-    executors = client.list_all_executors(app_id=app_id)
-    return _calculate_executor_metrics(executors)
+    return _calculate_executor_metrics(await snapshot.executors())
 
 
 @mcp.tool()
-def compare_job_performance(
+async def compare_job_performance(
     app_id1: str, app_id2: str, server: Optional[str] = None
 ) -> Dict[str, Any]:
     """
@@ -562,60 +603,32 @@ def compare_job_performance(
         Dictionary containing detailed performance comparison
     """
     ctx = mcp.get_context()
-    client = get_client_or_default(ctx, server)
+    client = get_async_client_or_default(ctx, server)
+
+    snapshot1 = AppSnapshot(client, app_id1)
+    snapshot2 = AppSnapshot(client, app_id2)
 
     # Define API calls for parallel execution
     api_calls = [
-        ("app1", lambda: client.get_application(app_id1)),
-        ("app2", lambda: client.get_application(app_id2)),
-        ("exec_summary1", lambda: _calc_executor_summary_from_client(client, app_id1)),
-        ("exec_summary2", lambda: _calc_executor_summary_from_client(client, app_id2)),
-        ("jobs1", lambda: client.list_jobs(app_id=app_id1)),
-        ("jobs2", lambda: client.list_jobs(app_id=app_id2)),
+        ("app1", snapshot1.application),
+        ("app2", snapshot2.application),
+        ("exec_summary1", lambda: _calc_executor_summary_from_snapshot(snapshot1)),
+        ("exec_summary2", lambda: _calc_executor_summary_from_snapshot(snapshot2)),
+        ("jobs1", snapshot1.jobs),
+        ("jobs2", snapshot2.jobs),
     ]
 
-    # Execute all API calls in parallel
-    execution_result = parallel_execute(
+    # Execute all API calls concurrently
+    execution_result = await parallel_execute(
         api_calls,
         max_workers=6,
         timeout=300,  # Apply generous timeout for large scale Spark applications
     )
 
-    # If parallel execution fails, try sequential as fallback
-    if execution_result["errors"] and len(execution_result["results"]) == 0:
-        try:
-            # Sequential fallback - get basic info first
-            app1 = client.get_application(app_id1)
-            app2 = client.get_application(app_id2)
-
-            # Use the actual errors from parallel execution
-            error_summary = "; ".join(execution_result["errors"])
-            return {
-                "error": f"Parallel execution failed: {error_summary}. Falling back to basic app info only.",
-                "partial_data": {
-                    "app1": {"id": app_id1, "name": app1.name},
-                    "app2": {"id": app_id2, "name": app2.name},
-                },
-            }
-        except Exception as e:
-            # If even basic app info fails, provide the original errors plus this failure
-            all_errors = execution_result["errors"] + [
-                f"Sequential fallback failed: {str(e)}"
-            ]
-            return {"error": f"Complete failure: {'; '.join(all_errors)}"}
-
-    if execution_result["errors"]:
-        return {"error": f"API failures: {'; '.join(execution_result['errors'])}"}
-
     results = execution_result["results"]
-
-    # Extract results
-    app1 = results["app1"]
-    app2 = results["app2"]
-    exec_summary1 = results["exec_summary1"]
-    exec_summary2 = results["exec_summary2"]
-    jobs1 = results["jobs1"]
-    jobs2 = results["jobs2"]
+    errors = execution_result["errors"]
+    if not results:
+        return {"error": f"API failures: {'; '.join(errors)}"}
 
     # Calculate job duration statistics
     def calc_job_stats(jobs):
@@ -640,32 +653,42 @@ def compare_job_performance(
             "max_duration": max(durations),
         }
 
-    job_stats1 = calc_job_stats(jobs1)
-    job_stats2 = calc_job_stats(jobs2)
+    def resource_allocation(app):
+        return {
+            "cores_granted": app.cores_granted,
+            "max_cores": app.max_cores,
+            "cores_per_executor": app.cores_per_executor,
+            "memory_per_executor_mb": app.memory_per_executor_mb,
+        }
 
-    comparison = {
+    # Compare whatever was fetched; sections missing data for either application
+    # are left out and the failures are reported in "errors"
+    app1 = results.get("app1")
+    app2 = results.get("app2")
+    comparison: Dict[str, Any] = {
         "applications": {
-            "app1": {"id": app_id1, "name": app1.name},
-            "app2": {"id": app_id2, "name": app2.name},
-        },
-        "resource_allocation": {
-            "app1": {
-                "cores_granted": app1.cores_granted,
-                "max_cores": app1.max_cores,
-                "cores_per_executor": app1.cores_per_executor,
-                "memory_per_executor_mb": app1.memory_per_executor_mb,
-            },
-            "app2": {
-                "cores_granted": app2.cores_granted,
-                "max_cores": app2.max_cores,
-                "cores_per_executor": app2.cores_per_executor,
-                "memory_per_executor_mb": app2.memory_per_executor_mb,
-            },
+            "app1": {"id": app_id1, "name": app1.name if app1 else None},
+            "app2": {"id": app_id2, "name": app2.name if app2 else None},
         },
-        "executor_metrics": {
-            "app1": exec_summary1,
-            "app2": exec_summary2,
-            "comparison": {
+    }
+
+    if app1 or app2:
+        comparison["resource_allocation"] = {
+            key: resource_allocation(app)
+            for key, app in (("app1", app1), ("app2", app2))
+            if app
+        }
+
+    exec_summary1 = results.get("exec_summary1")
+    exec_summary2 = results.get("exec_summary2")
+    if exec_summary1 or exec_summary2:
+        executor_metrics = {
+            key: summary
+            for key, summary in (("app1", exec_summary1), ("app2", exec_summary2))
+            if summary
+        }
+        if exec_summary1 and exec_summary2:
+            executor_metrics["comparison"] = {
                 "executor_count_ratio": exec_summary2["total_executors"]
                 / max(exec_summary1["total_executors"], 1),
                 "memory_usage_ratio": exec_summary2["memory_used"]
@@ -674,12 +697,19 @@ def compare_job_performance(
                 / max(exec_summary1["completed_tasks"], 1),
                 "gc_time_ratio": exec_summary2["total_gc_time"]
                 / max(exec_summary1["total_gc_time"], 1),
-            },
-        },
-        "job_performance": {
-            "app1": job_stats1,
-            "app2": job_stats2,
-            "comparison": {
+            }
+        comparison["executor_metrics"] = executor_metrics
+
+    job_stats1 = calc_job_stats(results["jobs1"]) if "jobs1" in results else None
+    job_stats2 = calc_job_stats(results["jobs2"]) if "jobs2" in results else None
+    if job_stats1 or job_stats2:
+        job_performance = {
+            key: stats
+            for key, stats in (("app1", job_stats1), ("app2", job_stats2))
+            if stats
+        }
+        if job_stats1 and job_stats2:
+            job_performance["comparison"] = {
                 "job_count_ratio": job_stats2["count"] / max(job_stats1["count"], 1),
                 "avg_duration_ratio": job_stats2["avg_duration"]
                 / max(job_stats1["avg_duration"], 1)
@@ -689,15 +719,17 @@ def compare_job_performance(
                 / max(job_stats1["total_duration"], 1)
                 if job_stats1["total_duration"] > 0
                 else 0,
-            },
-        },
-    }
+            }
+        comparison["job_performance"] = job_performance
+
+    if errors:
+        comparison["errors"] = errors
 
     return comparison
 
 
 @mcp.tool()
-def compare_sql_execution_plans(
+async def compare_sql_execution_plans(
     app_id1: str,
     app_id2: str,
     execution_id1: Optional[int] = None,
@@ -721,14 +753,13 @@ def compare_sql_execution_plans(
         Dictionary containing SQL execution plan comparison
     """
     ctx = mcp.get_context()
-    client = get_client_or_default(ctx, server)
+    client = get_async_client_or_default(ctx, server)
 
-    # Get SQL executions for both applications
-    sql_execs1 = client.get_sql_list(
-        app_id=app_id1, details=True, plan_description=True
-    )
-    sql_execs2 = client.get_sql_list(
-        app_id=app_id2, details=True, plan_description=True
+    # Get SQL executions for both applications. Only their IDs and durations are
+    # needed, so they are listed without details or plans
+    sql_execs1, sql_execs2 = await asyncio.gather(
+        plan_query(Query("sql", app_id1, fields=("id", "duration"))).execute(client),
+        plan_query(Query("sql", app_id2, fields=("id", "duration"))).execute(client),
     )
 
     # If specific execution IDs not provided, use the longest running ones
@@ -745,11 +776,13 @@ def compare_sql_execution_plans(
         }
 
     # Get specific execution details
-    exec1 = client.get_sql_execution(
-        app_id1, execution_id1, details=True, plan_description=True
-    )
-    exec2 = client.get_sql_execution(
-        app_id2, execution_id2, details=True, plan_description=True
+    exec1, exec2 = await asyncio.gather(
+        client.get_sql_execution(
+            app_id1, execution_id1, details=True, plan_description=True
+        ),
+        client.get_sql_execution(
+            app_id2, execution_id2, details=True, plan_description=True
+        ),
     )
 
     # Analyze nodes and operations
@@ -817,7 +850,7 @@ def compare_sql_execution_plans(
 
 
 @mcp.tool()
-def get_stage_task_summary(
+async def get_stage_task_summary(
     app_id: str,
     stage_id: int,
     attempt_id: int = 0,
@@ -841,13 +874,26 @@ def get_stage_task_summary(
         TaskMetricDistributions object containing metric distributions
     """
     ctx = mcp.get_context()
-    client = get_client_or_default(ctx, server)
+    client = get_async_client_or_default(ctx, server)
 
-    return client.get_stage_task_summary(
+    return await client.get_stage_task_summary(
         app_id=app_id, stage_id=stage_id, attempt_id=attempt_id, quantiles=quantiles
     )
 
 
+# ExecutionData fields summarized by list_slowest_sql_queries
+_SQL_SUMMARY_FIELDS = (
+    "id",
+    "duration",
+    "description",
+    "status",
+    "submission_time",
+    "success_job_ids",
+    "failed_job_ids",
+    "running_job_ids",
+)
+
+
 def truncate_plan_description(plan_desc: str, max_length: int) -> str:
     """
     Truncate plan description while preserving structure.
@@ -874,7 +920,7 @@ def truncate_plan_description(plan_desc: str, max_length: int) -> str:
 
 
 @mcp.tool()
-def list_slowest_sql_queries(
+async def list_slowest_sql_queries(
     app_id: str,
     server: Optional[str] = None,
     attempt_id: Optional[str] = None,
@@ -901,42 +947,26 @@ def list_slowest_sql_queries(
         List of SqlQuerySummary objects for the slowest queries
     """
     ctx = mcp.get_context()
-    client = get_client_or_default(ctx, server)
-
-    all_executions: List[ExecutionData] = []
-    offset = 0
-
-    # Fetch all pages of SQL executions
-    while True:
-        executions: List[ExecutionData] = client.get_sql_list(
-            app_id=app_id,
-            attempt_id=attempt_id,
-            details=True,
-            plan_description=True,
-            offset=offset,
-            length=page_size,
-        )
-
-        if not executions:
-            break
-
-        all_executions.extend(executions)
-        offset += page_size
-
-        # If we got fewer executions than the page size, we've reached the end
-        if len(executions) < page_size:
-            break
-
-    # Filter out running queries if not included
-    if not include_running:
-        all_executions = [
-            e for e in all_executions if e.status != SQLExecutionStatus.RUNNING.value
-        ]
-
-    # Get the top N slowest executions
-    slowest_executions = heapq.nlargest(top_n, all_executions, key=lambda e: e.duration)
+    client = get_async_client_or_default(ctx, server)
+
+    # Pages are fetched concurrently without the plan descriptions that make up
+    # most of their size, and reduced to the current top N as they arrive. Plans
+    # are then requested for the N slowest executions only.
+    fields = _SQL_SUMMARY_FIELDS
+    if include_plan_description:
+        fields += ("plan_description",)
+    query = Query(
+        "sql",
+        app_id,
+        exclude_statuses=() if include_running else (SQLExecutionStatus.RUNNING.value,),
+        fields=fields,
+        top_n=top_n,
+        attempt_id=attempt_id,
+        page_size=page_size,
+    )
+    slowest_executions = await plan_query(query).execute(client)
 
-    # Create simplified results without additional API calls. Raw object is too verbose.
+    # Create simplified results. Raw object is too verbose.
     simplified_results = []
     for execution in slowest_executions:
         job_summary = JobSummary(
@@ -970,7 +1000,7 @@ def list_slowest_sql_queries(
 
 
 @mcp.tool()
-def get_job_bottlenecks(
+async def get_job_bottlenecks(
     app_id: str, server: Optional[str] = None, top_n: int = 5
 ) -> Dict[str, Any]:
     """
@@ -988,41 +1018,56 @@ def get_job_bottlenecks(
         Dictionary containing identified bottlenecks and recommendations
     """
     ctx = mcp.get_context()
-    client = get_client_or_default(ctx, server)
-
-    # Get slowest stages
-    slowest_stages = list_slowest_stages(app_id, server, False, top_n)
-
-    # Get slowest jobs
-    slowest_jobs = list_slowest_jobs(app_id, server, False, top_n)
-
-    # Get executor summary
-    exec_summary = get_executor_summary(app_id, server)
+    client = get_async_client_or_default(ctx, server)
+
+    def scan_stages(records):
+        spilling = 0
+
+        def high_spill(stages: StageTable) -> np.ndarray:
+            nonlocal spilling
+            spilled = stages["memory_bytes_spilled"].astype(np.float64)
+            spilled[spilled <= 100 * 1024 * 1024] = np.nan  # > 100MB
+            spilling += np.count_nonzero(~np.isnan(spilled))
+            return spilled
+
+        # Find the slowest completed stages and the stages with high spill in a
+        # single pass, parsing only the top N of each into StageData but counting
+        # every stage with high spill
+        slowest, spilled = StageTable.nlargest(
+            records,
+            top_n,
+            [_stage_execution_seconds, high_spill],
+            _STAGE_TIME_COLUMNS + ("memory_bytes_spilled",),
+        )
+        return slowest.models(), spilled.models(), spilling
 
-    all_stages = client.list_stages(app_id=app_id)
+    # Scan stages and fetch jobs and executors concurrently, each exactly once
+    snapshot = AppSnapshot(client, app_id)
+    (slowest_stages, spilled_stages, spilling_count), _ = await asyncio.gather(
+        snapshot.scan_stages(scan_stages), snapshot.prefetch("jobs", "executors")
+    )
+    jobs_query = Query(
+        "jobs",
+        app_id,
+        exclude_statuses=(JobExecutionStatus.RUNNING.value,),
+        top_n=top_n,
+    )
+    slowest_jobs = plan_query(jobs_query).residual(await snapshot.jobs())
+    exec_summary = _calculate_executor_metrics(await snapshot.executors())
 
     # Identify stages with high spill
-    high_spill_stages = []
-    for stage in all_stages:
-        if (
-            stage.memory_bytes_spilled
-            and stage.memory_bytes_spilled > 100 * 1024 * 1024
-        ):  # > 100MB
-            high_spill_stages.append(
-                {
-                    "stage_id": stage.stage_id,
-                    "attempt_id": stage.attempt_id,
-                    "name": stage.name,
-                    "memory_spilled_mb": stage.memory_bytes_spilled / (1024 * 1024),
-                    "disk_spilled_mb": stage.disk_bytes_spilled / (1024 * 1024)
-                    if stage.disk_bytes_spilled
-                    else 0,
-                }
-            )
-
-    high_spill_stages = heapq.nlargest(
-        len(high_spill_stages), high_spill_stages, key=lambda x: x["memory_spilled_mb"]
-    )
+    high_spill_stages = [
+        {
+            "stage_id": stage.stage_id,
+            "attempt_id": stage.attempt_id,
+            "name": stage.name,
+            "memory_spilled_mb": stage.memory_bytes_spilled / (1024 * 1024),
+            "disk_spilled_mb": stage.disk_bytes_spilled / (1024 * 1024)
+            if stage.disk_bytes_spilled
+            else 0,
+        }
+        for stage in spilled_stages
+    ]
 
     # Identify GC pressure
     gc_pressure = (
@@ -1093,7 +1138,7 @@ def get_job_bottlenecks(
             {
                 "type": "memory",
                 "priority": "high",
-                "issue": f"Memory spilling detected in {len(high_spill_stages)} stages",
+                "issue": f"Memory spilling detected in {spilling_count} stages",
                 "suggestion": "Increase executor memory or optimize data partitioning",
             }
         )
@@ -1112,7 +1157,7 @@ def get_job_bottlenecks(
 
 
 @mcp.tool()
-def get_resource_usage_timeline(
+async def get_resource_usage_timeline(
     app_id: str, server: Optional[str] = None
 ) -> Dict[str, Any]:
     """
@@ -1129,16 +1174,31 @@ def get_resource_usage_timeline(
         Dictionary containing timeline of resource usage
     """
     ctx = mcp.get_context()
-    client = get_client_or_default(ctx, server)
-
-    # Get application info
-    app = client.get_application(app_id)
-
-    # Get all executors
-    executors = client.list_all_executors(app_id=app_id)
+    client = get_async_client_or_default(ctx, server)
+
+    def stage_table(records):
+        return StageTable.from_records(
+            records,
+            [
+                "stage_id",
+                "attempt_id",
+                "name",
+                "num_tasks",
+                "status",
+                "submission_time",
+                "completion_time",
+            ],
+        )
 
-    # Get stages
-    stages = client.list_stages(app_id=app_id)
+    # Get application info, all executors and stages concurrently. Stages are
+    # only needed as a few columns, so they are not parsed into StageData
+    snapshot = AppSnapshot(client, app_id)
+    stages, _ = await asyncio.gather(
+        snapshot.scan_stages(stage_table),
+        snapshot.prefetch("application", "executors"),
+    )
+    app = await snapshot.application()
+    executors = await snapshot.executors()
 
     # Create timeline events
     timeline_events = []
@@ -1169,34 +1229,31 @@ def get_resource_usage_timeline(
             )
 
     # Add stage events
-    for stage in stages:
-        if stage.submission_time:
-            timeline_events.append(
-                {
-                    "timestamp": stage.submission_time,
-                    "type": "stage_start",
-                    "stage_id": stage.stage_id,
-                    "attempt_id": stage.attempt_id,
-                    "name": stage.name,
-                    "task_count": stage.num_tasks,
-                }
-            )
-
-        if stage.completion_time:
-            timeline_events.append(
-                {
-                    "timestamp": stage.completion_time,
-                    "type": "stage_end",
-                    "stage_id": stage.stage_id,
-                    "attempt_id": stage.attempt_id,
-                    "status": stage.status,
-                    "duration_seconds": (
-                        stage.completion_time - stage.submission_time
-                    ).total_seconds()
-                    if stage.submission_time
-                    else 0,
-                }
-            )
+    submitted = stages["submission_time"]
+    completed = stages["completion_time"]
+    durations = np.nan_to_num(completed - submitted)
+    for i in np.flatnonzero(~np.isnan(submitted)):
+        timeline_events.append(
+            {
+                "timestamp": to_datetime(submitted[i]),
+                "type": "stage_start",
+                "stage_id": int(stages["stage_id"][i]),
+                "attempt_id": int(stages["attempt_id"][i]),
+                "name": stages["name"][i],
+                "task_count": int(stages["num_tasks"][i]),
+            }
+        )
+    for i in np.flatnonzero(~np.isnan(completed)):
+        timeline_events.append(
+            {
+                "timestamp": to_datetime(completed[i]),
+                "type": "stage_end",
+                "stage_id": int(stages["stage_id"][i]),
+                "attempt_id": int(stages["attempt_id"][i]),
+                "status": stages["status"][i],
+                "duration_seconds": float(durations[i]),
+            }
+        )
 
     # Sort events by timestamp
     timeline_events.sort(key=lambda x: x["timestamp"])
@@ -0,0 +1,103 @@
+"""
+Prometheus metrics of the MCP server and its Spark History Server traffic.
+
+Metrics live in the default prometheus_client registry, next to its process and
+garbage collection metrics, and are served at /metrics by the HTTP transports.
+"""
+
+import re
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Byte sizes of Spark History Server responses, from 1 KiB to 1 GiB
+_BYTE_BUCKETS = tuple(1024 * 4**i for i in range(11))
+
+TOOL_CALLS = Counter(
+    "spark_mcp_tool_calls",
+    "MCP tool calls by outcome",
+    ["tool", "outcome"],
+)
+TOOL_DURATION = Histogram(
+    "spark_mcp_tool_duration_seconds",
+    "Duration of MCP tool calls",
+    ["tool"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+
+SHS_REQUEST_DURATION = Histogram(
+    "spark_mcp_shs_request_duration_seconds",
+    "Time to response headers of Spark History Server requests",
+    ["server", "endpoint"],
+)
+SHS_RESPONSES = Counter(
+    "spark_mcp_shs_responses",
+    "Spark History Server responses by HTTP status (timeout/error without one)",
+    ["server", "endpoint", "status"],
+)
+SHS_RESPONSE_BYTES = Histogram(
+    "spark_mcp_shs_response_bytes",
+    "Body size of Spark History Server responses",
+    ["server", "endpoint"],
+    buckets=_BYTE_BUCKETS,
+)
+JSON_DECODE_DURATION = Histogram(
+    "spark_mcp_json_decode_seconds",
+    "Time spent decoding buffered Spark History Server JSON responses",
+    ["server", "endpoint"],
+)
+MODEL_PARSE_DURATION = Histogram(
+    "spark_mcp_model_parse_seconds",
+    "Time spent validating JSON data into Pydantic models",
+    ["model"],
+)
+SHS_RETRIES = Counter(
+    "spark_mcp_shs_retries",
+    "Spark History Server requests retried after a transient failure",
+    ["server"],
+)
+SHS_BREAKER_STATE = Gauge(
+    "spark_mcp_shs_breaker_state",
+    "Circuit breaker state of Spark History Servers (0 closed, 1 half-open, 2 open)",
+    ["server"],
+)
+SHS_BREAKER_OPENED = Gauge(
+    "spark_mcp_shs_breaker_opened",
+    "Times the circuit breaker of a Spark History Server opened",
+    ["server"],
+)
+CACHE_LOOKUPS = Counter(
+    "spark_mcp_cache_lookups",
+    "Response cache lookups by cache tier and result",
+    ["server", "cache", "result"],
+)
+
+PARALLEL_QUEUED = Gauge(
+    "spark_mcp_parallel_queued_calls",
+    "parallel_execute calls waiting for a free worker",
+)
+PARALLEL_IN_FLIGHT = Gauge(
+    "spark_mcp_parallel_in_flight_calls",
+    "parallel_execute calls running",
+)
+
+_APP_PREFIX = re.compile(r"^applications/[^/]+")
+_NUMERIC_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_label(url: str) -> str:
+    """
+    Reduce a Spark History Server URL to a bounded-cardinality endpoint label.
+
+    Application, attempt, job, stage and other IDs are replaced by placeholders,
+    e.g. ".../api/v1/applications/app-1/1/stages/3" becomes
+    "applications/{app_id}/{id}/stages/{id}".
+
+    Args:
+        url: Request URL or API endpoint
+
+    Returns:
+        The endpoint label
+    """
+    path = url.split("/api/v1/", 1)[-1].split("?", 1)[0].strip("/")
+    path = _APP_PREFIX.sub("applications/{app_id}", path)
+    return _NUMERIC_SEGMENT.sub("/{id}", path)
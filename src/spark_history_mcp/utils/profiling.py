@@ -0,0 +1,187 @@
+"""
+Opt-in profiling of tool calls with one profile dump per call.
+
+A profiled call runs under two profilers:
+
+- cProfile, deterministic, on the event loop thread: the tool function itself and
+  the serialization of its result. Written as a .pstats file (pstats, snakeviz).
+- A stack sampler over all threads, which also sees the Spark History Server
+  requests, JSON decoding and model parsing running on the worker pool. Written
+  as a .collapsed file (one "frame;frame;... count" line per stack), the input of
+  flamegraph.pl and speedscope.
+
+Tools running concurrently on the event loop show up in the profiles too, so only
+one call is profiled at a time.
+"""
+
+import cProfile
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from spark_history_mcp.config.config import ProfilingConfig
+
+logger = logging.getLogger(__name__)
+
+_config = ProfilingConfig()
+
+# Held while a call is profiled
+_active = threading.Lock()
+
+# Leaf frames of threads waiting for work, left out of the sampled stacks
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+}
+
+
+def configure_profiling(config: ProfilingConfig) -> None:
+    """
+    Set which tool calls are profiled and where the profiles go.
+
+    Args:
+        config: Profiling configuration
+    """
+    global _config
+    _config = config
+    if config.enabled:
+        logger.info(
+            f"Profiling tool calls of {config.threshold_ms:g} ms or more "
+            f"into {config.directory}"
+        )
+    elif config.allow_per_call:
+        logger.info(f"Profiling tool calls on request into {config.directory}")
+
+
+class _StackSampler(threading.Thread):
+    """Thread counting the stacks of all other threads at a fixed interval."""
+
+    def __init__(self, interval: float):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == self.ident:
+                    continue
+                stack = _collapse(frame)
+                if stack:
+                    self.stacks[f"{names.get(ident, ident)};{stack}"] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+def _collapse(frame: Any) -> Optional[str]:
+    """Render a stack root first, or None if the thread is idle."""
+    leaf = frame.f_code
+    if (os.path.basename(leaf.co_filename), leaf.co_name) in _IDLE_FRAMES:
+        return None
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        filename = os.path.basename(code.co_filename)
+        frames.append(f"{code.co_qualname} ({filename}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(frames))
+
+
+@contextmanager
+def profile_call(
+    tool: str, arguments: Dict[str, Any], requested: bool = False
+) -> Iterator[None]:
+    """
+    Profile a tool call if profiling is enabled, or requested for it and allowed.
+
+    Profiles are written to the configured directory as
+    <time>_<tool>_<app ID>_<wall ms>ms.pstats and .collapsed, unless the call was
+    faster than the configured threshold. A call starting while another one is
+    profiled is not profiled.
+
+    Args:
+        tool: Name of the tool
+        arguments: Arguments of the call, used to tag the files with the app ID
+        requested: Whether the client asked to profile this call (only honoured
+            with allow_per_call)
+    """
+    config = _config
+    wanted = config.enabled or (requested and config.allow_per_call)
+    if not wanted or not _active.acquire(blocking=False):
+        yield
+        return
+
+    try:
+        profiler: Optional[cProfile.Profile] = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler or tracer (e.g. a debugger or coverage) is active
+            profiler = None
+        sampler = _StackSampler(config.sample_interval_ms / 1000)
+        sampler.start()
+        started = time.time()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if profiler is not None:
+                profiler.disable()
+            sampler.stop()
+            if elapsed_ms >= config.threshold_ms:
+                _write_profiles(
+                    config.directory,
+                    tool,
+                    arguments,
+                    started,
+                    elapsed_ms,
+                    profiler,
+                    sampler.stacks,
+                )
+    finally:
+        _active.release()
+
+
+def _write_profiles(
+    directory: str,
+    tool: str,
+    arguments: Dict[str, Any],
+    started: float,
+    elapsed_ms: float,
+    profiler: Optional[cProfile.Profile],
+    stacks: Counter,
+) -> None:
+    """Write the profiles of a call, logging instead of failing the call."""
+    app_id = arguments.get("app_id") or arguments.get("app_id1") or "no-app"
+    name = "_".join(
+        [
+            time.strftime("%Y%m%dT%H%M%S", time.localtime(started)),
+            tool,
+            str(app_id),
+            f"{elapsed_ms:.0f}ms",
+        ]
+    )
+    path = os.path.join(directory, re.sub(r"[^\w.-]", "_", name))
+    try:
+        os.makedirs(directory, exist_ok=True)
+        if profiler is not None:
+            profiler.dump_stats(f"{path}.pstats")
+        with open(f"{path}.collapsed", "w") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+    except OSError as e:
+        logger.warning(f"Could not write profile {path}: {e}")
+        return
+    logger.info(f"Profiled {tool} ({elapsed_ms:.0f} ms) into {path}")
@@ -0,0 +1,73 @@
+"""
+OpenTelemetry tracing of tool calls down to Spark History Server requests.
+
+Spans are created through the OpenTelemetry API, which does nothing until a tracer
+provider is installed. configure_tracing installs one from the `mcp.tracing`
+configuration; the SDK and the OTLP exporter come with the `tracing` extra.
+"""
+
+import logging
+
+from opentelemetry import trace
+
+from spark_history_mcp.config.config import TracingConfig
+
+logger = logging.getLogger(__name__)
+
+tracer = trace.get_tracer("spark_history_mcp")
+
+# The provider installed by configure_tracing (the global one can only be set once)
+_provider = None
+
+
+def configure_tracing(config: TracingConfig):
+    """
+    Export the spans of the server as configured.
+
+    Calling it again adds another exporter to the provider installed first, which
+    lets tests attach an in-memory exporter of their own.
+
+    Args:
+        config: Tracing configuration
+
+    Returns:
+        The span exporter, or None if tracing is disabled
+
+    Raises:
+        ImportError: If tracing is enabled but the OpenTelemetry SDK (or the OTLP
+            exporter) is not installed
+    """
+    global _provider
+    if not config.enabled:
+        return None
+
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        SimpleSpanProcessor,
+    )
+
+    if config.exporter == "memory":
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+            InMemorySpanExporter,
+        )
+
+        exporter = InMemorySpanExporter()
+        processor = SimpleSpanProcessor(exporter)
+    else:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+
+        exporter = OTLPSpanExporter(endpoint=config.endpoint)
+        processor = BatchSpanProcessor(exporter)
+
+    if _provider is None:
+        _provider = TracerProvider(
+            resource=Resource.create({"service.name": config.service_name})
+        )
+        trace.set_tracer_provider(_provider)
+    _provider.add_span_processor(processor)
+    logger.info(f"Tracing enabled, exporting spans to {config.exporter}")
+    return exporter
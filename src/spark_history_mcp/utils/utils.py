@@ -2,57 +2,97 @@
 Simple timeout handling and parallel execution for MCP tools.
 """
 
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any, Callable, Dict, List, Tuple
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import requests
 
+from spark_history_mcp.utils.metrics import PARALLEL_IN_FLIGHT, PARALLEL_QUEUED
+from spark_history_mcp.utils.tracing import tracer
 
-def parallel_execute(
-    api_calls: List[Tuple[str, Callable]], max_workers: int = 6, timeout: int = 180
+
+async def parallel_execute(
+    api_calls: List[Tuple[str, Callable[[], Awaitable[Any]]]],
+    max_workers: int = 6,
+    timeout: float = 180,
+    call_timeout: Optional[float] = None,
 ) -> Dict[str, Any]:
     """
-    Execute multiple API calls in parallel with error handling.
+    Execute multiple API calls concurrently, keeping whatever succeeds.
+
+    The blocking HTTP work behind the calls runs on the process-wide worker pool of
+    AsyncSparkRestClient; max_workers only bounds how many calls of this batch are
+    in flight at once. A call that fails or misses its deadline is reported in
+    errors without affecting the others. If the awaiting tool is cancelled, the
+    outstanding calls are cancelled with it.
 
     Args:
-        api_calls: List of (name, function) tuples
-        max_workers: Maximum number of parallel workers
-        timeout: Total timeout for all operations
+        api_calls: List of (name, coroutine function) tuples
+        max_workers: Maximum number of calls in flight at once
+        timeout: Total timeout for all operations, in seconds
+        call_timeout: Optional timeout for each call once started, in seconds
 
     Returns:
-        Dictionary with results and errors
+        Dictionary with the results of the calls that succeeded (by name), error
+        messages of the ones that did not, the names of the calls that timed out,
+        and the latency of every call that started (seconds, by name)
     """
-    results = {}
-    errors = []
-
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all tasks
-        future_to_name = {executor.submit(func): name for name, func in api_calls}
-
-        # Collect results as they complete
-        for future in as_completed(future_to_name, timeout=timeout):
-            name = future_to_name[future]
-            try:
-                result = future.result()
-                results[name] = result
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 500:
-                    # Try to extract the actual error from response text
-                    error_text = (
-                        e.response.text if hasattr(e.response, "text") else str(e)
-                    )
-                    if (
-                        "OutOfMemoryError" in error_text
-                        or "Java heap space" in error_text
-                    ):
-                        error_msg = f"{name} failed: Spark History Server out of memory (increase SPARK_DAEMON_MEMORY)"
-                else:
-                    error_msg = (
-                        f"{name} failed: HTTP {e.response.status_code} - {str(e)}"
-                    )
-                errors.append(error_msg)
-            except Exception as e:
-                error_msg = f"{name} failed: {str(e)}"
-                errors.append(error_msg)
-
-    return {"results": results, "errors": errors}
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    semaphore = asyncio.Semaphore(max_workers)
+    results: Dict[str, Any] = {}
+    failures: Dict[str, str] = {}
+    timed_out: List[str] = []
+    latencies: Dict[str, float] = {}
+
+    async def run(name: str, func: Callable[[], Awaitable[Any]]) -> None:
+        queued = True
+        PARALLEL_QUEUED.inc()
+        try:
+            async with asyncio.timeout_at(deadline):
+                async with semaphore:
+                    queued = False
+                    PARALLEL_QUEUED.dec()
+                    call_deadline = deadline
+                    if call_timeout is not None:
+                        call_deadline = min(deadline, loop.time() + call_timeout)
+                    start = time.perf_counter()
+                    try:
+                        with (
+                            PARALLEL_IN_FLIGHT.track_inprogress(),
+                            tracer.start_as_current_span(f"parallel {name}"),
+                        ):
+                            async with asyncio.timeout_at(call_deadline):
+                                results[name] = await func()
+                    finally:
+                        latencies[name] = time.perf_counter() - start
+        except TimeoutError:
+            timed_out.append(name)
+            failures[name] = f"{name} failed: timed out"
+        except Exception as e:
+            failures[name] = _describe_error(name, e)
+        finally:
+            if queued:
+                PARALLEL_QUEUED.dec()
+
+    await asyncio.gather(*(run(name, func) for name, func in api_calls))
+
+    return {
+        "results": results,
+        "errors": [failures[name] for name, _ in api_calls if name in failures],
+        "timed_out": timed_out,
+        "latencies": latencies,
+    }
+
+
+def _describe_error(name: str, e: Exception) -> str:
+    """Describe a failed API call for the tool output."""
+    if isinstance(e, requests.exceptions.HTTPError) and e.response is not None:
+        if e.response.status_code == 500:
+            # Try to extract the actual error from response text
+            error_text = e.response.text if hasattr(e.response, "text") else str(e)
+            if "OutOfMemoryError" in error_text or "Java heap space" in error_text:
+                return f"{name} failed: Spark History Server out of memory (increase SPARK_DAEMON_MEMORY)"
+        return f"{name} failed: HTTP {e.response.status_code} - {str(e)}"
+    return f"{name} failed: {str(e)}"
@@ -0,0 +1,75 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+
+from spark_history_mcp.api.app_snapshot import AppSnapshot
+from spark_history_mcp.api.async_spark_client import AsyncSparkRestClient
+from spark_history_mcp.api.spark_client import SparkRestClient
+
+
+class TestAppSnapshot(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.client = MagicMock(spec=SparkRestClient)
+        self.snapshot = AppSnapshot(AsyncSparkRestClient(self.client), "app-123")
+
+    async def test_resources_are_fetched_once(self):
+        self.client.list_jobs.return_value = ["job"]
+        self.client.get_application.return_value = "app"
+
+        await self.snapshot.prefetch("jobs", "application")
+        jobs, app = await asyncio.gather(
+            self.snapshot.jobs(), self.snapshot.application()
+        )
+        self.assertEqual(await self.snapshot.jobs(), jobs)
+
+        self.assertEqual(jobs, ["job"])
+        self.assertEqual(app, "app")
+        self.client.list_jobs.assert_called_once_with(app_id="app-123")
+        self.client.get_application.assert_called_once_with("app-123")
+        self.client.list_all_executors.assert_not_called()
+
+    async def test_stages_are_streamed_to_the_reduction(self):
+        self.client.iter_stage_records.return_value = iter(
+            [{"stageId": 1}, {"stageId": 2}]
+        )
+
+        count = await self.snapshot.scan_stages(lambda records: sum(1 for _ in records))
+
+        self.assertEqual(count, 2)
+        self.client.iter_stage_records.assert_called_once_with(app_id="app-123")
+        with self.assertRaisesRegex(ValueError, "stage_records"):
+            await self.snapshot.prefetch("stage_records")
+
+    async def test_concurrent_callers_share_one_fetch(self):
+        self.client.list_all_executors.return_value = ["executor"]
+
+        results = await asyncio.gather(*(self.snapshot.executors() for _ in range(5)))
+
+        self.assertEqual(results, [["executor"]] * 5)
+        self.client.list_all_executors.assert_called_once_with(app_id="app-123")
+
+    async def test_failures_are_retried(self):
+        self.client.get_application.side_effect = [ValueError("boom"), "app"]
+
+        with self.assertRaises(ValueError):
+            await self.snapshot.application()
+
+        self.assertEqual(await self.snapshot.application(), "app")
+        self.assertEqual(self.client.get_application.call_count, 2)
+
+    async def test_sql_reads_every_page(self):
+        pages = [list(range(100)), [100, 101]]
+        self.client.get_sql_list.side_effect = lambda offset, length, **kwargs: (
+            pages[offset // length] if offset // length < len(pages) else []
+        )
+
+        executions = await self.snapshot.sql()
+
+        self.assertEqual(executions, list(range(102)))
+        kwargs = self.client.get_sql_list.call_args.kwargs
+        self.assertFalse(kwargs["details"])
+        self.assertFalse(kwargs["plan_description"])
+
+    async def test_prefetch_rejects_unknown_resources(self):
+        with self.assertRaisesRegex(ValueError, "tasks"):
+            await self.snapshot.prefetch("jobs", "tasks")
@@ -0,0 +1,60 @@
+import unittest
+from unittest.mock import patch
+
+from spark_history_mcp.api.cache import ResponseCache
+
+
+class TestResponseCache(unittest.TestCase):
+    def test_hit_and_miss(self):
+        cache = ResponseCache(max_bytes=100, ttl=10)
+
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", {"x": 1}, size=10, immutable=True)
+
+        self.assertEqual(cache.get("a"), {"x": 1})
+        stats = cache.get_stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["bytes"], 10)
+
+    def test_lru_eviction_by_byte_budget(self):
+        cache = ResponseCache(max_bytes=100, ttl=10)
+        cache.put("a", "a", size=40, immutable=True)
+        cache.put("b", "b", size=40, immutable=True)
+        cache.get("a")  # "b" is now least recently used
+        cache.put("c", "c", size=40, immutable=True)
+
+        self.assertEqual(cache.get("a"), "a")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), "c")
+        self.assertEqual(cache.get_stats()["evictions"], 1)
+        self.assertEqual(cache.get_stats()["bytes"], 80)
+
+    def test_oversized_response_not_cached(self):
+        cache = ResponseCache(max_bytes=100, ttl=10)
+        cache.put("a", "a", size=101, immutable=True)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get_stats()["entries"], 0)
+
+    @patch("spark_history_mcp.api.cache.time.monotonic")
+    def test_mutable_entries_expire(self, mock_monotonic):
+        cache = ResponseCache(max_bytes=100, ttl=10)
+        mock_monotonic.return_value = 1000.0
+        cache.put("running", "r", size=10, immutable=False)
+        cache.put("completed", "c", size=10, immutable=True)
+
+        mock_monotonic.return_value = 1005.0
+        self.assertEqual(cache.get("running"), "r")
+
+        mock_monotonic.return_value = 1011.0
+        self.assertIsNone(cache.get("running"))
+        self.assertEqual(cache.get("completed"), "c")
+        self.assertEqual(cache.get_stats()["bytes"], 10)
+
+    def test_disabled_cache(self):
+        cache = ResponseCache(max_bytes=0, ttl=10)
+        cache.put("a", "a", size=1, immutable=True)
+
+        self.assertFalse(cache.enabled)
+        self.assertIsNone(cache.get("a"))
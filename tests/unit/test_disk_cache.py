@@ -0,0 +1,139 @@
+import json
+import os
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+import yaml
+
+from spark_history_mcp.api.disk_cache import (
+    DiskCache,
+    get_disk_cache_stats,
+    purge_disk_cache,
+)
+from spark_history_mcp.api.spark_client import SparkRestClient
+from spark_history_mcp.config.config import ServerConfig
+from spark_history_mcp.core import cache_cli
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cache", "shs.sqlite")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip_survives_reopen(self):
+        cache = DiskCache(self.path, namespace="prod", max_bytes=1024 * 1024)
+        cache.put("key", b'{"a": 1}', app_id="app-1")
+        cache.close()
+
+        reopened = DiskCache(self.path, namespace="prod", max_bytes=1024 * 1024)
+        self.assertEqual(reopened.get("key"), b'{"a": 1}')
+        self.assertIsNone(reopened.get("missing"))
+        reopened.close()
+
+    def test_namespaces_are_isolated(self):
+        prod = DiskCache(self.path, namespace="prod", max_bytes=1024 * 1024)
+        staging = DiskCache(self.path, namespace="staging", max_bytes=1024 * 1024)
+        prod.put("key", b"prod")
+
+        self.assertIsNone(staging.get("key"))
+        self.assertEqual(prod.get("key"), b"prod")
+        prod.close()
+        staging.close()
+
+    @patch("spark_history_mcp.api.disk_cache.time.time")
+    def test_lru_eviction_over_size_cap(self, mock_time):
+        body = os.urandom(400)  # incompressible
+        cache = DiskCache(self.path, namespace="prod", max_bytes=1000)
+
+        mock_time.return_value = 1.0
+        cache.put("a", body)
+        mock_time.return_value = 2.0
+        cache.put("b", body)
+        mock_time.return_value = 3.0
+        cache.get("a")  # "b" is now least recently used
+        mock_time.return_value = 4.0
+        cache.put("c", body)
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+        cache.close()
+
+    def test_stats_and_purge(self):
+        cache = DiskCache(self.path, namespace="prod", max_bytes=1024 * 1024)
+        cache.put("k1", b"x", app_id="app-1")
+        cache.put("k2", b"y", app_id="app-2")
+        cache.close()
+
+        stats = get_disk_cache_stats(self.path)
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(stats[0]["namespace"], "prod")
+        self.assertEqual(stats[0]["entries"], 2)
+        self.assertEqual(stats[0]["applications"], 2)
+
+        self.assertEqual(
+            purge_disk_cache(self.path, namespace="prod", app_id="app-1"), 1
+        )
+        self.assertEqual(get_disk_cache_stats(self.path)[0]["entries"], 1)
+        self.assertEqual(purge_disk_cache(self.path), 1)
+        self.assertEqual(get_disk_cache_stats(self.path), [])
+
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
+    def test_client_serves_completed_app_from_disk_after_restart(self, mock_get):
+        config = ServerConfig(
+            url="http://spark-history-server:18080", disk_cache_path=self.path
+        )
+        jobs_response = MagicMock()
+        jobs_response.json.return_value = [{"jobId": 1}]
+        jobs_response.content = b'[{"jobId": 1}]'
+        app_response = MagicMock()
+        app_response.json.return_value = {
+            "id": "app-1",
+            "name": "app",
+            "attempts": [{"duration": 1, "completed": True}],
+        }
+        app_response.content = json.dumps(app_response.json.return_value).encode()
+        mock_get.side_effect = [jobs_response, app_response]
+
+        client = SparkRestClient(config, name="prod")
+        self.assertEqual(client._get("applications/app-1/jobs"), [{"jobId": 1}])
+        self.assertEqual(mock_get.call_count, 2)
+        client.disk_cache.close()
+
+        restarted = SparkRestClient(config, name="prod")
+        self.assertEqual(restarted._get("applications/app-1/jobs"), [{"jobId": 1}])
+        self.assertEqual(mock_get.call_count, 2)
+        restarted.disk_cache.close()
+
+    def test_cli_stats_and_purge(self):
+        cache = DiskCache(self.path, namespace="prod", max_bytes=1024 * 1024)
+        cache.put("k1", b"x", app_id="app-1")
+        cache.close()
+        config_path = os.path.join(self.tmpdir.name, "config.yaml")
+        with open(config_path, "w") as f:
+            yaml.dump(
+                {
+                    "servers": {
+                        "prod": {
+                            "url": "http://prod:18080",
+                            "disk_cache_path": self.path,
+                        }
+                    }
+                },
+                f,
+            )
+
+        with patch("sys.stdout", new_callable=StringIO) as stdout:
+            self.assertEqual(cache_cli.main(["--config", config_path, "stats"]), 0)
+        self.assertEqual(
+            json.loads(stdout.getvalue())[0]["namespaces"][0]["entries"], 1
+        )
+
+        with patch("sys.stdout", new_callable=StringIO) as stdout:
+            self.assertEqual(cache_cli.main(["--config", config_path, "purge"]), 0)
+        self.assertEqual(json.loads(stdout.getvalue())[0]["deleted"], 1)
@@ -0,0 +1,484 @@
+import gzip
+import importlib.util
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from spark_history_mcp.api.event_log_client import EventLogClient
+from spark_history_mcp.config.config import ServerConfig
+from spark_history_mcp.eventlog.files import (
+    EventScanner,
+    event_type,
+    find_event_logs,
+    iter_lines,
+    read_lines,
+)
+from spark_history_mcp.eventlog.history import EventLogHistory
+from spark_history_mcp.eventlog.parallel import ParsePool, split_segment
+from spark_history_mcp.eventlog.replay import AppReplay
+from spark_history_mcp.models.spark_types import (
+    JobExecutionStatus,
+    StageStatus,
+    TaskStatus,
+)
+
+EVENTS = os.path.join(
+    os.path.dirname(__file__), "..", "..", "examples", "basic", "events"
+)
+APP_ID = "spark-cc4d115f011443d787f03a71a476a745"
+LOG = os.path.join(EVENTS, f"eventlog_v2_{APP_ID}", f"events_1_{APP_ID}")
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def _lz4_block_stream(data: bytes) -> bytes:
+    """Data in the LZ4BlockOutputStream format, in two blocks and an end mark."""
+    import lz4.block
+
+    out = b""
+    middle = len(data) // 2
+    for block in (data[:middle], data[middle:]):
+        compressed = lz4.block.compress(block, store_size=False)
+        out += struct.pack("<8sBiii", b"LZ4Block", 0x20, len(compressed), len(block), 0)
+        out += compressed
+    return out + struct.pack("<8sBiii", b"LZ4Block", 0x10, 0, 0, 0)
+
+
+def _snappy_stream(data: bytes) -> bytes:
+    """Data in the SnappyOutputStream format, in chunks of 32 KiB."""
+    import snappy
+
+    out = b"\x82SNAPPY\x00" + struct.pack(">ii", 1, 1)
+    for start in range(0, len(data), 32 * 1024):
+        compressed = snappy.compress(data[start : start + 32 * 1024])
+        out += struct.pack(">i", len(compressed)) + compressed
+    return out
+
+
+class TestEventLogFiles(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        with open(LOG, "rb") as f:
+            self.content = f.read()
+
+    def test_finds_rolling_logs(self):
+        logs = find_event_logs(EVENTS)
+
+        self.assertEqual(len(logs), 3)
+        self.assertTrue(all(log.completed for log in logs))
+        self.assertTrue(all(len(log.segments) == 1 for log in logs))
+
+    def test_rolling_log_in_progress(self):
+        rolling = os.path.join(self.directory, "eventlog_v2_app-1")
+        os.makedirs(rolling)
+        for name in [
+            "appstatus_app-1.inprogress",
+            "events_10_app-1",
+            "events_2_app-1.compact",
+            "events_1_app-1",
+        ]:
+            open(os.path.join(rolling, name), "w").close()
+        open(os.path.join(self.directory, "app-2.inprogress"), "w").close()
+
+        logs = find_event_logs(self.directory)
+
+        self.assertEqual(
+            [os.path.basename(path) for path in logs[1].segments],
+            ["events_2_app-1.compact", "events_10_app-1"],
+        )
+        self.assertFalse(logs[0].completed)
+        self.assertFalse(logs[1].completed)
+
+    def _write(self, name: str, content: bytes) -> str:
+        path = os.path.join(self.directory, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def _assert_lines(self, path: str):
+        lines = list(iter_lines(path))
+        self.assertEqual(b"\n".join(line for _, line in lines) + b"\n", self.content)
+        offsets = [lines[3][0], lines[-1][0]]
+        self.assertEqual(
+            list(read_lines(path, offsets)), [lines[3], lines[-1]], msg=path
+        )
+        # Continuing from the offset reached reads the rest only
+        self.assertEqual(list(iter_lines(path, lines[-2][0])), lines[-2:])
+
+    def test_plain_and_gzip(self):
+        self._assert_lines(self._write("app-1", self.content))
+        self._assert_lines(self._write("app-1.gz", gzip.compress(self.content)))
+
+    @unittest.skipUnless(_installed("zstandard"), "zstandard not installed")
+    def test_zstd(self):
+        import zstandard
+
+        compressor = zstandard.ZstdCompressor()
+        # Two frames, as written by a stream flushed mid-way
+        middle = len(self.content) // 2
+        content = compressor.compress(self.content[:middle]) + compressor.compress(
+            self.content[middle:]
+        )
+        self._assert_lines(self._write("app-1.zstd", content))
+
+    @unittest.skipUnless(_installed("lz4"), "lz4 not installed")
+    def test_lz4(self):
+        self._assert_lines(self._write("app-1.lz4", _lz4_block_stream(self.content)))
+
+    @unittest.skipUnless(_installed("snappy"), "python-snappy not installed")
+    def test_snappy(self):
+        self._assert_lines(self._write("app-1.snappy", _snappy_stream(self.content)))
+
+    def test_incomplete_last_line(self):
+        path = self._write("app-1.inprogress", self.content[:-10])
+
+        lines = list(iter_lines(path))
+
+        self.assertEqual(len(lines), self.content.count(b"\n") - 1)
+
+    def test_scanner_skips_other_events(self):
+        types = frozenset({"SparkListenerTaskEnd", "SparkListenerJobStart"})
+        # The last line is still being written
+        content = self.content + b'{"Event": "SparkListenerTaskEnd", "Stage'
+        for path in [
+            self._write("app-1.inprogress", content),
+            self._write("app-1.gz.inprogress", gzip.compress(content)),
+        ]:
+            lines = list(iter_lines(path))
+            scan = EventScanner(path, types)
+
+            self.assertEqual(
+                list(scan),
+                [(offset, line) for offset, line in lines if event_type(line) in types],
+            )
+            self.assertEqual(scan.position, len(self.content))
+            # Within a range, and continuing from its end
+            middle = lines[len(lines) // 2][0]
+            head = EventScanner(path, types, end=middle)
+            tail = EventScanner(path, types, middle)
+            self.assertEqual(list(head) + list(tail), list(EventScanner(path, types)))
+            self.assertEqual(head.position, middle)
+
+    def test_lzf_unsupported(self):
+        path = self._write("app-1.lzf", b"ZV")
+
+        with self.assertRaises(ValueError):
+            list(iter_lines(path))
+
+
+class TestEventLogClient(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = EventLogClient(ServerConfig(event_log_dir=EVENTS), name="logs")
+
+    def test_applications(self):
+        apps = self.client.list_applications()
+
+        self.assertEqual(len(apps), 3)
+        app = self.client.get_application(APP_ID)
+        self.assertEqual(app.name, "NewYorkTaxiData_2025_06_27_03_56_52")
+        self.assertTrue(app.attempts[0].completed)
+        self.assertEqual(app.attempts[0].app_spark_version, "3.5.3")
+        self.assertEqual(app.attempts[0].duration, 508614)
+        self.assertEqual(self.client.list_applications(limit=1)[0].id, APP_ID)
+        self.assertEqual(self.client.list_applications(status=["running"]), [])
+
+    def test_jobs_and_stages(self):
+        jobs = self.client.list_jobs(APP_ID)
+
+        self.assertEqual([job.job_id for job in jobs], [5, 4, 3, 2, 1, 0])
+        self.assertTrue(all(job.status == JobExecutionStatus.SUCCEEDED for job in jobs))
+        self.assertEqual(jobs[0].num_skipped_stages, 1)
+
+        stages = self.client.list_stages(APP_ID, status=[StageStatus.COMPLETE])
+        self.assertEqual(len(stages), 6)
+        self.assertEqual(sum(stage.num_complete_tasks for stage in stages), 73)
+        stage = self.client.get_stage_attempt(APP_ID, 2, 0, details=True)
+        self.assertEqual(len(stage.tasks), stage.num_complete_tasks)
+        self.assertEqual(
+            sum(summary.succeeded_tasks for summary in stage.executor_summary.values()),
+            stage.num_complete_tasks,
+        )
+
+    def test_tasks(self):
+        summary = self.client.get_stage_task_summary(APP_ID, 2, 0)
+        tasks = self.client.list_stage_tasks(APP_ID, 2, 0, length=100)
+
+        self.assertEqual(len(tasks), 34)
+        self.assertEqual(
+            [task.task_id for task in tasks], sorted(t.task_id for t in tasks)
+        )
+        self.assertTrue(all(task.status == "SUCCESS" for task in tasks))
+        run_times = sorted(task.task_metrics.executor_run_time for task in tasks)
+        self.assertEqual(summary.executor_run_time[2], run_times[17])
+        self.assertEqual(summary.executor_run_time[4], run_times[-2])
+
+        slowest = self.client.list_stage_tasks(
+            APP_ID, 2, 0, length=2, sort_by="-runtime"
+        )
+        self.assertEqual(
+            [task.task_metrics.executor_run_time for task in slowest], run_times[:-3:-1]
+        )
+        page = self.client.list_stage_tasks(APP_ID, 2, 0, offset=30, length=10)
+        self.assertEqual(page, tasks[30:])
+        self.assertEqual(
+            self.client.list_stage_tasks(APP_ID, 2, 0, status=[TaskStatus.FAILED]), []
+        )
+
+    def test_executors_and_environment(self):
+        executors = self.client.list_all_executors(APP_ID)
+        environment = self.client.get_environment(APP_ID)
+
+        self.assertEqual(executors[0].id, "driver")
+        self.assertEqual(len(executors), 5)
+        self.assertEqual(sum(executor.completed_tasks for executor in executors), 73)
+        self.assertEqual(environment.runtime.java_home, "/opt/java/openjdk")
+        self.assertIn("spark.app.name", dict(map(tuple, environment.spark_properties)))
+
+    def test_sql(self):
+        executions = self.client.get_sql_list(APP_ID)
+        execution = self.client.get_sql_execution(APP_ID, executions[0].id)
+
+        self.assertEqual(len(executions), 3)
+        self.assertEqual(executions[0].status, "COMPLETED")
+        self.assertEqual(executions[0].plan_description, "")
+        self.assertTrue(execution.plan_description)
+        names = [node.node_name for node in execution.nodes]
+        self.assertIn("Scan parquet", names)
+        node_ids = {node.node_id for node in execution.nodes}
+        self.assertTrue(
+            all(
+                edge.from_id in node_ids and edge.to_id in node_ids
+                for edge in execution.edges
+            )
+        )
+
+    def test_unknown_resources(self):
+        for call in [
+            lambda: self.client.get_application("app-42"),
+            lambda: self.client.get_job(APP_ID, 42),
+            lambda: self.client.get_stage_attempt(APP_ID, 2, 1),
+            lambda: self.client.get_sql_execution(APP_ID, 42),
+            lambda: self.client.get_metrics_prometheus(APP_ID),
+        ]:
+            with self.assertRaises(requests.exceptions.HTTPError) as cm:
+                call()
+            self.assertEqual(cm.exception.response.status_code, 404)
+        self.assertEqual(self.client.list_rdds(APP_ID), [])
+
+
+class TestRunningApplication(unittest.TestCase):
+    def test_follows_a_growing_log(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        with open(LOG, "rb") as f:
+            lines = f.read().splitlines(keepends=True)
+        first = next(
+            i for i, line in enumerate(lines) if b"SparkListenerJobEnd" in line
+        )
+        path = os.path.join(directory, f"{APP_ID}.inprogress")
+        with open(path, "wb") as f:
+            f.writelines(lines[: first + 1])
+        history = EventLogHistory(directory, refresh_interval=0)
+        app = f"applications/{APP_ID}"
+
+        self.assertEqual(
+            history.get("applications", {"status": ["running"]})[0]["id"], APP_ID
+        )
+        self.assertEqual(
+            [job["status"] for job in history.get(f"{app}/jobs")], ["SUCCEEDED"]
+        )
+        replay = history._replays[APP_ID, None].replay
+
+        # The application ends: the rest of its events, then the log is renamed
+        with open(path, "ab") as f:
+            f.writelines(lines[first + 1 :])
+        os.rename(path, path[: -len(".inprogress")])
+
+        self.assertEqual(len(history.get(f"{app}/jobs")), 6)
+        self.assertIs(history._replays[APP_ID, None].replay, replay)
+        self.assertTrue(history.get(app)["attempts"][0]["completed"])
+
+    def test_compressed_log_end_time_is_taken_from_its_replay(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, f"{APP_ID}.gz")
+        with open(LOG, "rb") as f, open(path, "wb") as out:
+            out.write(gzip.compress(f.read()))
+        history = EventLogHistory(directory)
+        app = f"applications/{APP_ID}"
+
+        # Listed from its first events and modification time only
+        with patch(
+            "spark_history_mcp.eventlog.history.event_type", wraps=event_type
+        ) as read:
+            (attempt,) = history.get(app)["attempts"]
+        self.assertLess(read.call_count, 100)
+        self.assertEqual(attempt["endTimeEpoch"], attempt["lastUpdatedEpoch"])
+
+        history.get(f"{app}/jobs")
+        self.assertEqual(history.get(app)["attempts"][0]["duration"], 508614)
+
+
+class TestEventLogIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.logs = os.path.join(self.directory, "logs")
+        self.index_dir = os.path.join(self.directory, "index")
+        os.makedirs(self.logs)
+        with open(LOG, "rb") as f:
+            self.lines = f.read().splitlines(keepends=True)
+        self.path = os.path.join(self.logs, f"{APP_ID}.inprogress")
+
+    def history(self) -> EventLogHistory:
+        return EventLogHistory(self.logs, refresh_interval=0, index_dir=self.index_dir)
+
+    def responses(self, history: EventLogHistory):
+        app = f"applications/{APP_ID}"
+        return [
+            history.get(endpoint, params)
+            for endpoint, params in [
+                (f"{app}/jobs", {}),
+                (f"{app}/stages", {"withSummaries": ["true"]}),
+                (f"{app}/stages/2/0", {"details": ["true"]}),
+                (f"{app}/stages/2/0/taskList", {"sortBy": ["-runtime"]}),
+                (f"{app}/allexecutors", {}),
+                (f"{app}/environment", {}),
+                (f"{app}/sql", {"planDescription": ["true"]}),
+            ]
+        ]
+
+    def test_reopening_parses_only_new_events(self):
+        middle = len(self.lines) // 2
+        with open(self.path, "wb") as f:
+            f.writelines(self.lines[:middle])
+        self.responses(self.history())
+
+        with open(self.path, "ab") as f:
+            f.writelines(self.lines[middle:])
+        with patch.object(AppReplay, "_apply", autospec=True, return_value=1) as apply:
+            reopened = self.responses(self.history())
+        # The restored replay only gets the appended events
+        self.assertEqual(apply.call_count, len(self.lines) - middle)
+
+        expected = self.responses(EventLogHistory(self.logs, refresh_interval=0))
+        self.assertNotEqual(reopened, expected)
+        # Rewritten shorter, the log is replayed from the start; then the
+        # appended events, applied for real, give the same state as a full replay
+        os.remove(self.path)
+        with open(self.path, "wb") as f:
+            f.writelines(self.lines[:middle])
+        self.responses(self.history())
+        with open(self.path, "ab") as f:
+            f.writelines(self.lines[middle:])
+        self.assertEqual(self.responses(self.history()), expected)
+
+    def test_completed_log_is_not_read_again(self):
+        with open(self.path, "wb") as f:
+            f.writelines(self.lines)
+        os.rename(self.path, self.path[: -len(".inprogress")])
+        expected = self.responses(self.history())
+
+        with patch.object(AppReplay, "_apply", autospec=True) as apply:
+            self.assertEqual(self.responses(self.history()), expected)
+        apply.assert_not_called()
+
+    def test_rewritten_log_is_replayed(self):
+        with open(self.path, "wb") as f:
+            f.writelines(self.lines)
+        self.responses(self.history())
+        # Another log of the same application replaces it
+        os.remove(self.path)
+        rolling = os.path.join(self.logs, f"eventlog_v2_{APP_ID}")
+        os.makedirs(rolling)
+        shutil.copy(LOG, rolling)
+
+        self.assertEqual(
+            self.responses(self.history()),
+            self.responses(EventLogHistory(self.logs, refresh_interval=0)),
+        )
+
+
+class TestParallelParsing(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = ParsePool(2, chunk_size=16 * 1024)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        with open(LOG, "rb") as f:
+            self.lines = f.read().splitlines(keepends=True)
+
+    def _state(self, replay: AppReplay):
+        return (
+            replay.positions,
+            replay.jobs,
+            replay.stages,
+            replay.executors,
+            replay.executor_ids,
+            replay.sql,
+            replay.accumulators,
+            replay.running,
+            {key: rows.tolist() for key, rows in replay.tasks.items()},
+        )
+
+    def test_split_segment(self):
+        path = os.path.join(self.directory, "events")
+        with open(path, "wb") as f:
+            f.writelines(self.lines)
+        starts = {offset for offset, _ in iter_lines(path)}
+
+        ranges = split_segment(path, 0, 16 * 1024)
+
+        self.assertGreater(len(ranges), 1)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertIsNone(ranges[-1][1])
+        for (_, end), (start, _) in zip(ranges, ranges[1:], strict=False):
+            self.assertEqual(end, start)
+            self.assertIn(start, starts)
+
+    def test_pool_replays_like_a_single_process(self):
+        # A rolling log of plain and compressed segments
+        rolling = os.path.join(self.directory, f"eventlog_v2_{APP_ID}")
+        os.makedirs(rolling)
+        third = len(self.lines) // 3
+        with open(os.path.join(rolling, f"events_1_{APP_ID}"), "wb") as f:
+            f.writelines(self.lines[:third])
+        with open(os.path.join(rolling, f"events_2_{APP_ID}.gz"), "wb") as f:
+            f.write(gzip.compress(b"".join(self.lines[third : 2 * third])))
+        last = os.path.join(rolling, f"events_3_{APP_ID}")
+        middle = (len(self.lines) + 2 * third) // 2
+        with open(last, "wb") as f:
+            f.writelines(self.lines[2 * third : middle])
+        (log,) = find_event_logs(self.directory)
+
+        expected = AppReplay(log)
+        expected.update()
+        replay = AppReplay(log)
+        self.assertTrue(replay.update(pool=self.pool))
+        self.assertEqual(self._state(replay), self._state(expected))
+
+        # The events added to the last segment are read from where it was
+        with open(last, "ab") as f:
+            f.writelines(self.lines[middle:])
+        expected.update()
+        self.assertTrue(replay.update(pool=self.pool))
+        self.assertEqual(self._state(replay), self._state(expected))
+        self.assertEqual(
+            replay.task_list((2, 0), None, "-RUNTIME", 0, 20),
+            expected.task_list((2, 0), None, "-RUNTIME", 0, 20),
+        )
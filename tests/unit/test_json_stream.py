@@ -0,0 +1,48 @@
+import json
+import unittest
+
+from spark_history_mcp.api.json_stream import iter_json_array
+
+
+def _chunked(body: bytes, size: int):
+    return [body[i : i + size] for i in range(0, len(body), size)]
+
+
+class TestIterJsonArray(unittest.TestCase):
+    def test_decodes_every_chunking(self):
+        items = [
+            {"stageId": 1, "name": "map at <console>:1", "tasks": {"1": {"x": [1, 2]}}},
+            12345,
+            -0.5,
+            "café ☃",
+            None,
+            True,
+            [],
+        ]
+        body = json.dumps(items, ensure_ascii=False, indent=1).encode("utf-8")
+
+        # Chunk boundaries fall inside numbers, literals and multi-byte characters
+        for size in (1, 2, 3, 7, 64, len(body)):
+            with self.subTest(size=size):
+                self.assertEqual(list(iter_json_array(_chunked(body, size))), items)
+
+    def test_empty_array(self):
+        self.assertEqual(list(iter_json_array([b" [ ", b" ]\n"])), [])
+        self.assertEqual(list(iter_json_array([b"[]"])), [])
+
+    def test_yields_items_before_the_document_ends(self):
+        def chunks():
+            yield b'[{"a": 1}, '
+            raise AssertionError("read past the first element")
+
+        self.assertEqual(next(iter_json_array(chunks())), {"a": 1})
+
+    def test_malformed_documents(self):
+        for body in (b'{"a": 1}', b"[1 2]", b'[{"a": 1}', b"[1,", b""):
+            with self.subTest(body=body):
+                with self.assertRaises(json.JSONDecodeError):
+                    list(iter_json_array(_chunked(body, 2)))
+
+
+if __name__ == "__main__":
+    unittest.main()
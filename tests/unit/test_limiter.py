@@ -0,0 +1,123 @@
+import threading
+import time
+import unittest
+
+from spark_history_mcp.api.limiter import AdaptiveLimiter, LimiterTimeoutError
+
+
+class TestAdaptiveLimiter(unittest.TestCase):
+    def test_healthy_responses_raise_the_limit(self):
+        limiter = AdaptiveLimiter(initial_limit=2, max_limit=4)
+
+        for _ in range(10):
+            with limiter.slot():
+                pass
+
+        self.assertEqual(limiter.limit, 4)
+        self.assertEqual(limiter.get_stats()["in_flight"], 0)
+
+    def test_slow_responses_hold_the_limit(self):
+        limiter = AdaptiveLimiter(initial_limit=2, latency_target=0)
+
+        with limiter.slot():
+            time.sleep(0.01)
+
+        self.assertEqual(limiter.limit, 2)
+
+    def test_overload_halves_the_limit_once_per_burst(self):
+        limiter = AdaptiveLimiter(initial_limit=8)
+        slots = [limiter.slot() for _ in range(3)]
+        admitted = [slot.__enter__() for slot in slots]
+
+        for context, slot in zip(slots, admitted, strict=True):
+            slot.overloaded = True
+            context.__exit__(None, None, None)
+
+        self.assertEqual(limiter.limit, 4)
+        self.assertEqual(limiter.get_stats()["decreases"], 1)
+
+        with limiter.slot() as slot:
+            slot.overloaded = True
+        self.assertEqual(limiter.limit, 2)
+
+    def test_limit_stays_above_minimum(self):
+        limiter = AdaptiveLimiter(initial_limit=2, min_limit=2)
+
+        with limiter.slot() as slot:
+            slot.overloaded = True
+
+        self.assertEqual(limiter.limit, 2)
+
+    def test_exceptions_release_the_slot(self):
+        limiter = AdaptiveLimiter(initial_limit=1)
+
+        with self.assertRaises(ValueError):
+            with limiter.slot():
+                raise ValueError("boom")
+
+        stats = limiter.get_stats()
+        self.assertEqual(stats["in_flight"], 0)
+        self.assertEqual(stats["limit"], 1)
+
+    def test_waiting_times_out(self):
+        limiter = AdaptiveLimiter(initial_limit=1, max_limit=1)
+
+        with limiter.slot():
+            with self.assertRaises(LimiterTimeoutError):
+                with limiter.slot(timeout=0.01):
+                    pass
+
+        stats = limiter.get_stats()
+        self.assertEqual(stats["in_flight"], 0)
+        self.assertEqual(stats["waiting"], 0)
+
+    def test_waiting_behind_a_stream_does_not_time_out(self):
+        limiter = AdaptiveLimiter(initial_limit=1, max_limit=1)
+        admitted = threading.Event()
+
+        def request():
+            with limiter.slot(timeout=0.05):
+                admitted.set()
+
+        with limiter.slot() as slot:
+            limiter.stream(slot)
+            thread = threading.Thread(target=request)
+            thread.start()
+            time.sleep(0.2)
+            self.assertFalse(admitted.is_set())
+        thread.join(timeout=5)
+
+        self.assertTrue(admitted.is_set())
+        self.assertEqual(limiter.get_stats()["in_flight"], 0)
+
+    def test_excess_callers_wait(self):
+        limiter = AdaptiveLimiter(initial_limit=2, max_limit=2)
+        release = threading.Event()
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def request():
+            nonlocal in_flight, peak
+            with limiter.slot():
+                with lock:
+                    in_flight += 1
+                    peak = max(peak, in_flight)
+                release.wait(timeout=5)
+                with lock:
+                    in_flight -= 1
+
+        threads = [threading.Thread(target=request) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        self.assertEqual(limiter.get_stats()["waiting"], 3)
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        self.assertEqual(peak, 2)
+
+    def test_invalid_limits(self):
+        with self.assertRaises(ValueError):
+            AdaptiveLimiter(min_limit=4, max_limit=2)
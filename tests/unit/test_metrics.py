@@ -0,0 +1,121 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+from mcp.server.fastmcp.exceptions import ToolError
+from prometheus_client import REGISTRY
+
+from spark_history_mcp.api.spark_client import SparkRestClient
+from spark_history_mcp.config.config import ServerConfig
+from spark_history_mcp.core.app import mcp, metrics
+from spark_history_mcp.utils.metrics import endpoint_label
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestEndpointLabel(unittest.TestCase):
+    def test_ids_are_replaced(self):
+        cases = {
+            "http://shs:18080/api/v1/applications": "applications",
+            "http://shs:18080/api/v1/version": "version",
+            "http://shs:18080/api/v1/applications/app-1/stages/3/0/taskList": (
+                "applications/{app_id}/stages/{id}/{id}/taskList"
+            ),
+            "applications/app-1/1/sql/12?details=false": (
+                "applications/{app_id}/{id}/sql/{id}"
+            ),
+        }
+        for url, label in cases.items():
+            with self.subTest(url=url):
+                self.assertEqual(endpoint_label(url), label)
+
+
+class TestClientMetrics(unittest.TestCase):
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
+    def test_requests_and_cache_lookups_are_recorded(self, mock_get):
+        client = SparkRestClient(
+            ServerConfig(url="http://spark-history-server:18080"), name="metrics"
+        )
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = {"spark": "3.5.0"}
+        response.content = b'{"spark": "3.5.0"}'
+        mock_get.return_value = response
+        labels = {"server": "metrics", "endpoint": "version"}
+
+        client.get_version()
+        client.get_version()
+
+        self.assertEqual(
+            _sample("spark_mcp_shs_responses_total", status="200", **labels), 1
+        )
+        self.assertEqual(
+            _sample("spark_mcp_shs_response_bytes_sum", **labels), len(response.content)
+        )
+        self.assertEqual(
+            _sample("spark_mcp_shs_request_duration_seconds_count", **labels), 1
+        )
+        self.assertEqual(
+            _sample(
+                "spark_mcp_cache_lookups_total",
+                server="metrics",
+                cache="memory",
+                result="hit",
+            ),
+            1,
+        )
+        self.assertGreaterEqual(
+            _sample("spark_mcp_model_parse_seconds_count", model="VersionInfo"), 2
+        )
+
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
+    def test_retries_and_breaker_are_recorded(self, mock_get):
+        client = SparkRestClient(
+            ServerConfig(
+                url="http://spark-history-server:18080",
+                cache_max_mb=0,
+                retries=1,
+                retry_backoff=0,
+                breaker_threshold=1,
+            ),
+            name="breaker",
+        )
+        response = MagicMock()
+        response.status_code = 503
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            response=response
+        )
+        mock_get.return_value = response
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            client.get_version()
+
+        self.assertEqual(_sample("spark_mcp_shs_retries_total", server="breaker"), 1)
+        self.assertEqual(_sample("spark_mcp_shs_breaker_state", server="breaker"), 2)
+        self.assertEqual(_sample("spark_mcp_shs_breaker_opened", server="breaker"), 1)
+
+
+class TestServerMetrics(unittest.IsolatedAsyncioTestCase):
+    async def test_tool_calls_are_recorded(self):
+        before = _sample("spark_mcp_tool_calls_total", tool="unknown", outcome="error")
+
+        with self.assertRaises(ToolError):
+            await mcp.call_tool("no_such_tool", {})
+
+        self.assertEqual(
+            _sample("spark_mcp_tool_calls_total", tool="unknown", outcome="error"),
+            before + 1,
+        )
+
+    async def test_metrics_endpoint(self):
+        self.assertIn(
+            "/metrics", [route.path for route in mcp.streamable_http_app().routes]
+        )
+
+        response = await metrics(MagicMock())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"spark_mcp_tool_calls_total", response.body)
+        self.assertTrue(response.media_type.startswith("text/plain"))
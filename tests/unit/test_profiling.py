@@ -0,0 +1,108 @@
+import os
+import pstats
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from spark_history_mcp.config.config import ProfilingConfig
+from spark_history_mcp.core.app import mcp
+from spark_history_mcp.utils.profiling import configure_profiling, profile_call
+
+
+def _busy_worker(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(1000))
+
+
+class TestProfileCall(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.addCleanup(configure_profiling, ProfilingConfig())
+
+    def _configure(self, **kwargs):
+        configure_profiling(
+            ProfilingConfig(directory=self.directory, sample_interval_ms=1, **kwargs)
+        )
+
+    def test_profiles_are_written_per_call(self):
+        self._configure(enabled=True)
+
+        with profile_call("get_stage", {"app_id": "app-123"}):
+            worker = threading.Thread(target=_busy_worker, args=(0.1,))
+            worker.start()
+            worker.join()
+
+        files = sorted(os.listdir(self.directory))
+        self.assertEqual(
+            [os.path.splitext(f)[1] for f in files], [".collapsed", ".pstats"]
+        )
+        self.assertRegex(files[0], r"^\d{8}T\d{6}_get_stage_app-123_\d+ms\.collapsed$")
+        with open(os.path.join(self.directory, files[0])) as f:
+            collapsed = f.read()
+        # Stacks of other threads are sampled, root frame first
+        self.assertIn("_busy_worker (test_profiling.py:", collapsed)
+        self.assertRegex(collapsed.splitlines()[0], r" \d+$")
+        pstats.Stats(os.path.join(self.directory, files[1]))
+
+    def test_fast_calls_are_not_kept(self):
+        self._configure(enabled=True, threshold_ms=60_000)
+
+        with profile_call("get_stage", {"app_id": "app-123"}):
+            pass
+
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_requests_are_ignored_unless_allowed(self):
+        self._configure()
+
+        with profile_call("list_applications", {}, requested=True):
+            pass
+
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_disabled_unless_requested(self):
+        self._configure(allow_per_call=True)
+
+        with profile_call("list_applications", {}):
+            pass
+        self.assertEqual(os.listdir(self.directory), [])
+
+        with profile_call("list_applications", {}, requested=True):
+            pass
+        self.assertEqual(len(os.listdir(self.directory)), 2)
+        self.assertIn("_list_applications_no-app_", os.listdir(self.directory)[0])
+
+    def test_one_call_at_a_time(self):
+        self._configure(enabled=True)
+
+        with profile_call("outer", {}):
+            with profile_call("inner", {}):
+                pass
+
+        self.assertTrue(all("outer" in f for f in os.listdir(self.directory)))
+
+
+class TestProfileRequests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.addCleanup(configure_profiling, ProfilingConfig())
+
+    @patch.object(type(mcp), "_profile_requested", return_value=True)
+    @patch("spark_history_mcp.tools.tools.get_client_or_default")
+    async def test_meta_profile_needs_allow_per_call(self, mock_get_client, _):
+        mock_get_client.return_value.list_jobs.return_value = []
+
+        for allow_per_call, expected in [(False, 0), (True, 2)]:
+            configure_profiling(
+                ProfilingConfig(directory=self.directory, allow_per_call=allow_per_call)
+            )
+
+            await mcp.call_tool("list_jobs", {"app_id": "app-123"})
+
+            self.assertEqual(len(os.listdir(self.directory)), expected)
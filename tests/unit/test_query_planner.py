@@ -0,0 +1,144 @@
+import unittest
+from unittest.mock import MagicMock
+
+from spark_history_mcp.api.async_spark_client import AsyncSparkRestClient
+from spark_history_mcp.api.query_planner import Query, plan_query
+from spark_history_mcp.api.spark_client import SparkRestClient
+from spark_history_mcp.models.spark_types import (
+    JobExecutionStatus,
+    StageData,
+    StageStatus,
+)
+
+
+def _stage(stage_id, status, seconds):
+    return {
+        "stageId": stage_id,
+        "attemptId": 0,
+        "status": status,
+        "name": f"Stage {stage_id}",
+        "details": "",
+        "firstTaskLaunchedTime": "2024-01-01T00:00:00.000GMT",
+        "completionTime": f"2024-01-01T00:00:{seconds:02d}.000GMT",
+    }
+
+
+class TestPlanQuery(unittest.TestCase):
+    def test_job_status_filter_is_pushed_down(self):
+        plan = plan_query(
+            Query("jobs", "app-123", exclude_statuses=("RUNNING",), top_n=3)
+        )
+
+        self.assertEqual(
+            plan.list_params,
+            {
+                "app_id": "app-123",
+                "status": [
+                    JobExecutionStatus.FAILED,
+                    JobExecutionStatus.SUCCEEDED,
+                    JobExecutionStatus.UNKNOWN,
+                ],
+            },
+        )
+        self.assertEqual(plan.keep_statuses, {"FAILED", "SUCCEEDED", "UNKNOWN"})
+
+    def test_no_status_filter(self):
+        plan = plan_query(Query("stages", "app-123"))
+
+        self.assertIsNone(plan.list_params["status"])
+        self.assertIsNone(plan.keep_statuses)
+        self.assertFalse(plan.list_params["details"])
+        self.assertFalse(plan.list_params["with_summaries"])
+
+    def test_running_stages_are_active(self):
+        plan = plan_query(Query("stages", "app-123", statuses=("running",)))
+
+        self.assertEqual(plan.list_params["status"], [StageStatus.ACTIVE])
+
+    def test_stage_details_only_for_fields_in_them(self):
+        plan = plan_query(Query("stages", "app-123", fields=("stageId", "tasks")))
+
+        self.assertTrue(plan.list_params["details"])
+        self.assertFalse(plan.list_params["with_summaries"])
+        self.assertEqual(plan.fields, ("stage_id", "status", "tasks"))
+
+    def test_sql_plans_only_for_winners(self):
+        plan = plan_query(
+            Query("sql", "app-123", fields=("id", "plan_description"), top_n=2)
+        )
+
+        self.assertFalse(plan.list_params["details"])
+        self.assertFalse(plan.list_params["plan_description"])
+        self.assertEqual(
+            plan.detail_params, {"details": False, "plan_description": True}
+        )
+
+    def test_sql_without_top_n_lists_plans(self):
+        plan = plan_query(Query("sql", "app-123", fields=("id", "plan_description")))
+
+        self.assertTrue(plan.list_params["plan_description"])
+        self.assertIsNone(plan.detail_params)
+
+    def test_sql_winners_are_fetched_by_id(self):
+        plan = plan_query(
+            Query("sql", "app-123", fields=("plan_description",), top_n=2)
+        )
+
+        self.assertEqual(plan.fields, ("duration", "id", "plan_description", "status"))
+
+    def test_unknown_status(self):
+        with self.assertRaisesRegex(ValueError, "Unknown jobs status DONE"):
+            plan_query(Query("jobs", "app-123", statuses=("DONE",)))
+
+
+class TestFetchPlanExecute(unittest.IsolatedAsyncioTestCase):
+    async def test_longest_stages(self):
+        client = MagicMock(spec=SparkRestClient)
+        client.iter_stage_records.return_value = iter(
+            [
+                _stage(1, "COMPLETE", 5),
+                _stage(2, "ACTIVE", 50),
+                _stage(3, "COMPLETE", 30),
+                _stage(4, "FAILED", 10),
+            ]
+        )
+        query = Query("stages", "app-123", exclude_statuses=("ACTIVE",), top_n=2)
+
+        stages = await plan_query(query).execute(AsyncSparkRestClient(client))
+
+        self.assertEqual([stage.stage_id for stage in stages], [3, 4])
+        self.assertIsInstance(stages[0], StageData)
+        client.iter_stage_records.assert_called_once_with(
+            app_id="app-123",
+            status=[
+                StageStatus.COMPLETE,
+                StageStatus.FAILED,
+                StageStatus.PENDING,
+                StageStatus.SKIPPED,
+            ],
+            details=False,
+            with_summaries=False,
+        )
+
+    async def test_sql_listing_parses_only_the_needed_fields(self):
+        client = MagicMock(spec=SparkRestClient)
+        client.get_sql_list.side_effect = lambda offset, length, **kwargs: []
+        query = Query("sql", "app-123", fields=("duration",), top_n=2)
+
+        await plan_query(query).execute(AsyncSparkRestClient(client))
+
+        self.assertEqual(
+            client.get_sql_list.call_args.kwargs["fields"], ("duration", "status")
+        )
+
+    def test_residual_on_prefetched_jobs(self):
+        jobs = []
+        for status in ["SUCCEEDED", "RUNNING", "FAILED"]:
+            job = MagicMock()
+            job.status = status
+            job.submission_time = None
+            job.completion_time = None
+            jobs.append(job)
+        plan = plan_query(Query("jobs", "app-123", exclude_statuses=("RUNNING",)))
+
+        self.assertEqual(plan.residual(jobs), [jobs[0], jobs[2]])
@@ -0,0 +1,96 @@
+import unittest
+from unittest.mock import patch
+
+from spark_history_mcp.api.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    @patch("spark_history_mcp.api.resilience.time.sleep")
+    def test_backoff_is_jittered_and_capped(self, mock_sleep):
+        policy = RetryPolicy(retries=5, backoff=1, backoff_max=3)
+
+        with patch("spark_history_mcp.api.resilience.random.uniform") as uniform:
+            uniform.side_effect = lambda low, high: high
+            for attempt in range(4):
+                policy.wait(attempt)
+
+        self.assertEqual([c.args[0] for c in mock_sleep.call_args_list], [1, 2, 3, 3])
+        self.assertEqual(policy.get_stats()["retries"], 4)
+
+    def test_retries_run_out(self):
+        policy = RetryPolicy(retries=2)
+
+        self.assertEqual(
+            [policy.should_retry(a) for a in range(3)], [True, True, False]
+        )
+        self.assertEqual(policy.get_stats()["retries_exhausted"], 1)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker("local", threshold=3, reset_timeout=30)
+
+        for success in [False, False, True, False, False]:
+            breaker.record(success, breaker.before_request())
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+        breaker.record(False, breaker.before_request())
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaisesRegex(CircuitOpenError, "local is unavailable"):
+            breaker.before_request()
+        self.assertEqual(breaker.get_stats()["rejected"], 1)
+
+    @patch("spark_history_mcp.api.resilience.time.monotonic")
+    def test_half_open_probe(self, mock_monotonic):
+        mock_monotonic.return_value = 0
+        breaker = CircuitBreaker("local", threshold=1, reset_timeout=30)
+        breaker.record(False, breaker.before_request())
+
+        mock_monotonic.return_value = 31
+        probe = breaker.before_request()
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+
+        breaker.record(False, probe)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+
+        mock_monotonic.return_value = 62
+        breaker.record(True, breaker.before_request())
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(breaker.get_stats()["opened"], 2)
+
+    @patch("spark_history_mcp.api.resilience.time.monotonic")
+    def test_stale_outcomes_are_ignored(self, mock_monotonic):
+        mock_monotonic.return_value = 0
+        breaker = CircuitBreaker("local", threshold=1, reset_timeout=30)
+        slow = breaker.before_request()
+        breaker.record(False, breaker.before_request())
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        # A request admitted before the breaker opened doesn't close it
+        breaker.record(True, slow)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        mock_monotonic.return_value = 31
+        probe = breaker.before_request()
+        breaker.record(True, slow)
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+        breaker.record(True, probe)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_disabled(self):
+        breaker = CircuitBreaker("local", threshold=0)
+
+        for _ in range(10):
+            breaker.record(False, breaker.before_request())
+
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
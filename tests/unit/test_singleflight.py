@@ -0,0 +1,67 @@
+import threading
+import unittest
+
+from spark_history_mcp.api.singleflight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    def _run_concurrently(self, flight, key, func, count):
+        results = [None] * count
+        errors = [None] * count
+
+        def worker(i):
+            try:
+                results[i] = flight.do(key, func)
+            except Exception as e:
+                errors[i] = e
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        return results, errors
+
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def slow_call():
+            calls.append(1)
+            release.wait(timeout=5)
+            return {"stages": []}
+
+        timer = threading.Timer(0.2, release.set)
+        timer.start()
+        results, errors = self._run_concurrently(flight, "key", slow_call, 5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(errors, [None] * 5)
+        self.assertTrue(all(result is results[0] for result in results))
+        stats = flight.get_stats()
+        self.assertEqual(stats["executed"], 1)
+        self.assertEqual(stats["coalesced"], 4)
+        self.assertEqual(stats["in_flight"], 0)
+
+    def test_errors_are_shared(self):
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def failing_call():
+            release.wait(timeout=5)
+            raise RuntimeError("SHS out of memory")
+
+        timer = threading.Timer(0.2, release.set)
+        timer.start()
+        results, errors = self._run_concurrently(flight, "key", failing_call, 3)
+
+        self.assertTrue(all(isinstance(e, RuntimeError) for e in errors))
+        self.assertEqual(flight.get_stats()["executed"], 1)
+
+    def test_sequential_calls_are_not_coalesced(self):
+        flight = SingleFlight()
+
+        self.assertEqual(flight.do("key", lambda: 1), 1)
+        self.assertEqual(flight.do("key", lambda: 2), 2)
+        self.assertEqual(flight.get_stats()["coalesced"], 0)
@@ -1,18 +1,31 @@
+import asyncio
+import json
+import threading
+import time
 import unittest
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import MagicMock, patch
 
 import requests
+from pydantic import ValidationError
 
+from spark_history_mcp.api.async_spark_client import AsyncSparkRestClient, iter_pages
+from spark_history_mcp.api.resilience import CircuitOpenError
 from spark_history_mcp.api.spark_client import SparkRestClient
 from spark_history_mcp.config.config import ServerConfig
+from spark_history_mcp.models.spark_types import StageData, TaskData
 
 
 class TestSparkClient(unittest.TestCase):
     def setUp(self):
-        self.server_config = ServerConfig(url="http://spark-history-server:18080")
+        # Response caching is covered by TestSparkClientCache
+        self.server_config = ServerConfig(
+            url="http://spark-history-server:18080", cache_max_mb=0
+        )
         self.client = SparkRestClient(self.server_config)
 
-    @patch("spark_history_mcp.api.spark_client.requests.get")
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
     def test_list_applications(self, mock_get):
         # Setup mock response
         mock_response = MagicMock()
@@ -52,6 +65,7 @@ class TestSparkClient(unittest.TestCase):
             timeout=30,
             verify=True,
             proxies=None,
+            stream=False,
         )
 
         self.assertEqual(len(apps), 1)
@@ -63,7 +77,7 @@ class TestSparkClient(unittest.TestCase):
         self.assertEqual(apps[0].attempts[0].spark_user, "spark")
         self.assertTrue(apps[0].attempts[0].completed)
 
-    @patch("spark_history_mcp.api.spark_client.requests.get")
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
     def test_list_applications_with_filters(self, mock_get):
         # Setup mock response
         mock_response = MagicMock()
@@ -106,11 +120,12 @@ class TestSparkClient(unittest.TestCase):
             timeout=30,
             verify=True,
             proxies=None,
+            stream=False,
         )
 
         self.assertEqual(len(apps), 1)
 
-    @patch("spark_history_mcp.api.spark_client.requests.get")
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
     def test_list_applications_empty_response(self, mock_get):
         # Setup mock response with empty list
         mock_response = MagicMock()
@@ -125,7 +140,7 @@ class TestSparkClient(unittest.TestCase):
         mock_get.assert_called_once()
         self.assertEqual(len(apps), 0)
 
-    @patch("spark_history_mcp.api.spark_client.requests.get")
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
     def test_fallback_behavior(self, mock_get):
         # First request fails with 404
         error_response = MagicMock()
@@ -139,8 +154,13 @@ class TestSparkClient(unittest.TestCase):
         success_response.json.return_value = {"key": "value"}
         success_response.raise_for_status.return_value = None
 
-        # Configure mock to return different responses
-        mock_get.side_effect = [error_response, success_response]
+        # Configure mock to return different responses, looking up the latest
+        # attempt of the application in between
+        mock_get.side_effect = [
+            error_response,
+            _json_response(_application("app-123", completed=True)),
+            success_response,
+        ]
 
         # Call method that should trigger EMR fallback
         result = self.client._get("applications/app-123/jobs")
@@ -154,6 +174,7 @@ class TestSparkClient(unittest.TestCase):
             timeout=30,
             verify=True,
             proxies=self.client.proxies,  # Use actual proxies value
+            stream=False,
         )
         mock_get.assert_any_call(
             "http://spark-history-server:18080/api/v1/applications/app-123/1/jobs",
@@ -163,12 +184,13 @@ class TestSparkClient(unittest.TestCase):
             timeout=30,
             verify=True,
             proxies=self.client.proxies,  # Use actual proxies value
+            stream=False,
         )
 
         # Verify we got the success response
         self.assertEqual(result, {"key": "value"})
 
-    @patch("spark_history_mcp.api.spark_client.requests.get")
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
     def test_fallback_fail(self, mock_get):
         # Create 404 response
         error_response = MagicMock()
@@ -177,17 +199,21 @@ class TestSparkClient(unittest.TestCase):
         http_error = requests.exceptions.HTTPError(response=error_response)
         error_response.raise_for_status.side_effect = http_error
 
-        # Both requests fail
-        mock_get.side_effect = [error_response, error_response]
+        # Every request fails, including the application lookup
+        mock_get.side_effect = [error_response, error_response, error_response]
 
         # Call method and expect exception
         with self.assertRaises(requests.exceptions.HTTPError):
             self.client._get("applications/app-123/jobs")
 
-        # Verify both URLs were tried
-        self.assertEqual(mock_get.call_count, 2)
+        # Verify the plain URL, the application and the attempt URL were tried
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(
+            mock_get.call_args[0][0],
+            "http://spark-history-server:18080/api/v1/applications/app-123/1/jobs",
+        )
 
-    @patch("spark_history_mcp.api.spark_client.requests.get")
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
     def test_proxy_configuration(self, mock_get):
         # Test with proxy enabled
         client = SparkRestClient(
@@ -238,3 +264,648 @@ class TestSparkClient(unittest.TestCase):
                 expected_url,
                 f"Failed to correctly modify URL.\nInput: {input_url}\nExpected: {expected_url}\nGot: {modified_url}",
             )
+
+    def test_session_uses_pooled_adapter(self):
+        client = SparkRestClient(
+            ServerConfig(url="http://spark-history-server:18080", pool_size=4)
+        )
+        adapter = client.session.get_adapter("http://spark-history-server:18080")
+
+        self.assertIs(adapter, client.adapter)
+        self.assertEqual(client.get_pool_stats()["pool_size"], 4)
+
+    def test_injected_session_uses_pooled_adapter(self):
+        # The EMR persistent UI path replaces the session after construction
+        session = requests.Session()
+        self.client.session = session
+
+        self.assertIs(self.client.session, session)
+        self.assertIs(
+            session.get_adapter("https://emr-ui.example.com"), self.client.adapter
+        )
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa: N802
+        body = json.dumps({"spark": "3.5.0"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+
+class TestSparkClientConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_connections_are_reused(self):
+        client = SparkRestClient(ServerConfig(url=self.url, cache_max_mb=0))
+
+        for _ in range(5):
+            self.assertEqual(client.get_version().spark, "3.5.0")
+
+        stats = client.get_pool_stats()
+        self.assertEqual(stats["requests"], 5)
+        self.assertEqual(stats["connections_opened"], 1)
+        self.assertEqual(stats["connections_reused"], 4)
+
+    def test_idle_connections_expire(self):
+        client = SparkRestClient(
+            ServerConfig(url=self.url, keepalive_timeout=0, cache_max_mb=0)
+        )
+
+        client.get_version()
+        time.sleep(0.01)
+        client.get_version()
+
+        stats = client.get_pool_stats()
+        self.assertEqual(stats["requests"], 2)
+        self.assertEqual(stats["connections_opened"], 2)
+        self.assertEqual(stats["connections_reused"], 0)
+
+
+class TestAsyncSparkClient(unittest.IsolatedAsyncioTestCase):
+    async def test_methods_run_off_the_event_loop(self):
+        client = MagicMock(spec=SparkRestClient)
+        loop_thread = threading.get_ident()
+        calls = []
+
+        def list_jobs(app_id, status=None):
+            calls.append(threading.get_ident())
+            return ["job"]
+
+        client.list_jobs.side_effect = list_jobs
+        async_client = AsyncSparkRestClient(client)
+
+        result = await async_client.list_jobs(app_id="app-123")
+
+        self.assertEqual(result, ["job"])
+        client.list_jobs.assert_called_once_with(app_id="app-123")
+        self.assertNotEqual(calls[0], loop_thread)
+
+    async def test_concurrent_calls_overlap(self):
+        client = MagicMock(spec=SparkRestClient)
+        barrier = threading.Barrier(2, timeout=5)
+        client.get_application.side_effect = lambda app_id: (barrier.wait(), app_id)[1]
+        async_client = AsyncSparkRestClient(client)
+
+        # Both calls must be in flight at once for the barrier to release
+        results = await asyncio.gather(
+            async_client.get_application("app-1"),
+            async_client.get_application("app-2"),
+        )
+
+        self.assertEqual(results, ["app-1", "app-2"])
+
+    async def test_iter_pages_keeps_a_window_in_flight(self):
+        in_flight = []
+        peak = 0
+        requested = []
+
+        async def fetch(offset, length):
+            nonlocal peak
+            requested.append(offset)
+            in_flight.append(offset)
+            peak = max(peak, len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(offset)
+            return list(range(offset, min(offset + length, 25)))
+
+        pages = [page async for page in iter_pages(fetch, page_size=10, window=3)]
+
+        self.assertEqual(
+            pages, [list(range(10)), list(range(10, 20)), [20, 21, 22, 23, 24]]
+        )
+        # The first page is fetched alone, then three at a time
+        self.assertEqual(requested, [0, 10, 20, 30])
+        self.assertEqual(peak, 3)
+
+    async def test_iter_pages_single_page(self):
+        fetch = MagicMock(side_effect=lambda offset, length: asyncio.sleep(0, [1, 2]))
+
+        pages = [page async for page in iter_pages(fetch, page_size=10)]
+
+        self.assertEqual(pages, [[1, 2]])
+        fetch.assert_called_once_with(0, 10)
+
+
+def _json_response(data):
+    response = MagicMock()
+    response.json.return_value = data
+    response.content = b"x" * 100
+    response.raise_for_status.return_value = None
+    return response
+
+
+def _application(app_id, completed):
+    return {
+        "id": app_id,
+        "name": "Test Spark App",
+        "attempts": [
+            {
+                "attemptId": "1",
+                "startTime": "2023-01-01T12:34:56.789GMT",
+                "duration": 3600000,
+                "completed": completed,
+            }
+        ],
+    }
+
+
+class TestSparkClientCache(unittest.TestCase):
+    def setUp(self):
+        self.client = SparkRestClient(
+            ServerConfig(url="http://spark-history-server:18080", cache_ttl=10)
+        )
+
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
+    def test_completed_application_responses_are_cached(self, mock_get):
+        mock_get.side_effect = [
+            _json_response([]),  # jobs
+            _json_response(_application("app-123", completed=True)),
+        ]
+
+        self.client.list_jobs("app-123")
+        self.client.list_jobs("app-123")
+        self.client.get_application("app-123")
+
+        # The jobs call triggers one application lookup; everything after is cached
+        self.assertEqual(mock_get.call_count, 2)
+        stats = self.client.get_cache_stats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["entries"], 2)
+
+    @patch("spark_history_mcp.api.cache.time.monotonic")
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
+    def test_running_application_responses_expire(self, mock_get, mock_monotonic):
+        mock_monotonic.return_value = 1000.0
+        mock_get.side_effect = [
+            _json_response([]),
+            _json_response(_application("app-123", completed=False)),
+            _json_response([]),
+            _json_response(_application("app-123", completed=False)),
+        ]
+
+        self.client.list_jobs("app-123")
+        self.client.list_jobs("app-123")
+        self.assertEqual(mock_get.call_count, 2)
+
+        mock_monotonic.return_value = 1011.0
+        self.client.list_jobs("app-123")
+        self.assertEqual(mock_get.call_count, 4)
+
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
+    def test_list_applications_marks_completed_apps(self, mock_get):
+        mock_get.side_effect = [
+            _json_response([_application("app-123", completed=True)]),
+            _json_response([]),
+        ]
+
+        self.client.list_applications()
+        self.client.list_stages("app-123")
+        self.client.list_stages("app-123")
+
+        # No extra application lookup is needed to cache the stages
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
+    def test_cache_key_includes_params(self, mock_get):
+        self.client._completed_apps.add("app-123")
+        mock_get.side_effect = [_json_response([]), _json_response([])]
+
+        self.client.list_stages("app-123", with_summaries=False)
+        self.client.list_stages("app-123", with_summaries=True)
+
+        self.assertEqual(mock_get.call_count, 2)
+
+
+class TestSparkClientCoalescing(unittest.TestCase):
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
+    def test_concurrent_identical_requests_are_coalesced(self, mock_get):
+        client = SparkRestClient(
+            ServerConfig(url="http://spark-history-server:18080", cache_max_mb=0)
+        )
+        release = threading.Event()
+
+        def slow_get(*args, **kwargs):
+            release.wait(timeout=5)
+            return _json_response([])
+
+        mock_get.side_effect = slow_get
+        threads = [
+            threading.Thread(target=client.list_stages, args=("app-123",))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        threading.Timer(0.2, release.set).start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(client.get_coalescing_stats()["coalesced"], 3)
+
+
+class TestSparkClientLimiter(unittest.TestCase):
+    def setUp(self):
+        self.client = SparkRestClient(
+            ServerConfig(
+                url="http://spark-history-server:18080",
+                cache_max_mb=0,
+                initial_concurrency=8,
+            )
+        )
+
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
+    def test_server_errors_cut_the_limit(self, mock_get):
+        response = MagicMock()
+        response.status_code = 500
+        response.text = "java.lang.OutOfMemoryError: Java heap space"
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            response=response
+        )
+        mock_get.return_value = response
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            self.client.get_version()
+
+        self.assertEqual(self.client.get_limiter_stats()["limit"], 4)
+
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
+    def test_timeouts_cut_the_limit(self, mock_get):
+        mock_get.side_effect = requests.exceptions.ReadTimeout()
+
+        with self.assertRaises(requests.exceptions.Timeout):
+            self.client.get_version()
+
+        stats = self.client.get_limiter_stats()
+        self.assertEqual(stats["limit"], 4)
+        self.assertEqual(stats["in_flight"], 0)
+
+
+def _unavailable():
+    response = MagicMock()
+    response.status_code = 503
+    response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+        response=response
+    )
+    return response
+
+
+class TestSparkClientResilience(unittest.TestCase):
+    def setUp(self):
+        self.client = SparkRestClient(
+            ServerConfig(
+                url="http://spark-history-server:18080",
+                cache_max_mb=0,
+                retry_backoff=0,
+                breaker_threshold=2,
+            )
+        )
+
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
+    def test_transient_failures_are_retried(self, mock_get):
+        response = _json_response({"spark": "3.5.0"})
+        response.status_code = 200
+        mock_get.side_effect = [_unavailable(), response]
+
+        self.assertEqual(self.client.get_version().spark, "3.5.0")
+
+        stats = self.client.get_breaker_stats()
+        self.assertEqual(stats["retries"], 1)
+        self.assertEqual(stats["state"], "closed")
+
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
+    def test_failing_server_is_failed_fast(self, mock_get):
+        mock_get.side_effect = lambda *args, **kwargs: _unavailable()
+
+        for _ in range(2):
+            with self.assertRaises(requests.exceptions.HTTPError):
+                self.client.get_version()
+        self.assertEqual(mock_get.call_count, 6)
+
+        with self.assertRaises(CircuitOpenError):
+            self.client.get_version()
+        self.assertEqual(mock_get.call_count, 6)
+
+        stats = self.client.get_breaker_stats()
+        self.assertEqual(stats["state"], "open")
+        self.assertEqual(stats["retries_exhausted"], 2)
+        self.assertEqual(stats["rejected"], 1)
+
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
+    def test_out_of_memory_server_opens_the_breaker(self, mock_get):
+        def out_of_memory(*args, **kwargs):
+            response = _unavailable()
+            response.status_code = 500
+            return response
+
+        mock_get.side_effect = out_of_memory
+
+        for _ in range(2):
+            with self.assertRaises(requests.exceptions.HTTPError):
+                self.client.get_version()
+        # 500 isn't retried, but counts towards the breaker
+        self.assertEqual(mock_get.call_count, 2)
+        with self.assertRaises(CircuitOpenError):
+            self.client.get_version()
+        self.assertEqual(self.client.get_breaker_stats()["state"], "open")
+
+
+def _not_found():
+    response = MagicMock()
+    response.status_code = 404
+    response.text = "no such app"
+    response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+        response=response
+    )
+    return response
+
+
+class TestSparkClientAttemptResolution(unittest.TestCase):
+    def setUp(self):
+        self.client = SparkRestClient(
+            ServerConfig(url="http://spark-history-server:18080", cache_max_mb=0)
+        )
+        self.base = "http://spark-history-server:18080/api/v1/applications"
+
+    def _urls(self, mock_get):
+        return [call[0][0] for call in mock_get.call_args_list]
+
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
+    def test_resolved_attempt_is_remembered(self, mock_get):
+        mock_get.side_effect = [
+            _not_found(),
+            _json_response(_application("app-123", completed=True)),
+            _json_response([]),  # jobs
+            _json_response([]),  # stages
+        ]
+
+        self.client._get("applications/app-123/jobs")
+        self.client._get("applications/app-123/stages")
+
+        self.assertEqual(
+            self._urls(mock_get),
+            [
+                f"{self.base}/app-123/jobs",
+                f"{self.base}/app-123",
+                f"{self.base}/app-123/1/jobs",
+                f"{self.base}/app-123/1/stages",
+            ],
+        )
+
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
+    def test_latest_attempt_is_used(self, mock_get):
+        app = _application("app-123", completed=True)
+        app["attempts"].insert(0, dict(app["attempts"][0], attemptId="2"))
+        mock_get.side_effect = [_not_found(), _json_response(app), _json_response([])]
+
+        self.client._get("applications/app-123/jobs")
+
+        self.assertEqual(self._urls(mock_get)[-1], f"{self.base}/app-123/2/jobs")
+
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
+    def test_attempt_known_from_application_info(self, mock_get):
+        mock_get.side_effect = [
+            _json_response(_application("app-123", completed=True)),
+            _json_response([]),  # jobs
+        ]
+
+        self.client.get_application("app-123")
+        self.client._get("applications/app-123/jobs")
+
+        self.assertEqual(self._urls(mock_get)[-1], f"{self.base}/app-123/1/jobs")
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
+    def test_plain_url_is_kept_without_attempt_ids(self, mock_get):
+        app = _application("app-123", completed=True)
+        del app["attempts"][0]["attemptId"]
+        mock_get.side_effect = [
+            _json_response(app),
+            _json_response([]),  # jobs
+            _json_response([]),  # sql with an explicit attempt
+        ]
+
+        self.client.get_application("app-123")
+        self.client._get("applications/app-123/jobs")
+        self.client._get("applications/app-123/1/sql")
+
+        self.assertEqual(
+            self._urls(mock_get)[1:],
+            [f"{self.base}/app-123/jobs", f"{self.base}/app-123/1/sql"],
+        )
+
+
+def _stream_response(data, chunk_size=7):
+    body = json.dumps(data).encode()
+    response = MagicMock()
+    response.iter_content.side_effect = lambda chunk_size=1: (
+        body[i : i + chunk_size] for i in range(0, len(body), chunk_size)
+    )
+    response.raise_for_status.return_value = None
+    return response
+
+
+class TestSparkClientStreaming(unittest.TestCase):
+    def setUp(self):
+        self.client = SparkRestClient(
+            ServerConfig(url="http://spark-history-server:18080", cache_max_mb=0)
+        )
+        self.stages = [
+            {
+                "status": "COMPLETE",
+                "stageId": i,
+                "attemptId": 0,
+                "name": f"stage {i}",
+                "details": "",
+            }
+            for i in range(3)
+        ]
+
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
+    def test_iter_stages(self, mock_get):
+        response = _stream_response(self.stages)
+        close = response.close
+        mock_get.return_value = response
+
+        stages = self.client.iter_stages("app-123", details=True)
+        first = next(stages)
+
+        self.assertEqual(first.stage_id, 0)
+        # The stream holds its room under the limit until it is closed
+        self.assertEqual(self.client.get_limiter_stats()["in_flight"], 1)
+        self.assertEqual([stage.stage_id for stage in stages], [1, 2])
+        self.assertTrue(mock_get.call_args[1]["stream"])
+        self.assertEqual(mock_get.call_args[1]["params"]["details"], "true")
+        response.json.assert_not_called()
+        close.assert_called_once()
+        self.assertEqual(self.client.get_limiter_stats()["in_flight"], 0)
+
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
+    def test_slow_stream_does_not_time_out_other_requests(self, mock_get):
+        client = SparkRestClient(
+            ServerConfig(
+                url="http://spark-history-server:18080",
+                cache_max_mb=0,
+                timeout=1,
+                initial_concurrency=1,
+                max_concurrency=1,
+            )
+        )
+        stream = _stream_response(self.stages, chunk_size=len(json.dumps(self.stages)))
+        slow_content = stream.iter_content.side_effect
+
+        def iter_content(chunk_size=1):
+            time.sleep(1.5)  # Longer than the request timeout
+            return slow_content(chunk_size)
+
+        stream.iter_content.side_effect = iter_content
+        jobs = MagicMock(status_code=200, content=b"[]")
+        jobs.json.return_value = []
+        mock_get.side_effect = [stream, jobs]
+        stages = []
+        consumer = threading.Thread(
+            target=lambda: stages.extend(client.iter_stage_records("app-123"))
+        )
+
+        consumer.start()
+        while client.get_limiter_stats()["in_flight"] == 0:
+            time.sleep(0.01)
+        # Waits for the stream to be read and closed, beyond its own timeout
+        self.assertEqual(client.list_jobs("app-123"), [])
+        consumer.join()
+
+        self.assertEqual(len(stages), 3)
+        self.assertEqual(client.get_limiter_stats()["in_flight"], 0)
+
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
+    def test_iter_stage_tasks(self, mock_get):
+        mock_get.return_value = _stream_response(
+            [
+                {
+                    "taskId": 1,
+                    "index": 0,
+                    "attempt": 0,
+                    "host": "worker-1",
+                    "status": "SUCCESS",
+                    "speculative": False,
+                }
+            ]
+        )
+
+        tasks = list(self.client.iter_stage_tasks("app-123", 1, 0, length=100))
+
+        self.assertEqual([task.task_id for task in tasks], [1])
+        self.assertEqual(
+            mock_get.call_args[0][0],
+            "http://spark-history-server:18080/api/v1/applications/app-123/stages/1/0/taskList",
+        )
+        self.assertEqual(mock_get.call_args[1]["params"]["length"], 100)
+
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
+    def test_iter_stages_served_from_cache(self, mock_get):
+        client = SparkRestClient(
+            ServerConfig(url="http://spark-history-server:18080", cache_ttl=10)
+        )
+        mock_get.side_effect = [
+            _json_response(self.stages),
+            _json_response(_application("app-123", completed=True)),
+        ]
+        client.list_stages("app-123")
+
+        stages = list(client.iter_stages("app-123"))
+
+        self.assertEqual([stage.stage_id for stage in stages], [0, 1, 2])
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
+    def test_scan_stages(self, mock_get):
+        mock_get.return_value = _stream_response(self.stages)
+        async_client = AsyncSparkRestClient(self.client)
+
+        count = asyncio.run(
+            async_client.scan_stages(lambda stages: sum(1 for _ in stages), "app-123")
+        )
+
+        self.assertEqual(count, 3)
+
+
+class TestSparkClientDecoding(unittest.TestCase):
+    def setUp(self):
+        self.client = SparkRestClient(
+            ServerConfig(url="http://spark-history-server:18080")
+        )
+
+    def test_bulk_list_parsing_matches_per_item_validation(self):
+        data = [
+            {
+                "taskId": i,
+                "index": i,
+                "attempt": 0,
+                "launchTime": "2023-01-01T12:34:56.789GMT",
+                "host": "worker-1",
+                "status": "SUCCESS",
+                "speculative": False,
+                "taskMetrics": {"executorRunTime": 100, "inputMetrics": {}},
+            }
+            for i in range(3)
+        ]
+
+        tasks = self.client._parse_model_list(data, TaskData)
+
+        self.assertEqual(tasks, [TaskData.model_validate(item) for item in data])
+        self.assertEqual(
+            tasks[0].launch_time,
+            datetime(2023, 1, 1, 12, 34, 56, 789000, tzinfo=timezone.utc),
+        )
+        self.assertEqual(tasks[2].task_metrics.executor_run_time, 100)
+
+    def test_bulk_list_parsing_reports_invalid_items(self):
+        with self.assertRaises(ValidationError):
+            self.client._parse_model_list([{"taskId": 1}], TaskData)
+
+    def test_projected_list_parsing(self):
+        data = [
+            {
+                "stageId": 1,
+                "status": "COMPLETE",
+                "submissionTime": "2023-01-01T12:34:56.789GMT",
+                "executorRunTime": 100,
+                "tasks": {"not": "a task"},
+            }
+        ]
+
+        [stage] = self.client._parse_model_list(
+            data, StageData, ["stage_id", "submissionTime"]
+        )
+
+        self.assertIsInstance(stage, StageData)
+        self.assertEqual(stage.stage_id, 1)
+        self.assertEqual(
+            stage.submission_time,
+            datetime(2023, 1, 1, 12, 34, 56, 789000, tzinfo=timezone.utc),
+        )
+        # Other fields, even required or invalid ones, are neither parsed nor returned
+        self.assertIsNone(stage.executor_run_time)
+        self.assertEqual(
+            stage.model_dump(by_alias=True),
+            {"stageId": 1, "submissionTime": stage.submission_time},
+        )
+
+    def test_projected_list_parsing_rejects_unknown_fields(self):
+        with self.assertRaisesRegex(ValueError, "StageData has no field foo"):
+            self.client._parse_model_list([], StageData, ["foo"])
@@ -0,0 +1,143 @@
+import os
+import tempfile
+import time
+import unittest
+
+import requests
+
+from spark_history_mcp.api.spark_client import SparkRestClient
+from spark_history_mcp.config.config import ServerConfig
+from spark_history_mcp.eventlog.history import EventLogHistory
+from spark_history_mcp.testing.recorded import RecordedHistory, record_history
+from spark_history_mcp.testing.stub_server import Faults, StubHistoryServer
+from spark_history_mcp.testing.synthetic import Scale, SyntheticHistory
+
+EVENTS = os.path.join(
+    os.path.dirname(__file__), "..", "..", "examples", "basic", "events"
+)
+APP_ID = "spark-cc4d115f011443d787f03a71a476a745"
+SCALE = Scale(applications=2, jobs=3, stages_per_job=2, tasks_per_stage=30)
+
+
+class TestRecordedHistory(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.synthetic = SyntheticHistory(SCALE)
+        cls.directory = tempfile.TemporaryDirectory()
+        # Recorded through the attempt ID, as from a History Server behind YARN
+        with StubHistoryServer(
+            cls.synthetic, faults=Faults(require_attempt_id=True)
+        ) as server:
+            cls.app_ids = record_history(server.url, cls.directory.name)
+        cls.recorded = RecordedHistory(cls.directory.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_answers_like_the_recorded_server(self):
+        self.assertEqual(self.app_ids, self.synthetic.app_ids[::-1])
+        app = f"applications/{self.app_ids[0]}"
+        for endpoint, params in [
+            ("applications", {"status": ["completed"], "limit": ["1"]}),
+            (app, {}),
+            (f"{app}/1/jobs", {}),
+            (f"{app}/jobs", {"status": ["failed"]}),
+            (f"{app}/jobs/2", {}),
+            (f"{app}/stages", {}),
+            (f"{app}/stages", {"withSummaries": ["true"], "status": ["complete"]}),
+            (f"{app}/stages/3", {}),
+            (f"{app}/stages/3/0", {"details": ["true"]}),
+            (f"{app}/stages/3/0/taskSummary", {}),
+            (
+                f"{app}/stages/3/0/taskList",
+                {"sortBy": ["-runtime"], "offset": ["5"], "length": ["10"]},
+            ),
+            (f"{app}/allexecutors", {}),
+            (f"{app}/environment", {}),
+            (f"{app}/sql", {"details": ["false"], "offset": ["2"], "length": ["5"]}),
+            (f"{app}/sql/4", {}),
+        ]:
+            with self.subTest(endpoint=endpoint, params=params):
+                self.assertEqual(
+                    self.recorded.get(endpoint, params),
+                    self.synthetic.get(endpoint, params),
+                )
+
+    def test_unknown_resources(self):
+        app = f"applications/{self.app_ids[0]}"
+        for endpoint in [
+            "applications/app-20240501000000-0042",
+            f"{app}/2/jobs",
+            f"{app}/jobs/42",
+            f"{app}/stages/3/1",
+            f"{app}/storage/rdd",
+        ]:
+            with self.subTest(endpoint=endpoint):
+                with self.assertRaises(LookupError):
+                    self.recorded.get(endpoint)
+
+    def test_missing_fixtures(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaisesRegex(FileNotFoundError, "record-fixtures"):
+                RecordedHistory(directory)
+
+
+class TestEventLogStub(unittest.TestCase):
+    def test_serves_the_example_event_logs(self):
+        with StubHistoryServer(EventLogHistory(EVENTS)) as server:
+            client = SparkRestClient(ServerConfig(url=server.url))
+            app = client.get_application(APP_ID)
+            jobs = client.list_jobs(APP_ID)
+
+        self.assertEqual(app.id, APP_ID)
+        self.assertEqual(len(jobs), 6)
+
+
+class TestFaults(unittest.TestCase):
+    def setUp(self):
+        self.history = SyntheticHistory(SCALE)
+        self.app_id = self.history.app_ids[0]
+
+    def serve(self, faults: Faults, **config) -> StubHistoryServer:
+        server = StubHistoryServer(self.history, faults=faults).start()
+        self.addCleanup(server.stop)
+        self.client = SparkRestClient(ServerConfig(url=server.url, **config))
+        return server
+
+    def test_server_errors(self):
+        self.serve(Faults(error_rate=1, seed=0), retries=0)
+
+        with self.assertRaises(requests.exceptions.HTTPError) as cm:
+            self.client.list_jobs(self.app_id)
+
+        self.assertIn(cm.exception.response.status_code, (500, 502, 503))
+
+    def test_out_of_memory(self):
+        self.serve(Faults(oom_pattern="taskList$"))
+
+        self.assertTrue(self.client.list_jobs(self.app_id))
+        with self.assertRaises(requests.exceptions.HTTPError) as cm:
+            self.client.list_stage_tasks(self.app_id, 0, 0)
+
+        self.assertEqual(cm.exception.response.status_code, 500)
+        self.assertIn("OutOfMemoryError", cm.exception.response.text)
+
+    def test_require_attempt_id(self):
+        server = self.serve(Faults(require_attempt_id=True))
+
+        jobs = self.client.list_jobs(self.app_id)
+
+        self.assertEqual(len(jobs), SCALE.jobs)
+        self.assertIn((f"applications/{self.app_id}/jobs", 404), server.requests)
+        self.assertEqual(
+            server.requests[-1], (f"applications/{self.app_id}/1/jobs", 200)
+        )
+
+    def test_latency(self):
+        self.serve(Faults(latency=0.05, latency_jitter=0.05, seed=0))
+
+        start = time.perf_counter()
+        self.client.get_application(self.app_id)
+
+        self.assertGreaterEqual(time.perf_counter() - start, 0.05)
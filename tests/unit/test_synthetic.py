@@ -0,0 +1,128 @@
+import dataclasses
+import unittest
+
+import requests
+
+from spark_history_mcp.api.spark_client import SparkRestClient
+from spark_history_mcp.config.config import ServerConfig
+from spark_history_mcp.models.spark_types import StageStatus, TaskStatus
+from spark_history_mcp.testing.stub_server import StubHistoryServer
+from spark_history_mcp.testing.synthetic import Scale, SyntheticHistory
+
+SCALE = Scale(applications=2, jobs=4, stages_per_job=2, tasks_per_stage=50)
+
+
+class TestSyntheticHistory(unittest.TestCase):
+    def setUp(self):
+        self.history = SyntheticHistory(SCALE)
+        self.app_id = self.history.app_ids[0]
+
+    def test_deterministic(self):
+        endpoint = f"applications/{self.app_id}/stages/3/0/taskList"
+        params = {"length": ["10"]}
+
+        self.assertEqual(
+            SyntheticHistory(SCALE).get(endpoint, params),
+            self.history.get(endpoint, params),
+        )
+        self.assertNotEqual(
+            SyntheticHistory(dataclasses.replace(SCALE, seed=1)).get(endpoint, params),
+            self.history.get(endpoint, params),
+        )
+
+    def test_stages_add_up_their_tasks(self):
+        stages = self.history.get(f"applications/{self.app_id}/stages")
+        # Newest first
+        self.assertEqual([s["stageId"] for s in stages], list(range(7, -1, -1)))
+
+        stage = stages[0]
+        tasks = self.history.get(
+            f"applications/{self.app_id}/stages/7/0/taskList", {"length": ["100"]}
+        )
+        self.assertEqual(len(tasks), stage["numTasks"])
+        self.assertEqual(
+            sum(t["taskMetrics"]["executorRunTime"] for t in tasks),
+            stage["executorRunTime"],
+        )
+
+    def test_task_list_paging_and_sorting(self):
+        endpoint = f"applications/{self.app_id}/stages/0/0/taskList"
+
+        page = self.history.get(endpoint, {"offset": ["10"], "length": ["5"]})
+        self.assertEqual([t["index"] for t in page], [10, 11, 12, 13, 14])
+
+        slowest = self.history.get(endpoint, {"sortBy": ["-runtime"]})
+        run_times = [t["taskMetrics"]["executorRunTime"] for t in slowest]
+        self.assertEqual(run_times, sorted(run_times, reverse=True))
+
+        with self.assertRaises(ValueError):
+            self.history.get(endpoint, {"sortBy": ["size"]})
+
+    def test_attempt_ids_are_optional(self):
+        jobs = self.history.get(f"applications/{self.app_id}/jobs")
+
+        self.assertEqual(self.history.get(f"applications/{self.app_id}/1/jobs"), jobs)
+        self.assertEqual(
+            self.history.get(f"applications/{self.app_id}/1")["attemptId"], "1"
+        )
+
+    def test_unknown_resources(self):
+        for endpoint in [
+            "applications/app-20240501000000-0042",
+            f"applications/{self.app_id}/jobs/4",
+            f"applications/{self.app_id}/2/jobs",
+            f"applications/{self.app_id}/stages/1/1",
+            f"applications/{self.app_id}/storage/rdd",
+        ]:
+            with self.subTest(endpoint=endpoint):
+                with self.assertRaises(LookupError):
+                    self.history.get(endpoint)
+
+
+class TestStubHistoryServer(unittest.TestCase):
+    def setUp(self):
+        self.history = SyntheticHistory(SCALE)
+        self.server = StubHistoryServer(self.history).start()
+        self.addCleanup(self.server.stop)
+        self.client = SparkRestClient(ServerConfig(url=self.server.url))
+        self.app_id = self.history.app_ids[1]
+
+    def test_responses_parse_into_models(self):
+        apps = self.client.list_applications()
+        self.assertEqual([app.id for app in apps], self.history.app_ids[::-1])
+
+        jobs = self.client.list_jobs(self.app_id)
+        self.assertEqual(len(jobs), SCALE.jobs)
+
+        stages = self.client.list_stages(
+            self.app_id, status=[StageStatus.COMPLETE], with_summaries=True
+        )
+        self.assertTrue(stages)
+        self.assertEqual(
+            stages[0].task_metrics_distributions.quantiles,
+            [0.05, 0.25, 0.5, 0.75, 0.95],
+        )
+
+        tasks = self.client.list_stage_tasks(
+            self.app_id, 1, 0, length=100, status=[TaskStatus.SUCCESS]
+        )
+        self.assertEqual(len(tasks), SCALE.tasks_per_stage)
+
+        executors = self.client.list_all_executors(self.app_id)
+        self.assertEqual(len(executors), SCALE.executors + 1)
+        self.assertLess(len(self.client.list_executors(self.app_id)), len(executors))
+
+        environment = self.client.get_environment(self.app_id)
+        self.assertIn(("spark.app.id", self.app_id), list(environment.spark_properties))
+
+        executions = self.client.get_sql_list(self.app_id, length=100)
+        self.assertEqual(len(executions), SCALE.sql_executions)
+        execution = self.client.get_sql_execution(self.app_id, 3)
+        self.assertIn("== Physical Plan ==", execution.plan_description)
+        self.assertEqual(len(execution.edges), len(execution.nodes) - 1)
+
+    def test_unknown_resources_are_404(self):
+        with self.assertRaises(requests.exceptions.HTTPError) as cm:
+            self.client.get_application("app-20240501000000-0042")
+
+        self.assertEqual(cm.exception.response.status_code, 404)
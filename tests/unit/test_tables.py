@@ -0,0 +1,112 @@
+import heapq
+import unittest
+from datetime import datetime, timezone
+
+import numpy as np
+
+from spark_history_mcp.models.spark_types import ExecutorSummary, StageData
+from spark_history_mcp.models.tables import ExecutorTable, StageTable, to_datetime
+
+
+def _stage_record(stage_id, status="COMPLETE", spilled=None, completed=True):
+    record = {
+        "status": status,
+        "stageId": stage_id,
+        "attemptId": 0,
+        "name": f"stage {stage_id}",
+        "details": "",
+        "firstTaskLaunchedTime": "2024-01-01T00:00:00.000GMT",
+    }
+    if completed:
+        record["completionTime"] = f"2024-01-01T00:00:{stage_id % 60:02d}.500GMT"
+    if spilled is not None:
+        record["memoryBytesSpilled"] = spilled
+    return record
+
+
+class TestTables(unittest.TestCase):
+    def test_records_and_models_give_the_same_columns(self):
+        records = [_stage_record(1, spilled=10), _stage_record(2, completed=False)]
+        columns = ["stage_id", "name", "memory_bytes_spilled", "completion_time"]
+
+        from_records = StageTable.from_records(records, columns)
+        from_models = StageTable.from_records(
+            [StageData.model_validate(r) for r in records], columns
+        )
+
+        for column in columns:
+            np.testing.assert_array_equal(from_records[column], from_models[column])
+        self.assertEqual(len(from_records), 2)
+        np.testing.assert_array_equal(from_records["memory_bytes_spilled"], [10, 0])
+        self.assertEqual(
+            to_datetime(from_records["completion_time"][0]),
+            datetime(2024, 1, 1, 0, 0, 1, 500000, tzinfo=timezone.utc),
+        )
+        self.assertIsNone(to_datetime(from_records["completion_time"][1]))
+
+    def test_nested_columns(self):
+        executor = {
+            "id": "1",
+            "isActive": True,
+            "memoryMetrics": {"usedOnHeapStorageMemory": 100},
+            "attributes": {},
+            "resources": {},
+        }
+        records = [executor, dict(executor, id="2", memoryMetrics=None)]
+
+        table = ExecutorTable.from_records(
+            records, ["is_active", "memory_metrics.used_on_heap_storage_memory"]
+        )
+
+        np.testing.assert_array_equal(table["is_active"], [True, True])
+        np.testing.assert_array_equal(
+            table["memory_metrics.used_on_heap_storage_memory"], [100, 0]
+        )
+        self.assertEqual(
+            ExecutorTable.from_records(
+                [ExecutorSummary.model_validate(executor)], ["is_active"]
+            )["is_active"].tolist(),
+            [True],
+        )
+
+    def test_invalid_columns(self):
+        with self.assertRaises(ValueError):
+            StageTable.from_records([], ["no_such_field"])
+        with self.assertRaises(ValueError):
+            StageTable.from_records([], ["accumulator_updates"])
+
+    def test_top_n_skips_nan_and_keeps_row_order_on_ties(self):
+        table = StageTable.from_records([{}] * 5, [])
+
+        indices = table.top_n(np.array([1.0, np.nan, 3.0, 1.0, 3.0]), 4)
+
+        self.assertEqual(indices.tolist(), [2, 4, 0, 3])
+
+    def test_nlargest_matches_heapq_across_batches(self):
+        records = [
+            _stage_record(i, spilled=(i * 7919) % 101, completed=i % 5 != 0)
+            for i in range(50)
+        ]
+
+        scored = []
+
+        def score(table):
+            scored.extend(table["stage_id"].tolist())
+            return table["memory_bytes_spilled"].astype(float)
+
+        [top] = StageTable.nlargest(
+            records, 6, [score], ["stage_id", "memory_bytes_spilled"], batch_size=7
+        )
+
+        # Every record is scored exactly once
+        self.assertEqual(scored, list(range(50)))
+        expected = heapq.nlargest(6, records, key=lambda r: r["memoryBytesSpilled"])
+        self.assertEqual(top.records, expected)
+        self.assertEqual(
+            [stage.stage_id for stage in top.models()],
+            [r["stageId"] for r in expected],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
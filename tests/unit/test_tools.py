@@ -7,12 +7,16 @@ from spark_history_mcp.models.spark_types import (
     ApplicationInfo,
     ExecutionData,
     JobData,
+    JobExecutionStatus,
     StageData,
     TaskMetricDistributions,
 )
 from spark_history_mcp.tools.tools import (
+    compare_job_performance,
     get_application,
     get_client_or_default,
+    get_job_bottlenecks,
+    get_resource_usage_timeline,
     get_stage,
     get_stage_task_summary,
     list_applications,
@@ -24,7 +28,13 @@ from spark_history_mcp.tools.tools import (
 )
 
 
-class TestTools(unittest.TestCase):
+def _executions_by_id(executions):
+    """Mock get_sql_execution returning the given executions by ID."""
+    by_id = {execution.id: execution for execution in executions}
+    return lambda app_id, execution_id, **kwargs: by_id[execution_id]
+
+
+class TestTools(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
         # Create mock context
         self.mock_ctx = MagicMock()
@@ -92,7 +102,7 @@ class TestTools(unittest.TestCase):
         self.assertIn("No Spark client found", str(context.exception))
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_get_slowest_jobs_empty(self, mock_get_client):
+    async def test_get_slowest_jobs_empty(self, mock_get_client):
         """Test list_slowest_jobs when no jobs are found"""
         # Setup mock client
         mock_client = MagicMock()
@@ -100,14 +110,22 @@ class TestTools(unittest.TestCase):
         mock_get_client.return_value = mock_client
 
         # Call the function
-        result = list_slowest_jobs("app-123", n=3)
+        result = await list_slowest_jobs("app-123", n=3)
 
-        # Verify results
+        # Verify results, with running jobs filtered out by the server
         self.assertEqual(result, [])
-        mock_client.list_jobs.assert_called_once_with(app_id="app-123")
+        mock_client.list_jobs.assert_called_once_with(
+            app_id="app-123",
+            status=[
+                JobExecutionStatus.FAILED,
+                JobExecutionStatus.SUCCEEDED,
+                JobExecutionStatus.UNKNOWN,
+            ],
+            fields=None,
+        )
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_get_slowest_jobs_exclude_running(self, mock_get_client):
+    async def test_get_slowest_jobs_exclude_running(self, mock_get_client):
         """Test list_slowest_jobs excluding running jobs"""
         # Setup mock client and jobs
         mock_client = MagicMock()
@@ -137,7 +155,7 @@ class TestTools(unittest.TestCase):
         mock_get_client.return_value = mock_client
 
         # Call the function with include_running=False (default)
-        result = list_slowest_jobs("app-123", n=2)
+        result = await list_slowest_jobs("app-123", n=2)
 
         # Verify results - should return job3 and job2 (in that order)
         self.assertEqual(len(result), 2)
@@ -148,7 +166,7 @@ class TestTools(unittest.TestCase):
         self.assertNotIn(job1, result)
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_get_slowest_jobs_include_running(self, mock_get_client):
+    async def test_get_slowest_jobs_include_running(self, mock_get_client):
         """Test list_slowest_jobs including running jobs"""
         # Setup mock client and jobs
         mock_client = MagicMock()
@@ -175,7 +193,7 @@ class TestTools(unittest.TestCase):
         mock_get_client.return_value = mock_client
 
         # Call the function with include_running=True
-        result = list_slowest_jobs("app-123", include_running=True, n=2)
+        result = await list_slowest_jobs("app-123", include_running=True, n=2)
 
         # Verify results - should include the running job
         self.assertEqual(len(result), 2)
@@ -185,7 +203,7 @@ class TestTools(unittest.TestCase):
         self.assertEqual(result[1], job2)
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_get_slowest_jobs_limit_results(self, mock_get_client):
+    async def test_get_slowest_jobs_limit_results(self, mock_get_client):
         """Test list_slowest_jobs limits results to n"""
         # Setup mock client and jobs
         mock_client = MagicMock()
@@ -204,13 +222,13 @@ class TestTools(unittest.TestCase):
         mock_get_client.return_value = mock_client
 
         # Call the function with n=3
-        result = list_slowest_jobs("app-123", n=3)
+        result = await list_slowest_jobs("app-123", n=3)
 
         # Verify results - should return only 3 jobs
         self.assertEqual(len(result), 3)
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_get_stage_with_attempt_id(self, mock_get_client):
+    async def test_get_stage_with_attempt_id(self, mock_get_client):
         """Test get_stage with a specific attempt ID"""
         # Setup mock client
         mock_client = MagicMock()
@@ -222,7 +240,7 @@ class TestTools(unittest.TestCase):
         mock_get_client.return_value = mock_client
 
         # Call the function with attempt_id
-        result = get_stage("app-123", stage_id=1, attempt_id=0)
+        result = await get_stage("app-123", stage_id=1, attempt_id=0)
 
         # Verify results
         self.assertEqual(result, mock_stage)
@@ -235,7 +253,7 @@ class TestTools(unittest.TestCase):
         )
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_get_stage_without_attempt_id_single_stage(self, mock_get_client):
+    async def test_get_stage_without_attempt_id_single_stage(self, mock_get_client):
         """Test get_stage without attempt ID when a single stage is returned"""
         # Setup mock client
         mock_client = MagicMock()
@@ -247,7 +265,7 @@ class TestTools(unittest.TestCase):
         mock_get_client.return_value = mock_client
 
         # Call the function without attempt_id
-        result = get_stage("app-123", stage_id=1)
+        result = await get_stage("app-123", stage_id=1)
 
         # Verify results
         self.assertEqual(result, mock_stage)
@@ -259,7 +277,7 @@ class TestTools(unittest.TestCase):
         )
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_get_stage_without_attempt_id_multiple_stages(self, mock_get_client):
+    async def test_get_stage_without_attempt_id_multiple_stages(self, mock_get_client):
         """Test get_stage without attempt ID when multiple stages are returned"""
         # Setup mock client
         mock_client = MagicMock()
@@ -277,7 +295,7 @@ class TestTools(unittest.TestCase):
         mock_get_client.return_value = mock_client
 
         # Call the function without attempt_id
-        result = get_stage("app-123", stage_id=1)
+        result = await get_stage("app-123", stage_id=1)
 
         # Verify results - should return the stage with highest attempt_id
         self.assertEqual(result, mock_stage2)
@@ -289,7 +307,7 @@ class TestTools(unittest.TestCase):
         )
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_get_stage_with_summaries_missing_metrics(self, mock_get_client):
+    async def test_get_stage_with_summaries_missing_metrics(self, mock_get_client):
         """Test get_stage with summaries when metrics distributions are missing"""
         # Setup mock client
         mock_client = MagicMock()
@@ -306,7 +324,9 @@ class TestTools(unittest.TestCase):
         mock_get_client.return_value = mock_client
 
         # Call the function with with_summaries=True
-        result = get_stage("app-123", stage_id=1, attempt_id=0, with_summaries=True)
+        result = await get_stage(
+            "app-123", stage_id=1, attempt_id=0, with_summaries=True
+        )
 
         # Verify results
         self.assertEqual(result, mock_stage)
@@ -327,7 +347,7 @@ class TestTools(unittest.TestCase):
         )
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_get_stage_no_stages_found(self, mock_get_client):
+    async def test_get_stage_no_stages_found(self, mock_get_client):
         """Test get_stage when no stages are found"""
         # Setup mock client
         mock_client = MagicMock()
@@ -335,13 +355,13 @@ class TestTools(unittest.TestCase):
         mock_get_client.return_value = mock_client
 
         with self.assertRaises(ValueError) as context:
-            get_stage("app-123", stage_id=1)
+            await get_stage("app-123", stage_id=1)
 
         self.assertIn("No stage found with ID 1", str(context.exception))
 
     # Tests for get_application tool
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_get_application_success(self, mock_get_client):
+    async def test_get_application_success(self, mock_get_client):
         """Test successful application retrieval"""
         # Setup mock client
         mock_client = MagicMock()
@@ -352,7 +372,7 @@ class TestTools(unittest.TestCase):
         mock_get_client.return_value = mock_client
 
         # Call the function
-        result = get_application("spark-app-123")
+        result = await get_application("spark-app-123")
 
         # Verify results
         self.assertEqual(result, mock_app)
@@ -360,7 +380,7 @@ class TestTools(unittest.TestCase):
         mock_get_client.assert_called_once_with(unittest.mock.ANY, None)
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_get_application_with_server(self, mock_get_client):
+    async def test_get_application_with_server(self, mock_get_client):
         """Test application retrieval with specific server"""
         # Setup mock client
         mock_client = MagicMock()
@@ -369,13 +389,13 @@ class TestTools(unittest.TestCase):
         mock_get_client.return_value = mock_client
 
         # Call the function with server
-        get_application("spark-app-123", server="production")
+        await get_application("spark-app-123", server="production")
 
         # Verify server parameter is passed
         mock_get_client.assert_called_once_with(unittest.mock.ANY, "production")
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_get_application_not_found(self, mock_get_client):
+    async def test_get_application_not_found(self, mock_get_client):
         """Test application retrieval when app doesn't exist"""
         # Setup mock client to raise exception
         mock_client = MagicMock()
@@ -384,13 +404,13 @@ class TestTools(unittest.TestCase):
 
         # Verify exception is propagated
         with self.assertRaises(Exception) as context:
-            get_application("non-existent-app")
+            await get_application("non-existent-app")
 
         self.assertIn("Application not found", str(context.exception))
 
     # Tests for list_applications tool
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_list_applications_no_filter(self, mock_get_client):
+    async def test_list_applications_no_filter(self, mock_get_client):
         """Test application listing without filters"""
         # Setup mock client
         mock_client = MagicMock()
@@ -401,7 +421,7 @@ class TestTools(unittest.TestCase):
         mock_get_client.return_value = mock_client
 
         # Call the function
-        result = list_applications()
+        result = await list_applications()
 
         # Verify results
         self.assertEqual(result, mock_apps)
@@ -415,7 +435,7 @@ class TestTools(unittest.TestCase):
         )
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_list_applications_with_filters(self, mock_get_client):
+    async def test_list_applications_with_filters(self, mock_get_client):
         """Test application listing with filters"""
         # Setup mock client
         mock_client = MagicMock()
@@ -425,7 +445,7 @@ class TestTools(unittest.TestCase):
         mock_get_client.return_value = mock_client
 
         # Call with filters
-        result = list_applications(
+        result = await list_applications(
             status=["COMPLETED"], min_date="2024-01-01", limit=10
         )
 
@@ -441,7 +461,7 @@ class TestTools(unittest.TestCase):
         )
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_list_applications_empty_result(self, mock_get_client):
+    async def test_list_applications_empty_result(self, mock_get_client):
         """Test application listing with empty result"""
         # Setup mock client
         mock_client = MagicMock()
@@ -449,13 +469,13 @@ class TestTools(unittest.TestCase):
         mock_get_client.return_value = mock_client
 
         # Call the function
-        result = list_applications()
+        result = await list_applications()
 
         # Verify results
         self.assertEqual(result, [])
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_list_applications_with_server(self, mock_get_client):
+    async def test_list_applications_with_server(self, mock_get_client):
         """Test application listing with specific server"""
         # Setup mock client
         mock_client = MagicMock()
@@ -464,14 +484,14 @@ class TestTools(unittest.TestCase):
         mock_get_client.return_value = mock_client
 
         # Call with server
-        list_applications(server="production")
+        await list_applications(server="production")
 
         # Verify server parameter is passed
         mock_get_client.assert_called_once_with(unittest.mock.ANY, "production")
 
     # Tests for list_jobs tool
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_list_jobs_no_filter(self, mock_get_client):
+    async def test_list_jobs_no_filter(self, mock_get_client):
         """Test job retrieval without status filter"""
         # Setup mock client
         mock_client = MagicMock()
@@ -480,16 +500,16 @@ class TestTools(unittest.TestCase):
         mock_get_client.return_value = mock_client
 
         # Call the function
-        result = list_jobs("spark-app-123")
+        result = await list_jobs("spark-app-123")
 
         # Verify results
         self.assertEqual(result, mock_jobs)
         mock_client.list_jobs.assert_called_once_with(
-            app_id="spark-app-123", status=None
+            app_id="spark-app-123", status=None, fields=None
         )
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_list_jobs_with_status_filter(self, mock_get_client):
+    async def test_list_jobs_with_status_filter(self, mock_get_client):
         """Test job retrieval with status filter"""
         # Setup mock client
         mock_client = MagicMock()
@@ -499,14 +519,14 @@ class TestTools(unittest.TestCase):
         mock_get_client.return_value = mock_client
 
         # Call the function with status filter
-        result = list_jobs("spark-app-123", status=["SUCCEEDED"])
+        result = await list_jobs("spark-app-123", status=["SUCCEEDED"])
 
         # Verify results
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0].status, "SUCCEEDED")
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_list_jobs_empty_result(self, mock_get_client):
+    async def test_list_jobs_empty_result(self, mock_get_client):
         """Test job retrieval with empty result"""
         # Setup mock client
         mock_client = MagicMock()
@@ -514,13 +534,13 @@ class TestTools(unittest.TestCase):
         mock_get_client.return_value = mock_client
 
         # Call the function
-        result = list_jobs("spark-app-123")
+        result = await list_jobs("spark-app-123")
 
         # Verify results
         self.assertEqual(result, [])
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_list_jobs_status_filtering(self, mock_get_client):
+    async def test_list_jobs_status_filtering(self, mock_get_client):
         """Test job status filtering logic"""
         # Setup mock client
         mock_client = MagicMock()
@@ -538,7 +558,7 @@ class TestTools(unittest.TestCase):
         mock_get_client.return_value = mock_client
 
         # Test filtering for SUCCEEDED jobs
-        result = list_jobs("spark-app-123", status=["SUCCEEDED"])
+        result = await list_jobs("spark-app-123", status=["SUCCEEDED"])
 
         # Should only return SUCCEEDED job
         self.assertEqual(len(result), 1)
@@ -546,7 +566,7 @@ class TestTools(unittest.TestCase):
 
     # Tests for list_stages tool
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_get_stages_no_filter(self, mock_get_client):
+    async def test_get_stages_no_filter(self, mock_get_client):
         """Test stage retrieval without filters"""
         # Setup mock client
         mock_client = MagicMock()
@@ -555,16 +575,19 @@ class TestTools(unittest.TestCase):
         mock_get_client.return_value = mock_client
 
         # Call the function
-        result = list_stages("spark-app-123")
+        result = await list_stages("spark-app-123")
 
         # Verify results
         self.assertEqual(result, mock_stages)
         mock_client.list_stages.assert_called_once_with(
-            app_id="spark-app-123", status=None, with_summaries=False
+            app_id="spark-app-123",
+            status=None,
+            with_summaries=False,
+            fields=None,
         )
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_get_stages_with_status_filter(self, mock_get_client):
+    async def test_get_stages_with_status_filter(self, mock_get_client):
         """Test stage retrieval with status filter"""
         # Setup mock client
         mock_client = MagicMock()
@@ -582,14 +605,14 @@ class TestTools(unittest.TestCase):
         mock_get_client.return_value = mock_client
 
         # Call with status filter
-        result = list_stages("spark-app-123", status=["COMPLETE"])
+        result = await list_stages("spark-app-123", status=["COMPLETE"])
 
         # Should only return COMPLETE stage
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0].status, "COMPLETE")
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_get_stages_with_summaries(self, mock_get_client):
+    async def test_get_stages_with_summaries(self, mock_get_client):
         """Test stage retrieval with summaries enabled"""
         # Setup mock client
         mock_client = MagicMock()
@@ -598,15 +621,34 @@ class TestTools(unittest.TestCase):
         mock_get_client.return_value = mock_client
 
         # Call with summaries enabled
-        list_stages("spark-app-123", with_summaries=True)
+        await list_stages("spark-app-123", with_summaries=True)
 
         # Verify summaries parameter is passed
         mock_client.list_stages.assert_called_once_with(
-            app_id="spark-app-123", status=None, with_summaries=True
+            app_id="spark-app-123",
+            status=None,
+            with_summaries=True,
+            fields=None,
         )
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_get_stages_empty_result(self, mock_get_client):
+    async def test_get_stages_with_fields(self, mock_get_client):
+        """Test stage retrieval projected onto a few fields"""
+        mock_client = MagicMock()
+        mock_client.list_stages.return_value = []
+        mock_get_client.return_value = mock_client
+
+        await list_stages("spark-app-123", fields=["stage_id", "name"])
+
+        mock_client.list_stages.assert_called_once_with(
+            app_id="spark-app-123",
+            status=None,
+            with_summaries=False,
+            fields=["stage_id", "name"],
+        )
+
+    @patch("spark_history_mcp.tools.tools.get_client_or_default")
+    async def test_get_stages_empty_result(self, mock_get_client):
         """Test stage retrieval with empty result"""
         # Setup mock client
         mock_client = MagicMock()
@@ -614,14 +656,14 @@ class TestTools(unittest.TestCase):
         mock_get_client.return_value = mock_client
 
         # Call the function
-        result = list_stages("spark-app-123")
+        result = await list_stages("spark-app-123")
 
         # Verify results
         self.assertEqual(result, [])
 
     # Tests for get_stage_task_summary tool
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_get_stage_task_summary_success(self, mock_get_client):
+    async def test_get_stage_task_summary_success(self, mock_get_client):
         """Test successful stage task summary retrieval"""
         # Setup mock client
         mock_client = MagicMock()
@@ -630,7 +672,7 @@ class TestTools(unittest.TestCase):
         mock_get_client.return_value = mock_client
 
         # Call the function
-        result = get_stage_task_summary("spark-app-123", 1, 0)
+        result = await get_stage_task_summary("spark-app-123", 1, 0)
 
         # Verify results
         self.assertEqual(result, mock_summary)
@@ -642,7 +684,7 @@ class TestTools(unittest.TestCase):
         )
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_get_stage_task_summary_with_quantiles(self, mock_get_client):
+    async def test_get_stage_task_summary_with_quantiles(self, mock_get_client):
         """Test stage task summary with custom quantiles"""
         # Setup mock client
         mock_client = MagicMock()
@@ -651,7 +693,7 @@ class TestTools(unittest.TestCase):
         mock_get_client.return_value = mock_client
 
         # Call with custom quantiles
-        get_stage_task_summary("spark-app-123", 1, 0, quantiles="0.25,0.5,0.75")
+        await get_stage_task_summary("spark-app-123", 1, 0, quantiles="0.25,0.5,0.75")
 
         # Verify quantiles parameter is passed
         mock_client.get_stage_task_summary.assert_called_once_with(
@@ -659,7 +701,7 @@ class TestTools(unittest.TestCase):
         )
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_get_stage_task_summary_not_found(self, mock_get_client):
+    async def test_get_stage_task_summary_not_found(self, mock_get_client):
         """Test stage task summary when stage doesn't exist"""
         # Setup mock client to raise exception
         mock_client = MagicMock()
@@ -668,13 +710,15 @@ class TestTools(unittest.TestCase):
 
         # Verify exception is propagated
         with self.assertRaises(Exception) as context:
-            get_stage_task_summary("spark-app-123", 999, 0)
+            await get_stage_task_summary("spark-app-123", 999, 0)
 
         self.assertIn("Stage not found", str(context.exception))
 
     # Tests for list_slowest_stages tool
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_list_slowest_stages_execution_time_vs_total_time(self, mock_get_client):
+    async def test_list_slowest_stages_execution_time_vs_total_time(
+        self, mock_get_client
+    ):
         """Test that list_slowest_stages prioritizes execution time over total stage duration"""
         mock_client = MagicMock()
 
@@ -706,11 +750,11 @@ class TestTools(unittest.TestCase):
         stage_b.completion_time = datetime.now()
         # Execution time: 7 minutes (first_task_launched to completion)
 
-        mock_client.list_stages.return_value = [stage_a, stage_b]
+        mock_client.iter_stage_records.return_value = [stage_a, stage_b]
         mock_get_client.return_value = mock_client
 
         # Call the function
-        result = list_slowest_stages("app-123", n=2)
+        result = await list_slowest_stages("app-123", n=2)
 
         # Verify results - Stage B should be first (longer execution time: 7 min vs 5 min)
         # even though Stage A has longer total duration (10 min vs 8 min)
@@ -719,7 +763,7 @@ class TestTools(unittest.TestCase):
         self.assertEqual(result[1], stage_a)  # Stage A second (5 min execution)
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_list_slowest_stages_exclude_running(self, mock_get_client):
+    async def test_list_slowest_stages_exclude_running(self, mock_get_client):
         """Test that list_slowest_stages excludes running stages by default"""
         mock_client = MagicMock()
 
@@ -743,11 +787,11 @@ class TestTools(unittest.TestCase):
         completed_stage.first_task_launched_time = datetime.now() - timedelta(minutes=4)
         completed_stage.completion_time = datetime.now()
 
-        mock_client.list_stages.return_value = [running_stage, completed_stage]
+        mock_client.iter_stage_records.return_value = [running_stage, completed_stage]
         mock_get_client.return_value = mock_client
 
         # Call the function with include_running=False (default)
-        result = list_slowest_stages("app-123", include_running=False, n=2)
+        result = await list_slowest_stages("app-123", include_running=False, n=2)
 
         # Should only return the completed stage
         self.assertEqual(len(result), 1)
@@ -755,7 +799,7 @@ class TestTools(unittest.TestCase):
         self.assertNotIn(running_stage, result)
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_list_slowest_stages_include_running(self, mock_get_client):
+    async def test_list_slowest_stages_include_running(self, mock_get_client):
         """Test that list_slowest_stages includes running stages when requested"""
         mock_client = MagicMock()
 
@@ -779,11 +823,11 @@ class TestTools(unittest.TestCase):
         completed_stage.first_task_launched_time = datetime.now() - timedelta(minutes=4)
         completed_stage.completion_time = datetime.now()
 
-        mock_client.list_stages.return_value = [running_stage, completed_stage]
+        mock_client.iter_stage_records.return_value = [running_stage, completed_stage]
         mock_get_client.return_value = mock_client
 
         # Call the function with include_running=True
-        result = list_slowest_stages("app-123", include_running=True, n=2)
+        result = await list_slowest_stages("app-123", include_running=True, n=2)
 
         # Should include both stages, but running stage will have duration 0
         # so completed stage should be first
@@ -792,7 +836,7 @@ class TestTools(unittest.TestCase):
         self.assertEqual(result[1], running_stage)  # Duration 0
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_list_slowest_stages_missing_timestamps(self, mock_get_client):
+    async def test_list_slowest_stages_missing_timestamps(self, mock_get_client):
         """Test list_slowest_stages handles stages with missing timestamps"""
         # Setup mock client
         mock_client = MagicMock()
@@ -829,7 +873,7 @@ class TestTools(unittest.TestCase):
         valid_stage.first_task_launched_time = datetime.now() - timedelta(minutes=2)
         valid_stage.completion_time = datetime.now()
 
-        mock_client.list_stages.return_value = [
+        mock_client.iter_stage_records.return_value = [
             stage_missing_launch,
             stage_missing_completion,
             valid_stage,
@@ -837,28 +881,28 @@ class TestTools(unittest.TestCase):
         mock_get_client.return_value = mock_client
 
         # Call the function
-        result = list_slowest_stages("app-123", n=3)
+        result = await list_slowest_stages("app-123", n=3)
 
         # Should return valid stage first, others should have duration 0
         self.assertEqual(len(result), 3)
         self.assertEqual(result[0], valid_stage)  # Only one with valid duration
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_list_slowest_stages_empty_result(self, mock_get_client):
+    async def test_list_slowest_stages_empty_result(self, mock_get_client):
         """Test list_slowest_stages with no stages"""
         # Setup mock client
         mock_client = MagicMock()
-        mock_client.list_stages.return_value = []
+        mock_client.iter_stage_records.return_value = []
         mock_get_client.return_value = mock_client
 
         # Call the function
-        result = list_slowest_stages("app-123", n=5)
+        result = await list_slowest_stages("app-123", n=5)
 
         # Should return empty list
         self.assertEqual(result, [])
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_list_slowest_stages_limit_results(self, mock_get_client):
+    async def test_list_slowest_stages_limit_results(self, mock_get_client):
         """Test list_slowest_stages limits results to n"""
         # Setup mock client
         mock_client = MagicMock()
@@ -877,11 +921,11 @@ class TestTools(unittest.TestCase):
             stage.completion_time = datetime.now()
             stages.append(stage)
 
-        mock_client.list_stages.return_value = stages
+        mock_client.iter_stage_records.return_value = stages
         mock_get_client.return_value = mock_client
 
         # Call the function with n=3
-        result = list_slowest_stages("app-123", n=3)
+        result = await list_slowest_stages("app-123", n=3)
 
         # Should return only 3 stages (the ones with longest execution times)
         self.assertEqual(len(result), 3)
@@ -890,9 +934,113 @@ class TestTools(unittest.TestCase):
         self.assertEqual(result[1].stage_id, 3)  # 4 minutes
         self.assertEqual(result[2].stage_id, 2)  # 3 minutes
 
+    @patch("spark_history_mcp.tools.tools.get_client_or_default")
+    async def test_get_job_bottlenecks_scans_stages_once(self, mock_get_client):
+        """Test get_job_bottlenecks finds slow and spilling stages in one stage scan"""
+        mock_client = MagicMock()
+
+        stages = []
+        for i in range(6):
+            stage = MagicMock(spec=StageData)
+            stage.stage_id = i
+            stage.attempt_id = 0
+            stage.name = f"Stage {i}"
+            stage.status = "ACTIVE" if i == 5 else "COMPLETE"
+            stage.num_tasks = 10
+            stage.num_failed_tasks = 0
+            stage.submission_time = datetime.now() - timedelta(minutes=10)
+            stage.first_task_launched_time = datetime.now() - timedelta(minutes=i + 1)
+            stage.completion_time = datetime.now()
+            # Stages 0-2 spill more than 100MB, stage 0 the most
+            stage.memory_bytes_spilled = (300 - i) * 1024 * 1024 if i < 3 else 0
+            stage.disk_bytes_spilled = 0
+            stages.append(stage)
+
+        mock_client.iter_stage_records.return_value = stages
+        mock_client.list_jobs.return_value = []
+        mock_client.list_all_executors.return_value = []
+        mock_get_client.return_value = mock_client
+
+        result = await get_job_bottlenecks("app-123", top_n=2)
+
+        mock_client.iter_stage_records.assert_called_once_with(app_id="app-123")
+        mock_client.list_stages.assert_not_called()
+        mock_client.list_jobs.assert_called_once_with(app_id="app-123")
+        mock_client.list_all_executors.assert_called_once_with(app_id="app-123")
+        slowest = result["performance_bottlenecks"]["slowest_stages"]
+        self.assertEqual([s["stage_id"] for s in slowest], [4, 3])
+        spilled = result["resource_bottlenecks"]["memory_spill_stages"]
+        self.assertEqual([s["stage_id"] for s in spilled], [0, 1])
+        self.assertEqual(spilled[0]["memory_spilled_mb"], 300)
+        # All three spilling stages are counted, not only the top_n listed
+        issues = [r["issue"] for r in result["recommendations"]]
+        self.assertIn("Memory spilling detected in 3 stages", issues)
+
+    @patch("spark_history_mcp.tools.tools.get_client_or_default")
+    async def test_get_resource_usage_timeline(self, mock_get_client):
+        """Test the timeline is built from raw stage records"""
+        mock_client = MagicMock()
+        mock_app = MagicMock()
+        mock_app.name = "Timeline App"
+        mock_client.get_application.return_value = mock_app
+        mock_client.list_all_executors.return_value = []
+        mock_client.iter_stage_records.return_value = [
+            {
+                "status": "COMPLETE",
+                "stageId": 3,
+                "attemptId": 0,
+                "name": "collect",
+                "numTasks": 8,
+                "submissionTime": "2024-01-01T00:00:00.000GMT",
+                "completionTime": "2024-01-01T00:00:02.500GMT",
+            },
+            {
+                "status": "ACTIVE",
+                "stageId": 4,
+                "attemptId": 0,
+                "name": "save",
+                "numTasks": 2,
+                "submissionTime": "2024-01-01T00:00:01.000GMT",
+            },
+        ]
+        mock_get_client.return_value = mock_client
+
+        result = await get_resource_usage_timeline("app-123")
+
+        mock_client.list_stages.assert_not_called()
+        self.assertEqual(result["summary"]["total_events"], 3)
+        self.assertEqual(result["summary"]["stage_executions"], 2)
+        self.assertEqual(result["application_name"], "Timeline App")
+
+    @patch("spark_history_mcp.tools.tools.get_client_or_default")
+    async def test_compare_job_performance_partial_results(self, mock_get_client):
+        """Test compare_job_performance returns what succeeded when a call fails"""
+        mock_client = MagicMock()
+        apps = {}
+        for app_id in ("app-1", "app-2"):
+            apps[app_id] = MagicMock()
+            apps[app_id].name = f"App {app_id}"
+        mock_client.get_application.side_effect = lambda app_id: apps[app_id]
+        mock_client.list_all_executors.return_value = []
+
+        def list_jobs(app_id):
+            if app_id == "app-2":
+                raise ValueError("jobs unavailable")
+            return []
+
+        mock_client.list_jobs.side_effect = list_jobs
+        mock_get_client.return_value = mock_client
+
+        result = await compare_job_performance("app-1", "app-2")
+
+        self.assertEqual(result["applications"]["app2"]["name"], "App app-2")
+        self.assertIn("comparison", result["executor_metrics"])
+        self.assertEqual(list(result["job_performance"]), ["app1"])
+        self.assertEqual(result["errors"], ["jobs2 failed: jobs unavailable"])
+
     # Tests for list_slowest_sql_queries tool
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_get_slowest_sql_queries_success(self, mock_get_client):
+    async def test_get_slowest_sql_queries_success(self, mock_get_client):
         """Test successful SQL query retrieval and sorting"""
         # Setup mock client
         mock_client = MagicMock()
@@ -932,10 +1080,13 @@ class TestTools(unittest.TestCase):
         sql3.plan_description = "Sample plan description"
 
         mock_client.get_sql_list.return_value = [sql1, sql2, sql3]
+        mock_client.get_sql_execution.side_effect = _executions_by_id(
+            [sql1, sql2, sql3]
+        )
         mock_get_client.return_value = mock_client
 
         # Call the function
-        result = list_slowest_sql_queries("spark-app-123", top_n=2)
+        result = await list_slowest_sql_queries("spark-app-123", top_n=2)
 
         # Verify results are sorted by duration (descending)
         self.assertEqual(len(result), 2)
@@ -943,7 +1094,7 @@ class TestTools(unittest.TestCase):
         self.assertEqual(result[1].duration, 5000)  # Second slowest
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_get_slowest_sql_queries_exclude_running(self, mock_get_client):
+    async def test_get_slowest_sql_queries_exclude_running(self, mock_get_client):
         """Test SQL query retrieval excluding running queries"""
         # Setup mock client
         mock_client = MagicMock()
@@ -972,17 +1123,18 @@ class TestTools(unittest.TestCase):
         sql2.plan_description = "Completed plan description"
 
         mock_client.get_sql_list.return_value = [sql1, sql2]
+        mock_client.get_sql_execution.side_effect = _executions_by_id([sql1, sql2])
         mock_get_client.return_value = mock_client
 
         # Call the function (include_running=False by default)
-        result = list_slowest_sql_queries("spark-app-123")
+        result = await list_slowest_sql_queries("spark-app-123")
 
         # Should exclude running query
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0].status, "COMPLETED")
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_get_slowest_sql_queries_include_running(self, mock_get_client):
+    async def test_get_slowest_sql_queries_include_running(self, mock_get_client):
         """Test SQL query retrieval including running queries"""
         # Setup mock client
         mock_client = MagicMock()
@@ -1011,10 +1163,11 @@ class TestTools(unittest.TestCase):
         sql2.plan_description = "Completed plan description"
 
         mock_client.get_sql_list.return_value = [sql1, sql2]
+        mock_client.get_sql_execution.side_effect = _executions_by_id([sql1, sql2])
         mock_get_client.return_value = mock_client
 
         # Call the function with include_running=True and top_n=2
-        result = list_slowest_sql_queries(
+        result = await list_slowest_sql_queries(
             "spark-app-123", include_running=True, top_n=2
         )
 
@@ -1022,7 +1175,7 @@ class TestTools(unittest.TestCase):
         self.assertEqual(len(result), 2)
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_get_slowest_sql_queries_empty_result(self, mock_get_client):
+    async def test_get_slowest_sql_queries_empty_result(self, mock_get_client):
         """Test SQL query retrieval with empty result"""
         # Setup mock client
         mock_client = MagicMock()
@@ -1030,13 +1183,62 @@ class TestTools(unittest.TestCase):
         mock_get_client.return_value = mock_client
 
         # Call the function
-        result = list_slowest_sql_queries("spark-app-123")
+        result = await list_slowest_sql_queries("spark-app-123")
 
         # Verify results
         self.assertEqual(result, [])
 
     @patch("spark_history_mcp.tools.tools.get_client_or_default")
-    def test_get_slowest_sql_queries_limit(self, mock_get_client):
+    async def test_get_slowest_sql_queries_fetches_plans_for_winners(
+        self, mock_get_client
+    ):
+        """Test paged SQL listing without plans, then plans for the slowest only"""
+        mock_client = MagicMock()
+
+        def execution(i, plan_description=""):
+            sql = MagicMock(spec=ExecutionData)
+            sql.id = i
+            sql.duration = [3000, 1000, 5000, 2000, 4000][i]
+            sql.status = "COMPLETED"
+            sql.success_job_ids = [i]
+            sql.failed_job_ids = []
+            sql.running_job_ids = []
+            sql.description = f"Query {i}"
+            sql.submission_time = datetime.now()
+            sql.plan_description = plan_description
+            return sql
+
+        sql_execs = [execution(i) for i in range(5)]
+
+        def get_sql_list(offset, length, **kwargs):
+            return sql_execs[offset : offset + length]
+
+        def get_sql_execution(app_id, execution_id, **kwargs):
+            return execution(execution_id, f"Plan {execution_id}")
+
+        mock_client.get_sql_list.side_effect = get_sql_list
+        mock_client.get_sql_execution.side_effect = get_sql_execution
+        mock_get_client.return_value = mock_client
+
+        result = await list_slowest_sql_queries("spark-app-123", top_n=2, page_size=2)
+
+        self.assertEqual([query.id for query in result], [2, 4])
+        self.assertEqual(
+            [query.plan_description for query in result], ["Plan 2", "Plan 4"]
+        )
+        for call in mock_client.get_sql_list.call_args_list:
+            self.assertFalse(call.kwargs["details"])
+            self.assertFalse(call.kwargs["plan_description"])
+        self.assertEqual(
+            sorted(
+                c.kwargs["execution_id"]
+                for c in mock_client.get_sql_execution.call_args_list
+            ),
+            [2, 4],
+        )
+
+    @patch("spark_history_mcp.tools.tools.get_client_or_default")
+    async def test_get_slowest_sql_queries_limit(self, mock_get_client):
         """Test SQL query retrieval with limit"""
         # Setup mock client
         mock_client = MagicMock()
@@ -1057,10 +1259,11 @@ class TestTools(unittest.TestCase):
             sql_execs.append(sql)
 
         mock_client.get_sql_list.return_value = sql_execs
+        mock_client.get_sql_execution.side_effect = _executions_by_id(sql_execs)
         mock_get_client.return_value = mock_client
 
         # Call the function with top_n=3
-        result = list_slowest_sql_queries("spark-app-123", top_n=3)
+        result = await list_slowest_sql_queries("spark-app-123", top_n=3)
 
         # Verify results - should return only 3 queries
         self.assertEqual(len(result), 3)
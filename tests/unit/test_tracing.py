@@ -0,0 +1,88 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from spark_history_mcp.api.spark_client import SparkRestClient
+from spark_history_mcp.config.config import ServerConfig, TracingConfig
+from spark_history_mcp.core.app import mcp
+from spark_history_mcp.utils.tracing import configure_tracing, tracer
+from spark_history_mcp.utils.utils import parallel_execute
+
+
+def _response(status_code, data=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = data
+    response.content = b"{}"
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            response=response
+        )
+    return response
+
+
+class TestTracing(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.exporter = configure_tracing(
+            TracingConfig(enabled=True, exporter="memory")
+        )
+
+    def _spans(self):
+        return {span.name: span for span in self.exporter.get_finished_spans()}
+
+    def test_disabled(self):
+        self.assertIsNone(configure_tracing(TracingConfig()))
+
+    @patch("spark_history_mcp.api.spark_client.requests.Session.get")
+    @patch("spark_history_mcp.tools.tools.get_client_or_default")
+    async def test_tool_call_down_to_requests(self, mock_get_client, mock_get):
+        mock_get_client.return_value = SparkRestClient(
+            ServerConfig(url="http://spark-history-server:18080", cache_max_mb=0)
+        )
+        application = {
+            "id": "app-123",
+            "name": "app",
+            "attempts": [{"attemptId": "1", "duration": 1000, "completed": True}],
+        }
+        mock_get.side_effect = [
+            _response(404),
+            _response(200, application),
+            _response(200, []),
+        ]
+
+        await mcp.call_tool("list_jobs", {"app_id": "app-123"})
+
+        spans = self._spans()
+        root = spans["tool list_jobs"]
+        self.assertIsNone(root.parent)
+        self.assertEqual(spans["execute"].parent.span_id, root.context.span_id)
+        # The 404 is retried with the attempt ID of the application
+        self.assertEqual(
+            [
+                (span.name, span.attributes["http.response.status_code"])
+                for span in self.exporter.get_finished_spans()
+                if span.name.startswith("GET ")
+            ],
+            [
+                ("GET applications/{app_id}/jobs", 404),
+                ("GET applications/{app_id}", 200),
+                ("GET applications/{app_id}/{id}/jobs", 200),
+            ],
+        )
+        # Spans of the worker thread belong to the trace of the tool call
+        for name in ["shs.get", "json.decode", "parse JobData"]:
+            self.assertEqual(spans[name].context.trace_id, root.context.trace_id)
+
+    async def test_parallel_calls_are_children_of_the_caller(self):
+        async def call():
+            return "ok"
+
+        with tracer.start_as_current_span("caller") as caller:
+            await parallel_execute([("a", call), ("b", call)])
+
+        spans = self._spans()
+        for name in ["parallel a", "parallel b"]:
+            self.assertEqual(
+                spans[name].parent.span_id, caller.get_span_context().span_id
+            )
@@ -0,0 +1,109 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+
+import requests
+
+from spark_history_mcp.utils.utils import parallel_execute
+
+
+def _http_error(status_code, text=""):
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = text
+    return requests.exceptions.HTTPError(f"{status_code} Error", response=response)
+
+
+class TestParallelExecute(unittest.IsolatedAsyncioTestCase):
+    async def test_partial_results(self):
+        async def ok():
+            return "ok"
+
+        async def fail():
+            raise ValueError("boom")
+
+        result = await parallel_execute([("a", ok), ("b", fail), ("c", ok)])
+
+        self.assertEqual(result["results"], {"a": "ok", "c": "ok"})
+        self.assertEqual(result["errors"], ["b failed: boom"])
+        self.assertEqual(set(result["latencies"]), {"a", "b", "c"})
+
+    async def test_timeout_keeps_completed_results(self):
+        async def fast():
+            return "fast"
+
+        async def slow():
+            await asyncio.sleep(10)
+
+        result = await parallel_execute([("fast", fast), ("slow", slow)], timeout=0.1)
+
+        self.assertEqual(result["results"], {"fast": "fast"})
+        self.assertEqual(result["timed_out"], ["slow"])
+        self.assertEqual(result["errors"], ["slow failed: timed out"])
+
+    async def test_call_timeout(self):
+        async def slow():
+            await asyncio.sleep(10)
+
+        result = await parallel_execute([("slow", slow)], call_timeout=0.05)
+
+        self.assertEqual(result["timed_out"], ["slow"])
+        self.assertLess(result["latencies"]["slow"], 5)
+
+    async def test_max_workers(self):
+        in_flight = 0
+        peak = 0
+
+        async def call():
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        await parallel_execute([(str(i), call) for i in range(6)], max_workers=2)
+
+        self.assertEqual(peak, 2)
+
+    async def test_http_errors(self):
+        async def oom():
+            raise _http_error(500, "java.lang.OutOfMemoryError: Java heap space")
+
+        async def server_error():
+            raise _http_error(500, "NullPointerException")
+
+        async def not_found():
+            raise _http_error(404)
+
+        result = await parallel_execute(
+            [("oom", oom), ("error", server_error), ("missing", not_found)]
+        )
+
+        self.assertEqual(
+            result["errors"],
+            [
+                "oom failed: Spark History Server out of memory (increase SPARK_DAEMON_MEMORY)",
+                "error failed: HTTP 500 - 500 Error",
+                "missing failed: HTTP 404 - 404 Error",
+            ],
+        )
+
+    async def test_cancellation_cancels_outstanding_calls(self):
+        started = asyncio.Event()
+        cancelled = []
+
+        async def slow():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        task = asyncio.create_task(parallel_execute([("slow", slow)]))
+        await started.wait()
+        task.cancel()
+
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertEqual(cancelled, [True])